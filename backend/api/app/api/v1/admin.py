@@ -0,0 +1,56 @@
+"""Operator endpoints: the in-process query profile.
+
+Off unless ADMIN_API_TOKEN is set -- every route then 404s, as if it weren't
+there. With a token set, a request must carry it as `Authorization: Bearer
+<token>`. The profile holds SQL text and timings, never query parameters, but
+it still maps out what users are asking and what's slow, so it isn't public.
+"""
+
+import hmac
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+
+from app.core.config import get_settings
+from app.services.query_profile import profiler
+
+router = APIRouter()
+
+
+def require_admin(authorization: Optional[str] = Header(default=None)) -> None:
+    token = get_settings().ADMIN_API_TOKEN
+    if not token:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if authorization is None or not hmac.compare_digest(
+        authorization.encode(), f"Bearer {token}".encode()
+    ):
+        raise HTTPException(status_code=401, detail="Admin token required")
+
+
+@router.get("/query-profile")
+async def query_profile(
+    limit: int = Query(default=50, ge=1, le=1000),
+    source: Optional[str] = Query(default=None, pattern="^(sra_mirror|catalog)$"),
+    tool: Optional[str] = Query(default=None),
+    include_profiles: bool = Query(
+        default=False, description="Include DuckDB's JSON profile for each query"
+    ),
+    _: None = Depends(require_admin),
+):
+    """Recent SRA mirror and catalog calls with their per-query timings, rows
+    scanned and cache outcome, newest first, plus per-tool totals over the
+    whole buffer. Empty unless QUERY_PROFILING_ENABLED is set."""
+    return {
+        "enabled": profiler.enabled,
+        "capacity": profiler.capacity,
+        "summary": profiler.summary(),
+        "records": profiler.records(
+            limit, source=source, tool=tool, include_profiles=include_profiles
+        ),
+    }
+
+
+@router.delete("/query-profile", status_code=204)
+async def clear_query_profile(_: None = Depends(require_admin)):
+    """Empty the buffer, e.g. before a load test."""
+    profiler.clear()
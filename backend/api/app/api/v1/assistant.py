@@ -53,6 +53,16 @@ async def assistant_info(
     )
 
 
+@router.get("/catalog-query/stats")
+async def catalog_query_stats(
+    agent=Depends(get_assistant_agent),
+):
+    """Result-cache hit rate of this worker's query_catalog engine."""
+    if agent.query_engine is None:
+        raise HTTPException(status_code=503, detail="Catalog queries unavailable")
+    return agent.query_engine.cache_stats()
+
+
 @router.post("/chat", response_model=ChatResponse)
 async def assistant_chat(
     request: ChatRequest,
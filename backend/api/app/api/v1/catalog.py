@@ -0,0 +1,41 @@
+"""Catalog lookups: type-ahead suggestions and workflow compatibility."""
+
+from typing import List, Literal, Optional
+
+from fastapi import APIRouter, Depends, Query
+
+from app.core.dependencies import get_catalog_data
+from app.models.catalog import CompatibleWorkflowsRequest
+from app.services.catalog_data import CatalogData
+
+router = APIRouter()
+
+
+@router.get("/suggest")
+async def suggest(
+    q: str = Query(min_length=1, max_length=200, description="What's typed so far"),
+    limit: int = Query(default=10, ge=1, le=50),
+    type: Optional[List[Literal["organism", "assembly", "workflow"]]] = Query(
+        default=None, description="Entity types to suggest; repeat for several"
+    ),
+    catalog: CatalogData = Depends(get_catalog_data),
+):
+    """Organisms (by species or common name), assemblies (by accession) and
+    workflows (by name) whose name, or a later word of it, starts with `q`.
+    Exact names first, then name prefixes, then word prefixes."""
+    return {"query": q, "suggestions": catalog.suggest(q, limit, type)}
+
+
+@router.post("/compatible-workflows")
+async def compatible_workflows(
+    payload: CompatibleWorkflowsRequest,
+    catalog: CatalogData = Depends(get_catalog_data),
+):
+    """The workflows compatible with each of many assemblies (by accession) and
+    organisms (by taxonomy ID; those compatible with at least one of its
+    assemblies) at once. Returns IWC ids per key, each workflow described once
+    under `workflows`, and the keys the catalog doesn't have under
+    `not_found`."""
+    return catalog.get_compatible_workflows_bulk(
+        payload.accessions, payload.taxonomy_ids
+    )
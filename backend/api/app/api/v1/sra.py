@@ -0,0 +1,93 @@
+"""Bulk export of runs from the local SRA mirror, plus its query counters.
+
+The MCP and assistant tools page through runs a few hundred at a time; the
+export is for "give me every run of this BioProject" -- a file download rather
+than something to put through a model's context.
+"""
+
+import re
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+
+from app.core.dependencies import get_sra_mirror_service
+from app.services.sra_mirror import SRAMirrorService
+
+router = APIRouter()
+
+_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+
+def get_available_sra_mirror() -> SRAMirrorService:
+    """The mirror service, or 503 when no mirror is configured or loaded."""
+    mirror = get_sra_mirror_service()
+    if mirror is None or not mirror.is_available():
+        raise HTTPException(status_code=503, detail="SRA mirror not available")
+    return mirror
+
+
+@router.get("/runs/export")
+async def export_runs(
+    format: str = Query(default="ndjson", pattern="^(ndjson|csv|parquet)$"),
+    organism: Optional[str] = Query(
+        default=None, description="Scientific name or NCBI taxonomy ID"
+    ),
+    accession: Optional[str] = Query(
+        default=None, description="SRA study (SRP/ERP/DRP) or BioProject (PRJ*)"
+    ),
+    assay_type: Optional[str] = Query(default=None),
+    platform: Optional[str] = Query(default=None),
+    country: Optional[str] = Query(default=None),
+    since: Optional[str] = Query(default=None, description="YYYY[-MM[-DD]]"),
+    mirror: SRAMirrorService = Depends(get_available_sra_mirror),
+):
+    """Stream every run matching an organism search or a study accession.
+
+    Filters apply to organism searches only. Rows come in mirror order, not
+    sorted -- sort downstream if order matters.
+    """
+    if accession is not None and any((assay_type, platform, country, since)):
+        raise HTTPException(
+            status_code=400, detail="Filters apply to organism exports only"
+        )
+    try:
+        # Resolving a study accession queries the mirror before the first
+        # chunk, so the call goes to the threadpool with the iteration.
+        chunks = await run_in_threadpool(
+            mirror.export_runs,
+            format,
+            organism=organism,
+            accession=accession,
+            assay_type=assay_type,
+            platform=platform,
+            country=country,
+            since=since,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+
+    stem = re.sub(r"[^A-Za-z0-9]+", "-", organism or accession).strip("-").lower()
+    return StreamingResponse(
+        chunks,
+        media_type=_MEDIA_TYPES[format],
+        headers={
+            "Content-Disposition": (
+                f'attachment; filename="sra-runs-{stem or "export"}.{format}"'
+            )
+        },
+    )
+
+
+@router.get("/stats")
+async def query_stats(
+    mirror: SRAMirrorService = Depends(get_available_sra_mirror),
+):
+    """This worker's mirror query counters: queries executed, calls served
+    by another call's in-flight query, and queries running now."""
+    return mirror.query_stats()
@@ -162,9 +162,54 @@ class Settings:
 
         # Catalog path
         self.CATALOG_PATH: str = os.getenv("CATALOG_PATH", "/catalog/output")
+        # Prebuilt DuckDB snapshot for query_catalog (scripts.build_catalog_snapshot);
+        # empty means catalog-query.duckdb in CATALOG_PATH. JSON is the fallback.
+        self.CATALOG_SNAPSHOT_PATH: str = os.getenv("CATALOG_SNAPSHOT_PATH", "")
 
         # SRA-DuckDB mirror. Empty path disables the assistant's SRA tools.
         self.SRA_MIRROR_PATH: str = os.getenv("SRA_MIRROR_PATH", "")
+        # How often to check SRA_MIRROR_PATH for a new build to swap in
+        # without a restart; 0 disables the check.
+        self.SRA_MIRROR_RELOAD_SECONDS: int = int(
+            os.getenv("SRA_MIRROR_RELOAD_SECONDS", "60")
+        )
+
+        # Cost guards for the in-process DuckDB queries (see query_guard.py):
+        # a per-call deadline in seconds, a cap on the rows one query returns,
+        # and a DuckDB memory_limit for the whole database ("" keeps DuckDB's
+        # default of 80% of RAM). 0 turns the deadline or row cap off.
+        self.SRA_QUERY_TIMEOUT_SECONDS: float = float(
+            os.getenv("SRA_QUERY_TIMEOUT_SECONDS", "30")
+        )
+        self.SRA_QUERY_MAX_ROWS: int = int(os.getenv("SRA_QUERY_MAX_ROWS", "50000"))
+        self.SRA_QUERY_MEMORY_LIMIT: str = os.getenv("SRA_QUERY_MEMORY_LIMIT", "")
+        self.CATALOG_QUERY_TIMEOUT_SECONDS: float = float(
+            os.getenv("CATALOG_QUERY_TIMEOUT_SECONDS", "10")
+        )
+        self.CATALOG_QUERY_MAX_ROWS: int = int(
+            os.getenv("CATALOG_QUERY_MAX_ROWS", "10000")
+        )
+        self.CATALOG_QUERY_MEMORY_LIMIT: str = os.getenv(
+            "CATALOG_QUERY_MEMORY_LIMIT", ""
+        )
+        # Threads (each with its own DuckDB connection) running query_catalog
+        # queries; more queries than this wait for a free one.
+        self.CATALOG_QUERY_WORKERS: int = int(os.getenv("CATALOG_QUERY_WORKERS", "4"))
+        # Results of that many distinct queries kept per worker; 0 turns the
+        # result cache off.
+        self.CATALOG_QUERY_CACHE_SIZE: int = int(
+            os.getenv("CATALOG_QUERY_CACHE_SIZE", "1024")
+        )
+        # Opt-in profiling of those queries into a ring buffer of the last
+        # QUERY_PROFILING_BUFFER_SIZE calls, served at /api/v1/admin.
+        self.QUERY_PROFILING_ENABLED: bool = (
+            os.getenv("QUERY_PROFILING_ENABLED", "false").lower() == "true"
+        )
+        self.QUERY_PROFILING_BUFFER_SIZE: int = int(
+            os.getenv("QUERY_PROFILING_BUFFER_SIZE", "256")
+        )
+        # Bearer token for the /api/v1/admin endpoints; empty disables them.
+        self.ADMIN_API_TOKEN: str = os.getenv("ADMIN_API_TOKEN", "")
 
         # Keycloak / OIDC settings
         self.KEYCLOAK_ISSUER_URL: str = os.getenv(
@@ -16,6 +16,7 @@ from app.services.assistant_agent import AssistantAgent
 from app.services.auth_service import COOKIE_NAME, AuthService
 from app.services.catalog_data import CatalogData
 from app.services.ena_service import ENAService
+from app.services.query_guard import QueryLimits
 from app.services.sra_mirror import SRAMirrorService
 
 logger = logging.getLogger(__name__)
@@ -55,7 +56,15 @@ def get_sra_mirror_service() -> Optional[SRAMirrorService]:
     if not settings.SRA_MIRROR_PATH:
         logger.info("SRA_MIRROR_PATH not set -- SRA mirror service disabled")
         return None
-    service = SRAMirrorService(settings.SRA_MIRROR_PATH)
+    service = SRAMirrorService(
+        settings.SRA_MIRROR_PATH,
+        reload_interval=settings.SRA_MIRROR_RELOAD_SECONDS,
+        limits=QueryLimits(
+            timeout_seconds=settings.SRA_QUERY_TIMEOUT_SECONDS,
+            max_rows=settings.SRA_QUERY_MAX_ROWS,
+            memory_limit=settings.SRA_QUERY_MEMORY_LIMIT,
+        ),
+    )
     logger.info(
         f"SRA mirror service initialized (singleton), available: {service.is_available()}"
     )
@@ -6,14 +6,17 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.api.v1 import (
+    admin,
     assistant,
     auth,
     cache,
+    catalog,
     ena,
     favorites,
     health,
     links,
     saved_analyses,
+    sra,
     user,
     version,
     workflow_runs,
@@ -30,6 +33,7 @@ from app.core.dependencies import (
 from app.db.session import close_db, init_db
 from app.services import turn_log
 from app.services.mcp_server import create_mcp_server
+from app.services.query_profile import profiler
 
 logger = logging.getLogger(__name__)
 
@@ -50,6 +54,11 @@ def create_app() -> FastAPI:
             traces_sample_rate=1.0,
         )
 
+    profiler.configure(
+        enabled=settings.QUERY_PROFILING_ENABLED,
+        capacity=settings.QUERY_PROFILING_BUFFER_SIZE,
+    )
+
     mcp = create_mcp_server(
         get_catalog_data(),
         get_ena_service(),
@@ -82,6 +91,8 @@ def create_app() -> FastAPI:
             await auth_service.close()
             await close_db()
             await cache_service.close()
+            if (sra_mirror := get_sra_mirror_service()) is not None:
+                sra_mirror.close()
             reset_all_services()
             logger.info("All services shut down")
 
@@ -107,6 +118,7 @@ def create_app() -> FastAPI:
     app.include_router(version.router, prefix="/api/v1/version", tags=["version"])
     app.include_router(links.router, prefix="/api/v1", tags=["links"])
     app.include_router(ena.router, prefix="/api/v1/ena", tags=["ena"])
+    app.include_router(catalog.router, prefix="/api/v1/catalog", tags=["catalog"])
     app.include_router(assistant.router, prefix="/api/v1/assistant", tags=["assistant"])
     app.include_router(auth.router, prefix="/api/v1/auth", tags=["auth"])
     app.include_router(favorites.router, prefix="/api/v1/favorites", tags=["favorites"])
@@ -116,11 +128,13 @@ def create_app() -> FastAPI:
         tags=["saved_analyses"],
     )
     app.include_router(user.router, prefix="/api/v1/user", tags=["user"])
+    app.include_router(sra.router, prefix="/api/v1/sra", tags=["sra"])
     app.include_router(
         workflow_runs.router,
         prefix="/api/v1/workflow_runs",
         tags=["workflow_runs"],
     )
+    app.include_router(admin.router, prefix="/api/v1/admin", tags=["admin"])
 
     app.mount("/api/v1/mcp", mcp_app)
 
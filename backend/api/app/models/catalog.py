@@ -0,0 +1,9 @@
+from pydantic import BaseModel, Field
+
+# Per request, so one call can't make the worker build an unbounded response.
+MAX_BULK_KEYS = 1000
+
+
+class CompatibleWorkflowsRequest(BaseModel):
+    accessions: list[str] = Field(default_factory=list, max_length=MAX_BULK_KEYS)
+    taxonomy_ids: list[str] = Field(default_factory=list, max_length=MAX_BULK_KEYS)
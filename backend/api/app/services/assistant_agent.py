@@ -38,6 +38,7 @@ from app.models.assistant import (
     TurnOutcome,
     TurnTelemetry,
 )
+from app.services.query_guard import QueryLimits
 from app.services.session_service import SessionService
 from app.services.sra_mirror import SRAMirrorService
 from app.services.tools.catalog_data import CatalogData, _is_assembly_scope
@@ -56,8 +57,11 @@ from app.services.tools.catalog_tools import (
     search_organisms,
 )
 from app.services.tools.sra_tools import (
+    get_sra_runs,
     get_sra_study_runs,
     search_sra_runs,
+    sra_release_histogram,
+    sra_summaries_for_organisms,
     sra_summary_for_organism,
     top_bioprojects_for_organism,
 )
@@ -343,15 +347,24 @@ data-availability question in real numbers:
   recent activity, largest BioProjects. Call this first whenever a user \
   asks how much data exists, or before suggesting analyses, so your \
   recommendations are grounded in real availability.
+- `sra_summaries_for_organisms` — the same snapshot for several organisms \
+  in one call; use it for comparisons instead of repeated single calls.
+- `sra_release_histogram` — runs per release month/quarter/year, optionally \
+  split by platform, assay type or country; use it for "how has this grown \
+  over time" questions rather than repeated searches with `since`.
 - `search_sra_runs` — filtered run listing (assay type, platform, country, \
   release date) for when the user wants concrete accessions.
 - `top_bioprojects_for_organism` — when the user asks about large cohorts \
   or major studies.
 - `get_sra_study_runs` — runs for a specific SRP/ERP/DRP study or PRJ* \
   BioProject accession.
+- `get_sra_runs` — metadata for a list of SRR/ERR/DRR run accessions the \
+  user already has, up to 5000 in one call.
 
 The mirror handles taxonomic synonyms automatically (e.g. accepts either \
-"Candida auris" or "Candidozyma auris" — same data). Every response \
+"Candida auris" or "Candidozyma auris" — same data). An unresolved term \
+comes back with ranked `did_you_mean` candidates: retry with the top one \
+when it is clearly what the user meant, otherwise ask. Every response \
 includes provenance (mirror build date, resolved name set) in `_meta`; \
 mention it when it matters.
 
@@ -388,8 +401,15 @@ def build_system_prompt(include_sra_tools: bool) -> str:
 def _wrap_tool(fn):
     """Wrap a tool function so it receives AssistantDeps from RunContext."""
 
-    async def wrapper(ctx: RunContext[AssistantDeps], **kwargs) -> str:
-        return fn(ctx.deps, **kwargs)
+    if inspect.iscoroutinefunction(fn):
+
+        async def wrapper(ctx: RunContext[AssistantDeps], **kwargs) -> str:
+            return await fn(ctx.deps, **kwargs)
+
+    else:
+
+        async def wrapper(ctx: RunContext[AssistantDeps], **kwargs) -> str:
+            return fn(ctx.deps, **kwargs)
 
     wrapper.__name__ = fn.__name__
     wrapper.__doc__ = fn.__doc__
@@ -450,14 +470,19 @@ class AssistantAgent:
         self.session_service = SessionService(cache)
         self.catalog = CatalogData(self.settings.CATALOG_PATH)
         self.sra_mirror = sra_mirror
-        self.query_con = self._init_query_engine()
+        self.query_limits = QueryLimits(
+            timeout_seconds=self.settings.CATALOG_QUERY_TIMEOUT_SECONDS,
+            max_rows=self.settings.CATALOG_QUERY_MAX_ROWS,
+            memory_limit=self.settings.CATALOG_QUERY_MEMORY_LIMIT,
+        )
+        self.query_engine = self._init_query_engine()
 
         self.agent: Optional[Agent] = None
         self.extract_agent: Optional[Agent] = None
         self._init_agent()
 
     def _init_query_engine(self):
-        """In-process DuckDB connection backing the query_catalog tool.
+        """In-process DuckDB engine backing the query_catalog tool.
 
         Degrades to None (tool reports unavailable) if duckdb or the catalog
         can't load, so the rest of the agent still works. connect() fail-softs to
@@ -467,9 +492,26 @@ class AssistantAgent:
         rather than swallow it silently.
         """
         try:
-            from app.services.tools.catalog_query import connect
+            from app.services.tools.catalog_query import (
+                CatalogEngine,
+                catalog_build_id,
+                connect,
+            )
 
-            return connect(self.settings.CATALOG_PATH)
+            con = connect(
+                self.settings.CATALOG_PATH,
+                self.query_limits,
+                snapshot_path=self.settings.CATALOG_SNAPSHOT_PATH or None,
+            )
+            if con is None:
+                return None
+            return CatalogEngine(
+                con,
+                self.query_limits,
+                max_workers=self.settings.CATALOG_QUERY_WORKERS,
+                build_id=catalog_build_id(self.settings.CATALOG_PATH),
+                cache_size=self.settings.CATALOG_QUERY_CACHE_SIZE,
+            )
         except ImportError as e:
             logger.warning("Catalog query engine unavailable (duckdb missing): %s", e)
             return None
@@ -506,9 +548,12 @@ class AssistantAgent:
             tool_fns.extend(
                 [
                     sra_summary_for_organism,
+                    sra_summaries_for_organisms,
+                    sra_release_histogram,
                     search_sra_runs,
                     top_bioprojects_for_organism,
                     get_sra_study_runs,
+                    get_sra_runs,
                 ]
             )
             logger.info("SRA mirror tools registered with assistant agent")
@@ -1130,7 +1175,7 @@ class AssistantAgent:
         deps = AssistantDeps(
             catalog=self.catalog,
             sra_mirror=self.sra_mirror,
-            con=self.query_con,
+            query_engine=self.query_engine,
         )
         result = await self._run_agent_with_retry(
             augmented_message, deps=deps, message_history=agent_history
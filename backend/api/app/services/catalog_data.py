@@ -1,10 +1,26 @@
-import json
 import logging
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Set
+from typing import Any, Dict, List, Optional
+
+from app.services.catalog_store import get_catalog_store
+from app.services.catalog_suggest import CatalogSuggester
+from app.services.lineage_index import LineageIndex
+from app.services.organism_search import OrganismSearchIndex
+from app.services.workflow_compatibility import CompatibilityMatrix
 
 logger = logging.getLogger(__name__)
 
+# Fields search_organisms matches a query against (any substring).
+_SEARCH_FIELDS = (
+    "taxonomicLevelSpecies",
+    "taxonomicLevelGenus",
+    "commonNames",
+    "ncbiTaxonomyId",
+    "taxonomicGroup",
+    "taxonomicLevelStrain",
+    "taxonomicLevelIsolate",
+)
+
 
 def _is_assembly_scope(wf: Dict[str, Any]) -> bool:
     """The guided single-organism/single-assembly flow can't drive ORGANISM- or
@@ -31,24 +47,19 @@ class CatalogData:
         self._assemblies_by_accession: Dict[str, Dict[str, Any]] = {}
         self._assemblies_by_tax_id: Dict[str, List[Dict[str, Any]]] = {}
         self._workflows_by_iwc_id: Dict[str, Dict[str, Any]] = {}
-        self._lineage_by_tax_id: Dict[str, Set[str]] = {}
+        self._lineage = LineageIndex([])
+        self._compatibility = CompatibilityMatrix([], [], self._lineage)
+        self._organism_search = OrganismSearchIndex([], _SEARCH_FIELDS)
+        self._suggester = CatalogSuggester([], [], [])
 
         self._load()
 
     def _load(self) -> None:
-        for name in ("organisms", "assemblies", "workflows"):
-            path = self.catalog_path / f"{name}.json"
-            if not path.exists():
-                logger.warning(f"Catalog file not found: {path}")
-                continue
-            with open(path) as f:
-                data = json.load(f)
-            if name == "organisms":
-                self.organisms = data
-            elif name == "assemblies":
-                self.assemblies = data
-            elif name == "workflows":
-                self.workflow_categories = data
+        # Records are shared with the assistant's CatalogData; see catalog_store.
+        store = get_catalog_store(str(self.catalog_path))
+        self.organisms = store.organisms
+        self.assemblies = store.assemblies
+        self.workflow_categories = store.workflow_categories
         self._build_indexes()
         wf_count = sum(len(c.get("workflows", [])) for c in self.workflow_categories)
         logger.info(
@@ -57,6 +68,12 @@ class CatalogData:
         )
 
     def _build_indexes(self) -> None:
+        self._organism_search = OrganismSearchIndex(self.organisms, _SEARCH_FIELDS)
+        # Ancestor lookups (e.g. "is 2 (Bacteria) an ancestor of 562 (E.
+        # coli)?") over the tree the assemblies' lineages span.
+        self._lineage = LineageIndex(
+            asm.get("lineageTaxonomyIds") or [] for asm in self.assemblies
+        )
         for org in self.organisms:
             tax_id = str(org.get("ncbiTaxonomyId", ""))
             if tax_id:
@@ -73,20 +90,6 @@ class CatalogData:
             species_tax_id = str(asm.get("speciesTaxonomyId", ""))
             if species_tax_id and species_tax_id != tax_id:
                 self._assemblies_by_tax_id.setdefault(species_tax_id, []).append(asm)
-            # Build lineage index: maps each taxonomy ID to the set of IDs
-            # in its lineage so ancestor lookups work (e.g. "is 2 (Bacteria)
-            # an ancestor of 562 (E. coli)?"). Each tax ID gets its own set
-            # copy; when multiple assemblies share a tax ID, their lineages
-            # are merged into that ID's set.
-            lineage = asm.get("lineageTaxonomyIds", [])
-            if lineage:
-                lineage_strs = [str(t) for t in lineage]
-                for tid in lineage_strs:
-                    existing = self._lineage_by_tax_id.get(tid)
-                    if existing is None:
-                        self._lineage_by_tax_id[tid] = set(lineage_strs)
-                    else:
-                        existing.update(lineage_strs)
 
         for cat in self.workflow_categories:
             for wf in cat.get("workflows", []):
@@ -96,35 +99,46 @@ class CatalogData:
                         **wf,
                         "_category": cat.get("name", ""),
                     }
+        # Compatible (workflow, assembly) pairs, with the ASSEMBLY-scope
+        # workflows as columns in catalog order.
+        self._compatibility = CompatibilityMatrix(
+            [
+                wf
+                for cat in self.workflow_categories
+                for wf in cat.get("workflows", [])
+                if _is_assembly_scope(wf)
+            ],
+            self.assemblies,
+            self._lineage,
+        )
+
+        self._suggester = CatalogSuggester(
+            self._organisms_by_tax_id.values(),
+            self._assemblies_by_accession.values(),
+            (wf for wf in self._workflows_by_iwc_id.values() if _is_assembly_scope(wf)),
+        )
+
+    # -- Suggestions --
+
+    def suggest(
+        self, query: str, limit: int = 10, types: Optional[List[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """Type-ahead suggestions: organisms, assemblies and workflows whose
+        name (or a later word of it) starts with `query`."""
+        return self._suggester.suggest(query, limit, types)
 
     # -- Organism methods --
 
     def search_organisms(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
         """
         Search organisms by name, taxonomy ID, or taxonomic group.
+        Exact matches rank first, then word prefixes, then other substrings.
         Returns condensed records suitable for MCP responses.
         """
-        if not query.strip():
-            return []
-        q = query.lower()
-        results = []
-        for org in self.organisms:
-            if any(
-                q in str(org.get(field, "")).lower()
-                for field in (
-                    "taxonomicLevelSpecies",
-                    "taxonomicLevelGenus",
-                    "commonNames",
-                    "ncbiTaxonomyId",
-                    "taxonomicGroup",
-                    "taxonomicLevelStrain",
-                    "taxonomicLevelIsolate",
-                )
-            ):
-                results.append(self._condense_organism(org))
-                if len(results) >= limit:
-                    break
-        return results
+        return [
+            self._condense_organism(self.organisms[i])
+            for i in self._organism_search.search(query, limit)
+        ]
 
     def get_organism_by_taxonomy_id(self, taxonomy_id: str) -> Optional[Dict[str, Any]]:
         org = self._organisms_by_tax_id.get(str(taxonomy_id))
@@ -208,29 +222,56 @@ class CatalogData:
         self, ploidies: List[str], taxonomy_id: str = ""
     ) -> List[Dict[str, Any]]:
         """Find workflows compatible with given ploidies and optional taxonomy ID."""
-        results = []
-        for cat in self.workflow_categories:
-            for wf in cat.get("workflows", []):
-                if not _is_assembly_scope(wf):
-                    continue
-                wf_ploidy = wf.get("ploidy")
-                wf_tax = wf.get("taxonomyId")
-                # Ploidy must match (None/ANY = universal)
-                if (
-                    wf_ploidy is not None
-                    and wf_ploidy != "ANY"
-                    and wf_ploidy not in ploidies
-                ):
-                    continue
-                # Taxonomy must match if specified on both sides;
-                # check against the full lineage so a workflow targeting
-                # e.g. Bacteria (2) matches E. coli (562)
-                if taxonomy_id and wf_tax is not None:
-                    lineage = self._lineage_by_tax_id.get(str(taxonomy_id), set())
-                    if str(wf_tax) not in lineage:
-                        continue
-                results.append(self._condense_workflow(wf))
-        return results
+        # Ploidy must match (None/ANY = universal)
+        columns = self._compatibility.for_ploidies(ploidies)
+        # Taxonomy must match if specified on both sides; a workflow
+        # targeting e.g. Bacteria (2) matches E. coli (562)
+        if taxonomy_id:
+            columns &= self._compatibility.for_taxon(taxonomy_id)
+        return [
+            self._condense_workflow(wf) for wf in self._compatibility.select(columns)
+        ]
+
+    def get_compatible_workflows_bulk(
+        self, accessions: List[str], taxonomy_ids: List[str]
+    ) -> Dict[str, Any]:
+        """IWC ids of the workflows compatible with each of `accessions` and
+        with each organism of `taxonomy_ids` (those compatible with at least one
+        of its assemblies), each workflow described once under "workflows"."""
+        workflows: Dict[str, Dict[str, Any]] = {}
+        # Assemblies of a species mostly share a set; build each list once.
+        lists: Dict[int, List[str]] = {}
+
+        def iwc_ids(columns: int) -> List[str]:
+            if columns not in lists:
+                ids = lists[columns] = []
+                for wf in self._compatibility.select(columns):
+                    iwc_id = wf.get("iwcId")
+                    if iwc_id and iwc_id not in ids:
+                        ids.append(iwc_id)
+                        if iwc_id not in workflows:
+                            workflows[iwc_id] = self._condense_workflow(
+                                self._workflows_by_iwc_id[iwc_id]
+                            )
+            return lists[columns]
+
+        result: Dict[str, Any] = {
+            "assemblies": {},
+            "organisms": {},
+            "workflows": workflows,
+            "not_found": {"assemblies": [], "organisms": []},
+        }
+        for kind, keys, lookup in (
+            ("assemblies", accessions, self._compatibility.for_assembly),
+            ("organisms", taxonomy_ids, self._compatibility.for_organism),
+        ):
+            for key in keys:
+                columns = lookup(key)
+                if columns is None:
+                    result["not_found"][kind].append(key)
+                else:
+                    result[kind][key] = iwc_ids(columns)
+        return result
 
     def get_workflow_details(self, iwc_id: str) -> Optional[Dict[str, Any]]:
         wf = self._workflows_by_iwc_id.get(iwc_id)
@@ -248,6 +289,14 @@ class CatalogData:
         if not asm:
             return {"compatible": False, "reason": f"Assembly '{accession}' not found"}
 
+        if self._compatibility.compatible(iwc_id, accession):
+            return {
+                "compatible": True,
+                "workflow": wf.get("workflowName"),
+                "assembly": accession,
+            }
+
+        # Only an incompatible pair needs the checks, to say why.
         issues = []
         wf_ploidy = wf.get("ploidy")
         asm_ploidies = asm.get("ploidy", [])
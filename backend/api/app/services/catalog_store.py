@@ -0,0 +1,176 @@
+"""One in-memory copy of the catalog per process.
+
+The MCP server's CatalogData and the assistant's each used to json.load the
+catalog into dicts of their own -- organisms.json twice, assemblies.json once --
+and organisms.json repeats every assembly under its organism, so a worker held
+each assembly three times over, each a full dict. The store loads the files
+once per catalog directory and keeps:
+
+  - organisms and assemblies as CatalogRecords: read-only mappings holding one
+    tuple of values, with the key table shared by every record of the file
+    instead of a hash table per record;
+  - an organism's genomes as the assembly records themselves, wherever
+    assemblies.json has an identical record;
+  - strings interned, so the few thousand distinct taxonomy names, ids, levels
+    and ploidies are stored once however many records repeat them.
+
+Each file is compacted before the next is parsed, so only one file's parsed
+dicts are alive at a time. Workflows stay as parsed; there are only a few dozen.
+
+Both CatalogData classes are views over the store: they build their own indexes
+and read records through the Mapping interface, as they did the dicts. The
+query_catalog engine keeps its own columnar copy in DuckDB (or reads the shared
+snapshot).
+"""
+
+import json
+import logging
+import sys
+import threading
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Marks a key the record's JSON object didn't have, as opposed to a null.
+_MISSING = object()
+
+
+class CatalogRecord(Mapping):
+    """A read-only JSON object: its values in one tuple, indexed by a key table
+    shared with the other records loaded from the same file."""
+
+    __slots__ = ("_keys", "_values")
+
+    def __init__(self, keys: Dict[str, int], values: Tuple[Any, ...]):
+        self._keys = keys
+        self._values = values
+
+    def __getitem__(self, key: str) -> Any:
+        i = self._keys.get(key)
+        if i is not None and self._values[i] is not _MISSING:
+            return self._values[i]
+        raise KeyError(key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        i = self._keys.get(key)
+        if i is None or self._values[i] is _MISSING:
+            return default
+        return self._values[i]
+
+    def __iter__(self) -> Iterator[str]:
+        return (k for k, i in self._keys.items() if self._values[i] is not _MISSING)
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __bool__(self) -> bool:
+        # Stops at the first key present, where len() counts them all.
+        return any(v is not _MISSING for v in self._values)
+
+    def __repr__(self) -> str:
+        return f"CatalogRecord({dict(self)!r})"
+
+
+def _shared(value: Any) -> Any:
+    """`value` with its strings, and those of a list's items, interned."""
+    if type(value) is str:
+        return sys.intern(value)
+    if type(value) is list:
+        return [_shared(v) for v in value]
+    return value
+
+
+def _records(objects: List[Dict[str, Any]]) -> List[CatalogRecord]:
+    keys: Dict[str, int] = {}
+    for obj in objects:
+        for k in obj:
+            if k not in keys:
+                keys[sys.intern(k)] = len(keys)
+    records = []
+    for obj in objects:
+        values = [_MISSING] * len(keys)
+        for k, v in obj.items():
+            values[keys[k]] = _shared(v)
+        records.append(CatalogRecord(keys, tuple(values)))
+    return records
+
+
+def _read(path: Path) -> List[Dict[str, Any]]:
+    if not path.exists():
+        logger.warning(f"Catalog file not found: {path}")
+        return []
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except Exception:
+        logger.exception(f"Failed to load {path}")
+        return []
+
+
+class CatalogStore:
+    """The organisms, assemblies and workflow categories of one catalog."""
+
+    def __init__(self, catalog_path: Path):
+        self.catalog_path = Path(catalog_path)
+        self.organisms: List[CatalogRecord] = []
+        self.assemblies: List[CatalogRecord] = []
+        self.workflow_categories: List[Dict[str, Any]] = []
+        self._load()
+
+    def _load(self) -> None:
+        self.workflow_categories = _read(self.catalog_path / "workflows.json")
+        self.assemblies = _records(_read(self.catalog_path / "assemblies.json"))
+        by_accession = {a.get("accession"): a for a in self.assemblies}
+
+        raw_organisms = _read(self.catalog_path / "organisms.json")
+        genomes = _records(
+            [g for org in raw_organisms for g in org.get("genomes") or []]
+        )
+        # A genome is shared when it's value for value its assembly's record,
+        # which needs the two files' records to have the same keys in order.
+        comparable = bool(genomes and self.assemblies) and (
+            genomes[0]._keys == self.assemblies[0]._keys
+        )
+        unshared = 0
+        pos = 0
+        for org in raw_organisms:
+            if not org.get("genomes"):
+                continue
+            shared = []
+            for genome in genomes[pos : pos + len(org["genomes"])]:
+                asm = by_accession.get(genome.get("accession"))
+                if comparable and asm is not None and asm._values == genome._values:
+                    genome = asm
+                else:
+                    unshared += 1
+                shared.append(genome)
+            pos += len(shared)
+            org["genomes"] = shared
+        self.organisms = _records(raw_organisms)
+
+        logger.info(
+            f"Catalog store loaded from {self.catalog_path}: "
+            f"{len(self.organisms)} organisms, {len(self.assemblies)} assemblies "
+            f"({unshared} organism genomes not in assemblies.json)"
+        )
+
+
+_lock = threading.Lock()
+_stores: Dict[Path, CatalogStore] = {}
+
+
+def get_catalog_store(catalog_path: str) -> CatalogStore:
+    """The process's store for `catalog_path`, loaded on first use.
+
+    It is never reloaded: both CatalogData instances are built once per
+    worker and keep the records they were built from, so a fresh store for
+    changed files would only give a later consumer a second copy.
+    """
+    path = Path(catalog_path).resolve()
+    with _lock:
+        store = _stores.get(path)
+        if store is None:
+            store = _stores[path] = CatalogStore(path)
+        return store
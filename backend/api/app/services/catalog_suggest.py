@@ -0,0 +1,134 @@
+"""Type-ahead suggestions over catalog names.
+
+Each entity type keeps two sorted arrays of lowercased keys -- whole names
+(species, common names, assembly accessions, workflow names) and the later
+words of those names, so "falcip" finds "Plasmodium falciparum" -- searched by
+bisect. A keystroke costs a binary search and a walk over at most `limit` keys
+per array, however large the catalog.
+
+Suggestions rank an exact name first, then names starting with the query, then
+names with a later word starting with it; alphabetical within each.
+"""
+
+from __future__ import annotations
+
+import bisect
+import re
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+SUGGEST_TYPES = ("organism", "assembly", "workflow")
+
+_WORD_START = re.compile(r"(?<![^\W_])[^\W_]")
+
+_EXACT, _NAME, _WORD = 0, 1, 2
+
+
+def _names(raw: Any) -> List[str]:
+    items = raw if isinstance(raw, list) else (raw,)
+    return [s for s in (str(x).strip() for x in items if x is not None) if s]
+
+
+class _Keys:
+    """Sorted keys with, for each, its entry and the name it came from."""
+
+    __slots__ = ("keys", "refs")
+
+    def __init__(self, pairs: Iterable[Tuple[str, Tuple[int, str]]]):
+        ordered = sorted(pairs)
+        self.keys = [key for key, _ in ordered]
+        self.refs = [ref for _, ref in ordered]
+
+    def starting_with(self, prefix: str) -> Iterable[Tuple[str, Tuple[int, str]]]:
+        for j in range(bisect.bisect_left(self.keys, prefix), len(self.keys)):
+            key = self.keys[j]
+            if not key.startswith(prefix):
+                return
+            yield key, self.refs[j]
+
+
+class CatalogSuggester:
+    """Prefix lookup over organism, assembly and workflow names."""
+
+    def __init__(
+        self,
+        organisms: Iterable[Dict[str, Any]],
+        assemblies: Iterable[Dict[str, Any]],
+        workflows: Iterable[Dict[str, Any]],
+    ):
+        self._entries: List[Dict[str, Any]] = []
+        names: Dict[str, list] = {t: [] for t in SUGGEST_TYPES}
+        words: Dict[str, list] = {t: [] for t in SUGGEST_TYPES}
+
+        def add(kind: str, entry: Dict[str, Any], labels: Sequence[str]) -> None:
+            i = len(self._entries)
+            self._entries.append({"type": kind, **entry})
+            for label in labels:
+                key = label.lower()
+                names[kind].append((key, (i, label)))
+                # Later words only; the first starts the whole name.
+                for m in list(_WORD_START.finditer(key))[1:]:
+                    words[kind].append((key[m.start() :], (i, label)))
+
+        for org in organisms:
+            species = _names(org.get("taxonomicLevelSpecies"))
+            common = _names(org.get("commonNames"))
+            add(
+                "organism",
+                {
+                    "id": str(org.get("ncbiTaxonomyId", "")),
+                    "label": species[0] if species else None,
+                    "description": common[0] if common else None,
+                },
+                species + common,
+            )
+        for asm in assemblies:
+            accession = _names(asm.get("accession"))
+            add(
+                "assembly",
+                {
+                    "id": accession[0] if accession else None,
+                    "label": accession[0] if accession else None,
+                    "description": asm.get("taxonomicLevelSpecies"),
+                },
+                accession,
+            )
+        for wf in workflows:
+            name = _names(wf.get("workflowName"))
+            add(
+                "workflow",
+                {
+                    "id": wf.get("iwcId"),
+                    "label": name[0] if name else None,
+                    "description": wf.get("_category"),
+                },
+                name,
+            )
+        self._names = {t: _Keys(names[t]) for t in SUGGEST_TYPES}
+        self._words = {t: _Keys(words[t]) for t in SUGGEST_TYPES}
+
+    def suggest(
+        self, query: str, limit: int = 10, types: Optional[Sequence[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """Up to `limit` suggestions for `query`, of the given `types` (all by
+        default), best first. Each names the entity and the name that matched."""
+        prefix = query.strip().lower()
+        if not prefix or limit <= 0:
+            return []
+        best: Dict[int, Tuple[int, str, str]] = {}
+        for kind in types or SUGGEST_TYPES:
+            for keys in (self._names[kind], self._words[kind]):
+                # Within one array the first `limit` distinct entries are the
+                # only ones that can make the cut.
+                added = 0
+                for key, (i, label) in keys.starting_with(prefix):
+                    if i in best:
+                        continue
+                    rank = _WORD if keys is self._words[kind] else _NAME
+                    if key == prefix and rank == _NAME:
+                        rank = _EXACT
+                    best[i] = (rank, key, label)
+                    added += 1
+                    if added == limit:
+                        break
+        ranked = sorted(best.items(), key=lambda item: (item[1], item[0]))[:limit]
+        return [{**self._entries[i], "matched": label} for i, (_, _, label) in ranked]
@@ -0,0 +1,79 @@
+"""Ancestor tests over the taxonomy tree spanned by the catalog's lineages.
+
+Workflow compatibility asks whether a workflow's taxon is an ancestor of (or
+is) an organism's or assembly's taxon. The catalogs used to answer that from a
+set of ancestor IDs kept for every taxon, merged genome by genome. This index
+instead numbers the tree's taxa in preorder (an Euler tour) and keeps, for each,
+the last preorder number in its subtree; a taxon's descendants are exactly the
+taxa numbered inside its interval, so the test is two integer comparisons, and
+listing them is a slice.
+
+The tree comes from the genomes' lineageTaxonomyIds (root first). It isn't read
+from ncbi-taxa-tree.json: that tree keeps only ranked taxa, and workflows
+target unranked ones too (cellular organisms, Viruses).
+"""
+
+import logging
+from array import array
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+
+class LineageIndex:
+    """Preorder intervals of the taxonomy tree the given lineages span."""
+
+    def __init__(self, lineages: Iterable[Sequence[Any]]):
+        children: Dict[Optional[str], List[str]] = {}
+        parent: Dict[str, Optional[str]] = {}
+        conflicts = 0
+        for lineage in lineages:
+            above: Optional[str] = None
+            for tid in map(str, lineage):
+                if tid not in parent:
+                    parent[tid] = above
+                    children.setdefault(above, []).append(tid)
+                elif parent[tid] != above:
+                    # A tree has one parent per taxon; the first lineage wins.
+                    conflicts += 1
+                above = tid
+        if conflicts:
+            logger.warning(f"{conflicts} lineage steps disagree with earlier ones")
+
+        self._pre: Dict[str, int] = {}
+        self._taxa: List[str] = []
+        self._last = array("l")
+        stack = [(tid, False) for tid in reversed(children.get(None, []))]
+        while stack:
+            tid, done = stack.pop()
+            if done:
+                self._last[self._pre[tid]] = len(self._pre) - 1
+                continue
+            self._pre[tid] = len(self._pre)
+            self._taxa.append(tid)
+            self._last.append(0)
+            stack.append((tid, True))
+            stack.extend((c, False) for c in reversed(children.get(tid, [])))
+
+    def __len__(self) -> int:
+        return len(self._pre)
+
+    def __contains__(self, taxon: Any) -> bool:
+        return str(taxon) in self._pre
+
+    def is_ancestor(self, ancestor: Any, taxon: Any) -> bool:
+        """True if `ancestor` is `taxon` or above it in the tree; False when
+        either isn't in it."""
+        a = self._pre.get(str(ancestor))
+        t = self._pre.get(str(taxon))
+        if a is None or t is None:
+            return False
+        return a <= t <= self._last[a]
+
+    def subtree(self, taxon: Any) -> List[str]:
+        """`taxon` and every taxon below it, in preorder; empty when it isn't in
+        the tree."""
+        a = self._pre.get(str(taxon))
+        if a is None:
+            return []
+        return self._taxa[a : self._last[a] + 1]
@@ -38,14 +38,16 @@ def create_mcp_server(
     if sra_enabled:
         instructions += (
             "\n\nThis server also exposes a local SRA metadata mirror "
-            "(search_sra, sra_data_summary, get_sra_study_runs): fast, "
+            "(search_sra, sra_data_summary, sra_data_summaries, "
+            "sra_release_histogram, get_sra_study_runs, get_sra_runs): fast, "
             "structured multi-facet search (platform / assay type / country / "
             "release date) over SRA runs scoped to BRC-relevant organisms, "
             "refreshed weekly and resilient to ENA/EBI outages. Prefer the SRA "
             "tools for broad or filtered 'what data exists' queries on BRC "
-            "pathogens; prefer the ENA tools (search_ena, search_ena_keywords) "
-            "for the very latest submissions, non-BRC organisms, or free-text "
-            "keyword search."
+            "pathogens, and sra_data_summaries over repeated sra_data_summary "
+            "calls to compare several organisms; prefer the ENA tools "
+            "(search_ena, search_ena_keywords) for the very latest submissions, "
+            "non-BRC organisms, or free-text keyword search."
         )
     mcp = FastMCP("BRC Analytics", instructions=instructions)
 
@@ -176,7 +178,8 @@ def create_mcp_server(
     # filters_applied). Unlike the ENA tools, these don't raise on a bad input
     # -- the service returns a structured {"error": ...} or resolved=false that
     # is more useful to an agent than an exception. Result caps come from the
-    # service's own clamps (search 200, get_study_runs 500).
+    # service's own clamps (search 200, get_study_runs 500); `next_cursor`
+    # pages past them, and /api/v1/sra/runs/export streams the full set.
 
     if sra_enabled:
 
@@ -188,6 +191,7 @@ def create_mcp_server(
             country: Optional[str] = None,
             since: Optional[str] = None,
             limit: int = 50,
+            cursor: Optional[str] = None,
         ) -> dict:
             """Search the local SRA mirror for sequencing runs matching an
             organism plus optional facet filters. Fast, structured, scoped to
@@ -204,6 +208,8 @@ def create_mcp_server(
                 since: optional release-date floor, ISO format (YYYY, YYYY-MM,
                     or YYYY-MM-DD).
                 limit: max runs to return (default 50, capped at 200).
+                cursor: `next_cursor` from a previous response, to fetch the
+                    next page (newest first). Absent on the last page.
             """
             return sra_mirror.search_runs(
                 organism=organism,
@@ -212,6 +218,7 @@ def create_mcp_server(
                 country=country,
                 since=since,
                 limit=limit,
+                cursor=cursor,
             )
 
         @mcp.tool()
@@ -228,15 +235,81 @@ def create_mcp_server(
             return sra_mirror.summary_for_organism(organism)
 
         @mcp.tool()
-        def get_sra_study_runs(accession: str, limit: int = 200) -> dict:
+        def sra_data_summaries(organisms: List[str]) -> dict:
+            """sra_data_summary for several organisms in one call, for
+            comparison questions ("compare SRA coverage for P. falciparum,
+            P. vivax and P. knowlesi"). Cheaper than one call per organism.
+
+            Args:
+                organisms: scientific names or NCBI taxonomy IDs, at most 20.
+                    `summaries` comes back in the same order, one per
+                    distinct organism, each shaped like sra_data_summary.
+            """
+            return sra_mirror.summaries_for_organisms(organisms)
+
+        @mcp.tool()
+        def sra_release_histogram(
+            organism: str,
+            interval: str = "year",
+            breakdown: Optional[str] = None,
+            assay_type: Optional[str] = None,
+            platform: Optional[str] = None,
+            country: Optional[str] = None,
+            since: Optional[str] = None,
+        ) -> dict:
+            """Runs per release month, quarter or year for an organism, for
+            "how has sequencing of X grown over time?" questions. One call
+            instead of a search_sra per period.
+
+            Args:
+                organism: scientific name or NCBI taxonomy ID.
+                interval: "month", "quarter" or "year" (default).
+                breakdown: optional "platform", "assay_type" or "country" --
+                    splits each period's count across the top keys, with the
+                    rest under "other".
+                assay_type: optional filter, as in search_sra.
+                platform: optional filter, as in search_sra.
+                country: optional filter, as in search_sra.
+                since: optional release-date floor (YYYY, YYYY-MM, or
+                    YYYY-MM-DD).
+            """
+            return sra_mirror.release_histogram(
+                organism,
+                interval=interval,
+                breakdown=breakdown,
+                assay_type=assay_type,
+                platform=platform,
+                country=country,
+                since=since,
+            )
+
+        @mcp.tool()
+        def get_sra_study_runs(
+            accession: str, limit: int = 200, cursor: Optional[str] = None
+        ) -> dict:
             """Get the runs belonging to a specific SRA study (SRP*/ERP*/DRP*)
             or BioProject (PRJNA*/PRJEB*/PRJDB*).
 
             Args:
                 accession: SRA study or BioProject accession.
                 limit: max runs to return (default 200, capped at 500).
+                cursor: `next_cursor` from a previous response, to fetch the
+                    next page. Absent on the last page.
+            """
+            return sra_mirror.get_study_runs(accession, limit=limit, cursor=cursor)
+
+        @mcp.tool()
+        def get_sra_runs(accessions: List[str]) -> dict:
+            """Look up SRA runs by run accession (SRR*/ERR*/DRR*), up to 5000
+            per call.
+
+            Returns the runs in input order, with accessions the mirror
+            doesn't have listed under `not_found`.
+
+            Args:
+                accessions: run accessions, e.g. ["SRR1234567", "ERR2345678"].
             """
-            return sra_mirror.get_study_runs(accession, limit=limit)
+            return sra_mirror.get_runs_by_accessions(accessions)
 
         logger.info("SRA mirror tools registered on MCP server")
 
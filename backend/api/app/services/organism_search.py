@@ -0,0 +1,197 @@
+"""Inverted index behind the two CatalogData.search_organisms.
+
+Both catalogs answered a search by lowercasing and substring-matching every
+searchable field of every organism, on every call. This index is built once at
+load time instead:
+
+  - each field value (lowercased, trimmed) to the organisms that have it, which
+    also serves fields that only match whole (the assistant's taxonomy id);
+  - each word of a value -- a run of letters and digits -- to the organisms
+    whose values contain it, and the sorted list of those words;
+  - each trigram of a word to the words containing it.
+
+A query still matches an organism when it's a substring of one of its values.
+Results are ranked -- a whole value, then a value with a word starting with the
+query, then any other substring; catalog order breaks ties -- and search()
+finds them rank by rank: whole values by lookup, word starts from the range of
+words starting with the query's first word, and the rest from the words
+containing each of its words (every word of a query lies inside one word of any
+value it's a substring of), found by trigram. Candidates come in catalog order,
+so the search stops as soon as it has enough.
+"""
+
+from __future__ import annotations
+
+import bisect
+import collections
+import heapq
+import itertools
+import re
+from typing import Any, Dict, Iterable, Iterator, List, Sequence, Set, Tuple
+
+_WORD = re.compile(r"[^\W_]+")
+_GRAM = 3
+
+EXACT, PREFIX, SUBSTRING, NO_MATCH = 0, 1, 2, 3
+
+
+def field_values(org: Dict[str, Any], field: str) -> List[str]:
+    """`field`'s values on `org`, lowercased and trimmed; list fields give
+    one value per element."""
+    raw = org.get(field)
+    items = raw if isinstance(raw, list) else (raw,)
+    return [v for v in (str(x).strip().lower() for x in items if x is not None) if v]
+
+
+def _grams(word: str) -> Set[str]:
+    return {word[i : i + _GRAM] for i in range(len(word) - _GRAM + 1)}
+
+
+def _rank(q: str, values: Iterable[str]) -> int:
+    """How well `q` matches the best of `values`; NO_MATCH if none does."""
+    best = NO_MATCH
+    for value in values:
+        if value == q:
+            return EXACT
+        start = value.find(q)
+        while start >= 0 and best > PREFIX:
+            if start == 0 or not _WORD.match(value[start - 1]):
+                best = PREFIX
+            else:
+                best = SUBSTRING
+            start = value.find(q, start + 1)
+    return best
+
+
+def _merged(postings: Iterable[List[int]]) -> Iterator[int]:
+    """The union of sorted posting lists, in order."""
+    last = -1
+    for i in heapq.merge(*postings):
+        if i != last:
+            last = i
+            yield i
+
+
+class OrganismSearchIndex:
+    """Ranked substring search over `fields` of a list of organisms.
+
+    `fields` match on any substring; `exact_fields` only on their whole value.
+    search() returns positions in the list it was built from.
+    """
+
+    def __init__(
+        self,
+        organisms: Sequence[Dict[str, Any]],
+        fields: Sequence[str],
+        exact_fields: Sequence[str] = (),
+    ):
+        exact: Dict[str, List[int]] = collections.defaultdict(list)
+        word_orgs: Dict[str, List[int]] = collections.defaultdict(list)
+        # Per organism, the values a candidate is checked against.
+        self._values: List[Tuple[str, ...]] = []
+        findall = _WORD.findall
+        for i, org in enumerate(organisms):
+            values = tuple(v for f in fields for v in field_values(org, f))
+            self._values.append(values)
+            whole = {*values, *(v for f in exact_fields for v in field_values(org, f))}
+            for v in whole:
+                exact[v].append(i)
+            for word in set(findall(" ".join(values))):
+                word_orgs[word].append(i)
+        # Plain dicts from here on, so a lookup can't add an entry.
+        self._exact = dict(exact)
+        self._word_orgs = dict(word_orgs)
+        self._words = sorted(word_orgs)
+        grams: Dict[str, List[str]] = collections.defaultdict(list)
+        for word in self._words:
+            for gram in _grams(word):
+                grams[gram].append(word)
+        self._grams = dict(grams)
+
+    def _words_with_prefix(self, prefix: str) -> List[str]:
+        lo = hi = bisect.bisect_left(self._words, prefix)
+        while hi < len(self._words) and self._words[hi].startswith(prefix):
+            hi += 1
+        return self._words[lo:hi]
+
+    def _words_containing(self, word: str) -> List[str]:
+        # Any of its trigrams' words are a superset; take the rarest.
+        rarest = min((self._grams.get(g, []) for g in _grams(word)), key=len)
+        return [w for w in rarest if word in w]
+
+    def search(self, query: str, limit: int = 10) -> List[int]:
+        """Positions of the best `limit` matches for `query`, best first.
+
+        Works down the ranks in catalog order and stops once `limit` are found,
+        so a common query costs no more than a rare one.
+        """
+        q = query.strip().lower()
+        if not q or limit <= 0:
+            return []
+        found = self._exact.get(q, [])[:limit]
+        taken = set(found)
+        words = _WORD.findall(q)
+        long_words = [w for w in words if len(w) >= _GRAM]
+        if len(found) == limit:
+            return found
+        if not long_words:
+            # Too short for a trigram: scan, like the search this replaced.
+            everyone = range(len(self._values))
+            return found + self._ranked(q, everyone, limit - len(found), taken)
+
+        if q == words[0]:
+            # One word. Word-start matches are the organisms with a word
+            # beginning with it -- a range of the sorted words -- and need no
+            # further check; the rest have a word containing it.
+            for words_ in (self._words_with_prefix(q), self._words_containing(q)):
+                found += self._first(words_, limit - len(found), taken)
+                taken.update(found)
+                if len(found) == limit:
+                    break
+            return found
+
+        # Several words, or punctuation: every match has, for each of the
+        # query's words, a word containing it. Candidates are the organisms that
+        # do for all the long ones, checked in catalog order.
+        per_word = [
+            [self._word_orgs[w] for w in self._words_containing(word)]
+            for word in long_words
+        ]
+        if len(per_word) == 1:
+            candidates: Iterable[int] = _merged(per_word[0])
+        else:
+            per_word.sort(key=lambda lists: sum(map(len, lists)))
+            common = set(itertools.chain.from_iterable(per_word[0]))
+            for lists in per_word[1:]:
+                common.intersection_update(itertools.chain.from_iterable(lists))
+            candidates = sorted(common)
+        return found + self._ranked(q, candidates, limit - len(found), taken)
+
+    def _first(self, words: List[str], n: int, taken: Set[int]) -> List[int]:
+        """The first `n` organisms in catalog order with any of `words`,
+        leaving out `taken`."""
+        # Those are among the first n + len(taken) of each word's organisms.
+        cut = n + len(taken)
+        pool = set(
+            itertools.chain.from_iterable(self._word_orgs[w][:cut] for w in words)
+        )
+        pool.difference_update(taken)
+        return heapq.nsmallest(n, pool)
+
+    def _ranked(
+        self, q: str, candidates: Iterable[int], need: int, taken: Set[int]
+    ) -> List[int]:
+        """The best `need` of `candidates` (in catalog order) not yet taken."""
+        prefix: List[int] = []
+        substring: List[int] = []
+        for i in candidates:
+            if i in taken:
+                continue
+            rank = _rank(q, self._values[i])
+            if rank == PREFIX:
+                prefix.append(i)
+                if len(prefix) == need:
+                    break
+            elif rank == SUBSTRING and len(substring) < need:
+                substring.append(i)
+        return (prefix + substring)[:need]
@@ -0,0 +1,199 @@
+"""Deadlines and cost limits for the in-process DuckDB queries.
+
+The SRA mirror and the catalog query engine run DuckDB inside the API worker.
+One pathological query -- a name union that matches half the mirror, a facet
+over an unexpectedly huge organism -- would otherwise hold its thread, and a
+pooled cursor or the event loop with it, for as long as it takes. Each guarded
+call gets:
+
+  - a deadline, enforced by a watchdog thread that calls `interrupt()` on the
+    call's connection once the deadline passes;
+  - a cap on the rows one query may hand back to Python;
+  - a memory limit, set on the database when it is opened (DuckDB's
+    `memory_limit` is per database instance, so it bounds all the queries on
+    one mirror file or one catalog together, not each query separately).
+
+Going past any of them raises QueryTooExpensive, which the services turn into
+a structured "query too expensive" result instead of a stalled worker.
+
+duckdb is imported where it's used, like catalog_query.connect(), so importing
+this module doesn't require it.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import heapq
+import itertools
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class QueryLimits:
+    """Per-call limits; a zero or empty value turns that limit off."""
+
+    # Wall-clock budget for one guarded call, in seconds.
+    timeout_seconds: float = 0
+    # Rows one query may return to Python (see fetch_capped).
+    max_rows: int = 0
+    # DuckDB memory_limit for the database, e.g. "2GB".
+    memory_limit: str = ""
+
+    def duckdb_config(self) -> Dict[str, str]:
+        """Config for duckdb.connect() on the database these limits guard.
+
+        With a memory limit set, spilling is turned off too: an in-memory
+        database would otherwise spill to a `.tmp` directory in the working
+        directory, and a query that needs that much is one to refuse.
+        """
+        if not self.memory_limit:
+            return {}
+        return {"memory_limit": self.memory_limit, "temp_directory": ""}
+
+
+class QueryTooExpensive(Exception):
+    """A guarded query went past one of its QueryLimits."""
+
+    _MESSAGES = {
+        "timeout": "it ran longer than the {limit}s limit",
+        "rows": "it returned more than the {limit:,} row limit",
+        "memory": "it needed more memory than the {limit} limit",
+    }
+
+    def __init__(self, reason: str, limit: Any):
+        self.reason = reason
+        self.limit = limit
+        super().__init__(
+            "Query too expensive: " + self._MESSAGES[reason].format(limit=limit)
+        )
+
+    def result(self) -> Dict[str, Any]:
+        """The structured result a tool returns in place of the answer."""
+        return {
+            "error": str(self),
+            "too_expensive": {"reason": self.reason, "limit": self.limit},
+            "message": (
+                "Narrow the query -- a more specific organism, a filter, or "
+                "fewer items per call -- and try again."
+            ),
+        }
+
+
+_REINTERRUPT_SECONDS = 0.05
+
+
+class _Deadline:
+    __slots__ = ("con", "fired", "done")
+
+    def __init__(self, con: Any):
+        self.con = con
+        self.fired = False
+        self.done = False
+
+
+class QueryWatchdog:
+    """One daemon thread that interrupts connections past their deadline.
+
+    Deadlines sit in a heap; the thread sleeps until the earliest one. A call
+    that finishes marks its entry done under the same lock the thread holds
+    while interrupting, so a connection is never interrupted after its call
+    has returned. Past the deadline the connection is interrupted again every
+    _REINTERRUPT_SECONDS until the call returns: DuckDB clears an interrupt
+    when the next query starts, so one that lands between two queries of a
+    call would otherwise be lost.
+    """
+
+    def __init__(self):
+        self._heap: List[Tuple[float, int, _Deadline]] = []
+        self._seq = itertools.count()
+        self._wake = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+
+    @contextlib.contextmanager
+    def guard(self, con: Any, limits: QueryLimits) -> Iterator[None]:
+        """Run the block's queries on `con` under `limits`.
+
+        Raises QueryTooExpensive when the deadline interrupts a query or one
+        runs out of memory; other DuckDB errors pass through.
+        """
+        import duckdb
+
+        deadline = None
+        if limits.timeout_seconds > 0:
+            deadline = self._arm(con, limits.timeout_seconds)
+        try:
+            yield
+        except duckdb.InterruptException as exc:
+            if deadline is not None and deadline.fired:
+                raise QueryTooExpensive("timeout", limits.timeout_seconds) from exc
+            raise
+        except duckdb.OutOfMemoryException as exc:
+            raise QueryTooExpensive("memory", limits.memory_limit or "default") from exc
+        finally:
+            if deadline is not None:
+                with self._wake:
+                    deadline.done = True
+
+    def _arm(self, con: Any, seconds: float) -> _Deadline:
+        deadline = _Deadline(con)
+        with self._wake:
+            heapq.heappush(
+                self._heap, (time.monotonic() + seconds, next(self._seq), deadline)
+            )
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="duckdb-query-watchdog", daemon=True
+                )
+                self._thread.start()
+            self._wake.notify()
+        return deadline
+
+    def _run(self) -> None:
+        with self._wake:
+            while True:
+                # Finished calls are dropped as they reach the top.
+                while self._heap and self._heap[0][2].done:
+                    heapq.heappop(self._heap)
+                if not self._heap:
+                    self._wake.wait()
+                    continue
+                due, _, deadline = self._heap[0]
+                wait = due - time.monotonic()
+                if wait > 0:
+                    self._wake.wait(wait)
+                    continue
+                heapq.heapreplace(
+                    self._heap,
+                    (due + _REINTERRUPT_SECONDS, next(self._seq), deadline),
+                )
+                deadline.fired = True
+                try:
+                    deadline.con.interrupt()
+                except Exception:  # noqa: BLE001
+                    # A connection closed under us has nothing left to stop.
+                    logger.debug("Interrupting a timed-out query failed", exc_info=True)
+
+
+# Shared by every guarded database in the process: one thread, however many
+# mirror files and catalogs are open.
+watchdog = QueryWatchdog()
+
+
+def fetch_capped(result: Any, max_rows: int) -> List[Tuple]:
+    """fetchall() that raises QueryTooExpensive past `max_rows` (0: no cap).
+
+    Reads one row past the cap to tell a result of exactly `max_rows` from a
+    larger one, and stops there rather than materializing the rest.
+    """
+    if max_rows <= 0:
+        return result.fetchall()
+    rows = result.fetchmany(max_rows + 1)
+    if len(rows) > max_rows:
+        raise QueryTooExpensive("rows", max_rows)
+    return rows
@@ -0,0 +1,196 @@
+"""Opt-in profiling of the in-process DuckDB queries.
+
+With profiling on, each SRA mirror call and each query_catalog run is recorded
+into a bounded ring buffer: which call it was, whether it was served from the
+cache, its wall time, and for every query it ran the wall time, the rows DuckDB
+scanned, and DuckDB's own JSON profile (operator tree, per-operator timings and
+cardinalities). The admin endpoint serves the buffer, so the hot queries under
+real load can be read off a running worker.
+
+Off by default. When off, a call costs one attribute check; when on, each query
+also pays for DuckDB's profiler and a JSON parse -- within run-to-run noise,
+and at most single-digit percent, on the mirror's organism summaries. Query
+parameters (organism names, accessions) are never recorded, only the SQL
+text.
+
+One profiler per process (`profiler`), shared by the mirror and the catalog.
+"""
+
+from __future__ import annotations
+
+import collections
+import contextlib
+import datetime
+import json
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional
+
+# SQL text kept per query; the shapes are what matter, and the long ones are
+# long because of whitespace and column lists.
+_SQL_MAX_CHARS = 2000
+
+
+class _Call:
+    __slots__ = ("source", "tool", "cache", "started_at", "queries", "profiled")
+
+    def __init__(self, source: str, tool: str):
+        self.source = source
+        self.tool = tool
+        self.cache: Optional[str] = None
+        self.started_at = datetime.datetime.now(datetime.timezone.utc)
+        self.queries: List[Dict[str, Any]] = []
+        # Connections this call turned DuckDB's profiler on for, to turn it
+        # back off before a pooled cursor is handed to the next call.
+        self.profiled: List[Any] = []
+
+
+class QueryProfiler:
+    """Per-call query profiles in a ring buffer of the last `capacity` calls."""
+
+    def __init__(self, capacity: int = 256, enabled: bool = False):
+        self.enabled = enabled
+        self._records: collections.deque = collections.deque(maxlen=capacity)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def configure(self, enabled: bool, capacity: int) -> None:
+        """Turn profiling on or off and resize the buffer, keeping the most
+        recent records that still fit."""
+        with self._lock:
+            self.enabled = enabled
+            self._records = collections.deque(self._records, maxlen=capacity)
+
+    @contextlib.contextmanager
+    def call(self, source: str, tool: str) -> Iterator[None]:
+        """Record the block as one call of `tool` on `source`.
+
+        Nested calls on the same thread -- a pooled mirror method calling
+        another -- fold into the outermost one.
+        """
+        if not self.enabled or getattr(self._local, "call", None) is not None:
+            yield
+            return
+        call = self._local.call = _Call(source, tool)
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            wall_ms = (time.perf_counter() - started) * 1000
+            self._local.call = None
+            for con in call.profiled:
+                with contextlib.suppress(Exception):
+                    con.execute("PRAGMA disable_profiling")
+            record = {
+                "at": call.started_at.isoformat(),
+                "source": call.source,
+                "tool": call.tool,
+                "cache": call.cache or "none",
+                "wall_ms": round(wall_ms, 3),
+                "rows_scanned": sum(q["rows_scanned"] for q in call.queries),
+                "queries": call.queries,
+            }
+            with self._lock:
+                self._records.append(record)
+
+    def cache(self, outcome: str) -> None:
+        """Tag the current call's cache outcome: "hit", "miss" or
+        "coalesced" (served by another call's in-flight query)."""
+        call = getattr(self._local, "call", None)
+        if call is not None and call.cache is None:
+            call.cache = outcome
+
+    @contextlib.contextmanager
+    def query(self, con: Any, sql: str) -> Iterator[None]:
+        """Profile one query run (and fetched) on `con` inside the block."""
+        call = getattr(self._local, "call", None)
+        if call is None:
+            yield
+            return
+        if not any(c is con for c in call.profiled):
+            con.execute("PRAGMA enable_profiling = 'no_output'")
+            call.profiled.append(con)
+        started = time.perf_counter()
+        yield
+        wall_ms = (time.perf_counter() - started) * 1000
+        profile = json.loads(con.get_profiling_information(format="json"))
+        call.queries.append(
+            {
+                "sql": " ".join(sql.split())[:_SQL_MAX_CHARS],
+                "wall_ms": round(wall_ms, 3),
+                "rows_scanned": profile.get("cumulative_rows_scanned", 0),
+                "profile": profile,
+            }
+        )
+
+    @property
+    def capacity(self) -> int:
+        return self._records.maxlen
+
+    def records(
+        self,
+        limit: Optional[int] = None,
+        source: Optional[str] = None,
+        tool: Optional[str] = None,
+        include_profiles: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """Buffered calls, newest first, optionally filtered. DuckDB's
+        profile trees run to kilobytes per query, so they're left out unless
+        asked for."""
+        with self._lock:
+            records = list(self._records)
+        records.reverse()
+        if source is not None:
+            records = [r for r in records if r["source"] == source]
+        if tool is not None:
+            records = [r for r in records if r["tool"] == tool]
+        if limit is not None:
+            records = records[:limit]
+        if include_profiles:
+            return records
+        return [
+            dict(
+                r,
+                queries=[
+                    {k: v for k, v in q.items() if k != "profile"} for q in r["queries"]
+                ],
+            )
+            for r in records
+        ]
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """Per (source, tool, cache) totals over the buffer, slowest total
+        wall time first -- the first place to look for hot queries."""
+        with self._lock:
+            records = list(self._records)
+        groups: Dict[tuple, Dict[str, Any]] = {}
+        for r in records:
+            key = (r["source"], r["tool"], r["cache"])
+            g = groups.setdefault(
+                key,
+                {
+                    "source": r["source"],
+                    "tool": r["tool"],
+                    "cache": r["cache"],
+                    "calls": 0,
+                    "total_wall_ms": 0.0,
+                    "max_wall_ms": 0.0,
+                    "rows_scanned": 0,
+                },
+            )
+            g["calls"] += 1
+            g["total_wall_ms"] += r["wall_ms"]
+            g["max_wall_ms"] = max(g["max_wall_ms"], r["wall_ms"])
+            g["rows_scanned"] += r["rows_scanned"]
+        out = sorted(groups.values(), key=lambda g: g["total_wall_ms"], reverse=True)
+        for g in out:
+            g["total_wall_ms"] = round(g["total_wall_ms"], 3)
+            g["mean_wall_ms"] = round(g["total_wall_ms"] / g["calls"], 3)
+        return out
+
+    def clear(self) -> None:
+        with self._lock:
+            self._records.clear()
+
+
+profiler = QueryProfiler()
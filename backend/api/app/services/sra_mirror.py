@@ -9,31 +9,87 @@ table for provenance metadata.
 
 from __future__ import annotations
 
+import array
+import base64
+import bisect
+import collections
+import contextlib
 import copy
+import csv
 import datetime
 import functools
+import io
+import json
 import logging
+import os
+import re
+import tempfile
 import threading
 import time
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
 
 import duckdb
 
+from app.services.query_guard import (
+    QueryLimits,
+    QueryTooExpensive,
+    fetch_capped,
+    watchdog,
+)
+from app.services.query_profile import profiler
+
 logger = logging.getLogger(__name__)
 
 # In-process per-call TTL for repeated reads (e.g. the assistant chatting
 # about the same organism across turns). DuckDB queries are already fast
-# but `summary_for_organism` runs ~6 aggregates -- caching collapses that
-# to a hashmap hit for the second-and-later asks in a session. Tool calls
-# are sync; on the assistant path they run on the event loop thread, but
-# FastMCP offloads the MCP tools to a worker threadpool, so the shared
-# DuckDB connection and this dict are reachable from multiple threads and
-# are guarded by self._lock (see the @_synchronized decorator).
+# but `summary_for_organism` aggregates every run of the organism -- caching
+# collapses that to a hashmap hit for the second-and-later asks in a session.
+# Tool calls are sync; on the assistant path they run on the event loop
+# thread, but FastMCP offloads the MCP tools to a worker threadpool, so this
+# dict is reachable from multiple threads and is guarded by its own lock
+# (queries run on pooled cursors -- see _ConnectionPool).
 _CACHE_TTL_SECONDS = 300
 # Cap the entry count so a long-lived worker can't grow the cache without
 # bound -- the search key is a 7-tuple, so the keyspace is effectively open.
 _CACHE_MAX_ENTRIES = 512
+# "Did you mean" for unresolved organism terms (see _NameSuggester). A
+# candidate must average this per-token trigram similarity to be offered.
+_SUGGEST_LIMIT = 5
+_SUGGEST_MIN_SCORE = 0.5
+_SUGGEST_MIN_TOKEN_SCORE = 0.3
+# Work bounds per lookup, so the cost stays flat as taxid_names grows: posting
+# entries counted while matching one token, vocabulary tokens rescored for it,
+# and candidate names rescored overall.
+_SUGGEST_GRAM_BUDGET = 20_000
+_SUGGEST_TOKEN_CANDIDATES = 30
+_SUGGEST_CANDIDATES = 400
+# Cached summaries / BioProject rankings recomputed on a newly swapped-in
+# mirror before it goes live (see SRAMirrorService.reload), most recent first.
+_RELOAD_WARM_ENTRIES = 64
+# Organisms per summaries_for_organisms call. The grouped pass costs about
+# the scan of their combined runs; this keeps one call from asking for the
+# whole mirror.
+_BATCH_MAX_ORGANISMS = 20
+# Breakdown keys kept per release histogram, by total runs; the rest are
+# folded into "other" so a month-by-country series stays a readable size.
+_HISTOGRAM_TOP_KEYS = 8
+# Run accessions per get_runs_by_accessions call, and how many distinct
+# organisms a batch may span before its organism ids stop being worth
+# filtering on -- past that the id list costs more than it prunes.
+_ACCESSION_BATCH_MAX = 5000
+_ACCESSION_NARROW_ORGANISMS = 16
+# Widest accession-number range a batch may cover and still be looked up in
+# run_accessions first. The table is sorted by accession, so this bounds the
+# rows the lookup reads to a few row groups; a wider batch (a hand-picked
+# list from across the archive) would pay for a near-full scan up front.
+_ACCESSION_LOOKUP_SPAN = 500_000
+# Name the mirror file is attached under (see _connect).
+_MIRROR_CATALOG = "mirror"
+# Idle cursors kept for reuse. Concurrency above this still works -- extra
+# cursors are opened on demand and closed on release -- this only bounds what
+# a burst leaves behind. Sized to anyio's default worker-thread limit (40).
+_POOL_MAX_IDLE = 40
 
 
 # Curated abbreviations and colloquial names. NCBI's taxonomy `names.dmp`
@@ -122,6 +178,458 @@ _COUNTRY_SYNONYMS: Dict[str, List[str]] = {
 }
 
 
+# Every facet of summary_for_organism from one pass over the organism's runs.
+#
+# The six separate aggregates this replaces each re-scanned `runs` and
+# re-evaluated the organism filter, which dominates the cost for a small
+# organism and repeats the heavy lifting for a large one. Here the filter runs
+# once and collapses the rows to one per distinct (platform, assay, country,
+# bioproject, study) combination -- runs within a study overwhelmingly share
+# all of those, so this is roughly one row per study -- and GROUPING SETS then
+# derives every facet from that small relation in a single aggregate.
+#
+# Each output row is tagged with its facet. n_keys counts a facet's non-NULL
+# keys, which is COUNT(DISTINCT col) -- the sra_study set exists only for
+# that. Top-N cuts happen in the window (platforms 5, everything else 10;
+# NULL keys and 'uncalculated' countries never rank), and `keep` marks the
+# rows that made the cut. The rn = 1 row of every facet always comes back so
+# n_keys is readable even when no key of that facet is displayable.
+#
+# Several organisms are summarized in the same pass: the first two parameters
+# are parallel lists of group number and organism, every facet is computed
+# per group, and a name listed under two groups counts toward both (the way
+# resolving either organism on its own would). A single summary is group 0.
+# {column} is `organism`, matched by name, or `organism_id` on a compacted
+# mirror (see compact_mirror). The third parameter is the distinct organisms
+# again: the join alone only gets an optional IN filter pushed into the scan,
+# which DuckDB applies as a min/max range -- for "Organism 1", "Organism 3"
+# that range admits every "Organism 1xx" -- while list_contains is evaluated
+# in the scan and keeps a several-organism pass as cheap as the
+# single-organism one.
+_SUMMARY_SQL = """
+WITH wanted AS (
+    SELECT UNNEST(?) AS grp, UNNEST(?) AS member
+),
+combos AS (
+    SELECT grp, platform, assay_type, geo_loc_name_country_calc AS country,
+           bioproject, sra_study,
+           COUNT(*) AS n,
+           MIN(releasedate) AS earliest,
+           MAX(releasedate) AS latest,
+           COUNT(*) FILTER (
+               WHERE releasedate >= CURRENT_DATE - INTERVAL 90 DAY
+           ) AS n_recent
+    FROM runs JOIN wanted ON runs.{column} = wanted.member
+    WHERE list_contains(?, runs.{column})
+    GROUP BY ALL
+),
+facets AS (
+    SELECT
+        grp,
+        CASE
+            WHEN GROUPING(platform) = 0 THEN 'platform'
+            WHEN GROUPING(assay_type) = 0 THEN 'assay_type'
+            WHEN GROUPING(country) = 0 THEN 'country'
+            WHEN GROUPING(bioproject) = 0 THEN 'bioproject'
+            WHEN GROUPING(sra_study) = 0 THEN 'sra_study'
+            ELSE 'total'
+        END AS facet,
+        -- Only the grouped column is non-NULL within a set.
+        COALESCE(platform, assay_type, country, bioproject, sra_study) AS key,
+        SUM(n) AS n,
+        MIN(earliest) AS earliest,
+        MAX(latest) AS latest,
+        SUM(n_recent) AS n_recent
+    FROM combos
+    GROUP BY GROUPING SETS (
+        (grp), (grp, platform), (grp, assay_type), (grp, country),
+        (grp, bioproject), (grp, sra_study)
+    )
+),
+ranked AS (
+    SELECT *,
+           key IS NULL OR (facet = 'country' AND key = 'uncalculated') AS hidden,
+           COUNT(key) OVER (PARTITION BY grp, facet) AS n_keys,
+           ROW_NUMBER() OVER (
+               PARTITION BY grp, facet ORDER BY hidden, n DESC, key DESC
+           ) AS rn
+    FROM facets
+)
+SELECT grp, facet, key, n, earliest, latest, n_recent, n_keys,
+       NOT hidden AND rn <= CASE facet
+           WHEN 'platform' THEN 5
+           WHEN 'sra_study' THEN 0
+           ELSE 10
+       END AS keep
+FROM ranked
+WHERE facet = 'total' OR rn = 1 OR keep
+ORDER BY grp, facet, rn
+"""
+
+
+# Release-date histogram: runs per month / quarter / year, optionally split by
+# one facet. One pass bins every matching run into (period, key) counts; the
+# keys are then ranked by their total across the whole series and everything
+# past the top few is folded into 'other', so each period's counts add up to
+# its total. {key} and {where} are filled from fixed tables, never user input.
+# Undated runs come back as the NULL period.
+_HISTOGRAM_SQL = """
+WITH binned AS (
+    SELECT CAST(date_trunc(?, releasedate) AS DATE) AS period,
+           COALESCE({key}, 'unknown') AS key,
+           COUNT(*) AS n
+    FROM runs
+    WHERE {where}
+    GROUP BY ALL
+),
+ranked AS (
+    SELECT key, ROW_NUMBER() OVER (ORDER BY SUM(n) DESC, key) AS rn
+    FROM binned
+    GROUP BY key
+)
+SELECT period, CASE WHEN rn <= ? THEN key ELSE 'other' END AS key, SUM(n) AS n
+FROM binned JOIN ranked USING (key)
+GROUP BY ALL
+ORDER BY period NULLS LAST, n DESC, key
+"""
+
+_HISTOGRAM_INTERVALS = {"month": 1, "quarter": 3, "year": 12}
+# Breakdown name -> `runs` expression. Countries the mirror couldn't place
+# count as 'unknown', the same as a NULL country.
+_HISTOGRAM_BREAKDOWNS = {
+    "platform": "platform",
+    "assay_type": "assay_type",
+    "country": "NULLIF(geo_loc_name_country_calc, 'uncalculated')",
+}
+
+# Optional per-taxid rollups, materialized into the mirror file next to `runs`
+# by build_rollups() (see scripts/build_sra_rollups.py). Summary questions are
+# repeated across organisms and sessions, and the dominant organisms' answers
+# cost a full aggregate of millions of runs each time; the rollups turn those
+# into a read of a few pre-aggregated rows.
+#
+# Keyed by taxid with the same membership the live path uses: a run belongs to
+# a taxid when its `organism` is one of that taxid's taxid_names entries, so a
+# name shared by two taxids counts toward both, exactly as resolving either
+# taxid and scanning its name union would. Terms that don't resolve to a taxid
+# always take the live path.
+_ROLLUP_TABLES = (
+    "rollup_taxid_totals",
+    "rollup_taxid_facets",
+    "rollup_taxid_bioprojects",
+    "rollup_taxid_months",
+    "rollup_taxid_recent",
+)
+
+# How far back rollup_taxid_recent keeps per-day counts. runs_last_90_days is
+# anchored on the query date, which is never earlier than the build date, so
+# a run released more than 90 days before the build can never fall inside the
+# window -- keeping just that tail keeps the count exact for the life of the
+# build without storing every release day.
+_RECENT_WINDOW_DAYS = 90
+
+_ROLLUP_BUILD_SQL = (
+    # Runs joined to every taxid that claims their organism name. DISTINCT so a
+    # duplicated (taxid, name) row can't double-count, matching IN semantics.
+    """
+    CREATE OR REPLACE TEMP TABLE _taxid_runs AS
+    SELECT t.taxid, r.platform, r.assay_type,
+           r.geo_loc_name_country_calc AS country,
+           r.bioproject, r.sra_study, r.releasedate
+    FROM runs r
+    JOIN (SELECT DISTINCT taxid, name FROM taxid_names) t ON r.organism = t.name
+    """,
+    # Every known taxid gets a totals row, zero-run ones included, so a
+    # resolved organism with no data is answered here rather than by a scan.
+    """
+    CREATE OR REPLACE TABLE rollup_taxid_totals AS
+    SELECT k.taxid,
+           COALESCE(a.n_runs, 0) AS n_runs,
+           COALESCE(a.n_bioprojects, 0) AS n_bioprojects,
+           COALESCE(a.n_studies, 0) AS n_studies,
+           a.earliest, a.latest
+    FROM (SELECT DISTINCT taxid FROM taxid_names) k
+    LEFT JOIN (
+        SELECT taxid, COUNT(*) AS n_runs,
+               COUNT(DISTINCT bioproject) AS n_bioprojects,
+               COUNT(DISTINCT sra_study) AS n_studies,
+               MIN(releasedate) AS earliest, MAX(releasedate) AS latest
+        FROM _taxid_runs GROUP BY taxid
+    ) a USING (taxid)
+    """,
+    # Facet keys the summary would rank: NULLs and 'uncalculated' countries
+    # are dropped at build time, the same exclusions _SUMMARY_SQL applies.
+    """
+    CREATE OR REPLACE TABLE rollup_taxid_facets AS
+    SELECT taxid, 'platform' AS facet, platform AS key, COUNT(*) AS n_runs
+    FROM _taxid_runs WHERE platform IS NOT NULL GROUP BY ALL
+    UNION ALL
+    SELECT taxid, 'assay_type', assay_type, COUNT(*)
+    FROM _taxid_runs WHERE assay_type IS NOT NULL GROUP BY ALL
+    UNION ALL
+    SELECT taxid, 'country', country, COUNT(*)
+    FROM _taxid_runs
+    WHERE country IS NOT NULL AND country != 'uncalculated' GROUP BY ALL
+    """,
+    """
+    CREATE OR REPLACE TABLE rollup_taxid_bioprojects AS
+    SELECT taxid, bioproject, COUNT(*) AS n_runs,
+           COUNT(DISTINCT sra_study) AS n_studies,
+           MIN(releasedate) AS earliest, MAX(releasedate) AS latest
+    FROM _taxid_runs WHERE bioproject IS NOT NULL GROUP BY ALL
+    """,
+    """
+    CREATE OR REPLACE TABLE rollup_taxid_months AS
+    SELECT taxid, CAST(date_trunc('month', releasedate) AS DATE) AS month,
+           COUNT(*) AS n_runs
+    FROM _taxid_runs WHERE releasedate IS NOT NULL GROUP BY ALL
+    """,
+    f"""
+    CREATE OR REPLACE TABLE rollup_taxid_recent AS
+    SELECT taxid, releasedate, COUNT(*) AS n_runs
+    FROM _taxid_runs
+    WHERE releasedate >= CURRENT_DATE - INTERVAL {_RECENT_WINDOW_DAYS} DAY
+    GROUP BY ALL
+    """,
+    "DROP TABLE _taxid_runs",
+)
+
+
+def build_rollups(con: duckdb.DuckDBPyConnection) -> Dict[str, str]:
+    """Materialize the per-taxid rollup tables into a writable mirror connection.
+
+    Runs in one transaction, so a failure leaves any previous rollups (and
+    their provenance) untouched. Provenance lands in `mirror_meta` under
+    `rollups_*` keys: the build time plus the `mirror_built_at` and run count
+    of the `runs` table the rollups were computed from, which is what the
+    service compares on open to tell fresh rollups from stale ones. Returns
+    the provenance written.
+    """
+    meta = dict(con.execute("SELECT key, value FROM mirror_meta").fetchall())
+    total_runs = con.execute("SELECT COUNT(*) FROM runs").fetchone()[0]
+    provenance = {
+        "rollups_built_at": datetime.datetime.now(datetime.timezone.utc).isoformat(
+            timespec="seconds"
+        ),
+        "rollups_source_built_at": meta.get("mirror_built_at", ""),
+        "rollups_source_runs": str(total_runs),
+    }
+    con.execute("BEGIN TRANSACTION")
+    try:
+        for statement in _ROLLUP_BUILD_SQL:
+            con.execute(statement)
+        con.execute(
+            "DELETE FROM mirror_meta WHERE key IN (SELECT UNNEST(?))",
+            [list(provenance)],
+        )
+        con.executemany(
+            "INSERT INTO mirror_meta VALUES (?, ?)", list(provenance.items())
+        )
+    except BaseException:
+        con.execute("ROLLBACK")
+        raise
+    con.execute("COMMIT")
+    return provenance
+
+
+def _rollups_usable(
+    con: duckdb.DuckDBPyConnection, meta: Dict[str, str], total_runs: int
+) -> bool:
+    """True if the mirror carries a complete rollup set built from these runs.
+
+    Missing rollups are the normal case (the build step is optional) and stay
+    quiet; rollups whose provenance doesn't match the runs table -- the mirror
+    was rebuilt without re-running the rollup step -- are logged, since they
+    would serve last week's numbers.
+    """
+    present = {
+        row[0]
+        for row in con.execute(
+            "SELECT table_name FROM duckdb_tables() WHERE table_name LIKE 'rollup_%'"
+        ).fetchall()
+    }
+    if not set(_ROLLUP_TABLES) <= present:
+        return False
+    source_built_at = meta.get("rollups_source_built_at")
+    source_runs = meta.get("rollups_source_runs")
+    if source_built_at != meta.get("mirror_built_at", "") or source_runs != str(
+        total_runs
+    ):
+        logger.warning(
+            "SRA mirror rollups are stale (built from mirror %s with %s runs; "
+            "mirror is %s with %s runs) -- falling back to live scans",
+            source_built_at,
+            source_runs,
+            meta.get("mirror_built_at"),
+            total_runs,
+        )
+        return False
+    return True
+
+
+# Optional compacted layout, written by compact_mirror() (see
+# scripts/compact_sra_mirror.py). The mirror's row order is whatever the
+# ingest produced, so the per-row-group min/max stats DuckDB keeps can't skip
+# anything for an organism filter. Two things fix that:
+#
+# - `runs` is rewritten sorted by organism, then release date newest first,
+#   then accession -- the listing order. An organism's runs then sit in a
+#   handful of adjacent row groups, and a listing page stops after the first
+#   of them: the top-N pushes its running cutoff into the scan as a
+#   releasedate filter, which the descending sort makes prune.
+# - Each distinct organism gets a dense integer `organism_id`, with the
+#   dictionary in `organism_ids`. String stats keep only an 8-byte prefix,
+#   so on "Organism 7" or "Plasmodium ..." they can't tell names apart;
+#   queries filter on the id instead.
+#
+# Clustering by organism scatters a study's runs relative to its accession,
+# so `run_spans` records, per study and BioProject accession, the organism-id
+# and release-date range its runs occupy. A study lookup adds those ranges as
+# constant predicates, which the sorted columns prune on. A bound is NULL
+# when any of the accession's runs lacks that column, and is then left out.
+#
+# Run accessions get the same treatment one level down: `run_accessions` is
+# (acc, organism_id, releasedate) sorted by acc, so a batch of accessions --
+# usually one study's, with consecutive numbers -- is found in a row group or
+# two, and its organisms and dates then bound the read of `runs`.
+_COMPACT_SKIP_TABLES = ("runs", "organism_ids", "run_spans", "run_accessions")
+
+_COMPACT_SQL = (
+    """
+    CREATE TABLE organism_ids AS
+    SELECT CAST(ROW_NUMBER() OVER (ORDER BY organism) AS INTEGER) AS organism_id,
+           organism
+    FROM (SELECT DISTINCT organism FROM _source.runs WHERE organism IS NOT NULL)
+    """,
+    """
+    CREATE TABLE runs AS
+    SELECT {columns}, i.organism_id
+    FROM _source.runs r LEFT JOIN organism_ids i USING (organism)
+    ORDER BY i.organism_id NULLS LAST, r.releasedate DESC, r.acc DESC
+    """,
+    """
+    CREATE TABLE run_spans AS
+    SELECT accession,
+           CASE WHEN COUNT(organism_id) = COUNT(*) THEN MIN(organism_id) END
+               AS organism_lo,
+           CASE WHEN COUNT(organism_id) = COUNT(*) THEN MAX(organism_id) END
+               AS organism_hi,
+           CASE WHEN COUNT(releasedate) = COUNT(*) THEN MIN(releasedate) END
+               AS released_lo,
+           CASE WHEN COUNT(releasedate) = COUNT(*) THEN MAX(releasedate) END
+               AS released_hi
+    FROM (
+        SELECT sra_study AS accession, organism_id, releasedate
+        FROM runs WHERE sra_study IS NOT NULL
+        UNION ALL
+        SELECT bioproject, organism_id, releasedate
+        FROM runs WHERE bioproject IS NOT NULL
+    )
+    GROUP BY accession
+    ORDER BY accession
+    """,
+    """
+    CREATE TABLE run_accessions AS
+    SELECT acc, organism_id, releasedate
+    FROM runs WHERE acc IS NOT NULL
+    ORDER BY acc
+    """,
+)
+
+
+def compact_mirror(con: duckdb.DuckDBPyConnection, source: str) -> Dict[str, str]:
+    """Copy the mirror at `source` into the empty database `con`, with `runs`
+    in the compacted layout.
+
+    Every other table (taxid_names, mirror_meta, any rollups) is copied as
+    is. The rows of `runs` are the same, so rollups keep matching their
+    provenance. Compacting an already compacted file rebuilds the layout.
+    Runs in one transaction and writes `runs_compacted_at` into
+    `mirror_meta`; returns it.
+    """
+    quoted = source.replace("'", "''")
+    con.execute(f"ATTACH '{quoted}' AS _source (READ_ONLY)")
+    try:
+        tables = [
+            row[0]
+            for row in con.execute(
+                """
+                SELECT table_name FROM duckdb_tables()
+                WHERE database_name = '_source' AND schema_name = 'main'
+                ORDER BY table_name
+                """
+            ).fetchall()
+        ]
+        columns = [
+            row[0]
+            for row in con.execute(
+                """
+                SELECT column_name FROM duckdb_columns()
+                WHERE database_name = '_source' AND schema_name = 'main'
+                  AND table_name = 'runs' AND column_name != 'organism_id'
+                ORDER BY column_index
+                """
+            ).fetchall()
+        ]
+        if not columns:
+            raise duckdb.CatalogException(f"No runs table in {source}")
+        now = datetime.datetime.now(datetime.timezone.utc)
+        provenance = {"runs_compacted_at": now.isoformat(timespec="seconds")}
+        con.execute("BEGIN TRANSACTION")
+        try:
+            for table in tables:
+                if table not in _COMPACT_SKIP_TABLES:
+                    con.execute(
+                        f'CREATE TABLE "{table}" AS SELECT * FROM _source."{table}"'
+                    )
+            select = ", ".join(f'r."{column}"' for column in columns)
+            for statement in _COMPACT_SQL:
+                con.execute(statement.format(columns=select))
+            con.execute(
+                "DELETE FROM mirror_meta WHERE key IN (SELECT UNNEST(?))",
+                [list(provenance)],
+            )
+            con.executemany(
+                "INSERT INTO mirror_meta VALUES (?, ?)", list(provenance.items())
+            )
+        except BaseException:
+            con.execute("ROLLBACK")
+            raise
+        con.execute("COMMIT")
+    finally:
+        con.execute("DETACH _source")
+    return provenance
+
+
+def _load_organism_ids(con: duckdb.DuckDBPyConnection) -> Optional[Dict[str, int]]:
+    """The organism -> organism_id dictionary of a compacted mirror, or None
+    for a mirror in ingest order."""
+    present = {
+        (table, column)
+        for table, column in con.execute(
+            """
+            SELECT table_name, column_name FROM duckdb_columns()
+            WHERE database_name = ?
+              AND table_name IN (
+                  'runs', 'organism_ids', 'run_spans', 'run_accessions'
+              )
+            """,
+            [_MIRROR_CATALOG],
+        ).fetchall()
+    }
+    compacted = {
+        ("runs", "organism_id"),
+        ("organism_ids", "organism_id"),
+        ("run_spans", "accession"),
+        ("run_accessions", "acc"),
+    } <= present
+    if not compacted:
+        return None
+    return dict(
+        con.execute("SELECT organism, organism_id FROM organism_ids").fetchall()
+    )
+
+
 def _norm_organism(organism: str) -> str:
     """Collapse casing and whitespace for use as a cache key, so
     "Plasmodium falciparum", "plasmodium  falciparum" and "  ... " share one
@@ -169,47 +677,817 @@ def _normalize_since(value: str) -> Optional[str]:
     return s
 
 
-def _synchronized(method):
-    """Serialize a public method on the instance lock.
+def _period_label(start: datetime.date, interval: str) -> str:
+    """'2024-01', '2024-Q1' or '2024' for the period starting at `start`."""
+    if interval == "year":
+        return str(start.year)
+    if interval == "quarter":
+        return f"{start.year}-Q{(start.month - 1) // 3 + 1}"
+    return f"{start.year}-{start.month:02d}"
+
+
+def _period_starts(
+    first: datetime.date, last: datetime.date, interval: str
+) -> Iterator[datetime.date]:
+    """Every period start from `first` to `last` inclusive, so a histogram
+    shows the quiet periods as zeros instead of skipping them."""
+    step = _HISTOGRAM_INTERVALS[interval]
+    current = first
+    while current <= last:
+        yield current
+        month = current.month - 1 + step
+        current = datetime.date(current.year + month // 12, month % 12 + 1, 1)
+
+
+# Run listings share one projection: API field name -> `runs` column. The
+# aliases keep exported files and JSON responses field-for-field identical.
+_RUN_FIELDS = (
+    ("accession", "acc"),
+    ("study", "sra_study"),
+    ("bioproject", "bioproject"),
+    ("organism", "organism"),
+    ("assay_type", "assay_type"),
+    ("platform", "platform"),
+    ("instrument", "instrument"),
+    ("library_layout", "librarylayout"),
+    ("release_date", "releasedate"),
+    ("country", "geo_loc_name_country_calc"),
+    ("mbases", "mbases"),
+)
+_RUN_SELECT = ", ".join(f"{col} AS {field}" for field, col in _RUN_FIELDS)
+_RELEASE_DATE = [field for field, _ in _RUN_FIELDS].index("release_date")
+_ACCESSION = [field for field, _ in _RUN_FIELDS].index("accession")
+
+# Rows per fetchmany() batch while exporting: big enough to amortize the
+# per-batch overhead, small enough that a batch is a few MB at most.
+_EXPORT_BATCH_ROWS = 10_000
+_EXPORT_FORMATS = ("ndjson", "csv", "parquet")
+
+
+# SRA / ENA / DDBJ run accessions. Anything else can't match a run, and
+# keeping commas out is what lets a batch travel as one delimited parameter.
+_RUN_ACCESSION = re.compile(r"[SED]RR[0-9A-Z]+")
+
+
+def _accession_span_is_narrow(accessions: List[str]) -> bool:
+    """True when the accessions share a prefix and digit count and their
+    numbers lie within _ACCESSION_LOOKUP_SPAN of each other.
+
+    Same-length accessions sort as their numbers do, so the span is also the
+    range of run_accessions the lookup reads.
+    """
+    shapes = {(a[:3], len(a)) for a in accessions}
+    if len(shapes) != 1 or not all(a[3:].isdigit() for a in accessions):
+        return False
+    numbers = [int(a[3:]) for a in accessions]
+    return max(numbers) - min(numbers) <= _ACCESSION_LOOKUP_SPAN
+
+
+def _run_dict(row: Tuple) -> Dict[str, Any]:
+    run = {field: value for (field, _), value in zip(_RUN_FIELDS, row, strict=True)}
+    date = run["release_date"]
+    run["release_date"] = str(date) if date else None
+    return run
+
+
+def _encode_cursor(row: Tuple) -> str:
+    """Opaque resume token for the row after `row` in (releasedate, acc) DESC
+    order -- the listing's ORDER BY, so a page boundary is exact even when
+    many runs share a release date."""
+    date = row[_RELEASE_DATE]
+    key = [str(date) if date else None, row[_ACCESSION]]
+    return base64.urlsafe_b64encode(json.dumps(key).encode()).decode()
+
+
+def _keyset_clause(cursor: str) -> Tuple[str, List[Any]]:
+    """WHERE fragment selecting the rows after `cursor`; ValueError if the
+    token wasn't produced by _encode_cursor.
+
+    DuckDB sorts NULLs last under DESC, so undated runs come after every
+    dated one and page among themselves by accession alone.
+    """
+    try:
+        date, acc = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        if date is not None:
+            datetime.date.fromisoformat(date)
+        if not isinstance(acc, str):
+            raise ValueError(acc)
+    except (ValueError, TypeError) as exc:
+        raise ValueError(f"Invalid cursor {cursor!r}") from exc
+    if date is None:
+        return "(releasedate IS NULL AND acc < ?)", [acc]
+    return (
+        "(releasedate < ? OR (releasedate = ? AND acc < ?) OR releasedate IS NULL)",
+        [date, date, acc],
+    )
+
+
+def _summary_payload(
+    totals: Tuple, recent_count: int, top: Dict[str, List[Tuple]]
+) -> Dict[str, Any]:
+    """Shape summary facets into the summary_for_organism payload.
+
+    `totals` is (n_runs, n_bioprojects, n_studies, earliest, latest) and `top`
+    maps each facet to ranked (key, n_runs, earliest, latest) tuples -- the
+    form both the live single-pass query and the rollup reads produce.
+    """
+    n_runs, n_projects, n_studies, earliest, latest = totals
+    return {
+        "n_runs": n_runs,
+        "n_bioprojects": n_projects,
+        "n_studies": n_studies,
+        "earliest_release": str(earliest) if earliest else None,
+        "latest_release": str(latest) if latest else None,
+        "runs_last_90_days": recent_count,
+        "top_platforms": [
+            {"platform": p, "n_runs": n} for p, n, _, _ in top["platform"]
+        ],
+        "top_assay_types": [
+            {"assay_type": a, "n_runs": n} for a, n, _, _ in top["assay_type"]
+        ],
+        "top_countries": [{"country": c, "n_runs": n} for c, n, _, _ in top["country"]],
+        "top_bioprojects": [
+            {
+                "bioproject": bp,
+                "n_runs": n,
+                "earliest_release": str(e) if e else None,
+                "latest_release": str(la) if la else None,
+            }
+            for bp, n, e, la in top["bioproject"]
+        ],
+    }
+
+
+class FrozenResult(dict):
+    """A read-only result dict, shared by every caller that hits the cache.
+
+    Cache hits hand back the cached object itself -- no copy -- so it must
+    not be mutable: item assignment and the mutating methods raise, here and
+    on the nested dicts and lists. Still a dict (and lists), so json.dumps,
+    pydantic and FastMCP serialize it unchanged. `copy.deepcopy` returns
+    plain, mutable dicts and lists for a caller that wants to edit.
+
+    `to_json()` serializes once per cached result and memoizes, so the
+    assistant tools return the same string on every hit instead of
+    re-encoding it.
+    """
+
+    __slots__ = ("_json",)
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError(
+            "SRA mirror results are shared and read-only; "
+            "copy.deepcopy() one to modify it"
+        )
+
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def __deepcopy__(self, memo):
+        return {k: copy.deepcopy(v, memo) for k, v in self.items()}
+
+    def __copy__(self):
+        return dict(self)
+
+    def __reduce__(self):
+        return dict, (dict(self),)
+
+    def to_json(self) -> str:
+        try:
+            return self._json
+        except AttributeError:
+            # Racing threads may both encode; they produce the same string.
+            self._json = json.dumps(self, indent=2, default=str)
+            return self._json
+
+
+class _FrozenList(list):
+    """The read-only list inside a FrozenResult."""
+
+    __slots__ = ()
+    _read_only = FrozenResult._read_only
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _read_only
+    append = extend = insert = pop = remove = clear = sort = reverse = _read_only
+
+    def __deepcopy__(self, memo):
+        return [copy.deepcopy(v, memo) for v in self]
+
+    def __copy__(self):
+        return list(self)
+
+    def __reduce__(self):
+        return list, (list(self),)
+
+
+def _freeze(value: Any) -> Any:
+    if isinstance(value, dict):
+        return FrozenResult((k, _freeze(v)) for k, v in value.items())
+    if isinstance(value, list):
+        return _FrozenList(_freeze(v) for v in value)
+    return value
+
+
+class _OrganismNames:
+    """taxid_names held in memory, so resolving a term is a dict lookup.
+
+    `_resolve_organism` runs before every uncached search and summary, and
+    its name match is a `LOWER(name) = LOWER(?)` scan of the whole table --
+    no index can serve it. The table is fixed for the life of the file, so
+    it is read once per opened mirror, from the same handle the queries run
+    on: a service pointed at a new file rebuilds it in `_initialize` along
+    with everything else.
+
+    Kept flat to stay small at NCBI scale: names live in one tuple, sliced
+    per taxid through a sorted taxid array and an offsets array, so the only
+    per-name overhead beyond the strings is the lowercase lookup dict (whose
+    values reuse one int object per taxid).
+    """
+
+    __slots__ = ("_taxids", "_offsets", "_names", "_taxid_by_name")
+
+    def __init__(self, rows: List[Tuple[int, str]]):
+        # rows: (taxid, name) sorted by taxid, names in table order within one.
+        self._taxids = array.array("q")
+        self._offsets = array.array("q", [0])
+        self._taxid_by_name: Dict[str, int] = {}
+        names: List[str] = []
+        current: Optional[int] = None
+        for taxid, name in rows:
+            if taxid != current:
+                if current is not None:
+                    self._offsets.append(len(names))
+                self._taxids.append(taxid)
+                # One int object per taxid, shared by all its dict entries.
+                current = taxid
+            names.append(name)
+            # Ascending taxid order, so a name listed under several taxids
+            # keeps the smallest -- every process and restart agrees.
+            self._taxid_by_name.setdefault(name.lower(), current)
+        if current is not None:
+            self._offsets.append(len(names))
+        self._names = tuple(names)
+
+    @classmethod
+    def load(cls, con: duckdb.DuckDBPyConnection) -> "_OrganismNames":
+        # A sorted flat fetch grouped here is ~4x faster than list() per
+        # taxid in SQL at a million names.
+        return cls(
+            con.execute(
+                "SELECT taxid, name FROM taxid_names ORDER BY taxid, rowid"
+            ).fetchall()
+        )
+
+    def names(self, taxid: int) -> List[str]:
+        """Every name recorded for `taxid`, or [] if it isn't in the table."""
+        i = bisect.bisect_left(self._taxids, taxid)
+        if i == len(self._taxids) or self._taxids[i] != taxid:
+            return []
+        return list(self._names[self._offsets[i] : self._offsets[i + 1]])
+
+    def taxid_for(self, name: str) -> Optional[int]:
+        """Case-insensitive exact lookup of a name."""
+        return self._taxid_by_name.get(name.lower())
+
+    def groups(self) -> Iterator[Tuple[int, Tuple[str, ...]]]:
+        """(taxid, names) for every taxid, in ascending taxid order."""
+        for i, taxid in enumerate(self._taxids):
+            yield taxid, self._names[self._offsets[i] : self._offsets[i + 1]]
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+
+def _trigrams(text: str) -> set:
+    padded = f"  {text} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+class _NameSuggester:
+    """Prefix and typo-tolerant lookup over taxid_names and _ORGANISM_ALIASES.
+
+    When a term doesn't resolve, the model otherwise gets a bare "couldn't
+    resolve" and spends a round-trip guessing the spelling. This ranks
+    likely intended names instead: completions of the term as a prefix
+    first, then names whose words are trigram-similar to the term's words.
+
+    Matching is per word: a typo rarely spans words, and the vocabulary of
+    distinct words is far smaller than the names, so the trigram index is
+    over words and a word -> names posting list finds the candidates. Each
+    lookup is bounded (see the _SUGGEST_* budgets) so it stays in the low
+    milliseconds at a million names. Purely numeric words (strain numbers)
+    are matched exactly only.
+    """
+
+    __slots__ = ("_keys", "_display", "_taxids", "_postings", "_vocab", "_grams")
+
+    def __init__(self, names: _OrganismNames, aliases: Dict[str, int]):
+        entries: Dict[str, Tuple[str, int]] = {}
+        # Ascending taxid, so a name shared by several taxids suggests the
+        # one _resolve_organism would pick.
+        for taxid, group in names.groups():
+            for name in group:
+                entries.setdefault(name.lower(), (name, taxid))
+        for alias, taxid in aliases.items():
+            entries.setdefault(alias, (alias, taxid))
+        self._keys = sorted(entries)
+        self._display = [entries[k][0] for k in self._keys]
+        self._taxids = array.array("q", [entries[k][1] for k in self._keys])
+        del entries
+
+        postings: Dict[str, Any] = {}
+        for i, key in enumerate(self._keys):
+            for word in set(key.split()):
+                postings.setdefault(word, []).append(i)
+        # Most words (strain designations) occur in one name; a bare int
+        # costs far less than a one-element array.
+        self._postings: Dict[str, Any] = {
+            w: p[0] if len(p) == 1 else array.array("I", p) for w, p in postings.items()
+        }
+        del postings
+
+        self._vocab = [w for w in self._postings if not w.isdigit()]
+        grams: Dict[str, List[int]] = {}
+        for j, word in enumerate(self._vocab):
+            for gram in _trigrams(word):
+                grams.setdefault(gram, []).append(j)
+        self._grams = {g: array.array("I", p) for g, p in grams.items()}
+
+    def _posting(self, word: str) -> Sequence[int]:
+        found = self._postings.get(word, ())
+        return (found,) if isinstance(found, int) else found
+
+    def suggest(self, term: str, limit: int) -> List[Tuple[str, int]]:
+        """Up to `limit` (name, taxid) candidates for `term`, best first, one
+        per taxid."""
+        key = " ".join(term.lower().split())
+        if not key:
+            return []
+        start = bisect.bisect_left(self._keys, key)
+        prefixed = []
+        for i in range(start, min(start + _SUGGEST_CANDIDATES, len(self._keys))):
+            if not self._keys[i].startswith(key):
+                break
+            prefixed.append(i)
+        prefixed.sort(key=lambda i: len(self._keys[i]))
+
+        out: List[Tuple[str, int]] = []
+        seen = set()
+        # Completions are the likelier intent; only fall through to the
+        # similarity search when they don't fill the list.
+        for batch in (prefixed, None):
+            if batch is None:
+                batch = self._similar_names(key.split())
+            for i in batch:
+                taxid = self._taxids[i]
+                if taxid in seen:
+                    continue
+                seen.add(taxid)
+                out.append((self._display[i], taxid))
+                if len(out) == limit:
+                    return out
+        return out
+
+    def _similar_words(self, word: str) -> Dict[str, float]:
+        """Vocabulary words similar to `word`, with their trigram Jaccard."""
+        if word in self._postings:
+            return {word: 1.0}
+        if word.isdigit():
+            return {}
+        grams = _trigrams(word)
+        # Rarest grams first; stop before the budget is blown on grams common
+        # enough ("ium", "ter") to say little about the word anyway.
+        counts: collections.Counter = collections.Counter()
+        spent = 0
+        for gram in sorted(grams, key=lambda g: len(self._grams.get(g, ()))):
+            posting = self._grams.get(gram)
+            if not posting:
+                continue
+            if spent and spent + len(posting) > _SUGGEST_GRAM_BUDGET:
+                break
+            counts.update(posting)
+            spent += len(posting)
+        similar = {}
+        for j, _ in counts.most_common(_SUGGEST_TOKEN_CANDIDATES):
+            other = _trigrams(self._vocab[j])
+            score = len(grams & other) / len(grams | other)
+            if score >= _SUGGEST_MIN_TOKEN_SCORE:
+                similar[self._vocab[j]] = score
+        return similar
+
+    def _similar_names(self, words: List[str]) -> List[int]:
+        """Name indexes ranked by mean best-word similarity to `words`."""
+        matches = [self._similar_words(w) for w in words]
+        # Draw candidates through the query word whose matches name the
+        # fewest entries -- a name has to contain one of them to score.
+        sizes = [
+            (sum(len(self._posting(w)) for w in m), n)
+            for n, m in enumerate(matches)
+            if m
+        ]
+        if not sizes:
+            return []
+        pick = matches[min(sizes)[1]]
+        candidates: set = set()
+        for word in sorted(pick, key=pick.get, reverse=True):
+            room = _SUGGEST_CANDIDATES - len(candidates)
+            candidates.update(self._posting(word)[:room])
+            if len(candidates) >= _SUGGEST_CANDIDATES:
+                break
+
+        scored = []
+        for i in candidates:
+            key_words = self._keys[i].split()
+            score = sum(
+                max((m.get(w, 0.0) for w in key_words), default=0.0) for m in matches
+            ) / len(matches)
+            if score >= _SUGGEST_MIN_SCORE:
+                # Shorter names first on a tie: the species before its strains.
+                scored.append((-score, len(self._keys[i]), i))
+        scored.sort()
+        return [i for _, _, i in scored]
+
+
+class _ConnectionPool:
+    """Read-only cursors on one shared DuckDB database, checked out per call.
+
+    FastMCP offloads sync MCP tools to a worker threadpool (sync tool fns are
+    run via anyio.to_thread), and the SRAMirrorService singleton is shared
+    between that threadpool and the assistant's event-loop thread. A single
+    DuckDB connection is not safe for concurrent execute()/fetch() -- a
+    second thread's execute() rebinds the connection's pending result between
+    the first thread's execute() and fetch() -- so each call gets a connection
+    of its own. `cursor()` opens one on the same database instance: it shares
+    the buffer manager and catalog with the root connection, costs no file
+    re-open, and DuckDB releases the GIL while it executes, so concurrent
+    searches run in parallel instead of queuing on one lock.
+
+    A pool belongs to one mirror file. When the watcher swaps in a new file
+    the old pool is retired: calls already holding one of its cursors finish
+    on it, the database is closed once the last one is returned, and a
+    checkout that arrives after retirement raises _PoolRetired so the caller
+    can take the new file's pool instead.
+    """
+
+    def __init__(self, con: duckdb.DuckDBPyConnection, max_idle: int):
+        self._root = con
+        self._max_idle = max_idle
+        self._idle: List[duckdb.DuckDBPyConnection] = []
+        self._active = 0
+        self._retired = False
+        self._lock = threading.Lock()
+
+    def checkout(self) -> duckdb.DuckDBPyConnection:
+        with self._lock:
+            if self._retired:
+                raise _PoolRetired
+            con = self._idle.pop() if self._idle else None
+            self._active += 1
+        if con is None:
+            try:
+                con = self._root.cursor()
+                # The default catalog is per connection (see _connect).
+                con.execute(f"USE {_MIRROR_CATALOG}")
+            except BaseException:
+                self.release(None)
+                raise
+        return con
+
+    def release(self, con: Optional[duckdb.DuckDBPyConnection]) -> None:
+        with self._lock:
+            self._active -= 1
+            keep = (
+                con is not None
+                and not self._retired
+                and len(self._idle) < self._max_idle
+            )
+            if keep:
+                self._idle.append(con)
+            drained = self._retired and not self._active
+        if con is not None and not keep:
+            con.close()
+        if drained:
+            self._root.close()
+
+    @contextlib.contextmanager
+    def connection(self) -> Iterator[duckdb.DuckDBPyConnection]:
+        con = self.checkout()
+        try:
+            yield con
+        finally:
+            self.release(con)
+
+    def retire(self) -> None:
+        """Refuse new checkouts; close the database once the last checked-out
+        cursor is back."""
+        with self._lock:
+            self._retired = True
+            idle, self._idle = self._idle, []
+            drained = not self._active
+        for con in idle:
+            con.close()
+        if drained:
+            self._root.close()
+
+
+class _PoolRetired(Exception):
+    """Checkout from a pool whose mirror file has been swapped out."""
+
+
+class _MirrorState:
+    """Everything loaded from one mirror file, swapped as a unit on reload.
+
+    A pooled call pins the state it started on (see _pooled), so a query
+    in flight across a swap finishes against the file it began on, with
+    that file's names, rollups and provenance.
+    """
+
+    __slots__ = (
+        "con",
+        "pool",
+        "meta",
+        "total_runs",
+        "names",
+        "suggester",
+        "rollups_built_at",
+        "organism_ids",
+        "identity",
+        "generation",
+    )
+
+    def __init__(
+        self,
+        con: Optional[duckdb.DuckDBPyConnection] = None,
+        meta: Optional[Dict[str, str]] = None,
+        total_runs: Optional[int] = None,
+        names: Optional[_OrganismNames] = None,
+        rollups_built_at: Optional[str] = None,
+        organism_ids: Optional[Dict[str, int]] = None,
+        identity: Optional[Tuple[int, ...]] = None,
+        generation: int = 0,
+    ):
+        self.con = con
+        self.pool = _ConnectionPool(con, _POOL_MAX_IDLE) if con is not None else None
+        self.meta = meta or {}
+        self.total_runs = total_runs
+        self.names = names if names is not None else _OrganismNames([])
+        # Built off-thread after the mirror opens (see _build_suggester); None
+        # until then, and unresolved terms get no suggestions meanwhile.
+        self.suggester: Optional[_NameSuggester] = None
+        # Set when the mirror carries fresh per-taxid rollups; None means
+        # every summary is computed from `runs` directly.
+        self.rollups_built_at = rollups_built_at
+        # organism -> organism_id when the file is in the compacted layout
+        # (see compact_mirror); None means organisms are matched by name.
+        self.organism_ids = organism_ids
+        # (device, inode, mtime, size) of the file as opened -- how the
+        # watcher tells a new build from the one being served.
+        self.identity = identity
+        self.generation = generation
+
+
+def _connect(path: str, limits: QueryLimits) -> duckdb.DuckDBPyConnection:
+    """A read-only connection to the mirror file at `path`.
+
+    Attached to a fresh in-memory database rather than opened with
+    duckdb.connect(path): DuckDB shares one database instance per canonical
+    path within a process, so while the old file is still draining,
+    connect() on the same path would hand back the old file's instance
+    instead of opening the new build. The database gets `limits`' memory
+    limit, which every pooled cursor on it shares.
+    """
+    con = duckdb.connect(config=limits.duckdb_config())
+    try:
+        quoted = path.replace("'", "''")
+        con.execute(f"ATTACH '{quoted}' AS {_MIRROR_CATALOG} (READ_ONLY)")
+        con.execute(f"USE {_MIRROR_CATALOG}")
+    except duckdb.Error:
+        con.close()
+        raise
+    return con
+
+
+def _file_identity(path: str) -> Optional[Tuple[int, ...]]:
+    # stat() follows symlinks, so a flipped link reads as a different inode;
+    # a file replaced by rename does too. mtime and size catch the rest.
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_dev, st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+class _Flight:
+    """One in-flight computation of a cache key that other callers wait on."""
 
-    FastMCP offloads sync MCP tools to a worker threadpool (sync tool fns
-    are run via anyio.to_thread), and the SRAMirrorService singleton is
-    shared between that threadpool and the assistant's event-loop thread.
-    A single DuckDB connection is not safe for concurrent execute()/fetch()
-    -- a second thread's execute() rebinds the connection's pending result
-    between the first thread's execute() and fetch() -- and the plain-dict
-    cache is not safe for concurrent mutation. Holding the lock for the whole
-    call keeps each lookup (cache check + queries + cache store) atomic.
+    __slots__ = ("done", "result")
 
-    Queries are sub-200ms and usually cache hits, so the serialization cost
-    is negligible; per-thread duckdb cursors could restore read parallelism
-    later if it ever matters.
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Optional[FrozenResult] = None
+
+
+def _pooled(method):
+    """Run a method with a pooled cursor checked out as `self._cur`.
+
+    Re-entrant per thread: a pooled method calling another pooled method
+    reuses the cursor already checked out rather than taking a second. The
+    outermost call also pins the mirror state it checked out from, so every
+    attribute the call reads comes from one file even if a reload lands
+    mid-call.
+
+    The outermost call is what the query profiler records as one call, and
+    it runs under the service's QueryLimits: past its deadline the watchdog
+    interrupts the cursor, and a call that goes over a limit returns
+    QueryTooExpensive.result() -- every public query method returns a result
+    dict, and this is one more error shape of it.
     """
 
     @functools.wraps(method)
     def wrapper(self, *args, **kwargs):
-        with self._lock:
+        if getattr(self._local, "cur", None) is not None:
+            return method(self, *args, **kwargs)
+        state, cur = self._checkout()
+        if cur is None:
             return method(self, *args, **kwargs)
+        pinned = getattr(self._local, "state", None)
+        self._local.state, self._local.cur = state, cur
+        try:
+            with profiler.call("sra_mirror", method.__name__):
+                with watchdog.guard(cur, self._limits):
+                    return method(self, *args, **kwargs)
+        except QueryTooExpensive as exc:
+            logger.warning("SRA mirror %s refused: %s", method.__name__, exc)
+            return exc.result()
+        finally:
+            self._local.state, self._local.cur = pinned, None
+            state.pool.release(cur)
 
     return wrapper
 
 
+class _ExportStream:
+    """An export's chunks, holding the cursor they're read from until the
+    stream is exhausted, fails or is closed. Unlike a generator's finally,
+    close() also releases a stream that never produced a chunk."""
+
+    def __init__(
+        self,
+        pool: _ConnectionPool,
+        con: duckdb.DuckDBPyConnection,
+        chunks: Iterator[bytes],
+    ):
+        self._pool = pool
+        self._con: Optional[duckdb.DuckDBPyConnection] = con
+        self._chunks = chunks
+
+    def __iter__(self) -> "_ExportStream":
+        return self
+
+    def __next__(self) -> bytes:
+        try:
+            return next(self._chunks)
+        except BaseException:
+            self.close()
+            raise
+
+    def close(self) -> None:
+        self._chunks.close()
+        con, self._con = self._con, None
+        if con is not None:
+            self._pool.release(con)
+
+    def __del__(self) -> None:
+        self.close()
+
+
 class SRAMirrorService:
     """Read-only access to the local SRA-DuckDB mirror."""
 
-    def __init__(self, mirror_path: str):
+    def __init__(
+        self,
+        mirror_path: str,
+        reload_interval: float = 0,
+        limits: Optional[QueryLimits] = None,
+    ):
         self.mirror_path = mirror_path
-        self._con: Optional[duckdb.DuckDBPyConnection] = None
-        self._meta: Dict[str, str] = {}
-        self._total_runs: Optional[int] = None
+        # Deadline, row cap and memory limit for each pooled call (see
+        # _pooled and query_guard); the default is no limits.
+        self._limits = limits or QueryLimits()
+        # The mirror file being served; replaced whole by reload().
+        self._state = _MirrorState()
+        self._local = threading.local()
+        self._suggester_thread: Optional[threading.Thread] = None
+        # Cache keys carry the state's generation (see _cache_key), so a
+        # reload can keep the entries it warmed for the new file and drop
+        # the rest.
         self._cache: Dict[Tuple, Tuple[float, Any]] = {}
-        # Guards the shared DuckDB connection and the cache dict: the MCP
-        # tools execute in FastMCP's worker threadpool, so both are touched
-        # from multiple threads. RLock so a future nested call can't deadlock.
-        self._lock = threading.RLock()
+        # Guards only the cache dict (queries run on pooled cursors). Held for
+        # dict operations alone -- never across a query -- so a slow aggregate
+        # on one thread doesn't stall another thread's hit.
+        self._cache_lock = threading.Lock()
+        # Cache keys being computed right now, so concurrent identical misses
+        # wait on one query (see _coalesced). Guarded by _cache_lock too.
+        self._inflight: Dict[Tuple, _Flight] = {}
+        self._query_stats = {"executed": 0, "coalesced": 0}
+        # Serializes reload() between the watcher and any direct caller.
+        self._reload_lock = threading.Lock()
+        self._failed_identity: Optional[Tuple[int, ...]] = None
+        self._stop_watching = threading.Event()
+        self._watcher: Optional[threading.Thread] = None
         self._initialize()
+        if reload_interval > 0 and self.mirror_path:
+            self._watcher = threading.Thread(
+                target=self._watch,
+                args=(reload_interval,),
+                name="sra-mirror-watcher",
+                daemon=True,
+            )
+            self._watcher.start()
+
+    def _current(self) -> _MirrorState:
+        """The state pinned by the running pooled call, else the live one."""
+        pinned = getattr(self._local, "state", None)
+        return pinned if pinned is not None else self._state
+
+    def _checkout(
+        self,
+    ) -> Tuple[_MirrorState, Optional[duckdb.DuckDBPyConnection]]:
+        """A cursor from the current state's pool, with that state; None for
+        the cursor when no mirror is open. Release it to state.pool."""
+        while True:
+            state = self._current()
+            if state.pool is None:
+                return state, None
+            try:
+                return state, state.pool.checkout()
+            except _PoolRetired:
+                # A reload swapped the file out between reading the state and
+                # checking out; the next read sees the new one.
+                continue
+
+    @property
+    def _cur(self) -> duckdb.DuckDBPyConnection:
+        """The cursor checked out for the current @_pooled call."""
+        return self._local.cur
+
+    def _rows(self, query: str, params: Sequence[Any] = ()) -> List[Tuple]:
+        """Run `query` on the call's cursor and fetch its rows, up to the
+        row cap in the service's QueryLimits.
+
+        Every query a pooled call makes goes through here (or _row), so the
+        row cap and the profiler see all of them.
+        """
+        cur = self._cur
+        with profiler.query(cur, query):
+            return fetch_capped(cur.execute(query, params), self._limits.max_rows)
+
+    def _row(self, query: str, params: Sequence[Any] = ()) -> Optional[Tuple]:
+        """The first row of `query`, or None."""
+        rows = self._rows(query, params)
+        return rows[0] if rows else None
 
-    def _cache_get(self, key: Tuple) -> Optional[Any]:
+    @property
+    def _con(self) -> Optional[duckdb.DuckDBPyConnection]:
+        return self._current().con
+
+    @property
+    def _pool(self) -> Optional[_ConnectionPool]:
+        return self._current().pool
+
+    @property
+    def _meta(self) -> Dict[str, str]:
+        return self._current().meta
+
+    @property
+    def _total_runs(self) -> Optional[int]:
+        return self._current().total_runs
+
+    @property
+    def _names(self) -> _OrganismNames:
+        return self._current().names
+
+    @property
+    def _suggester(self) -> Optional[_NameSuggester]:
+        return self._current().suggester
+
+    @property
+    def _organism_ids(self) -> Optional[Dict[str, int]]:
+        return self._current().organism_ids
+
+    @property
+    def _rollups_built_at(self) -> Optional[str]:
+        return self._current().rollups_built_at
+
+    def _cache_key(self, key: Tuple) -> Tuple:
+        return (self._current().generation, *key)
+
+    def _cache_get(self, key: Tuple) -> Optional[FrozenResult]:
+        key = self._cache_key(key)
+        with self._cache_lock:
+            return self._cache_lookup(key)
+
+    def _cache_lookup(self, key: Tuple) -> Optional[FrozenResult]:
+        # Caller holds self._cache_lock.
         entry = self._cache.get(key)
         if entry is None:
             return None
@@ -218,18 +1496,84 @@ class SRAMirrorService:
             # Pop the expired entry instead of leaving it to shadow the slot.
             del self._cache[key]
             return None
-        # Hand back a copy so a caller mutating the result can't corrupt the
-        # shared cache entry.
-        return copy.deepcopy(value)
-
-    def _cache_put(self, key: Tuple, value: Any) -> None:
-        if key not in self._cache and len(self._cache) >= _CACHE_MAX_ENTRIES:
-            self._evict()
-        # Store an independent copy so a caller mutating the returned dict
-        # (which it still holds a reference to) can't reach into the cache.
-        self._cache[key] = (time.monotonic(), copy.deepcopy(value))
+        # Frozen, so the shared entry itself is safe to hand out.
+        return value
+
+    def _cache_put(self, key: Tuple, value: Dict[str, Any]) -> FrozenResult:
+        """Freeze and cache `value`; return the frozen form, which the miss
+        path returns too so hits and misses behave alike."""
+        frozen = _freeze(value)
+        key = self._cache_key(key)
+        with self._cache_lock:
+            if (flight := self._inflight.get(key)) is not None:
+                flight.result = frozen
+            if key[0] < self._state.generation:
+                # Computed on a file that's been swapped out while it ran:
+                # hand it to this call's waiters but don't cache it.
+                return frozen
+            if key not in self._cache and len(self._cache) >= _CACHE_MAX_ENTRIES:
+                self._evict()
+            self._cache[key] = (time.monotonic(), frozen)
+        return frozen
+
+    @contextlib.contextmanager
+    def _coalesced(self, key: Tuple) -> Iterator[Optional[FrozenResult]]:
+        """Single-flight around a cache miss: yield the result for `key` if
+        it's cached or another thread is already computing it, else None --
+        and the caller computes it and hands it to _cache_put.
+
+        Several assistant sessions asking about the same organism at once
+        would otherwise each miss and each run the full aggregate. The
+        first caller runs it; later ones block until it finishes and share
+        its frozen result. A computation that ends without caching anything
+        (an error result, an exception) isn't shared: its waiters retry, one
+        of them taking over as the runner.
+        """
+        key = self._cache_key(key)
+        while True:
+            with self._cache_lock:
+                hit = self._cache_lookup(key)
+                flight = self._inflight.get(key)
+                runner = hit is None and flight is None
+                if runner:
+                    flight = self._inflight[key] = _Flight()
+                    self._query_stats["executed"] += 1
+            if runner:
+                profiler.cache("miss")
+                break
+            if hit is not None:
+                profiler.cache("hit")
+                yield hit
+                return
+            # Waiters keep their pooled cursor; the pool opens another for the
+            # runner if none is idle, so this can't starve it.
+            flight.done.wait()
+            if flight.result is not None:
+                with self._cache_lock:
+                    self._query_stats["coalesced"] += 1
+                profiler.cache("coalesced")
+                yield flight.result
+                return
+        try:
+            yield None
+        except QueryTooExpensive as exc:
+            # Share the refusal with this run's waiters, uncached: retrying
+            # would only run the same query into the same limit, one waiter
+            # after another.
+            flight.result = _freeze(exc.result())
+            raise
+        finally:
+            with self._cache_lock:
+                del self._inflight[key]
+            flight.done.set()
+
+    def query_stats(self) -> Dict[str, int]:
+        """Queries run vs calls served by another call's in-flight run."""
+        with self._cache_lock:
+            return dict(self._query_stats, in_flight=len(self._inflight))
 
     def _evict(self) -> None:
+        # Caller holds self._cache_lock.
         now = time.monotonic()
         expired = [
             k for k, (ts, _) in self._cache.items() if now - ts >= _CACHE_TTL_SECONDS
@@ -244,7 +1588,7 @@ class SRAMirrorService:
     def _initialize(self) -> None:
         # Path('').exists() is True (it resolves to '.'), so guard the empty
         # case explicitly and require an actual file -- otherwise an unset
-        # SRA_MIRROR_PATH falls through to duckdb.connect('', read_only=True),
+        # SRA_MIRROR_PATH falls through to an ATTACH of '' (see _connect),
         # which raises and logs a scary traceback on every default-deploy boot.
         if not self.mirror_path:
             logger.info("SRA_MIRROR_PATH not set -- SRA mirror service disabled")
@@ -255,15 +1599,37 @@ class SRAMirrorService:
                 self.mirror_path,
             )
             return
-        # Build into locals and only publish to self on full success, so a
-        # query failure after connect() can't leave self._con pointing at a
-        # half-initialized handle. Distinct except arms give an actionable log
-        # line instead of one flattened "failed" with a raw traceback.
+        state = self._open(_file_identity(self.mirror_path), generation=1)
+        if state is None:
+            return
+        self._state = state
+        # The suggester takes seconds at a million names; don't hold up
+        # startup for what only the unresolved-term path needs.
+        self._suggester_thread = threading.Thread(
+            target=self._build_suggester,
+            args=(state,),
+            name="sra-name-suggester",
+            daemon=True,
+        )
+        self._suggester_thread.start()
+
+    def _open(
+        self, identity: Optional[Tuple[int, ...]], generation: int
+    ) -> Optional[_MirrorState]:
+        """Open the file at mirror_path and load what the service keeps in
+        memory for it; None (logged) if that fails."""
+        # Build into locals and only return a state on full success, so a
+        # query failure after connect() can't leave a half-initialized handle
+        # being served. Distinct except arms give an actionable log line
+        # instead of one flattened "failed" with a raw traceback.
         con: Optional[duckdb.DuckDBPyConnection] = None
         try:
-            con = duckdb.connect(self.mirror_path, read_only=True)
+            con = _connect(self.mirror_path, self._limits)
             meta = dict(con.execute("SELECT key, value FROM mirror_meta").fetchall())
             total_runs = con.execute("SELECT COUNT(*) FROM runs").fetchone()[0]
+            rollups = _rollups_usable(con, meta, total_runs)
+            names = _OrganismNames.load(con)
+            organism_ids = _load_organism_ids(con)
         except duckdb.IOException as exc:
             logger.error("Could not open SRA mirror at %s: %s", self.mirror_path, exc)
         except duckdb.CatalogException as exc:
@@ -275,32 +1641,177 @@ class SRAMirrorService:
         except duckdb.Error as exc:
             logger.error("Failed to load SRA mirror at %s: %s", self.mirror_path, exc)
         else:
-            self._con = con
-            self._meta = meta
-            self._total_runs = total_runs
+            state = _MirrorState(
+                con,
+                meta=meta,
+                total_runs=total_runs,
+                names=names,
+                rollups_built_at=meta.get("rollups_built_at") if rollups else None,
+                organism_ids=organism_ids,
+                identity=identity,
+                generation=generation,
+            )
             logger.info(
-                "SRA mirror loaded: %s rows, built %s",
+                "SRA mirror loaded: %s rows, %s organism names, built %s, "
+                "rollups %s, layout %s",
                 f"{total_runs:,}",
+                f"{len(names):,}",
                 meta.get("mirror_built_at", "unknown"),
+                state.rollups_built_at or "not in use",
+                "compacted" if organism_ids is not None else "ingest order",
             )
-            return
+            return state
 
         # Reached only on a caught failure: close the opened handle so the
-        # file lock doesn't linger until GC, and stay unavailable.
+        # file lock doesn't linger until GC.
         if con is not None:
             con.close()
-        self._con = None
+        return None
+
+    def _build_suggester(self, state: _MirrorState) -> None:
+        started = time.perf_counter()
+        state.suggester = _NameSuggester(state.names, _ORGANISM_ALIASES)
+        logger.info(
+            "SRA organism-name suggester built in %.1fs",
+            time.perf_counter() - started,
+        )
+
+    def reload(self) -> bool:
+        """Swap to the file now at mirror_path if it isn't the one being
+        served; True if it swapped.
+
+        The weekly rebuild is published by renaming the new file over the old
+        path or flipping a symlink to it, either of which changes what
+        mirror_path stat()s to. The new file is opened and warmed here, off
+        the request path -- names index, suggester, and the summaries and
+        BioProject rankings currently in the cache, recomputed against it --
+        and only then made live, with the rest of the cache dropped. Calls
+        already running finish on the old file, which is closed when the
+        last of them returns. A file that fails to open is logged and left
+        alone until it changes again; the old one keeps serving.
+        """
+        with self._reload_lock:
+            identity = _file_identity(self.mirror_path)
+            if identity is None or identity in (
+                self._state.identity,
+                self._failed_identity,
+            ):
+                return False
+            started = time.perf_counter()
+            state = self._open(identity, generation=self._state.generation + 1)
+            if state is None:
+                self._failed_identity = identity
+                return False
+            self._build_suggester(state)
+            warmed = self._warm(state)
+            old = self._state
+            with self._cache_lock:
+                self._state = state
+                self._cache = {
+                    k: v for k, v in self._cache.items() if k[0] == state.generation
+                }
+            if old.pool is not None:
+                old.pool.retire()
+            logger.info(
+                "SRA mirror swapped to build %s (was %s) in %.1fs, %d results warmed",
+                state.meta.get("mirror_built_at", "unknown"),
+                old.meta.get("mirror_built_at", "unknown"),
+                time.perf_counter() - started,
+                warmed,
+            )
+            return True
+
+    def _warm(self, state: _MirrorState) -> int:
+        """Recompute the cached summaries and BioProject rankings against
+        `state` before it goes live, so the organisms being asked about don't
+        all miss at once on the new file. Returns how many were computed."""
+        with self._cache_lock:
+            hot = [
+                key[1:]
+                for key in reversed(self._cache)
+                if key[0] == self._state.generation
+                and key[1] in ("summary", "top_bioprojects")
+            ][:_RELOAD_WARM_ENTRIES]
+        self._local.state = state
+        try:
+            for kind, organism, *rest in hot:
+                if kind == "summary":
+                    self.summary_for_organism(organism)
+                else:
+                    self.top_bioprojects_for_organism(organism, *rest)
+        except duckdb.Error as exc:
+            # Warming is best effort; whatever is left fills in on demand.
+            logger.warning("SRA mirror warm-up stopped early: %s", exc)
+        finally:
+            self._local.state = None
+        return len(hot)
+
+    def _watch(self, interval: float) -> None:
+        while not self._stop_watching.wait(interval):
+            try:
+                self.reload()
+            except Exception:  # noqa: BLE001 -- keep watching; old file serves
+                logger.exception("SRA mirror reload failed")
+
+    def close(self) -> None:
+        """Stop the reload watcher and close the mirror once calls drain."""
+        self._stop_watching.set()
+        with self._reload_lock:
+            old, self._state = self._state, _MirrorState()
+        if old.pool is not None:
+            old.pool.retire()
 
     def is_available(self) -> bool:
         return self._con is not None
 
-    def _provenance(self, resolved_names: List[str]) -> Dict[str, Any]:
-        return {
+    def _provenance(
+        self, resolved_names: List[str], from_rollup: bool = False
+    ) -> Dict[str, Any]:
+        meta = {
             "mirror_built_at": self._meta.get("mirror_built_at"),
             "taxdump_version": self._meta.get("taxdump_version"),
             "total_runs_in_mirror": self._total_runs,
             "resolved_names_for_query": resolved_names,
         }
+        if from_rollup:
+            meta["rollups_built_at"] = self._rollups_built_at
+        return meta
+
+    @_pooled
+    def _rollup_covers(self, taxid: Optional[int]) -> bool:
+        """True if the rollups can answer for `taxid`.
+
+        Every taxid in taxid_names has a totals row, so a miss means the term
+        resolved through an alias whose taxid has no names in this mirror --
+        the live path then matches the literal term, which the rollups can't.
+        """
+        if taxid is None or self._rollups_built_at is None:
+            return False
+        row = self._row("SELECT 1 FROM rollup_taxid_totals WHERE taxid = ?", [taxid])
+        return row is not None
+
+    def _unresolved(self, organism: str) -> Dict[str, Any]:
+        """The message for a term that didn't resolve, with ranked "did you
+        mean" candidates when the suggester has any."""
+        suggester = self._suggester
+        candidates = suggester.suggest(organism, _SUGGEST_LIMIT) if suggester else []
+        if not candidates:
+            return {
+                "message": (
+                    f"Couldn't resolve '{organism}' to a known organism -- check "
+                    "the spelling, or try the scientific name or NCBI taxid."
+                )
+            }
+        listed = ", ".join(f"{name} (taxid {taxid})" for name, taxid in candidates)
+        return {
+            "message": (
+                f"Couldn't resolve '{organism}' to a known organism. Did you "
+                f"mean: {listed}? Retry with one of these names or taxids."
+            ),
+            "did_you_mean": [
+                {"name": name, "taxid": taxid} for name, taxid in candidates
+            ],
+        }
 
     def _resolve_organism(self, organism: str) -> tuple[Optional[int], List[str]]:
         """Resolve a user-supplied organism term to (taxid, names_in_mirror).
@@ -321,11 +1832,9 @@ class SRAMirrorService:
 
         if term.isdigit():
             taxid = int(term)
-            rows = self._con.execute(
-                "SELECT name FROM taxid_names WHERE taxid = ?", [taxid]
-            ).fetchall()
-            if rows:
-                return taxid, [r[0] for r in rows]
+            names = self._names.names(taxid)
+            if names:
+                return taxid, names
             # A numeric taxid we don't know about isn't "resolved" -- mirror the
             # unknown-name path below so callers don't report a phantom organism.
             return None, [term]
@@ -335,34 +1844,26 @@ class SRAMirrorService:
         # "SARS-CoV-2" or "TB", so these would otherwise miss.
         alias_taxid = _ORGANISM_ALIASES.get(" ".join(term.lower().split()))
         if alias_taxid is not None:
-            rows = self._con.execute(
-                "SELECT name FROM taxid_names WHERE taxid = ?", [alias_taxid]
-            ).fetchall()
-            if rows:
-                return alias_taxid, [r[0] for r in rows]
-            return alias_taxid, [term]
+            return alias_taxid, self._names.names(alias_taxid) or [term]
 
-        rows = self._con.execute(
-            """
-            SELECT DISTINCT taxid FROM taxid_names
-            WHERE LOWER(name) = LOWER(?)
-            ORDER BY taxid
-            """,
-            [term],
-        ).fetchall()
-        if rows:
-            # Deterministic pick when a name maps to multiple taxids -- the
-            # ORDER BY makes restarts/processes agree instead of taking
-            # whatever row DuckDB happened to return first.
-            taxid = rows[0][0]
-            names = self._con.execute(
-                "SELECT name FROM taxid_names WHERE taxid = ?", [taxid]
-            ).fetchall()
-            return taxid, [r[0] for r in names]
+        # Names shared by several taxids resolve to the smallest one (see
+        # _OrganismNames.load), a deterministic pick across restarts/processes.
+        taxid = self._names.taxid_for(term)
+        if taxid is not None:
+            return taxid, self._names.names(taxid)
 
         return None, [term]
 
-    @_synchronized
+    def _organism_match(self, names: List[str]) -> Tuple[str, List[Any]]:
+        """(runs column, values) selecting the runs of `names`: their ids on a
+        compacted mirror, which the row-group stats can prune on, else the
+        names themselves. A name with no runs has no id and drops out."""
+        ids = self._organism_ids
+        if ids is None:
+            return "organism", names
+        return "organism_id", sorted({ids[name] for name in names if name in ids})
+
+    @_pooled
     def summary_for_organism(self, organism: str) -> Dict[str, Any]:
         """High-leverage one-call snapshot for an organism.
 
@@ -373,127 +1874,292 @@ class SRAMirrorService:
             return {"error": "SRA mirror not available"}
 
         cache_key = ("summary", _norm_organism(organism))
-        if (cached := self._cache_get(cache_key)) is not None:
-            return cached
-
-        taxid, names = self._resolve_organism(organism)
-        con = self._con
+        with self._coalesced(cache_key) as shared:
+            if shared is not None:
+                return shared
+
+            taxid, names = self._resolve_organism(organism)
+            from_rollup = self._rollup_covers(taxid)
+            if from_rollup:
+                facets = self._summarize_from_rollups(taxid)
+            else:
+                facets = self._summarize(names)
 
-        n_runs, n_projects, n_studies, earliest, latest = con.execute(
-            """
-            SELECT
-                COUNT(*),
-                COUNT(DISTINCT bioproject),
-                COUNT(DISTINCT sra_study),
-                MIN(releasedate),
-                MAX(releasedate)
-            FROM runs WHERE organism IN (SELECT UNNEST(?))
-            """,
-            [names],
-        ).fetchone()
+            result = self._summary_result(organism, taxid, names, facets, from_rollup)
+            return self._cache_put(cache_key, result)
 
-        if not n_runs:
+    def _summary_result(
+        self,
+        organism: str,
+        taxid: Optional[int],
+        names: List[str],
+        facets: Dict[str, Any],
+        from_rollup: bool,
+    ) -> Dict[str, Any]:
+        """The summary_for_organism payload for a resolved term's facets."""
+        if not facets["n_runs"]:
             # Distinguish "we don't recognize this term" (likely a typo) from
             # "real organism, just no data" -- otherwise the model relays an
             # authoritative "no data" for a misspelling.
             resolved = taxid is not None
             if resolved:
-                message = (
-                    f"'{organism}' resolved to a known organism (taxid {taxid}) "
-                    "but the SRA mirror has no runs for it."
-                )
+                hint = {
+                    "message": (
+                        f"'{organism}' resolved to a known organism (taxid "
+                        f"{taxid}) but the SRA mirror has no runs for it."
+                    )
+                }
             else:
-                message = (
-                    f"Couldn't resolve '{organism}' to a known organism -- check "
-                    "the spelling, or try the scientific name or NCBI taxid."
-                )
-            empty = {
+                hint = self._unresolved(organism)
+            return {
                 "input": organism,
                 "resolved_taxid": taxid,
                 "resolved": resolved,
                 "n_runs": 0,
-                "message": message,
-                "_meta": self._provenance(names),
+                **hint,
+                "_meta": self._provenance(names, from_rollup),
             }
-            self._cache_put(cache_key, empty)
-            return empty
 
-        platforms = con.execute(
-            """
-            SELECT platform, COUNT(*) AS n FROM runs
-            WHERE organism IN (SELECT UNNEST(?)) AND platform IS NOT NULL
-            GROUP BY platform ORDER BY n DESC LIMIT 5
-            """,
-            [names],
-        ).fetchall()
+        return {
+            "input": organism,
+            "resolved_taxid": taxid,
+            "resolved": True,
+            **facets,
+            "_meta": self._provenance(names, from_rollup),
+        }
 
-        assays = con.execute(
+    @_pooled
+    def summaries_for_organisms(self, organisms: List[str]) -> Dict[str, Any]:
+        """summary_for_organism for several organisms at once, for comparison
+        questions ("P. falciparum vs P. vivax vs P. knowlesi").
+
+        Every term is resolved up front and all the live summaries come from
+        one grouped pass over runs, instead of one aggregate per organism.
+        Each entry of `summaries` has the summary_for_organism shape, in
+        input order, with repeats of a term (after normalization) dropped.
+        Cached summaries are reused and new ones are cached, so single-
+        organism follow-ups are hits.
+        """
+        if not self._con:
+            return {"error": "SRA mirror not available"}
+
+        terms: Dict[str, str] = {}
+        for organism in organisms:
+            if organism.strip():
+                terms.setdefault(_norm_organism(organism), organism)
+        if not terms:
+            return {"error": "Give at least one organism"}
+        if len(terms) > _BATCH_MAX_ORGANISMS:
+            return {
+                "error": (
+                    f"At most {_BATCH_MAX_ORGANISMS} organisms per call; got "
+                    f"{len(terms)}. Split the comparison."
+                )
+            }
+
+        summaries: Dict[str, Dict[str, Any]] = {}
+        # Terms that need the live scan, grouped by name union so two spellings
+        # of one organism ("5833", "Plasmodium falciparum") are summed once.
+        live: Dict[Tuple[str, ...], List[Tuple[str, str, Optional[int]]]] = {}
+        for norm, organism in terms.items():
+            if (cached := self._cache_get(("summary", norm))) is not None:
+                summaries[norm] = cached
+                continue
+            taxid, names = self._resolve_organism(organism)
+            if self._rollup_covers(taxid):
+                facets = self._summarize_from_rollups(taxid)
+                result = self._summary_result(organism, taxid, names, facets, True)
+                summaries[norm] = self._cache_put(("summary", norm), result)
+            else:
+                live.setdefault(tuple(names), []).append((norm, organism, taxid))
+
+        if live:
+            groups = list(live)
+            for names, facets in zip(
+                groups, self._summarize_many([list(g) for g in groups]), strict=True
+            ):
+                for norm, organism, taxid in live[names]:
+                    result = self._summary_result(
+                        organism, taxid, list(names), facets, False
+                    )
+                    summaries[norm] = self._cache_put(("summary", norm), result)
+
+        return {
+            "n_organisms": len(terms),
+            "summaries": [summaries[norm] for norm in terms],
+        }
+
+    def _summarize(self, names: List[str]) -> Dict[str, Any]:
+        """Compute every summary facet for a name union in one pass over runs.
+
+        Separate from summary_for_organism so the resolution/caching wrapper
+        stays readable and the benchmark script can time the engine on its
+        own.
+        """
+        return self._summarize_many([names])[0]
+
+    @_pooled
+    def _summarize_many(self, groups: List[List[str]]) -> List[Dict[str, Any]]:
+        """Summary facets for each name union in `groups`, all from one
+        _SUMMARY_SQL pass; its (group, facet, key, ...) rows are folded back
+        into one summary payload per group."""
+        group_ids: List[int] = []
+        members: List[Any] = []
+        column = "organism"
+        for i, names in enumerate(groups):
+            column, values = self._organism_match(names)
+            # A name listed twice in one group would double its runs in the join.
+            for value in dict.fromkeys(values):
+                group_ids.append(i)
+                members.append(value)
+        totals: List[Tuple] = [(0, None, None, 0)] * len(groups)
+        n_keys: List[Dict[str, int]] = [{} for _ in groups]
+        top: List[Dict[str, List[Tuple]]] = [
+            {"platform": [], "assay_type": [], "country": [], "bioproject": []}
+            for _ in groups
+        ]
+        rows = self._rows(
+            _SUMMARY_SQL.format(column=column),
+            [group_ids, members, list(dict.fromkeys(members))],
+        )
+        for grp, facet, key, n, earliest, latest, n_recent, keys, keep in rows:
+            if facet == "total":
+                totals[grp] = (n or 0, earliest, latest, n_recent or 0)
+                continue
+            n_keys[grp][facet] = keys
+            if keep:
+                top[grp][facet].append((key, n, earliest, latest))
+        payloads = []
+        for (n_runs, earliest, latest, recent_count), keys, facets in zip(
+            totals, n_keys, top, strict=True
+        ):
+            payloads.append(
+                _summary_payload(
+                    (
+                        n_runs,
+                        keys.get("bioproject", 0),
+                        keys.get("sra_study", 0),
+                        earliest,
+                        latest,
+                    ),
+                    recent_count,
+                    facets,
+                )
+            )
+        return payloads
+
+    @_pooled
+    def _summarize_from_rollups(self, taxid: int) -> Dict[str, Any]:
+        """The _summarize payload for a taxid, read from the rollup tables."""
+        totals = self._row(
             """
-            SELECT assay_type, COUNT(*) AS n FROM runs
-            WHERE organism IN (SELECT UNNEST(?)) AND assay_type IS NOT NULL
-            GROUP BY assay_type ORDER BY n DESC LIMIT 10
+            SELECT n_runs, n_bioprojects, n_studies, earliest, latest
+            FROM rollup_taxid_totals WHERE taxid = ?
             """,
-            [names],
-        ).fetchall()
-
-        countries = con.execute(
+            [taxid],
+        )
+        top: Dict[str, List[Tuple]] = {
+            "platform": [],
+            "assay_type": [],
+            "country": [],
+        }
+        facet_rows = self._rows(
             """
-            SELECT geo_loc_name_country_calc AS country, COUNT(*) AS n FROM runs
-            WHERE organism IN (SELECT UNNEST(?))
-              AND geo_loc_name_country_calc IS NOT NULL
-              AND geo_loc_name_country_calc != 'uncalculated'
-            GROUP BY country ORDER BY n DESC LIMIT 10
+            SELECT facet, key, n_runs FROM rollup_taxid_facets
+            WHERE taxid = ?
+            QUALIFY ROW_NUMBER() OVER (
+                PARTITION BY facet ORDER BY n_runs DESC, key DESC
+            ) <= CASE facet WHEN 'platform' THEN 5 ELSE 10 END
+            ORDER BY facet, n_runs DESC, key DESC
             """,
-            [names],
-        ).fetchall()
-
-        top_projects = con.execute(
+            [taxid],
+        )
+        for facet, key, n in facet_rows:
+            top[facet].append((key, n, None, None))
+        top["bioproject"] = self._rows(
             """
-            SELECT bioproject, COUNT(*) AS n_runs, MIN(releasedate) AS earliest, MAX(releasedate) AS latest
-            FROM runs
-            WHERE organism IN (SELECT UNNEST(?)) AND bioproject IS NOT NULL
-            GROUP BY bioproject ORDER BY n_runs DESC, bioproject DESC LIMIT 10
+            SELECT bioproject, n_runs, earliest, latest
+            FROM rollup_taxid_bioprojects WHERE taxid = ?
+            ORDER BY n_runs DESC, bioproject DESC LIMIT 10
             """,
-            [names],
-        ).fetchall()
-
-        recent_count = con.execute(
+            [taxid],
+        )
+        (recent_count,) = self._row(
             """
-            SELECT COUNT(*) FROM runs
-            WHERE organism IN (SELECT UNNEST(?))
-              AND releasedate >= CURRENT_DATE - INTERVAL 90 DAY
+            SELECT COALESCE(SUM(n_runs), 0) FROM rollup_taxid_recent
+            WHERE taxid = ? AND releasedate >= CURRENT_DATE - INTERVAL 90 DAY
             """,
-            [names],
-        ).fetchone()[0]
+            [taxid],
+        )
+        return _summary_payload(totals, recent_count, top)
 
-        result = {
-            "input": organism,
-            "resolved_taxid": taxid,
-            "resolved": True,
-            "n_runs": n_runs,
-            "n_bioprojects": n_projects,
-            "n_studies": n_studies,
-            "earliest_release": str(earliest) if earliest else None,
-            "latest_release": str(latest) if latest else None,
-            "runs_last_90_days": recent_count,
-            "top_platforms": [{"platform": p, "n_runs": n} for p, n in platforms],
-            "top_assay_types": [{"assay_type": a, "n_runs": n} for a, n in assays],
-            "top_countries": [{"country": c, "n_runs": n} for c, n in countries],
-            "top_bioprojects": [
-                {
-                    "bioproject": bp,
-                    "n_runs": n,
-                    "earliest_release": str(e) if e else None,
-                    "latest_release": str(la) if la else None,
-                }
-                for bp, n, e, la in top_projects
-            ],
-            "_meta": self._provenance(names),
-        }
-        self._cache_put(cache_key, result)
-        return result
+    def _search_filter(
+        self,
+        organism: str,
+        assay_type: Optional[str],
+        platform: Optional[str],
+        country: Optional[str],
+        since: Optional[str],
+    ) -> Tuple[Optional[int], List[str], str, List[Any]]:
+        """(taxid, names, WHERE clause, params) for an organism search.
+
+        Raises ValueError with a user-facing message for an unparseable
+        `since`; search_runs turns that into a structured error and the
+        export endpoint into a 400.
+        """
+        taxid, names = self._resolve_organism(organism)
+        column, values = self._organism_match(names)
+        clauses = [f"{column} IN (SELECT UNNEST(?))"]
+        params: List[Any] = [values]
 
-    @_synchronized
+        if assay_type:
+            clauses.append("LOWER(assay_type) = ?")
+            params.append(_norm_filter(assay_type))
+        if platform:
+            clauses.append("LOWER(platform) = ?")
+            params.append(_norm_filter(platform))
+        if country:
+            clauses.append("LOWER(geo_loc_name_country_calc) IN (SELECT UNNEST(?))")
+            params.append(_country_candidates(country))
+        if since:
+            normalized_since = _normalize_since(since)
+            if normalized_since is None:
+                raise ValueError(
+                    f"Invalid 'since' date {since!r}. Use YYYY, YYYY-MM, "
+                    "or YYYY-MM-DD (e.g. 2024, 2024-01, or 2024-01-01)."
+                )
+            clauses.append("releasedate >= ?")
+            params.append(normalized_since)
+        return taxid, names, " AND ".join(clauses), params
+
+    def _page(
+        self, where: str, params: List[Any], limit: int, cursor: Optional[str]
+    ) -> Tuple[List[Tuple], Optional[str]]:
+        """One page of runs matching `where`, newest first, plus the cursor
+        for the next page (None on the last). Raises ValueError for a bad
+        cursor.
+
+        Fetches limit + 1 rows so "there is a next page" is known rather than
+        guessed from a full page.
+        """
+        if cursor:
+            keyset, keyset_params = _keyset_clause(cursor)
+            where = f"{where} AND {keyset}"
+            params = params + keyset_params
+        rows = self._rows(
+            f"""
+            SELECT {_RUN_SELECT}
+            FROM runs WHERE {where}
+            ORDER BY releasedate DESC, acc DESC
+            LIMIT ?
+            """,
+            params + [limit + 1],
+        )
+        if len(rows) <= limit:
+            return rows, None
+        return rows[:limit], _encode_cursor(rows[limit - 1])
+
+    @_pooled
     def search_runs(
         self,
         organism: str,
@@ -502,8 +2168,13 @@ class SRAMirrorService:
         country: Optional[str] = None,
         since: Optional[str] = None,
         limit: int = 50,
+        cursor: Optional[str] = None,
     ) -> Dict[str, Any]:
-        """Search for runs by organism + filters."""
+        """Search for runs by organism + filters.
+
+        Pages with `cursor`: pass a response's `next_cursor` back to get the
+        runs after it. Absent on the last page.
+        """
         if not self._con:
             return {"error": "SRA mirror not available"}
 
@@ -519,100 +2190,57 @@ class SRAMirrorService:
             _norm_filter(country),
             since,
             limit,
+            cursor,
         )
-        if (cached := self._cache_get(cache_key)) is not None:
-            return cached
+        with self._coalesced(cache_key) as shared:
+            if shared is not None:
+                return shared
 
-        taxid, names = self._resolve_organism(organism)
-        clauses = ["organism IN (SELECT UNNEST(?))"]
-        params: List[Any] = [names]
-
-        if assay_type:
-            clauses.append("LOWER(assay_type) = ?")
-            params.append(_norm_filter(assay_type))
-        if platform:
-            clauses.append("LOWER(platform) = ?")
-            params.append(_norm_filter(platform))
-        if country:
-            clauses.append("LOWER(geo_loc_name_country_calc) IN (SELECT UNNEST(?))")
-            params.append(_country_candidates(country))
-        if since:
-            normalized_since = _normalize_since(since)
-            if normalized_since is None:
+            try:
+                taxid, names, where, params = self._search_filter(
+                    organism, assay_type, platform, country, since
+                )
+                rows, next_cursor = self._page(where, params, limit, cursor)
+            except ValueError as exc:
                 # Still honor the provenance contract -- every response carries
                 # resolution info and _meta, even when a filter is rejected.
+                taxid, names = self._resolve_organism(organism)
                 return {
                     "input": organism,
                     "resolved_taxid": taxid,
                     "resolved": taxid is not None,
-                    "error": (
-                        f"Invalid 'since' date {since!r}. Use YYYY, YYYY-MM, "
-                        "or YYYY-MM-DD (e.g. 2024, 2024-01, or 2024-01-01)."
-                    ),
+                    "error": str(exc),
                     "_meta": self._provenance(names),
                 }
-            clauses.append("releasedate >= ?")
-            params.append(normalized_since)
-
-        where = " AND ".join(clauses)
-        rows = self._con.execute(
-            f"""
-            SELECT acc, sra_study, bioproject, organism, assay_type, platform,
-                   instrument, librarylayout, releasedate,
-                   geo_loc_name_country_calc, mbases
-            FROM runs WHERE {where}
-            ORDER BY releasedate DESC, acc DESC
-            LIMIT ?
-            """,
-            params + [limit],
-        ).fetchall()
 
-        results = [
-            {
-                "accession": r[0],
-                "study": r[1],
-                "bioproject": r[2],
-                "organism": r[3],
-                "assay_type": r[4],
-                "platform": r[5],
-                "instrument": r[6],
-                "library_layout": r[7],
-                "release_date": str(r[8]) if r[8] else None,
-                "country": r[9],
-                "mbases": r[10],
+            results = [_run_dict(r) for r in rows]
+            resolved = taxid is not None or len(results) > 0
+            result = {
+                "input": organism,
+                "resolved_taxid": taxid,
+                "resolved": resolved,
+                "filters_applied": {
+                    k: v
+                    for k, v in {
+                        "assay_type": assay_type,
+                        "platform": platform,
+                        "country": country,
+                        "since": since,
+                    }.items()
+                    if v
+                },
+                "n_returned": len(results),
+                "limit": limit,
+                "runs": results,
+                "_meta": self._provenance(names),
             }
-            for r in rows
-        ]
+            if next_cursor:
+                result["next_cursor"] = next_cursor
+            if not resolved:
+                result.update(self._unresolved(organism))
+            return self._cache_put(cache_key, result)
 
-        resolved = taxid is not None or len(results) > 0
-        result = {
-            "input": organism,
-            "resolved_taxid": taxid,
-            "resolved": resolved,
-            "filters_applied": {
-                k: v
-                for k, v in {
-                    "assay_type": assay_type,
-                    "platform": platform,
-                    "country": country,
-                    "since": since,
-                }.items()
-                if v
-            },
-            "n_returned": len(results),
-            "limit": limit,
-            "runs": results,
-            "_meta": self._provenance(names),
-        }
-        if not resolved:
-            result["message"] = (
-                f"Couldn't resolve '{organism}' to a known organism -- check "
-                "the spelling, or try the scientific name or NCBI taxid."
-            )
-        self._cache_put(cache_key, result)
-        return result
-
-    @_synchronized
+    @_pooled
     def top_bioprojects_for_organism(
         self, organism: str, limit: int = 20
     ) -> Dict[str, Any]:
@@ -624,104 +2252,486 @@ class SRAMirrorService:
         limit = max(1, min(limit, 100))
 
         cache_key = ("top_bioprojects", _norm_organism(organism), limit)
-        if (cached := self._cache_get(cache_key)) is not None:
-            return cached
+        with self._coalesced(cache_key) as shared:
+            if shared is not None:
+                return shared
+
+            taxid, names = self._resolve_organism(organism)
+            from_rollup = self._rollup_covers(taxid)
+            if from_rollup:
+                rows = self._rows(
+                    """
+                    SELECT bioproject, n_runs, n_studies, earliest, latest
+                    FROM rollup_taxid_bioprojects WHERE taxid = ?
+                    ORDER BY n_runs DESC, bioproject DESC
+                    LIMIT ?
+                    """,
+                    [taxid, limit],
+                )
+            else:
+                rows = self._top_bioprojects_scan(names, limit)
 
-        taxid, names = self._resolve_organism(organism)
-        rows = self._con.execute(
-            """
+            resolved = taxid is not None or len(rows) > 0
+            result = {
+                "input": organism,
+                "resolved_taxid": taxid,
+                "resolved": resolved,
+                "n_returned": len(rows),
+                "bioprojects": [
+                    {
+                        "bioproject": bp,
+                        "n_runs": n_runs,
+                        "n_studies": n_studies,
+                        "earliest_release": str(e) if e else None,
+                        "latest_release": str(la) if la else None,
+                    }
+                    for bp, n_runs, n_studies, e, la in rows
+                ],
+                "_meta": self._provenance(names, from_rollup),
+            }
+            if not resolved:
+                result.update(self._unresolved(organism))
+            return self._cache_put(cache_key, result)
+
+    @_pooled
+    def _top_bioprojects_scan(self, names: List[str], limit: int) -> List[Tuple]:
+        column, values = self._organism_match(names)
+        return self._rows(
+            f"""
             SELECT bioproject,
                    COUNT(*) AS n_runs,
                    COUNT(DISTINCT sra_study) AS n_studies,
                    MIN(releasedate) AS earliest,
                    MAX(releasedate) AS latest
             FROM runs
-            WHERE organism IN (SELECT UNNEST(?)) AND bioproject IS NOT NULL
+            WHERE {column} IN (SELECT UNNEST(?)) AND bioproject IS NOT NULL
             GROUP BY bioproject
             ORDER BY n_runs DESC, bioproject DESC
             LIMIT ?
             """,
-            [names, limit],
-        ).fetchall()
-
-        resolved = taxid is not None or len(rows) > 0
-        result = {
-            "input": organism,
-            "resolved_taxid": taxid,
-            "resolved": resolved,
-            "n_returned": len(rows),
-            "bioprojects": [
-                {
-                    "bioproject": bp,
-                    "n_runs": n_runs,
-                    "n_studies": n_studies,
-                    "earliest_release": str(e) if e else None,
-                    "latest_release": str(la) if la else None,
-                }
-                for bp, n_runs, n_studies, e, la in rows
-            ],
-            "_meta": self._provenance(names),
-        }
-        if not resolved:
-            result["message"] = (
-                f"Couldn't resolve '{organism}' to a known organism -- check "
-                "the spelling, or try the scientific name or NCBI taxid."
-            )
-        self._cache_put(cache_key, result)
-        return result
+            [values, limit],
+        )
 
-    @_synchronized
-    def get_study_runs(self, accession: str, limit: int = 200) -> Dict[str, Any]:
-        """Get runs by SRA study (SRP*/ERP*/DRP*) or BioProject (PRJ*) accession."""
+    @_pooled
+    def release_histogram(
+        self,
+        organism: str,
+        interval: str = "year",
+        breakdown: Optional[str] = None,
+        assay_type: Optional[str] = None,
+        platform: Optional[str] = None,
+        country: Optional[str] = None,
+        since: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Runs per release month, quarter or year for an organism, optionally
+        split by platform, assay type or country -- "how has sequencing of X
+        grown over time" in one call instead of a `since` search per period.
+
+        Periods run from the first release to the last with empty ones as
+        zeros. With a breakdown, each period's `counts` holds the top keys
+        across the whole series plus 'other'. Takes the same filters as
+        search_runs. An unfiltered, unsplit series for a taxid comes from the
+        monthly rollup when the mirror has one.
+        """
         if not self._con:
             return {"error": "SRA mirror not available"}
 
+        interval = (interval or "year").strip().lower()
+        if interval not in _HISTOGRAM_INTERVALS:
+            return {
+                "error": (
+                    f"Unknown interval {interval!r}. Use one of: "
+                    f"{', '.join(_HISTOGRAM_INTERVALS)}."
+                )
+            }
+        breakdown = breakdown.strip().lower() if breakdown else None
+        if breakdown is not None and breakdown not in _HISTOGRAM_BREAKDOWNS:
+            return {
+                "error": (
+                    f"Unknown breakdown {breakdown!r}. Use one of: "
+                    f"{', '.join(_HISTOGRAM_BREAKDOWNS)}."
+                )
+            }
+
+        cache_key = (
+            "release_histogram",
+            _norm_organism(organism),
+            interval,
+            breakdown,
+            _norm_filter(assay_type),
+            _norm_filter(platform),
+            _norm_filter(country),
+            since,
+        )
+        with self._coalesced(cache_key) as shared:
+            if shared is not None:
+                return shared
+
+            try:
+                taxid, names, where, params = self._search_filter(
+                    organism, assay_type, platform, country, since
+                )
+            except ValueError as exc:
+                taxid, names = self._resolve_organism(organism)
+                return {
+                    "input": organism,
+                    "resolved_taxid": taxid,
+                    "resolved": taxid is not None,
+                    "error": str(exc),
+                    "_meta": self._provenance(names),
+                }
+
+            from_rollup = (
+                breakdown is None
+                and not any((assay_type, platform, country, since))
+                and self._rollup_covers(taxid)
+            )
+            if from_rollup:
+                rows = self._histogram_from_rollups(taxid, interval)
+            else:
+                query = _HISTOGRAM_SQL.format(
+                    key=_HISTOGRAM_BREAKDOWNS.get(breakdown, "NULL"), where=where
+                )
+                rows = self._rows(query, [interval, *params, _HISTOGRAM_TOP_KEYS])
+
+            dated = [row for row in rows if row[0] is not None]
+            by_period: Dict[datetime.date, Dict[str, int]] = {}
+            key_totals: Dict[str, int] = collections.Counter()
+            for period, key, n in dated:
+                by_period.setdefault(period, {})[key] = n
+                key_totals[key] += n
+            buckets = []
+            if dated:
+                for start in _period_starts(dated[0][0], dated[-1][0], interval):
+                    counts = by_period.get(start, {})
+                    bucket: Dict[str, Any] = {
+                        "period": _period_label(start, interval),
+                        "start": str(start),
+                        "n_runs": sum(counts.values()),
+                    }
+                    if breakdown:
+                        bucket["counts"] = counts
+                    buckets.append(bucket)
+            n_undated = sum(n for period, _, n in rows if period is None)
+            n_runs = sum(key_totals.values()) + n_undated
+
+            resolved = taxid is not None or n_runs > 0
+            result = {
+                "input": organism,
+                "resolved_taxid": taxid,
+                "resolved": resolved,
+                "interval": interval,
+                "breakdown": breakdown,
+                "filters_applied": {
+                    k: v
+                    for k, v in {
+                        "assay_type": assay_type,
+                        "platform": platform,
+                        "country": country,
+                        "since": since,
+                    }.items()
+                    if v
+                },
+                "n_runs": n_runs,
+                "n_undated": n_undated,
+                "n_buckets": len(buckets),
+                "buckets": buckets,
+                "_meta": self._provenance(names, from_rollup),
+            }
+            if breakdown:
+                # 'other' last whatever its size; the rest by total, as ranked.
+                result["key_totals"] = [
+                    {"key": key, "n_runs": n}
+                    for key, n in sorted(
+                        key_totals.items(),
+                        key=lambda kv: (kv[0] == "other", -kv[1], kv[0]),
+                    )
+                ]
+            if not resolved:
+                result.update(self._unresolved(organism))
+            return self._cache_put(cache_key, result)
+
+    @_pooled
+    def _histogram_from_rollups(
+        self, taxid: int, interval: str
+    ) -> List[Tuple[Optional[datetime.date], str, int]]:
+        """_HISTOGRAM_SQL's unsplit rows for a taxid, from rollup_taxid_months.
+
+        Month rows re-bin to any interval. Undated runs aren't in the months
+        table; they're the difference from the taxid's total.
+        """
+        rows = self._rows(
+            """
+            SELECT CAST(date_trunc(?, month) AS DATE) AS period, 'unknown',
+                   SUM(n_runs)
+            FROM rollup_taxid_months WHERE taxid = ?
+            GROUP BY ALL
+            ORDER BY period
+            """,
+            [interval, taxid],
+        )
+        (total,) = self._row(
+            "SELECT n_runs FROM rollup_taxid_totals WHERE taxid = ?", [taxid]
+        )
+        undated = total - sum(n for _, _, n in rows)
+        if undated:
+            rows.append((None, "unknown", undated))
+        return rows
+
+    @_pooled
+    def _study_filter(self, accession: str) -> Tuple[str, str, str, List[Any]]:
+        """(normalized accession, matched column, WHERE, params) for a study
+        or BioProject accession.
+
+        On a compacted mirror the WHERE also carries the accession's run_spans
+        ranges, so the scan reads only the row groups its runs are in.
+        """
         # Accessions are conventionally upper-case; normalize so a
         # lowercase or whitespace-padded "prjna12345" still routes to the
         # bioproject column instead of silently missing on sra_study.
+        accession = accession.strip().upper()
+        column = "bioproject" if accession.startswith("PRJ") else "sra_study"
+        clauses = [f"{column} = ?"]
+        params: List[Any] = [accession]
+        if self._organism_ids is not None:
+            span = self._row(
+                """
+                SELECT organism_lo, organism_hi, released_lo, released_hi
+                FROM run_spans WHERE accession = ?
+                """,
+                [accession],
+            )
+            if span is None:
+                # Every accession with runs has a span; skip the scan.
+                clauses.append("FALSE")
+            else:
+                organism_lo, organism_hi, released_lo, released_hi = span
+                if organism_lo is not None:
+                    clauses.append("organism_id BETWEEN ? AND ?")
+                    params += [organism_lo, organism_hi]
+                if released_lo is not None:
+                    clauses.append("releasedate BETWEEN ? AND ?")
+                    params += [released_lo, released_hi]
+        return accession, column, " AND ".join(clauses), params
+
+    @_pooled
+    def get_study_runs(
+        self, accession: str, limit: int = 200, cursor: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Get runs by SRA study (SRP*/ERP*/DRP*) or BioProject (PRJ*) accession.
+
+        Pages with `cursor` like search_runs.
+        """
+        if not self._con:
+            return {"error": "SRA mirror not available"}
+
         accession = accession.strip().upper()
         limit = max(1, min(limit, 500))
 
-        cache_key = ("study_runs", accession, limit)
-        if (cached := self._cache_get(cache_key)) is not None:
-            return cached
+        cache_key = ("study_runs", accession, limit, cursor)
+        with self._coalesced(cache_key) as shared:
+            if shared is not None:
+                return shared
 
-        column = "bioproject" if accession.startswith("PRJ") else "sra_study"
-        rows = self._con.execute(
-            f"""
-            SELECT acc, sra_study, bioproject, organism, assay_type, platform,
-                   instrument, librarylayout, releasedate,
-                   geo_loc_name_country_calc, mbases
-            FROM runs
-            WHERE {column} = ?
-            ORDER BY releasedate DESC, acc DESC
-            LIMIT ?
-            """,
-            [accession, limit],
-        ).fetchall()
+            _, column, where, params = self._study_filter(accession)
+            try:
+                rows, next_cursor = self._page(where, params, limit, cursor)
+            except ValueError as exc:
+                return {
+                    "accession": accession,
+                    "error": str(exc),
+                    "_meta": self._provenance([]),
+                }
 
+            result = {
+                "accession": accession,
+                "matched_column": column,
+                "n_returned": len(rows),
+                "limit": limit,
+                "runs": [_run_dict(r) for r in rows],
+                "_meta": self._provenance([]),
+            }
+            if next_cursor:
+                result["next_cursor"] = next_cursor
+            return self._cache_put(cache_key, result)
+
+    @_pooled
+    def get_runs_by_accessions(self, accessions: List[str]) -> Dict[str, Any]:
+        """Runs for a list of SRR/ERR/DRR accessions, in one query.
+
+        `runs` follows the input order with repeats dropped; accessions the
+        mirror doesn't have, or that aren't run accessions, are listed in
+        `not_found`. Not cached: a batch is rarely asked twice, and thousands
+        of runs would crowd the summaries out of the cache.
+        """
+        if not self._con:
+            return {"error": "SRA mirror not available"}
+
+        wanted = list(dict.fromkeys(a.strip().upper() for a in accessions if a.strip()))
+        if not wanted:
+            return {"error": "Give at least one run accession"}
+        if len(wanted) > _ACCESSION_BATCH_MAX:
+            return {
+                "error": (
+                    f"At most {_ACCESSION_BATCH_MAX} accessions per call; got "
+                    f"{len(wanted)}. Split the list."
+                )
+            }
+
+        valid = [a for a in wanted if _RUN_ACCESSION.fullmatch(a)]
+        rows = []
+        if valid:
+            where, params = self._accession_filter(valid)
+            rows = self._rows(f"SELECT {_RUN_SELECT} FROM runs WHERE {where}", params)
+        by_accession = {row[_ACCESSION]: row for row in rows}
         result = {
-            "accession": accession,
-            "matched_column": column,
-            "n_returned": len(rows),
-            "limit": limit,
-            "runs": [
-                {
-                    "accession": r[0],
-                    "study": r[1],
-                    "bioproject": r[2],
-                    "organism": r[3],
-                    "assay_type": r[4],
-                    "platform": r[5],
-                    "instrument": r[6],
-                    "library_layout": r[7],
-                    "release_date": str(r[8]) if r[8] else None,
-                    "country": r[9],
-                    "mbases": r[10],
-                }
-                for r in rows
-            ],
+            "n_requested": len(wanted),
+            "n_returned": len(by_accession),
+            "runs": [_run_dict(by_accession[a]) for a in wanted if a in by_accession],
+            "not_found": [a for a in wanted if a not in by_accession],
             "_meta": self._provenance([]),
         }
-        self._cache_put(cache_key, result)
+        if any(not _RUN_ACCESSION.fullmatch(a) for a in result["not_found"]):
+            result["message"] = (
+                "Only run accessions (SRR/ERR/DRR) are looked up here; use "
+                "get_study_runs for study (SRP/ERP/DRP) or BioProject (PRJ*) "
+                "accessions."
+            )
         return result
+
+    @_pooled
+    def _accession_filter(self, accessions: List[str]) -> Tuple[str, List[Any]]:
+        """(WHERE, params) selecting the runs with these accessions.
+
+        The list goes in as one comma-joined string: DuckDB converts a Python
+        list parameter element by element, which for a few thousand strings
+        costs more than the query. On a compacted mirror a batch of nearby
+        accessions is looked up in run_accessions first; its organisms and
+        release dates then bound which row groups of `runs` are read.
+        """
+        joined = ",".join(accessions)
+        match = "acc IN (SELECT UNNEST(string_split(?, ',')))"
+        clauses = [match]
+        params: List[Any] = [joined]
+        if self._organism_ids is not None and _accession_span_is_narrow(accessions):
+            hits = self._rows(
+                f"SELECT organism_id, releasedate FROM run_accessions WHERE {match}",
+                [joined],
+            )
+            if not hits:
+                return "FALSE", []
+            organisms = {organism for organism, _ in hits}
+            if None not in organisms and len(organisms) <= _ACCESSION_NARROW_ORGANISMS:
+                clauses.append("organism_id IN (SELECT UNNEST(?))")
+                params.append(sorted(organisms))
+            dates = [released for _, released in hits]
+            if None not in dates:
+                clauses.append("releasedate BETWEEN ? AND ?")
+                params += [min(dates), max(dates)]
+        return " AND ".join(clauses), params
+
+    def export_runs(
+        self,
+        fmt: str,
+        organism: Optional[str] = None,
+        accession: Optional[str] = None,
+        assay_type: Optional[str] = None,
+        platform: Optional[str] = None,
+        country: Optional[str] = None,
+        since: Optional[str] = None,
+    ) -> Iterator[bytes]:
+        """Every run matching an organism search or a study accession, as a
+        stream of NDJSON, CSV or Parquet chunks.
+
+        Arguments are validated here, before the first chunk, so a bad filter
+        raises ValueError while the caller can still answer with a 400. Rows
+        are streamed in mirror order rather than sorted: a sort has to hold
+        the whole result, and a full SARS-CoV-2 export is millions of runs.
+
+        The stream checks out its own cursor rather than going through
+        @_pooled -- Starlette advances a sync iterator on whichever
+        threadpool thread is free, so a thread-bound checkout would leak. The
+        filter is built on that cursor's state and the rows are read from it,
+        so the export keeps the file it started on until it finishes, across
+        a reload.
+        """
+        if fmt not in _EXPORT_FORMATS:
+            formats = ", ".join(_EXPORT_FORMATS)
+            raise ValueError(f"Unknown export format {fmt!r}; use one of {formats}")
+        if (organism is None) == (accession is None):
+            raise ValueError("Give exactly one of 'organism' or 'accession'")
+        state, con = self._checkout()
+        if con is None:
+            raise ValueError("SRA mirror not available")
+        # Pin the state for the filter, as _warm does -- organism ids and
+        # run_spans bounds are per file -- and lend it the cursor, so its
+        # pooled calls don't check out from a pool a reload has retired.
+        pinned = (
+            getattr(self._local, "state", None),
+            getattr(self._local, "cur", None),
+        )
+        self._local.state, self._local.cur = state, con
+        try:
+            if organism is not None:
+                _, _, where, params = self._search_filter(
+                    organism, assay_type, platform, country, since
+                )
+            else:
+                _, _, where, params = self._study_filter(accession)
+        except BaseException:
+            state.pool.release(con)
+            raise
+        finally:
+            self._local.state, self._local.cur = pinned
+
+        query = f"SELECT {_RUN_SELECT} FROM runs WHERE {where}"
+        if fmt == "parquet":
+            chunks = self._export_parquet(con, query, params)
+        else:
+            chunks = self._export_rows(con, query, params, fmt)
+        return _ExportStream(state.pool, con, chunks)
+
+    @staticmethod
+    def _export_rows(
+        con: duckdb.DuckDBPyConnection, query: str, params: List[Any], fmt: str
+    ) -> Iterator[bytes]:
+        # DuckDB streams execute() results: fetchmany pulls the next chunk
+        # from the scan instead of materializing the whole result.
+        result = con.execute(query, params)
+        buf = io.StringIO()
+        writer = csv.writer(buf, lineterminator="\n")
+        if fmt == "csv":
+            writer.writerow(field for field, _ in _RUN_FIELDS)
+        while rows := result.fetchmany(_EXPORT_BATCH_ROWS):
+            if fmt == "csv":
+                writer.writerows(rows)
+            else:
+                for row in rows:
+                    buf.write(json.dumps(_run_dict(row)))
+                    buf.write("\n")
+            yield buf.getvalue().encode()
+            buf.seek(0)
+            buf.truncate()
+        if buf.tell():
+            yield buf.getvalue().encode()
+
+    @staticmethod
+    def _export_parquet(
+        con: duckdb.DuckDBPyConnection, query: str, params: List[Any]
+    ) -> Iterator[bytes]:
+        # Parquet's footer is written last, so the file can't be produced
+        # incrementally over the wire. DuckDB's COPY writes it row group by
+        # row group in bounded memory; the finished file is then streamed
+        # back in chunks and removed.
+        fd, path = tempfile.mkstemp(prefix="sra-export-", suffix=".parquet")
+        os.close(fd)
+        try:
+            con.execute(
+                f"COPY ({query}) TO '{path}' (FORMAT parquet, COMPRESSION zstd)",
+                params,
+            )
+            with open(path, "rb") as fh:
+                while chunk := fh.read(1 << 20):
+                    yield chunk
+        finally:
+            os.unlink(path)
@@ -3,10 +3,13 @@
 Provides search and lookup methods used by the assistant agent's tools.
 """
 
-import json
 import logging
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Set
+from typing import Any, Dict, List, Optional
+
+from app.services.catalog_store import get_catalog_store
+from app.services.lineage_index import LineageIndex
+from app.services.organism_search import OrganismSearchIndex
 
 logger = logging.getLogger(__name__)
 
@@ -36,43 +39,44 @@ class CatalogData:
         self.catalog_path = Path(catalog_path)
         self.organisms: List[Dict[str, Any]] = []
         self.workflows_by_category: List[Dict[str, Any]] = []
-        # Maps each taxonomy ID to its own ancestor lineage -- the IDs from the
-        # root down to and including itself, never its descendants -- so a
-        # workflow annotated with an ancestor taxon (e.g. Bacteria=2) matches
-        # every organism below it (e.g. E. coli=562). Built from genome lineages.
-        self._lineage_by_tax_id: Dict[str, Set[str]] = {}
+        # Answers "is this taxon an ancestor of that one?", so a workflow
+        # annotated with an ancestor taxon (e.g. Bacteria=2) matches every
+        # organism below it (e.g. E. coli=562). Built from genome lineages.
+        self._lineage = LineageIndex([])
+        self._organism_search = OrganismSearchIndex([], ())
         self._load()
 
     def _load(self) -> None:
-        self._load_organisms()
-        self._load_workflows()
+        # Records are shared with the MCP server's CatalogData; see catalog_store.
+        store = get_catalog_store(str(self.catalog_path))
+        self.organisms = store.organisms
+        self.workflows_by_category = store.workflow_categories
+        total = sum(len(cat.get("workflows", [])) for cat in self.workflows_by_category)
+        logger.info(
+            f"Loaded {len(self.organisms)} organisms and {total} workflows in "
+            f"{len(self.workflows_by_category)} categories"
+        )
         self._build_lineage_index()
+        # Names match on any substring; a taxonomy ID only whole.
+        self._organism_search = OrganismSearchIndex(
+            self.organisms,
+            ("taxonomicLevelSpecies", "commonNames", "taxonomicLevelGenus"),
+            exact_fields=("ncbiTaxonomyId",),
+        )
 
     def _build_lineage_index(self) -> None:
-        """Index each taxonomy ID to its own ancestor lineage (root..tid).
+        """Index the taxonomy tree the genomes' lineages span.
 
         Lets ancestor lookups answer "is Bacteria (2) in E. coli's (562)
         lineage?" so a workflow targeting a higher-rank taxon applies to all
-        taxa below it. lineageTaxonomyIds is root-first, so each ID maps only
-        to the prefix up to and including itself -- mapping it to the full
-        lineage would pollute ancestor keys with their descendants (key "2"
-        would contain "562"), wrongly matching a descendant-targeted workflow
-        against a higher-rank organism. When several genomes share a tax ID
-        their ancestor sets are merged.
+        taxa below it -- and only those: a descendant-targeted workflow must
+        not match a higher-rank organism.
         """
-        for org in self.organisms:
-            for genome in org.get("genomes", []):
-                lineage = genome.get("lineageTaxonomyIds") or []
-                if not lineage:
-                    continue
-                lineage_strs = [str(t) for t in lineage]
-                for i, tid in enumerate(lineage_strs):
-                    ancestors = set(lineage_strs[: i + 1])
-                    existing = self._lineage_by_tax_id.get(tid)
-                    if existing is None:
-                        self._lineage_by_tax_id[tid] = ancestors
-                    else:
-                        existing.update(ancestors)
+        self._lineage = LineageIndex(
+            genome.get("lineageTaxonomyIds") or []
+            for org in self.organisms
+            for genome in org.get("genomes", [])
+        )
 
     def _workflow_taxon_matches(
         self, workflow_tax_id: Any, target_tax_id: Optional[str]
@@ -86,63 +90,21 @@ class CatalogData:
         """
         if not target_tax_id:
             return False
-        lineage = self._lineage_by_tax_id.get(str(target_tax_id), set())
-        return str(workflow_tax_id) in lineage
-
-    def _load_organisms(self) -> None:
-        path = self.catalog_path / "organisms.json"
-        if not path.exists():
-            logger.warning(f"organisms.json not found at {path}")
-            return
-        try:
-            with open(path) as f:
-                self.organisms = json.load(f)
-            logger.info(f"Loaded {len(self.organisms)} organisms from catalog")
-        except Exception:
-            logger.exception("Failed to load organisms.json")
-
-    def _load_workflows(self) -> None:
-        path = self.catalog_path / "workflows.json"
-        if not path.exists():
-            logger.warning(f"workflows.json not found at {path}")
-            return
-        try:
-            with open(path) as f:
-                self.workflows_by_category = json.load(f)
-            total = sum(
-                len(cat.get("workflows", [])) for cat in self.workflows_by_category
-            )
-            logger.info(
-                f"Loaded {total} workflows in "
-                f"{len(self.workflows_by_category)} categories"
-            )
-        except Exception:
-            logger.exception("Failed to load workflows.json")
+        return self._lineage.is_ancestor(workflow_tax_id, target_tax_id)
 
     # ------------------------------------------------------------------
     # Organism queries
     # ------------------------------------------------------------------
 
     def search_organisms(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
-        """Search organisms by species name, common name, or taxonomy ID."""
-        q = query.lower().strip()
-        results = []
-        for org in self.organisms:
-            species = (org.get("taxonomicLevelSpecies") or "").lower()
-            commons = [(name or "").lower() for name in org.get("commonNames") or []]
-            tax_id = str(org.get("ncbiTaxonomyId") or "")
-            genus = (org.get("taxonomicLevelGenus") or "").lower()
-
-            if (
-                q in species
-                or any(q in common for common in commons)
-                or q == tax_id
-                or q in genus
-            ):
-                results.append(self._summarize_organism(org))
-                if len(results) >= limit:
-                    break
-        return results
+        """Search organisms by species name, common name, or taxonomy ID.
+
+        Exact matches rank first, then word prefixes, then other substrings.
+        """
+        return [
+            self._summarize_organism(self.organisms[i])
+            for i in self._organism_search.search(query, limit)
+        ]
 
     def get_organism_by_taxonomy_id(self, taxonomy_id: str) -> Optional[Dict[str, Any]]:
         for org in self.organisms:
@@ -16,14 +16,24 @@ tools.
 
 from __future__ import annotations
 
+import asyncio
+import copy
+import hashlib
+import json
 import logging
+import os
+import threading
 from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from enum import Enum
 from pathlib import Path
 from typing import Literal, Optional, Union
 
-from pydantic import BaseModel, Field, model_validator
+from pydantic import BaseModel, Field, field_validator, model_validator
+
+from app.services.query_guard import QueryLimits, fetch_capped, watchdog
+from app.services.query_profile import profiler
 
 logger = logging.getLogger(__name__)
 
@@ -286,6 +296,18 @@ class Filter(BaseModel):
     op: Op
     value: Optional[Union[Scalar, list[Scalar]]] = None
 
+    @field_validator("value")
+    @classmethod
+    def _strip(cls, value):
+        # Catalog values carry no surrounding whitespace, so " Anopheles " could
+        # only ever match nothing -- and stripping here keeps what runs and what
+        # the result cache keys on (canonical_query) the same.
+        if isinstance(value, str):
+            return value.strip()
+        if isinstance(value, list):
+            return [v.strip() if isinstance(v, str) else v for v in value]
+        return value
+
 
 class Sort(BaseModel):
     field: str
@@ -298,9 +320,9 @@ class CatalogQuery(BaseModel):
     entity: Literal["assembly", "organism"] = "assembly"
     filters: list[Filter] = Field(default_factory=list)
     operation: Literal["count", "list", "facets"] = "list"
-    # Each facet column is a separate GROUP BY query in execute(); cap the count
-    # so one call can't fan out into a burst of DB work. Realistic group-bys use
-    # one or two columns — 4 is comfortable headroom.
+    # Every facet column widens execute()'s grouped scan and adds a grouping
+    # set; cap the count so one call can't turn into a heavy aggregate.
+    # Realistic group-bys use one or two columns — 4 is comfortable headroom.
     facet_by: list[FacetField] = Field(default_factory=list, max_length=4)
     # Bound the page to a small, fixed size so a `list` is always a short, fully
     # rendered table — never a corpus dump or a variable-length one. The cap is the
@@ -495,8 +517,187 @@ def _compile_where(q: CatalogQuery) -> tuple[str, list]:
     return " AND ".join(frags), params
 
 
-def connect(catalog_dir: str):
-    """Load the catalog into an in-memory DuckDB connection (one table per entity).
+class CatalogSchemaDrift(Exception):
+    """A catalog table no longer matches its ENTITY_SCHEMA declaration."""
+
+    def __init__(self, entity: str, missing: list[str], mistyped: list[str]):
+        self.entity = entity
+        super().__init__(
+            f"{entity} schema has drifted from catalog_query.py — missing "
+            f"columns {missing}, mistyped {mistyped}"
+        )
+
+
+# The snapshot the build step writes next to the catalog JSON (see
+# build_snapshot), and the name it's attached under.
+SNAPSHOT_FILE = "catalog-query.duckdb"
+_SNAPSHOT_CATALOG = "snapshot"
+
+
+def _source_digest(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _check_schema(con, entity: str) -> int:
+    """Raise CatalogSchemaDrift if `entity`'s table doesn't match its declared
+    schema; otherwise return its row count.
+
+    The field allowlist and display projection are hand-maintained against the
+    catalog schema. If the schema has drifted (a configured column is gone or
+    mistyped), fail closed — disable the engine rather than serve queries that
+    would error or silently mislead. A drift is a build problem to fix, not
+    something to paper over.
+    """
+    coltypes = {
+        row[0]: str(row[1]).upper()
+        for row in con.execute(f"DESCRIBE {_qi(entity)}").fetchall()
+    }
+    missing, mistyped = _schema_issues(coltypes, entity)
+    if missing or mistyped:
+        raise CatalogSchemaDrift(entity, missing, mistyped)
+    return con.execute(f"SELECT count(*) FROM {_qi(entity)}").fetchone()[0]
+
+
+def _load_json(con, catalog: Path) -> dict[str, int]:
+    """Create one table per entity from its catalog JSON; return row counts."""
+    counts: dict[str, int] = {}
+    for entity, schema in ENTITY_SCHEMA.items():
+        # Bind the path as a parameter so DuckDB handles any special characters
+        # (no bespoke quoting needed). The table name is the entity, matching
+        # execute()'s _qi(q.entity) projection.
+        con.execute(
+            f"CREATE TABLE {_qi(entity)} AS "
+            "SELECT * FROM read_json_auto(?, "
+            f"format='array', maximum_object_size={_MAX_JSON_OBJECT_SIZE})",
+            [str(catalog / schema.source)],
+        )
+        counts[entity] = _check_schema(con, entity)
+    return counts
+
+
+def build_snapshot(catalog_dir: str, dest: Optional[str] = None) -> dict[str, int]:
+    """Write the query engine's tables to a DuckDB file; return row counts.
+
+    Build-time counterpart of connect(): loads every ENTITY_SCHEMA entity from
+    its JSON, runs the schema-drift check (raising CatalogSchemaDrift), and
+    records each source file's size and SHA-256 in `snapshot_meta` so a worker
+    can tell the snapshot was built from the JSON it sits next to. Written to a
+    temporary file and renamed into place, so a failed build leaves any previous
+    snapshot untouched. `dest` defaults to SNAPSHOT_FILE in `catalog_dir`.
+    """
+    import duckdb
+
+    catalog = Path(catalog_dir)
+    target = Path(dest) if dest else catalog / SNAPSHOT_FILE
+    tmp = target.with_name(target.name + ".tmp")
+    tmp.unlink(missing_ok=True)
+    con = duckdb.connect(str(tmp))
+    try:
+        counts = _load_json(con, catalog)
+        con.execute(
+            "CREATE TABLE snapshot_meta (entity VARCHAR, source VARCHAR, "
+            "size BIGINT, sha256 VARCHAR, n_rows BIGINT)"
+        )
+        con.executemany(
+            "INSERT INTO snapshot_meta VALUES (?, ?, ?, ?, ?)",
+            [
+                (
+                    entity,
+                    schema.source,
+                    (catalog / schema.source).stat().st_size,
+                    _source_digest(catalog / schema.source),
+                    counts[entity],
+                )
+                for entity, schema in ENTITY_SCHEMA.items()
+            ],
+        )
+        con.close()
+    except BaseException:
+        con.close()
+        tmp.unlink(missing_ok=True)
+        raise
+    os.replace(tmp, target)
+    return counts
+
+
+def _snapshot_is_current(con, catalog: Path) -> bool:
+    """True if the attached snapshot was built from the JSON in `catalog`.
+
+    Compares sizes first so a rebuilt catalog is usually caught without
+    hashing; an unchanged one costs one SHA-256 pass over the JSON, a fraction
+    of what parsing it would.
+    """
+    built = {
+        entity: (source, size, sha256)
+        for entity, source, size, sha256 in con.execute(
+            "SELECT entity, source, size, sha256 FROM snapshot_meta"
+        ).fetchall()
+    }
+    for entity, schema in ENTITY_SCHEMA.items():
+        path = catalog / schema.source
+        source, size, sha256 = built.get(entity, (None, None, None))
+        if source != schema.source or size != path.stat().st_size:
+            return False
+        if sha256 != _source_digest(path):
+            return False
+    return True
+
+
+def _open_snapshot(snapshot: Path, catalog: Path, limits: QueryLimits):
+    """The snapshot attached read-only, or None if it's stale or unusable."""
+    import duckdb
+
+    con = duckdb.connect(config=limits.duckdb_config())
+    try:
+        quoted = str(snapshot).replace("'", "''")
+        con.execute(f"ATTACH '{quoted}' AS {_SNAPSHOT_CATALOG} (READ_ONLY)")
+        con.execute(f"USE {_SNAPSHOT_CATALOG}")
+        if not _snapshot_is_current(con, catalog):
+            logger.warning(
+                "Catalog snapshot %s is older than the catalog JSON — loading "
+                "the JSON instead; re-run scripts.build_catalog_snapshot",
+                snapshot,
+            )
+            con.close()
+            return None
+        # Checked again here, not only at build time: a snapshot built by an
+        # older catalog_query.py can predate a schema change.
+        counts = {entity: _check_schema(con, entity) for entity in ENTITY_SCHEMA}
+    except CatalogSchemaDrift as exc:
+        logger.warning("Catalog snapshot %s not used: %s", snapshot, exc)
+    except duckdb.Error as exc:
+        logger.warning("Could not open catalog snapshot %s: %s", snapshot, exc)
+    else:
+        logger.info(
+            "Catalog query engine (DuckDB) opened from snapshot %s: %s",
+            snapshot,
+            ", ".join(f"{e}={n:,}" for e, n in counts.items()),
+        )
+        return con
+    con.close()
+    return None
+
+
+def connect(
+    catalog_dir: str,
+    limits: Optional[QueryLimits] = None,
+    snapshot_path: Optional[str] = None,
+):
+    """Open the catalog as a DuckDB connection (one table per entity).
+
+    Prefers the snapshot build_snapshot() wrote (`snapshot_path`, default
+    SNAPSHOT_FILE in `catalog_dir`): it's attached read-only, so boot skips
+    parsing the JSON and DuckDB reads table blocks from the file as queries
+    touch them, through the OS page cache the workers on a host share, instead
+    of every worker holding its own parsed copy. A missing, stale or drifted
+    snapshot falls back to loading the JSON into an in-memory database.
+
+    `limits`' memory limit is set on the database, so the tables count against
+    it along with the queries.
 
     Returns the connection, or None if any entity can't be loaded (the caller
     degrades to a "query engine unavailable" tool response). All entities are
@@ -504,19 +705,13 @@ def connect(catalog_dir: str):
     a build problem and fails the whole engine closed rather than serving some
     entities and not others.
 
-    Concurrency invariant: the assistant's tools are sync and run on the asyncio
-    event-loop thread, so this single connection is only ever touched by one
-    thread at a time and needs no lock. DuckDB connections are not thread-safe,
-    and per the DuckDB docs `cursor()` does NOT help — it is another handle on the
-    same connection, and cursors from one connection cannot run queries at the
-    same time. If tool execution is ever moved to a threadpool, "each thread must
-    have its own connection" — but a fresh `duckdb.connect()` here would be a new,
-    empty in-memory database without the loaded tables, so true concurrency would
-    require loading the catalog into a file-backed/shared DuckDB database, or
-    serializing access through a single-thread executor.
+    The connection is not for concurrent use: one DuckDB connection can't run
+    queries from several threads at once. Wrap it in a CatalogEngine, which
+    gives each of its query threads a connection of its own on this database.
     """
     import duckdb
 
+    limits = limits or QueryLimits()
     catalog = Path(catalog_dir)
     for entity, schema in ENTITY_SCHEMA.items():
         if not (catalog / schema.source).is_file():
@@ -527,46 +722,21 @@ def connect(catalog_dir: str):
             )
             return None
 
+    snapshot = Path(snapshot_path) if snapshot_path else catalog / SNAPSHOT_FILE
+    if snapshot.is_file():
+        con = _open_snapshot(snapshot, catalog, limits)
+        if con is not None:
+            return con
+
     # Build into a local handle and publish only on full success, so a load
     # failure can't leave a half-initialized connection in play. Distinct except
     # arms give an actionable log line instead of one flattened traceback.
     con: Optional["duckdb.DuckDBPyConnection"] = None
     try:
-        con = duckdb.connect()
-        counts: dict[str, int] = {}
-        for entity, schema in ENTITY_SCHEMA.items():
-            # Bind the path as a parameter so DuckDB handles any special characters
-            # (no bespoke quoting needed). The table name is the entity, matching
-            # execute()'s _qi(q.entity) projection.
-            con.execute(
-                f"CREATE TABLE {_qi(entity)} AS "
-                "SELECT * FROM read_json_auto(?, "
-                f"format='array', maximum_object_size={_MAX_JSON_OBJECT_SIZE})",
-                [str(catalog / schema.source)],
-            )
-            # The field allowlist and display projection are hand-maintained
-            # against the catalog schema. If the schema has drifted (a configured
-            # column is gone or mistyped), fail closed — disable the engine rather
-            # than serve queries that would error or silently mislead. A drift is a
-            # build problem to fix, not something to paper over.
-            coltypes = {
-                row[0]: str(row[1]).upper()
-                for row in con.execute(f"DESCRIBE {_qi(entity)}").fetchall()
-            }
-            missing, mistyped = _schema_issues(coltypes, entity)
-            if missing or mistyped:
-                logger.error(
-                    "Catalog query disabled: %s schema has drifted from "
-                    "catalog_query.py — missing columns %s, mistyped %s",
-                    entity,
-                    missing,
-                    mistyped,
-                )
-                con.close()
-                return None
-            counts[entity] = con.execute(
-                f"SELECT count(*) FROM {_qi(entity)}"
-            ).fetchone()[0]
+        con = duckdb.connect(config=limits.duckdb_config())
+        counts = _load_json(con, catalog)
+    except CatalogSchemaDrift as exc:
+        logger.error("Catalog query disabled: %s", exc)
     except duckdb.IOException as exc:
         logger.error("Could not read catalog at %s: %s", catalog, exc)
     except duckdb.CatalogException as exc:
@@ -586,43 +756,257 @@ def connect(catalog_dir: str):
     return None
 
 
-def execute(q: CatalogQuery, con) -> dict:
+def canonical_query(q: CatalogQuery) -> str:
+    """A key that's equal for validated queries that must return the same
+    result.
+
+    Filters are AND-composed, so they're sorted and deduplicated; list values
+    always mean a set (IN, or list membership), so they're sorted and
+    deduplicated too. Parts an operation doesn't use are dropped: a count
+    ignores facets, paging and sort, and a facets query ignores paging and
+    sort. Sort order and facet order are kept -- they shape the result.
+    """
+
+    def value(v):
+        if isinstance(v, list):
+            # Type name first: True == 1, and mixed types don't sort.
+            return sorted({(type(x).__name__, x) for x in v})
+        return v
+
+    filters = sorted(
+        {json.dumps([f.field, f.op.value, value(f.value)]) for f in q.filters}
+    )
+    key: dict = {"entity": q.entity, "operation": q.operation, "filters": filters}
+    if q.operation == "facets":
+        key["facet_by"] = list(dict.fromkeys(q.facet_by))
+    elif q.operation == "list":
+        key.update(
+            limit=q.limit,
+            offset=q.offset,
+            sort=[[s.field, s.desc] for s in q.sort],
+        )
+    return json.dumps(key, sort_keys=True)
+
+
+def catalog_build_id(catalog_dir: str) -> Optional[str]:
+    """The catalog build's id: `end_time` from data-build-meta.json, which the
+    catalog build rewrites on every run. None when there's no readable one."""
+    try:
+        meta = json.loads((Path(catalog_dir) / "data-build-meta.json").read_text())
+    except (OSError, ValueError):
+        return None
+    build_id = meta.get("end_time") if isinstance(meta, dict) else None
+    return str(build_id) if build_id else None
+
+
+class CatalogEngine:
+    """The catalog database, queried from a bounded pool of worker threads.
+
+    One DuckDB connection can't serve several threads at once, so each query
+    thread gets a connection of its own from `cursor()` on the database
+    connect() opened. Like the SRA mirror's pooled cursors, they share the
+    tables, the buffer manager and the memory limit, and DuckDB releases the
+    GIL while it executes, so queries from concurrent assistant turns run side
+    by side instead of queuing. `run()` hands a query to the pool and awaits
+    it, so the event loop keeps serving other requests meanwhile; at most
+    `max_workers` queries run at once and the rest wait their turn.
+
+    The catalog can't change under a loaded engine, so results are cached by
+    canonical_query(): a repeat of a query -- or one differing only in filter
+    order, list-value order or unused parts -- is answered without DuckDB.
+    Entries also carry `build_id`, the catalog build the tables came from, so a
+    result can only ever be served against the build that produced it. The
+    cache holds `cache_size` results (0 turns it off), evicting the oldest.
+
+    The engine owns `con` and closes it in close().
+    """
+
+    def __init__(
+        self,
+        con,
+        limits: Optional[QueryLimits] = None,
+        max_workers: int = 4,
+        build_id: Optional[str] = None,
+        cache_size: int = 1024,
+    ):
+        self._root = con
+        self.limits = limits or QueryLimits()
+        self.build_id = build_id
+        self._cache: dict[tuple, dict] = {}
+        self._cache_size = cache_size
+        self._cache_stats = {"hits": 0, "misses": 0}
+        # Per-connection setting: a snapshot is attached and selected with USE
+        # on the root connection (see _open_snapshot), and each thread's
+        # connection has to select it again.
+        self._database = con.execute("SELECT current_database()").fetchone()[0]
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="catalog-query"
+        )
+        self._local = threading.local()
+        self._connections: list = []
+        self._lock = threading.Lock()
+
+    def _connection(self):
+        con = getattr(self._local, "con", None)
+        if con is None:
+            con = self._root.cursor()
+            con.execute(f"USE {_qi(self._database)}")
+            with self._lock:
+                self._connections.append(con)
+            self._local.con = con
+        return con
+
+    def _cached(self, key: tuple) -> Optional[dict]:
+        """The cached result for `key`, counted as a hit or a miss."""
+        if not self._cache_size:
+            return None
+        with self._lock:
+            hit = self._cache.get(key)
+            self._cache_stats["hits" if hit is not None else "misses"] += 1
+        if hit is None:
+            return None
+        with profiler.call("catalog", "query_catalog"):
+            profiler.cache("hit")
+        # Callers own what they're handed; the cached copy stays untouched.
+        return copy.deepcopy(hit)
+
+    def _execute(self, q: CatalogQuery, key: tuple) -> dict:
+        with profiler.call("catalog", "query_catalog"):
+            if self._cache_size:
+                profiler.cache("miss")
+            result = execute(q, self._connection(), self.limits)
+        if self._cache_size:
+            with self._lock:
+                # Oldest-inserted first (dicts preserve insertion order).
+                while len(self._cache) >= self._cache_size:
+                    del self._cache[next(iter(self._cache))]
+                self._cache[key] = copy.deepcopy(result)
+        return result
+
+    def execute(self, q: CatalogQuery) -> dict:
+        """Answer `q` from the cache, or run it on this thread's connection
+        under the engine's limits."""
+        key = (self.build_id, canonical_query(q))
+        hit = self._cached(key)
+        return hit if hit is not None else self._execute(q, key)
+
+    async def run(self, q: CatalogQuery) -> dict:
+        """Answer `q` from the cache, or run it on one of the engine's threads
+        without blocking the loop."""
+        key = (self.build_id, canonical_query(q))
+        hit = self._cached(key)
+        if hit is not None:
+            return hit
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self._execute, q, key)
+
+    def cache_stats(self) -> dict:
+        """Result-cache counters for this engine."""
+        with self._lock:
+            hits, misses = self._cache_stats["hits"], self._cache_stats["misses"]
+            entries = len(self._cache)
+        lookups = hits + misses
+        return {
+            "build_id": self.build_id,
+            "entries": entries,
+            "capacity": self._cache_size,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / lookups, 4) if lookups else None,
+        }
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for con in connections:
+            con.close()
+        self._root.close()
+
+
+def execute(q: CatalogQuery, con, limits: Optional[QueryLimits] = None) -> dict:
     """Run a CatalogQuery against DuckDB; return the summary contract.
 
     Entity/column/sort identifiers are interpolated into SQL, not parameterized
     (SQL identifiers can't be) — the CatalogQuery allowlist validator is what
     gates that interpolation, so don't loosen it without revisiting this.
+
+    The whole call runs under `limits`: past the deadline the watchdog
+    interrupts `con`, and going over a limit raises QueryTooExpensive.
     """
+    limits = limits or QueryLimits()
+    with profiler.call("catalog", "query_catalog"), watchdog.guard(con, limits):
+        return _execute(q, con, limits.max_rows)
+
+
+def _execute(q: CatalogQuery, con, max_rows: int) -> dict:
     where, params = _compile_where(q)
     cap = q.limit
 
     entity = _qi(q.entity)
 
-    def _facets(cols: Sequence[str]) -> dict:
-        out = {}
-        for col in cols:
-            qcol = _qi(col)
-            # Cap to the top buckets by count — a high-cardinality field (e.g.
-            # a species column) would otherwise return thousands of buckets.
-            rows = con.execute(
-                f"SELECT {qcol} AS k, count(*) AS c FROM {entity} WHERE {where} "
-                # `, k` is a stable tiebreaker so equal-count buckets (and which
-                # ones fall at the LIMIT boundary) don't shuffle across runs.
-                f"GROUP BY {qcol} ORDER BY c DESC, k LIMIT {_FACET_LIMIT}",
-                params,
-            ).fetchall()
-            out[col] = {("(none)" if k is None else str(k)): c for k, c in rows}
-        return out
-
-    total = con.execute(
-        f"SELECT count(*) FROM {entity} WHERE {where}", params
-    ).fetchone()[0]
-    result: dict = {"total": total}
+    def _query(sql: str, capped: bool = True) -> tuple[list[str], list[tuple]]:
+        # (column names, rows) -- every query of the call goes through here,
+        # so the profiler sees all of them, and the row cap all but the facet
+        # query, whose size is bounded by construction. Each statement is
+        # planned afresh: the Python client can't bind parameters to a
+        # PREPAREd plan, and planning is under a tenth of an assembly query
+        # (python -m scripts.bench_catalog_query plan).
+        with profiler.query(con, sql):
+            cur = con.execute(sql, params)
+            rows = fetch_capped(cur, max_rows) if capped else cur.fetchall()
+            return [d[0] for d in cur.description], rows
+
+    def _total_and_facets(cols: Sequence[str]) -> tuple[int, dict]:
+        # The total and every facet from one scan. The scan groups by all the
+        # facet columns together -- a few hundred rows for the usual
+        # level/isRef/rank facets -- and GROUPING SETS rolls that up into the
+        # total (the () set) and one set per column. GROUPING SETS straight
+        # over the table would be simpler but is slower: DuckDB aggregates
+        # each set separately, so it's a hash table per set over every row.
+        # QUALIFY keeps each column's top buckets by count — a
+        # high-cardinality field (e.g. a species column) would otherwise
+        # return thousands of buckets. Each bucket's own column is the
+        # tiebreaker (the others are NULL within a set), so equal-count buckets
+        # (and which ones fall at the LIMIT boundary) don't shuffle across runs.
+        cols = list(dict.fromkeys(cols))
+        qcols = [_qi(c) for c in cols]
+        grouping = f"GROUPING({', '.join(qcols)})" if cols else "0"
+        sets = ", ".join(["()", *(f"({c})" for c in qcols)])
+        keys = "".join(f"{c}, " for c in qcols)
+        by_count = "".join(f", {c}" for c in qcols)
+        _, rows = _query(
+            f"WITH joint AS MATERIALIZED (SELECT {keys}count(*) AS __n "
+            f"FROM {entity} WHERE {where} GROUP BY ALL) "
+            f"SELECT {grouping} AS __g, coalesce(sum(__n), 0)::BIGINT AS __n"
+            f"{by_count} FROM joint GROUP BY GROUPING SETS ({sets}) "
+            f"QUALIFY row_number() OVER (PARTITION BY {grouping} "
+            f"ORDER BY sum(__n) DESC{by_count}) <= {_FACET_LIMIT} "
+            f"ORDER BY __g, __n DESC{by_count}",
+            # At most 1 + len(cols) * _FACET_LIMIT rows.
+            capped=False,
+        )
+        # GROUPING() sets bit (n - 1 - i) when column i is grouped out, so the
+        # set for column i has every bit but that one, and () has all of them.
+        every = (1 << len(cols)) - 1
+        bit = {every & ~(1 << (len(cols) - 1 - i)): i for i in range(len(cols))}
+        total = 0
+        out: dict = {c: {} for c in cols}
+        for g, c, *keys in rows:
+            if g == every:
+                total = c
+                continue
+            i = bit[g]
+            k = keys[i]
+            out[cols[i]][("(none)" if k is None else str(k))] = c
+        return total, out
+
     if q.operation == "count":
-        return result
+        _, [(total,)] = _query(f"SELECT count(*) FROM {entity} WHERE {where}")
+        return {"total": total}
     if q.operation == "facets":
-        result["facets"] = _facets(q.facet_by)
-        return result
+        total, facets = _total_and_facets(q.facet_by)
+        return {"total": total, "facets": facets}
 
     # Display columns are validated against the table at connect() time (the
     # engine fails closed on drift), so the projection is trusted here.
@@ -644,26 +1028,33 @@ def execute(q: CatalogQuery, con) -> dict:
         default = schema.default_order
         order = "ORDER BY " + (_order_by(default) if default else _qi(cols[0]))
     select = ", ".join(_qi(c) for c in cols)
-    cur = con.execute(
+    colnames, raw = _query(
         f"SELECT {select} FROM {entity} WHERE {where} {order} "
-        f"LIMIT {cap + 1} OFFSET {q.offset}",
-        params,
+        f"LIMIT {cap + 1} OFFSET {q.offset}"
     )
-    colnames = [d[0] for d in cur.description]
-    raw = cur.fetchall()
     rows = [dict(zip(colnames, r, strict=True)) for r in raw]
-    result["truncated"] = len(rows) > cap
-    result["rows"] = rows[:cap]
-    result["returned"] = len(result["rows"])
-    if result["truncated"]:
-        # Auto-facets are narrowing hints: only surface a breakdown that actually
-        # discriminates (>1 bucket). A single-bucket facet (e.g. isRef={No: N}
-        # when nothing is a reference) offers no choice, so drop it.
-        auto = {
-            col: buckets
-            for col, buckets in _facets(schema.auto_facets).items()
-            if len(buckets) > 1
-        }
-        if auto:
-            result["facets"] = auto
+    truncated = len(rows) > cap
+    if truncated:
+        # The page doesn't reach the end, so the total needs a scan -- the same
+        # one that computes the auto-facets.
+        total, facets = _total_and_facets(schema.auto_facets)
+    elif rows or not q.offset:
+        # The page reaches the end, so it tells the total.
+        total, facets = q.offset + len(rows), {}
+    else:
+        # Paged past the end: nothing on the page to count from.
+        _, [(total,)] = _query(f"SELECT count(*) FROM {entity} WHERE {where}")
+        facets = {}
+    result: dict = {
+        "total": total,
+        "truncated": truncated,
+        "rows": rows[:cap],
+        "returned": min(len(rows), cap),
+    }
+    # Auto-facets are narrowing hints: only surface a breakdown that actually
+    # discriminates (>1 bucket). A single-bucket facet (e.g. isRef={No: N}
+    # when nothing is a reference) offers no choice, so drop it.
+    auto = {col: buckets for col, buckets in facets.items() if len(buckets) > 1}
+    if auto:
+        result["facets"] = auto
     return result
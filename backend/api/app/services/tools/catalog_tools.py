@@ -5,10 +5,11 @@ from __future__ import annotations
 import json
 import logging
 from dataclasses import dataclass
-from typing import TYPE_CHECKING, Any, Optional
+from typing import TYPE_CHECKING, Optional
 
+from app.services.query_guard import QueryTooExpensive
 from app.services.tools.catalog_data import CatalogData
-from app.services.tools.catalog_query import CatalogQuery, execute
+from app.services.tools.catalog_query import CatalogEngine, CatalogQuery
 
 if TYPE_CHECKING:
     from app.services.sra_mirror import SRAMirrorService
@@ -20,7 +21,8 @@ logger = logging.getLogger(__name__)
 class AssistantDeps:
     catalog: CatalogData
     sra_mirror: Optional["SRAMirrorService"] = None
-    con: Any = None  # in-process DuckDB connection for query_catalog (optional)
+    # In-process DuckDB engine for query_catalog (optional).
+    query_engine: Optional[CatalogEngine] = None
 
 
 def search_organisms(deps: AssistantDeps, query: str) -> str:
@@ -106,7 +108,7 @@ def check_compatibility(deps: AssistantDeps, iwc_id: str, accession: str) -> str
     return json.dumps(result, indent=2)
 
 
-def query_catalog(deps: AssistantDeps, query: CatalogQuery) -> str:
+async def query_catalog(deps: AssistantDeps, query: CatalogQuery) -> str:
     """Count, filter, list, or facet (group-by) ASSEMBLIES or ORGANISMS with a query.
 
     Prefer this over enumerating rows yourself: it runs the filter/count in the
@@ -116,7 +118,8 @@ def query_catalog(deps: AssistantDeps, query: CatalogQuery) -> str:
     assume it's present); `facets` adds `facets`. Use it for "how many",
     attribute filters, clade queries, and "by/per X" breakdowns. On a failure or
     when the engine is unavailable it returns a short plain-text message instead
-    of JSON.
+    of JSON; a query over its time or size limit returns JSON with `error` and
+    `too_expensive` -- narrow it rather than retrying as is.
 
     Pick `entity` by what a result row should be: "assembly" for genome
     assemblies (accession, level, isRef, strain), "organism" for distinct
@@ -138,10 +141,13 @@ def query_catalog(deps: AssistantDeps, query: CatalogQuery) -> str:
     Args:
         query: the structured catalog query
     """
-    if deps.con is None:
+    if deps.query_engine is None:
         return "Catalog query engine is not available."
     try:
-        result = execute(query, deps.con)
+        result = await deps.query_engine.run(query)
+    except QueryTooExpensive as exc:
+        logger.warning("query_catalog refused: %s", exc)
+        return json.dumps(exc.result(), indent=2)
     except Exception:  # noqa: BLE001
         # Log the detail; return a controlled message rather than echoing raw
         # exception text (which can carry SQL fragments) to the model/user.
@@ -9,9 +9,18 @@ from __future__ import annotations
 
 import json
 
+from app.services.sra_mirror import FrozenResult
 from app.services.tools.catalog_tools import AssistantDeps
 
 
+def _dump(result: dict) -> str:
+    """Tool output for a service result. Cached results carry their JSON
+    encoding (see FrozenResult.to_json), so a cache hit costs no encode."""
+    if isinstance(result, FrozenResult):
+        return result.to_json()
+    return json.dumps(result, indent=2, default=str)
+
+
 def _mirror_unavailable() -> str:
     """Structured error for the unavailable-mirror path.
 
@@ -41,7 +50,67 @@ def sra_summary_for_organism(deps: AssistantDeps, organism: str) -> str:
     if not deps.sra_mirror or not deps.sra_mirror.is_available():
         return _mirror_unavailable()
     result = deps.sra_mirror.summary_for_organism(organism)
-    return json.dumps(result, indent=2, default=str)
+    return _dump(result)
+
+
+def sra_summaries_for_organisms(deps: AssistantDeps, organisms: list[str]) -> str:
+    """Get the sra_summary_for_organism snapshot for several organisms at once.
+
+    Use for comparison questions ("compare SRA coverage for P. falciparum,
+    P. vivax and P. knowlesi") instead of one sra_summary_for_organism call
+    per organism -- it's one call and one pass over the mirror. Returns
+    `summaries` in the order given, one per distinct organism, each shaped
+    exactly like sra_summary_for_organism's result.
+
+    Args:
+        organisms: organism scientific names or NCBI taxonomy IDs (at most 20).
+    """
+    if not deps.sra_mirror or not deps.sra_mirror.is_available():
+        return _mirror_unavailable()
+    result = deps.sra_mirror.summaries_for_organisms(organisms)
+    return _dump(result)
+
+
+def sra_release_histogram(
+    deps: AssistantDeps,
+    organism: str,
+    interval: str = "year",
+    breakdown: str | None = None,
+    assay_type: str | None = None,
+    platform: str | None = None,
+    country: str | None = None,
+    since: str | None = None,
+) -> str:
+    """Count an organism's SRA runs per release month, quarter or year.
+
+    Use for trend questions ("how has sequencing of X grown over time?",
+    "when did nanopore data for X take off?") instead of several
+    search_sra_runs calls with `since`. Returns `buckets` from the first
+    release to the last, empty periods included as zeros; runs with no
+    release date are counted in `n_undated`.
+
+    Args:
+        organism: organism scientific name or NCBI taxonomy ID
+        interval: "month", "quarter" or "year" (default "year")
+        breakdown: optional "platform", "assay_type" or "country" -- adds a
+            per-period `counts` split over the top keys, the rest as "other"
+        assay_type: optional filter, as in search_sra_runs
+        platform: optional filter, as in search_sra_runs
+        country: optional filter, as in search_sra_runs
+        since: optional ISO date floor, e.g. "2020" or "2020-01-01"
+    """
+    if not deps.sra_mirror or not deps.sra_mirror.is_available():
+        return _mirror_unavailable()
+    result = deps.sra_mirror.release_histogram(
+        organism,
+        interval=interval,
+        breakdown=breakdown,
+        assay_type=assay_type,
+        platform=platform,
+        country=country,
+        since=since,
+    )
+    return _dump(result)
 
 
 def search_sra_runs(
@@ -52,6 +121,7 @@ def search_sra_runs(
     country: str | None = None,
     since: str | None = None,
     limit: int = 50,
+    cursor: str | None = None,
 ) -> str:
     """Search the SRA mirror for individual runs matching organism + filters.
 
@@ -68,6 +138,8 @@ def search_sra_runs(
             synonyms accepted (e.g. "UK", "USA"); e.g. "Kenya"
         since: optional ISO date filter, e.g. "2024-01-01" (release date >=)
         limit: max number of runs to return (default 50, max 200)
+        cursor: optional `next_cursor` from a previous response, to fetch
+            the runs after that page
     """
     if not deps.sra_mirror or not deps.sra_mirror.is_available():
         return _mirror_unavailable()
@@ -79,8 +151,9 @@ def search_sra_runs(
         country=country,
         since=since,
         limit=limit,
+        cursor=cursor,
     )
-    return json.dumps(result, indent=2, default=str)
+    return _dump(result)
 
 
 def top_bioprojects_for_organism(
@@ -100,22 +173,41 @@ def top_bioprojects_for_organism(
         return _mirror_unavailable()
     limit = max(1, min(limit, 100))
     result = deps.sra_mirror.top_bioprojects_for_organism(organism, limit=limit)
-    return json.dumps(result, indent=2, default=str)
+    return _dump(result)
 
 
-def get_sra_study_runs(deps: AssistantDeps, accession: str, limit: int = 200) -> str:
+def get_sra_study_runs(
+    deps: AssistantDeps, accession: str, limit: int = 200, cursor: str | None = None
+) -> str:
     """Get the runs belonging to a specific SRA study or BioProject.
 
     Accepts either an SRA study accession (SRP*/ERP*/DRP*) or a BioProject
     accession (PRJEB*/PRJNA*/PRJDB*). Returns up to `limit` runs with full
-    metadata.
+    metadata, and a `next_cursor` when more remain.
 
     Args:
         accession: SRA study or BioProject accession
         limit: max runs to return (default 200, max 500)
+        cursor: optional `next_cursor` from a previous response, to fetch
+            the runs after that page
     """
     if not deps.sra_mirror or not deps.sra_mirror.is_available():
         return _mirror_unavailable()
     limit = max(1, min(limit, 500))
-    result = deps.sra_mirror.get_study_runs(accession, limit=limit)
-    return json.dumps(result, indent=2, default=str)
+    result = deps.sra_mirror.get_study_runs(accession, limit=limit, cursor=cursor)
+    return _dump(result)
+
+
+def get_sra_runs(deps: AssistantDeps, accessions: list[str]) -> str:
+    """Look up specific SRA runs by run accession, in one call.
+
+    Use when the user gives a list of SRR*/ERR*/DRR* accessions. Returns the
+    runs with full metadata in input order, and lists accessions the mirror
+    doesn't have under `not_found`.
+
+    Args:
+        accessions: run accessions, up to 5000
+    """
+    if not deps.sra_mirror or not deps.sra_mirror.is_available():
+        return _mirror_unavailable()
+    return _dump(deps.sra_mirror.get_runs_by_accessions(accessions))
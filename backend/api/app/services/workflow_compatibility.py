@@ -0,0 +1,126 @@
+"""Workflow compatibility, precomputed as bitsets.
+
+A workflow suits an assembly when its ploidy is ANY (or unset) or one of the
+assembly's, and its taxon (if it has one) is in the assembly's lineage. The MCP
+server's CatalogData used to re-check that for every workflow on every call.
+CompatibilityMatrix checks it once, at load time: each workflow is a column,
+and each set of workflows an int with the columns' bits set --
+
+  - per ploidy, the workflows that accept it;
+  - per taxon in the catalog's taxonomy tree, the workflows whose taxon is it or
+    an ancestor of it, found by walking each targeted taxon's subtree;
+  - per assembly, the workflows compatible with it, and per organism (taxonomy
+    ID or species taxonomy ID of its assemblies) those compatible with at least
+    one of its assemblies.
+
+A query is then a dict lookup or two and an AND. Only the pairs are computed
+here; workflow-assembly-mappings.json from the catalog build holds per-workflow
+counts, under the build's stricter rule (ASSEMBLY_ID workflows also need a
+Galaxy data cache URL), so it can't stand in for them.
+"""
+
+import collections
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence
+
+from app.services.lineage_index import LineageIndex
+
+
+def _bits(columns: int) -> Iterator[int]:
+    """The set bits of `columns`, lowest first."""
+    while columns:
+        low = columns & -columns
+        yield low.bit_length() - 1
+        columns ^= low
+
+
+def _ploidies(asm: Mapping[str, Any]) -> List[str]:
+    ploidies = asm.get("ploidy", [])
+    return [ploidies] if isinstance(ploidies, str) else list(ploidies or [])
+
+
+class CompatibilityMatrix:
+    """Compatible (workflow, assembly) and (workflow, organism) pairs over
+    `workflows`, in the order given."""
+
+    def __init__(
+        self,
+        workflows: Sequence[Mapping[str, Any]],
+        assemblies: Iterable[Mapping[str, Any]],
+        lineage: LineageIndex,
+    ):
+        self.workflows = list(workflows)
+        self._column: Dict[str, int] = {}
+        self._any_ploidy = 0
+        by_ploidy: Dict[str, int] = collections.defaultdict(int)
+        self._untargeted = 0
+        targeting: Dict[str, int] = collections.defaultdict(int)
+        for i, wf in enumerate(self.workflows):
+            bit = 1 << i
+            # Later duplicates win, like the catalog's by-IWC-id index.
+            self._column[wf.get("iwcId")] = i
+            ploidy = wf.get("ploidy")
+            if ploidy is None or ploidy == "ANY":
+                self._any_ploidy |= bit
+            else:
+                by_ploidy[ploidy] |= bit
+            tax = wf.get("taxonomyId")
+            if tax is None:
+                self._untargeted |= bit
+            else:
+                targeting[str(tax)] |= bit
+        self._by_ploidy = dict(by_ploidy)
+
+        self._by_taxon: Dict[str, int] = {}
+        for tax, columns in targeting.items():
+            for tid in lineage.subtree(tax):
+                self._by_taxon[tid] = (
+                    self._by_taxon.get(tid, self._untargeted) | columns
+                )
+
+        self._by_assembly: Dict[str, int] = {}
+        by_organism: Dict[str, int] = collections.defaultdict(int)
+        for asm in assemblies:
+            accession = asm.get("accession")
+            if not accession:
+                continue
+            # The assembly's own lineage, as check_workflow_assembly_compatibility
+            # reads it.
+            taxon = self._untargeted
+            for tid in asm.get("lineageTaxonomyIds") or []:
+                taxon |= targeting.get(str(tid), 0)
+            columns = self.for_ploidies(_ploidies(asm)) & taxon
+            self._by_assembly[accession] = columns
+            for key in ("ncbiTaxonomyId", "speciesTaxonomyId"):
+                tid = str(asm.get(key, ""))
+                if tid:
+                    by_organism[tid] |= columns
+        self._by_organism = dict(by_organism)
+
+    def for_ploidies(self, ploidies: Iterable[str]) -> int:
+        """Workflows accepting any of `ploidies`."""
+        columns = self._any_ploidy
+        for ploidy in ploidies:
+            columns |= self._by_ploidy.get(ploidy, 0)
+        return columns
+
+    def for_taxon(self, taxonomy_id: Any) -> int:
+        """Workflows with no taxon, or one that is `taxonomy_id` or above it."""
+        return self._by_taxon.get(str(taxonomy_id), self._untargeted)
+
+    def for_assembly(self, accession: str) -> Optional[int]:
+        """Workflows compatible with the assembly; None if it isn't known."""
+        return self._by_assembly.get(accession)
+
+    def for_organism(self, taxonomy_id: Any) -> Optional[int]:
+        """Workflows compatible with at least one of the organism's assemblies;
+        None if it has none."""
+        return self._by_organism.get(str(taxonomy_id))
+
+    def compatible(self, iwc_id: str, accession: str) -> bool:
+        column = self._column.get(iwc_id)
+        columns = self._by_assembly.get(accession, 0)
+        return column is not None and bool(columns >> column & 1)
+
+    def select(self, columns: int) -> List[Mapping[str, Any]]:
+        """The workflows in `columns`, in order."""
+        return [self.workflows[i] for i in _bits(columns)]
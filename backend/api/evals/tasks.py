@@ -218,7 +218,9 @@ def make_assistant_turn_task(deps: EvalDeps, entry: ModelEntry) -> Callable:
 
     async def task(case_input: dict) -> AgentTurnOutput:
         agent_deps = AssistantDeps(
-            catalog=aa.catalog, sra_mirror=deps.sra_mirror, con=aa.query_con
+            catalog=aa.catalog,
+            sra_mirror=deps.sra_mirror,
+            query_engine=aa.query_engine,
         )
         result = await aa._run_agent_with_retry(
             case_input["message"], deps=agent_deps, message_history=None
@@ -333,7 +335,9 @@ def make_structured_channel_task(deps: EvalDeps, entry: ModelEntry) -> Callable:
         replies: list[str] = []
         for i, turn in enumerate(case_input["turns"]):
             agent_deps = AssistantDeps(
-                catalog=aa.catalog, sra_mirror=deps.sra_mirror, con=aa.query_con
+                catalog=aa.catalog,
+                sra_mirror=deps.sra_mirror,
+                query_engine=aa.query_engine,
             )
             augmented = aa._wrap_user_message(schema, turn["text"])
             # Mirror production: truncate restored history before the run so a long
@@ -0,0 +1,174 @@
+#!/usr/bin/env python
+"""Worker memory benchmark for the two CatalogData loaders.
+
+Builds assemblies.json and organisms.json from the catalog build's genome TSV
+(catalog/build/intermediate/genomes-from-ncbi.tsv) in the shape the catalog
+build writes them -- organisms carry their genomes -- optionally repeated
+--scale times, then, in a fresh interpreter per size, loads the catalog the way
+a worker does (the MCP server's CatalogData, then the assistant's) and reports
+RSS after each step.
+
+    python -m scripts.bench_catalog_memory
+    python -m scripts.bench_catalog_memory --scale 1 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import resource
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+DEFAULT_TSV = (
+    Path(__file__).resolve().parents[3]
+    / "catalog/build/intermediate/genomes-from-ncbi.tsv"
+)
+TAXONOMY_LEVELS = (
+    "Domain Realm Kingdom Phylum Class Order Family Genus Species Strain "
+    "Serotype Isolate"
+).split()
+
+
+def _number(value: str) -> Any:
+    try:
+        return float(value) if "." in value else int(value)
+    except ValueError:
+        return None
+
+
+def _genome(row: Dict[str, str], copy: int) -> Dict[str, Any]:
+    accession = row["accession"]
+    if copy:
+        accession = f"{accession[:4]}{copy:03d}{accession[7:]}"
+    genome = {
+        "accession": accession,
+        "annotationStatus": row["annotationStatus"] or None,
+        "chromosomes": _number(row["chromosomeCount"]),
+        "commonNames": json.loads(row["commonNames"] or "[]"),
+        "coverage": row["coverage"] or None,
+        "galaxyDatacacheUrl": row["galaxyDatacacheUrl"] or None,
+        "gcPercent": _number(row["gcPercent"]),
+        "geneModelUrl": row["geneModelUrl"] or None,
+        "isRef": "Yes" if row["isRef"] == "True" else "No",
+        "length": _number(row["length"]),
+        "level": row["level"],
+        "lineageTaxonomyIds": row["lineageTaxonomyIds"].split(","),
+        "ncbiTaxonomyId": row["taxonomyId"],
+        "otherTaxa": row["otherTaxa"].split(",") if row["otherTaxa"] else None,
+        "ploidy": ["HAPLOID"],
+        "priority": None,
+        "priorityPathogenName": None,
+        "releaseDate": row["releaseDate"],
+        "scaffoldCount": _number(row["scaffoldCount"]),
+        "scaffoldL50": _number(row["scaffoldL50"]),
+        "scaffoldN50": _number(row["scaffoldN50"]),
+        "speciesTaxonomyId": row["speciesTaxonomyId"],
+        "strainName": row["strain"] or None,
+        "taxonomicGroup": row["taxonomicGroup"].split(","),
+        "ucscBrowserUrl": row["ucscBrowser"] or None,
+    }
+    for level in TAXONOMY_LEVELS:
+        genome[f"taxonomicLevel{level}"] = row[f"taxonomicLevel{level}"] or "None"
+    return genome
+
+
+def build_catalog(tsv: Path, path: Path, scale: int) -> None:
+    with open(tsv, newline="") as f:
+        rows = list(csv.DictReader(f, delimiter="\t"))
+    genomes = [_genome(row, copy) for copy in range(scale) for row in rows]
+    organisms: Dict[str, Dict[str, Any]] = {}
+    for g in genomes:
+        org = organisms.setdefault(
+            g["speciesTaxonomyId"],
+            {
+                "assemblyCount": 0,
+                "assemblyTaxonomyIds": [],
+                "commonNames": [],
+                "genomes": [],
+                "ncbiTaxonomyId": g["speciesTaxonomyId"],
+                **{
+                    k: g[k]
+                    for k in g
+                    if k.startswith("taxonomicLevel") or k == "taxonomicGroup"
+                },
+            },
+        )
+        org["assemblyCount"] += 1
+        org["assemblyTaxonomyIds"].append(g["ncbiTaxonomyId"])
+        org["commonNames"].extend(g["commonNames"])
+        org["genomes"].append(g)
+    (path / "assemblies.json").write_text(json.dumps(genomes))
+    (path / "organisms.json").write_text(json.dumps(list(organisms.values())))
+    (path / "workflows.json").write_text("[]")
+
+
+def _rss_mb() -> float:
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * resource.getpagesize() / 2**20
+    except OSError:
+        # Peak, not current, where /proc isn't available.
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def measure(catalog: str) -> List[Tuple[str, float]]:
+    """Load `catalog` as a worker does, in this interpreter."""
+    from app.services.catalog_data import CatalogData as MCPCatalogData
+    from app.services.tools.catalog_data import CatalogData as AssistantCatalogData
+
+    steps = [("imports", _rss_mb())]
+    keep = []
+    for name, cls in (("mcp", MCPCatalogData), ("+ assistant", AssistantCatalogData)):
+        keep.append(cls(catalog))
+        steps.append((name, _rss_mb()))
+    return steps
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tsv", type=Path, default=DEFAULT_TSV)
+    parser.add_argument(
+        "--scale",
+        type=int,
+        nargs="+",
+        default=[1, 10],
+        help="copies of the genome TSV to load (default: %(default)s)",
+    )
+    parser.add_argument("--measure", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        print(json.dumps(measure(args.measure)))
+        return 0
+
+    for scale in args.scale:
+        with tempfile.TemporaryDirectory() as tmp:
+            build_catalog(args.tsv, Path(tmp), scale)
+            size_mb = sum(p.stat().st_size for p in Path(tmp).iterdir()) / 2**20
+            out = subprocess.run(
+                [
+                    sys.executable,
+                    "-m",
+                    "scripts.bench_catalog_memory",
+                    "--measure",
+                    tmp,
+                ],
+                check=True,
+                capture_output=True,
+                text=True,
+            ).stdout
+        print(f"\n{scale}x genome TSV -- {size_mb:,.0f} MB of JSON")
+        print(f"{'after':<12} {'RSS MB':>8}")
+        for step, rss in json.loads(out.splitlines()[-1]):
+            print(f"{step:<12} {rss:>8,.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,396 @@
+#!/usr/bin/env python
+"""Benchmarks for the catalog query engine against a synthetic catalog.
+
+The catalog JSON is produced by the site build and isn't checked in, so this
+generates assemblies.json and organisms.json with every column ENTITY_SCHEMA
+declares, skewed the way the real catalog is -- a few large genera, most
+assemblies at scaffold or contig level, few references -- and replays the
+query shapes of the catalog_query eval dataset against it.
+
+    python -m scripts.bench_catalog_query facets --assemblies 200000
+
+The catalog is cached under --catalog and regenerated only when --assemblies
+changes.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+from app.services.query_profile import profiler
+from app.services.tools.catalog_query import (
+    _FACET_LIMIT,
+    ENTITY_SCHEMA,
+    CatalogEngine,
+    CatalogQuery,
+    Filter,
+    Op,
+    _compile_where,
+    _order_by,
+    _qi,
+    connect,
+    execute,
+)
+
+logger = logging.getLogger("bench_catalog_query")
+
+# (genus, species, kingdom) -- the eval cases' taxa plus filler.
+TAXA = [
+    ("Anopheles", "Anopheles gambiae", "Metazoa"),
+    ("Anopheles", "Anopheles stephensi", "Metazoa"),
+    ("Plasmodium", "Plasmodium vivax", "Alveolata"),
+    ("Plasmodium", "Plasmodium falciparum", "Alveolata"),
+    ("Candida", "Candida albicans", "Fungi"),
+    ("Cryptococcus", "Cryptococcus neoformans", "Fungi"),
+    ("Mycobacterium", "Mycobacterium tuberculosis", "Bacteria"),
+] + [
+    (f"Genus{g}", f"Genus{g} species{s}", "Fungi") for g in range(40) for s in range(5)
+]
+LEVELS = ["Contig"] * 4 + ["Scaffold"] * 4 + ["Chromosome", "Complete Genome"]
+SPECIES_TAXID = {"Mycobacterium tuberculosis": 1773}
+
+
+def _value(entity: str, column: str, i: int, rng: random.Random) -> Any:
+    schema = ENTITY_SCHEMA[entity]
+    if column in schema.numeric_fields:
+        return rng.randint(1, 10**9)
+    if column in schema.list_fields:
+        return [f"{column}-{rng.randint(0, 50)}"]
+    return f"{column}-{rng.randint(0, 200)}"
+
+
+def build_synthetic_catalog(path: Path, assemblies: int) -> None:
+    rng = random.Random(0)
+    # Zipf-ish: a handful of species hold most assemblies.
+    weights = [1 / (rank + 1) for rank in range(len(TAXA))]
+    records = []
+    for i in range(assemblies):
+        genus, species, kingdom = rng.choices(TAXA, weights)[0]
+        r = {
+            c: _value("assembly", c, i, rng)
+            for c in ENTITY_SCHEMA["assembly"].configured_columns
+        }
+        r.update(
+            accession=f"GCA_{i:09d}.1",
+            taxonomicLevelGenus=genus,
+            taxonomicLevelSpecies=species,
+            taxonomicLevelKingdom=kingdom,
+            speciesTaxonomyId=str(
+                SPECIES_TAXID.get(
+                    species, 10_000 + TAXA.index((genus, species, kingdom))
+                )
+            ),
+            level=rng.choice(LEVELS),
+            isRef="Yes" if rng.random() < 0.02 else "No",
+        )
+        records.append(r)
+    (path / "assemblies.json").write_text(json.dumps(records))
+    organisms = []
+    for n, (genus, species, kingdom) in enumerate(TAXA):
+        r = {
+            c: _value("organism", c, n, rng)
+            for c in ENTITY_SCHEMA["organism"].configured_columns
+        }
+        r.update(
+            ncbiTaxonomyId=str(SPECIES_TAXID.get(species, 10_000 + n)),
+            taxonomicLevelGenus=genus,
+            taxonomicLevelSpecies=species,
+            taxonomicLevelKingdom=kingdom,
+        )
+        organisms.append(r)
+    (path / "organisms.json").write_text(json.dumps(organisms))
+    (path / "synthetic.json").write_text(json.dumps({"assemblies": assemblies}))
+
+
+def open_catalog(path: Path, assemblies: int):
+    """Connect to the synthetic catalog at `path`, (re)generating it if it's
+    missing or was generated with a different size."""
+    path.mkdir(parents=True, exist_ok=True)
+    marker = path / "synthetic.json"
+    current = json.loads(marker.read_text())["assemblies"] if marker.is_file() else None
+    if current != assemblies:
+        logger.info("Building synthetic catalog with %s assemblies", f"{assemblies:,}")
+        build_synthetic_catalog(path, assemblies)
+    return connect(str(path), snapshot_path=str(path / "no-snapshot"))
+
+
+def eval_queries() -> List[Tuple[str, CatalogQuery]]:
+    """The catalog_query eval cases as the CatalogQuery each expects."""
+    from evals.datasets.catalog_query import _CASES
+
+    out = []
+    for case in _CASES:
+        entity = case["entity"]
+        filters = [
+            Filter(
+                field=spec.get(
+                    "field",
+                    "speciesTaxonomyId" if entity == "assembly" else "ncbiTaxonomyId",
+                ),
+                op=Op.eq,
+                value=spec["value"],
+            )
+            for spec in case.get("must_filter", [])
+        ]
+        operation = case["operation"] or "list"
+        facet_by = case.get("must_facet") or (
+            ["taxonomicLevelPhylum"] if operation == "facets" else []
+        )
+        out.append(
+            (
+                case["name"],
+                CatalogQuery(
+                    entity=entity,
+                    operation=operation,
+                    filters=filters,
+                    facet_by=facet_by,
+                ),
+            )
+        )
+    return out
+
+
+def time_call(fn: Callable[[], Any], repeat: int) -> Dict[str, float]:
+    """Median and min wall time of `fn` in ms, after one warm-up call."""
+    fn()
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return {"median_ms": statistics.median(samples), "min_ms": min(samples)}
+
+
+def queries_run(fn: Callable[[], Any]) -> int:
+    profiler.configure(enabled=True, capacity=1)
+    profiler.clear()
+    try:
+        with profiler.call("catalog", "bench"):
+            fn()
+        [record] = profiler.records()
+    finally:
+        profiler.configure(enabled=False, capacity=256)
+        profiler.clear()
+    return len(record["queries"])
+
+
+# -- facets ----------------------------------------------------------------
+
+
+def per_column_execute(q: CatalogQuery, con) -> dict:
+    """The executor before facets shared a scan: a count(*), then the page,
+    then one GROUP BY per facet column."""
+    where, params = _compile_where(q)
+    entity = _qi(q.entity)
+
+    def run(sql: str) -> List[tuple]:
+        with profiler.query(con, sql):
+            return con.execute(sql, params).fetchall()
+
+    def facets(cols) -> dict:
+        return {
+            col: dict(
+                run(
+                    f"SELECT {_qi(col)} AS k, count(*) AS c FROM {entity} "
+                    f"WHERE {where} GROUP BY {_qi(col)} "
+                    f"ORDER BY c DESC, k LIMIT {_FACET_LIMIT}"
+                )
+            )
+            for col in cols
+        }
+
+    [(total,)] = run(f"SELECT count(*) FROM {entity} WHERE {where}")
+    if q.operation == "count":
+        return {"total": total}
+    if q.operation == "facets":
+        return {"total": total, "facets": facets(q.facet_by)}
+    # The page query is unchanged; the eval cases don't sort.
+    schema = ENTITY_SCHEMA[q.entity]
+    select = ", ".join(_qi(c) for c in schema.display)
+    rows = run(
+        f"SELECT {select} FROM {entity} WHERE {where} "
+        f"ORDER BY {_order_by(schema.default_order)} "
+        f"LIMIT {q.limit + 1} OFFSET {q.offset}"
+    )
+    result = {"total": total, "rows": rows[: q.limit]}
+    if len(rows) > q.limit:
+        result["facets"] = facets(schema.auto_facets)
+    return result
+
+
+def bench_facets(con, repeat: int) -> None:
+    print(
+        f"{'case':<38} {'op':<7} {'queries':>9} {'per-column ms':>14} {'shared ms':>10}"
+    )
+    totals = [0, 0, 0.0, 0.0]
+    for name, q in eval_queries():
+        before = queries_run(lambda q=q: per_column_execute(q, con))
+        after = queries_run(lambda q=q: execute(q, con))
+        old = time_call(lambda q=q: per_column_execute(q, con), repeat)["median_ms"]
+        new = time_call(lambda q=q: execute(q, con), repeat)["median_ms"]
+        totals = [
+            totals[0] + before,
+            totals[1] + after,
+            totals[2] + old,
+            totals[3] + new,
+        ]
+        print(
+            f"{name:<38} {q.operation:<7} {before:>4} -> {after:<2} "
+            f"{old:>14.2f} {new:>10.2f}"
+        )
+    print(
+        f"{'total':<38} {'':<7} {totals[0]:>4} -> {totals[1]:<2} "
+        f"{totals[2]:>14.2f} {totals[3]:>10.2f}"
+    )
+
+
+# -- plan ------------------------------------------------------------------
+
+# DuckDB's own split of a query's latency; planning is binding, the optimizer
+# passes and physical planning.
+_PLAN_METRICS = {
+    "LATENCY": "true",
+    "PLANNER": "true",
+    "ALL_OPTIMIZERS": "true",
+    "PHYSICAL_PLANNER": "true",
+}
+
+
+def statements(q: CatalogQuery, con) -> List[str]:
+    """The SQL `execute` runs for `q`, as the profiler records it."""
+    profiler.configure(enabled=True, capacity=1)
+    profiler.clear()
+    try:
+        execute(q, con)
+        [record] = profiler.records()
+    finally:
+        profiler.configure(enabled=False, capacity=256)
+        profiler.clear()
+    return [query["sql"] for query in record["queries"]]
+
+
+def _literal(value: Any) -> str:
+    # Bench-only: DuckDB's Python client can't bind parameters to EXECUTE, so
+    # the prepared column has to inline the values.
+    if isinstance(value, list):
+        return "[" + ", ".join(_literal(v) for v in value) + "]"
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (int, float)):
+        return repr(value)
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def bench_plan(con, repeat: int) -> None:
+    """Per statement of each eval query: the Python compile time, DuckDB's
+    planning time and latency, and the wall time run fresh vs. as a reused
+    PREPAREd plan -- what a plan cache keyed by query shape could save."""
+    cur = con.cursor()
+    cur.execute(f"USE {con.execute('SELECT current_database()').fetchone()[0]}")
+    cur.execute("PRAGMA enable_profiling = 'no_output'")
+    cur.execute(f"PRAGMA custom_profiling_settings = '{json.dumps(_PLAN_METRICS)}'")
+    print(
+        f"{'case':<38} {'compile us':>10} {'plan ms':>8} {'latency ms':>11} "
+        f"{'plan %':>7} {'fresh ms':>9} {'prepared ms':>12}"
+    )
+    n = 0
+    for name, q in eval_queries():
+        compile_ms = time_call(lambda q=q: _compile_where(q), repeat)["median_ms"]
+        compiled = f"{compile_ms * 1000:.1f}"
+        _, params = _compile_where(q)
+        for sql in statements(q, con):
+            plan, latency = [], []
+            for _ in range(repeat):
+                cur.execute(sql, params).fetchall()
+                p = json.loads(cur.get_profiling_information(format="json"))
+                plan.append(p["planner"] + p["all_optimizers"] + p["physical_planner"])
+                latency.append(p["latency"])
+            fresh = time_call(
+                lambda sql=sql, params=params: cur.execute(sql, params).fetchall(),
+                repeat,
+            )
+            n += 1
+            cur.execute(f"PREPARE bench_{n} AS {sql}")
+            args = ", ".join(_literal(v) for v in params)
+            run = f"EXECUTE bench_{n}({args})" if params else f"EXECUTE bench_{n}"
+            prepared = time_call(lambda run=run: cur.execute(run).fetchall(), repeat)
+            plan_ms = statistics.median(plan) * 1000
+            latency_ms = statistics.median(latency) * 1000
+            print(
+                f"{name:<38} {compiled:>10} {plan_ms:>8.3f} {latency_ms:>11.3f} "
+                f"{100 * plan_ms / latency_ms:>6.1f}% {fresh['median_ms']:>9.3f} "
+                f"{prepared['median_ms']:>12.3f}"
+            )
+            # Further statements of the same call go on unlabelled rows.
+            name = compiled = ""
+    cur.close()
+
+
+# -- cache -----------------------------------------------------------------
+
+
+def bench_cache(con, repeat: int) -> None:
+    """Each eval query cold (cache off) and repeated (served by the cache)."""
+    cold = CatalogEngine(con, cache_size=0)
+    warm = CatalogEngine(con)
+    print(f"{'case':<38} {'op':<7} {'cold ms':>9} {'cached ms':>10}")
+    totals = [0.0, 0.0]
+    for name, q in eval_queries():
+        old = time_call(lambda q=q: cold.execute(q), repeat)["median_ms"]
+        new = time_call(lambda q=q: warm.execute(q), repeat)["median_ms"]
+        totals = [totals[0] + old, totals[1] + new]
+        print(f"{name:<38} {q.operation:<7} {old:>9.2f} {new:>10.3f}")
+    print(f"{'total':<38} {'':<7} {totals[0]:>9.2f} {totals[1]:>10.3f}")
+    print(warm.cache_stats())
+
+
+BENCHMARKS = {
+    "cache": bench_cache,
+    "facets": bench_facets,
+    "plan": bench_plan,
+}
+
+
+def main() -> int:
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("benchmark", choices=sorted(BENCHMARKS))
+    parser.add_argument(
+        "--assemblies",
+        type=int,
+        default=200_000,
+        help="assemblies in the synthetic catalog (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--catalog",
+        type=Path,
+        default=Path(tempfile.gettempdir()) / "bench-catalog",
+        help="where to build/reuse the synthetic catalog (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=9,
+        help="timed iterations per measurement (default: %(default)s)",
+    )
+    args = parser.parse_args()
+
+    con = open_catalog(args.catalog, args.assemblies)
+    if con is None:
+        logger.error("Synthetic catalog at %s failed to load", args.catalog)
+        return 1
+    BENCHMARKS[args.benchmark](con, args.repeat)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,104 @@
+#!/usr/bin/env python
+"""Per-keystroke latency benchmark for CatalogData.suggest.
+
+Builds the suggester over synthetic organisms (see bench_organism_search), one
+assembly per organism and a few hundred workflows, then types names one
+character at a time and reports the median and p99 of a suggest() call.
+
+    python -m scripts.bench_catalog_suggest
+    python -m scripts.bench_catalog_suggest --sizes 2000 200000 --names 500
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import sys
+import time
+from typing import Any, Dict, List
+
+from app.services.catalog_suggest import CatalogSuggester
+from scripts.bench_organism_search import _word, synthetic_organisms
+
+
+def synthetic_assemblies(organisms: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return [
+        {
+            "accession": f"GC{'AF'[i % 2]}_{i:09d}.{1 + i % 3}",
+            "taxonomicLevelSpecies": org["taxonomicLevelSpecies"],
+        }
+        for i, org in enumerate(organisms)
+    ]
+
+
+def synthetic_workflows(n: int) -> List[Dict[str, Any]]:
+    rng = random.Random(1)
+    return [
+        {
+            "iwcId": f"wf-{i}",
+            "workflowName": f"{_word(rng).title()} {_word(rng)} analysis",
+            "_category": "SYNTHETIC",
+        }
+        for i in range(n)
+    ]
+
+
+def keystrokes(names: List[str]) -> List[str]:
+    return [name[:j] for name in names for j in range(1, len(name) + 1)]
+
+
+def bench_size(n: int, names: int, limit: int) -> None:
+    organisms = synthetic_organisms(n)
+    assemblies = synthetic_assemblies(organisms)
+    started = time.perf_counter()
+    suggester = CatalogSuggester(organisms, assemblies, synthetic_workflows(300))
+    build_ms = (time.perf_counter() - started) * 1000
+
+    rng = random.Random(2)
+    picked = rng.sample(organisms, min(names, n))
+    typed = {
+        "species": keystrokes([o["taxonomicLevelSpecies"] for o in picked]),
+        "epithet": keystrokes([o["taxonomicLevelSpecies"].split()[1] for o in picked]),
+        "accession": keystrokes([a["accession"] for a in rng.sample(assemblies, 50)]),
+    }
+    print(f"\n{n:,} organisms + {n:,} assemblies -- built in {build_ms:,.0f} ms")
+    print(f"{'typing':<12} {'calls':>7} {'p50 us':>8} {'p99 us':>8} {'max us':>8}")
+    for name, prefixes in typed.items():
+        samples = []
+        for prefix in prefixes:
+            t0 = time.perf_counter()
+            suggester.suggest(prefix, limit)
+            samples.append((time.perf_counter() - t0) * 1e6)
+        p99 = statistics.quantiles(samples, n=100)[98]
+        print(
+            f"{name:<12} {len(samples):>7,} {statistics.median(samples):>8,.1f}"
+            f" {p99:>8,.1f} {max(samples):>8,.1f}"
+        )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[2_000, 20_000, 200_000],
+        help="organism counts to benchmark (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--names",
+        type=int,
+        default=200,
+        help="names typed out per size (default: %(default)s)",
+    )
+    parser.add_argument("--limit", type=int, default=10)
+    args = parser.parse_args()
+
+    for n in args.sizes:
+        bench_size(n, args.names, args.limit)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,136 @@
+#!/usr/bin/env python
+"""Scaling benchmark for CatalogData.search_organisms.
+
+Generates synthetic organisms -- Latin-ish binomials grouped into genera, common
+names, strains, isolates, taxonomic groups and taxonomy ids -- at 1x, 10x and
+100x the size of today's catalog (about 2,000 organisms), and times the MCP
+server's search with the inverted index against the linear scan it replaced.
+
+    python -m scripts.bench_organism_search
+    python -m scripts.bench_organism_search --sizes 2000 200000 --repeat 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import sys
+import time
+from typing import Any, Callable, Dict, List
+
+from app.services.catalog_data import _SEARCH_FIELDS
+from app.services.organism_search import OrganismSearchIndex
+
+SYLLABLES = (
+    "ba bo ca cor di do el fa fu gon ha is ju ka la li lo ma mo mu na nas "
+    "or pa pla ri ro sa si ta to tri um va xo ze"
+).split()
+GROUPS = ["Fungi", "Bacteria", "Apicomplexa", "Kinetoplastea", "Metazoa", "Viruses"]
+
+
+def _word(rng: random.Random) -> str:
+    return "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4)))
+
+
+def synthetic_organisms(n: int) -> List[Dict[str, Any]]:
+    rng = random.Random(0)
+    genera = [_word(rng).title() for _ in range(max(1, n // 20))]
+    organisms = []
+    for i in range(n):
+        genus = rng.choice(genera)
+        organisms.append(
+            {
+                "ncbiTaxonomyId": str(1000 + i),
+                "taxonomicLevelSpecies": f"{genus} {_word(rng)}",
+                "taxonomicLevelGenus": genus,
+                "commonNames": [f"{_word(rng)} {_word(rng)}"]
+                if rng.random() < 0.3
+                else [],
+                "taxonomicGroup": [rng.choice(GROUPS)],
+                "taxonomicLevelStrain": f"{genus} strain {_word(rng).upper()}{i}",
+                "taxonomicLevelIsolate": None,
+            }
+        )
+    return organisms
+
+
+def linear_search(organisms: List[Dict[str, Any]], query: str, limit: int) -> list:
+    """search_organisms before the index: the first `limit` organisms, in
+    catalog order, with a field containing the query."""
+    q = query.lower()
+    results = []
+    for org in organisms:
+        if any(q in str(org.get(field, "")).lower() for field in _SEARCH_FIELDS):
+            results.append(org)
+            if len(results) >= limit:
+                break
+    return results
+
+
+def queries(organisms: List[Dict[str, Any]]) -> Dict[str, str]:
+    mid = organisms[len(organisms) // 2]
+    species = mid["taxonomicLevelSpecies"]
+    genus, epithet = species.split()
+    return {
+        "species (exact)": species,
+        "genus (exact)": genus,
+        "genus prefix": genus[:4],
+        "species prefix": f"{genus} {epithet[:3]}",
+        "genus + initial": f"{genus} {epithet[0]}",
+        "epithet substring": epithet[1:6],
+        "taxonomy id": mid["ncbiTaxonomyId"],
+        "taxonomic group": "kinetoplastea",
+        "2-char": "co",
+        "no match": "zzqx",
+    }
+
+
+def time_us(fn: Callable[[], Any], repeat: int) -> float:
+    fn()
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1e6)
+    return statistics.median(samples)
+
+
+def bench_size(n: int, repeat: int, limit: int) -> None:
+    organisms = synthetic_organisms(n)
+    started = time.perf_counter()
+    index = OrganismSearchIndex(organisms, _SEARCH_FIELDS)
+    build_ms = (time.perf_counter() - started) * 1000
+    print(f"\n{n:,} organisms -- index built in {build_ms:,.0f} ms")
+    print(f"{'query':<20} {'scan us':>12} {'index us':>10} {'speedup':>8}")
+    for name, q in queries(organisms).items():
+        scan = time_us(lambda q=q: linear_search(organisms, q, limit), repeat)
+        indexed = time_us(lambda q=q: index.search(q, limit), repeat)
+        print(f"{name:<20} {scan:>12,.1f} {indexed:>10,.1f} {scan / indexed:>7.0f}x")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[2_000, 20_000, 200_000],
+        help="organism counts to benchmark (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=20,
+        help="timed iterations per query (default: %(default)s)",
+    )
+    parser.add_argument("--limit", type=int, default=10)
+    args = parser.parse_args()
+
+    for n in args.sizes:
+        bench_size(n, args.repeat, args.limit)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
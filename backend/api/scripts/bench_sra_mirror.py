@@ -0,0 +1,785 @@
+#!/usr/bin/env python
+"""Benchmarks for the SRA mirror service against a synthetic mirror.
+
+The production mirror is built externally and is too large to check in, so
+this generates a mirror with the same schema and a realistic shape -- one
+dominant organism holding ~40% of the runs (SARS-CoV-2 in the real file), a
+long tail of small ones, and runs grouped into studies that share platform,
+assay type and country -- and times the service's queries against it.
+
+    python -m scripts.bench_sra_mirror summary --rows 5000000
+    python -m scripts.bench_sra_mirror batch
+    python -m scripts.bench_sra_mirror histogram
+    python -m scripts.bench_sra_mirror layout
+    python -m scripts.bench_sra_mirror accessions
+    python -m scripts.bench_sra_mirror rollups
+    python -m scripts.bench_sra_mirror cache
+    python -m scripts.bench_sra_mirror concurrency --threads 1,2,4,8
+    python -m scripts.bench_sra_mirror resolve --names 1000000
+    python -m scripts.bench_sra_mirror suggest --names 1000000
+
+The mirror is cached at --mirror and rebuilt only when --rows changes, so
+repeated runs skip the generation step.
+"""
+
+from __future__ import annotations
+
+import argparse
+import concurrent.futures
+import copy
+import datetime
+import itertools
+import json
+import logging
+import shutil
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+from unittest import mock
+
+import duckdb
+
+from app.services import sra_mirror
+from app.services.sra_mirror import (
+    _ACCESSION_LOOKUP_SPAN,
+    _MIRROR_CATALOG,
+    _ORGANISM_ALIASES,
+    _RUN_SELECT,
+    _SUGGEST_LIMIT,
+    SRAMirrorService,
+    _NameSuggester,
+    _norm_organism,
+    _OrganismNames,
+    build_rollups,
+    compact_mirror,
+)
+
+logger = logging.getLogger("bench_sra_mirror")
+
+LARGE_ORGANISM = "Severe acute respiratory syndrome coronavirus 2"
+LARGE_TAXID = 3418604
+N_SMALL_ORGANISMS = 500
+RUNS_PER_STUDY = 40
+STUDIES_PER_PROJECT = 8
+NAME_SYLLABLES = (
+    "ba ce di fo gu la me ni po ru sa te vi xo ze bra cri dro fla glo "
+    "pla tri stro chlo phy myc bac ter cor lus ant ell ion orb ulm "
+    "plas mod sal mon esc her kleb toxo cand leish tryp"
+).split()
+
+
+def build_synthetic_mirror(path: Path, rows: int) -> None:
+    """Write a synthetic mirror with `rows` runs to `path`.
+
+    Generated in SQL from range() so a multi-million-row file takes seconds.
+    Study-level attributes are derived from the study id, with 5% of runs
+    drawing their own so facets aren't perfectly study-aligned.
+    """
+    path.unlink(missing_ok=True)
+    con = duckdb.connect(str(path))
+    try:
+        con.execute(
+            f"""
+            CREATE TABLE runs AS
+            WITH base AS (
+                SELECT i, i // {RUNS_PER_STUDY} AS s, hash(i) AS h,
+                       i // {RUNS_PER_STUDY * STUDIES_PER_PROJECT} AS p
+                FROM range({rows}) t(i)
+            ),
+            keyed AS (
+                SELECT *, CASE WHEN h % 20 = 0 THEN i ELSE s END AS k FROM base
+            )
+            SELECT
+                'SRR' || lpad(CAST(i AS VARCHAR), 10, '0') AS acc,
+                'SRP' || s AS sra_study,
+                'PRJNA' || p AS bioproject,
+                CASE WHEN hash(p) % 10 < 4 THEN '{LARGE_ORGANISM}'
+                     ELSE 'Organism ' || (hash(p) % {N_SMALL_ORGANISMS})
+                END AS organism,
+                ['WGS', 'RNA-Seq', 'AMPLICON', 'ChIP-Seq', NULL]
+                    [1 + CAST(hash(k * 3) % 5 AS BIGINT)] AS assay_type,
+                ['ILLUMINA', 'OXFORD_NANOPORE', 'PACBIO_SMRT', NULL]
+                    [1 + CAST(hash(k * 7) % 4 AS BIGINT)] AS platform,
+                'Instrument' AS instrument,
+                ['PAIRED', 'SINGLE'][1 + CAST(h % 2 AS BIGINT)] AS librarylayout,
+                DATE '2010-01-01'
+                    + CAST(hash(s * 11) % 6000 + h % 30 AS INTEGER) AS releasedate,
+                ['USA', 'Kenya', 'United Kingdom', 'uncalculated', NULL,
+                 'India', 'Brazil'][1 + CAST(hash(k * 13) % 7 AS BIGINT)]
+                    AS geo_loc_name_country_calc,
+                CAST(h % 1000 AS INTEGER) AS mbases
+            FROM keyed
+            """
+        )
+        con.execute("CREATE TABLE taxid_names (taxid INTEGER, name VARCHAR)")
+        con.execute(
+            "INSERT INTO taxid_names VALUES (?, ?)", [LARGE_TAXID, LARGE_ORGANISM]
+        )
+        con.execute(
+            f"""
+            INSERT INTO taxid_names
+            SELECT 100000 + i, 'Organism ' || i FROM range({N_SMALL_ORGANISMS}) t(i)
+            """
+        )
+        con.execute("CREATE TABLE mirror_meta (key VARCHAR, value VARCHAR)")
+        con.execute(
+            "INSERT INTO mirror_meta VALUES ('mirror_built_at', 'synthetic'), "
+            "('taxdump_version', 'synthetic'), ('synthetic_rows', ?)",
+            [str(rows)],
+        )
+    finally:
+        con.close()
+
+
+def open_mirror(path: Path, rows: int) -> SRAMirrorService:
+    """Open the synthetic mirror at `path`, (re)building it if it's missing
+    or was generated with a different row count."""
+    current = None
+    if path.is_file():
+        con = duckdb.connect(str(path), read_only=True)
+        try:
+            found = con.execute(
+                "SELECT value FROM mirror_meta WHERE key = 'synthetic_rows'"
+            ).fetchone()
+            current = int(found[0]) if found else None
+        except duckdb.Error:
+            current = None
+        finally:
+            con.close()
+    if current != rows:
+        logger.info("Building synthetic mirror with %s runs at %s", f"{rows:,}", path)
+        started = time.perf_counter()
+        build_synthetic_mirror(path, rows)
+        logger.info("Built in %.1fs", time.perf_counter() - started)
+    return SRAMirrorService(str(path))
+
+
+def time_call(fn: Callable[[], Any], repeat: int) -> Dict[str, float]:
+    """Median and min wall time of `fn` in ms, after one warm-up call."""
+    fn()
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return {"median_ms": statistics.median(samples), "min_ms": min(samples)}
+
+
+# -- summary ---------------------------------------------------------------
+
+
+def six_query_summary(con: duckdb.DuckDBPyConnection, names: List[str]) -> None:
+    """The pre-GROUPING-SETS summary path: one scan of `runs` per facet."""
+    filt = "organism IN (SELECT UNNEST(?))"
+    con.execute(
+        "SELECT COUNT(*), COUNT(DISTINCT bioproject), COUNT(DISTINCT sra_study), "
+        f"MIN(releasedate), MAX(releasedate) FROM runs WHERE {filt}",
+        [names],
+    ).fetchone()
+    con.execute(
+        f"SELECT platform, COUNT(*) AS n FROM runs WHERE {filt} "
+        "AND platform IS NOT NULL GROUP BY platform ORDER BY n DESC LIMIT 5",
+        [names],
+    ).fetchall()
+    con.execute(
+        f"SELECT assay_type, COUNT(*) AS n FROM runs WHERE {filt} "
+        "AND assay_type IS NOT NULL GROUP BY assay_type ORDER BY n DESC LIMIT 10",
+        [names],
+    ).fetchall()
+    con.execute(
+        "SELECT geo_loc_name_country_calc AS country, COUNT(*) AS n FROM runs "
+        f"WHERE {filt} AND geo_loc_name_country_calc IS NOT NULL "
+        "AND geo_loc_name_country_calc != 'uncalculated' "
+        "GROUP BY country ORDER BY n DESC LIMIT 10",
+        [names],
+    ).fetchall()
+    con.execute(
+        "SELECT bioproject, COUNT(*) AS n_runs, MIN(releasedate), MAX(releasedate) "
+        f"FROM runs WHERE {filt} AND bioproject IS NOT NULL GROUP BY bioproject "
+        "ORDER BY n_runs DESC, bioproject DESC LIMIT 10",
+        [names],
+    ).fetchall()
+    con.execute(
+        f"SELECT COUNT(*) FROM runs WHERE {filt} "
+        "AND releasedate >= CURRENT_DATE - INTERVAL 90 DAY",
+        [names],
+    ).fetchone()
+
+
+def bench_summary(svc: SRAMirrorService, repeat: int) -> None:
+    """Cache-miss cost of summary_for_organism: six scans vs one pass."""
+    for label, organism in (("large", LARGE_ORGANISM), ("small", "Organism 7")):
+        _, names = svc._resolve_organism(organism)
+        n_runs = svc._summarize(names)["n_runs"]
+        six = time_call(lambda names=names: six_query_summary(svc._con, names), repeat)
+        one = time_call(lambda names=names: svc._summarize(names), repeat)
+        print(
+            f"{label:>5} organism ({n_runs:>10,} runs): "
+            f"six-query {six['median_ms']:8.1f} ms   "
+            f"single-pass {one['median_ms']:8.1f} ms   "
+            f"speedup {six['median_ms'] / one['median_ms']:5.2f}x"
+        )
+
+
+def bench_batch(svc: SRAMirrorService, repeat: int) -> None:
+    """Cache-miss cost of a comparison: one summary call per organism vs one
+    grouped pass for all of them."""
+    for label, organisms in (
+        ("3 small", [f"Organism {i}" for i in range(3)]),
+        ("10 small", [f"Organism {i}" for i in range(10)]),
+        ("large + 4 small", [LARGE_ORGANISM] + [f"Organism {i}" for i in range(4)]),
+    ):
+        groups = [svc._resolve_organism(o)[1] for o in organisms]
+        each = time_call(
+            lambda groups=groups: [svc._summarize(g) for g in groups], repeat
+        )
+        batch = time_call(lambda groups=groups: svc._summarize_many(groups), repeat)
+        print(
+            f"{label:>16}: per-organism {each['median_ms']:8.1f} ms   "
+            f"batched {batch['median_ms']:8.1f} ms   "
+            f"speedup {each['median_ms'] / batch['median_ms']:5.2f}x"
+        )
+
+
+def per_period_counts(
+    con: duckdb.DuckDBPyConnection, names: List[str], split: bool
+) -> None:
+    """The pre-histogram way to a yearly series: a since-bounded count per
+    year (per platform too when `split`), as a model chains searches."""
+    first, last = con.execute(
+        "SELECT year(MIN(releasedate)), year(MAX(releasedate)) FROM runs "
+        "WHERE organism IN (SELECT UNNEST(?))",
+        [names],
+    ).fetchone()
+    platforms = ["ILLUMINA", "OXFORD_NANOPORE", "PACBIO_SMRT"] if split else [None]
+    for year in range(first, last + 1):
+        for platform in platforms:
+            con.execute(
+                "SELECT COUNT(*) FROM runs WHERE organism IN (SELECT UNNEST(?)) "
+                "AND releasedate >= ? AND releasedate < ? "
+                "AND (? IS NULL OR platform = ?)",
+                [names, f"{year}-01-01", f"{year + 1}-01-01", platform, platform],
+            ).fetchone()
+
+
+def bench_histogram(svc: SRAMirrorService, repeat: int) -> None:
+    """Cache-miss cost of a yearly release series: one count per period vs one
+    release_histogram pass."""
+    for label, organism in (("large", LARGE_ORGANISM), ("small", "Organism 7")):
+        _, names = svc._resolve_organism(organism)
+        for split in (False, True):
+            breakdown = "platform" if split else None
+
+            def histogram(organism=organism, breakdown=breakdown) -> None:
+                svc._cache.clear()
+                svc.release_histogram(organism, breakdown=breakdown)
+
+            each = time_call(
+                lambda names=names, split=split: per_period_counts(
+                    svc._con, names, split
+                ),
+                repeat,
+            )
+            one = time_call(histogram, repeat)
+            print(
+                f"{label:>5} organism, {breakdown or 'total':>8}: "
+                f"per-period {each['median_ms']:8.1f} ms   "
+                f"histogram {one['median_ms']:8.1f} ms   "
+                f"speedup {each['median_ms'] / one['median_ms']:5.2f}x"
+            )
+
+
+def bench_rollups(svc: SRAMirrorService, repeat: int) -> None:
+    """Cache-miss cost of summary_for_organism: live scan vs per-taxid rollups.
+
+    Rollups are built into a copy of the synthetic mirror, so the base file
+    keeps measuring the live path.
+    """
+    rolled = Path(svc.mirror_path).with_suffix(".rollups.duckdb")
+    shutil.copyfile(svc.mirror_path, rolled)
+    con = duckdb.connect(str(rolled))
+    try:
+        started = time.perf_counter()
+        build_rollups(con)
+        logger.info("Built rollups in %.1fs", time.perf_counter() - started)
+    finally:
+        con.close()
+    rsvc = SRAMirrorService(str(rolled))
+    for label, organism in (("large", LARGE_ORGANISM), ("small", "Organism 7")):
+        taxid, names = rsvc._resolve_organism(organism)
+        scan = time_call(lambda names=names: rsvc._summarize(names), repeat)
+        rollup = time_call(
+            lambda taxid=taxid: rsvc._summarize_from_rollups(taxid), repeat
+        )
+        print(
+            f"{label:>5} organism: live scan {scan['median_ms']:8.1f} ms   "
+            f"rollups {rollup['median_ms']:8.1f} ms   "
+            f"speedup {scan['median_ms'] / rollup['median_ms']:6.1f}x"
+        )
+
+
+# -- layout ------------------------------------------------------------------
+
+
+def rows_scanned(svc: SRAMirrorService, where: str, params: List[Any]) -> int:
+    """Rows DuckDB reads from `runs` for one listing page matching `where`."""
+    con = svc._con.cursor()
+    output = Path(tempfile.gettempdir()) / "bench-sra-profile.json"
+    try:
+        con.execute(f"USE {_MIRROR_CATALOG}")
+        con.execute("PRAGMA enable_profiling = 'json'")
+        con.execute(f"PRAGMA profiling_output = '{output}'")
+        con.execute(
+            f"SELECT {_RUN_SELECT} FROM runs WHERE {where} "
+            "ORDER BY releasedate DESC, acc DESC LIMIT 51",
+            params,
+        ).fetchall()
+        con.execute("PRAGMA disable_profiling")
+    finally:
+        con.close()
+    return json.loads(output.read_text())["cumulative_rows_scanned"]
+
+
+def compacted_copy(svc: SRAMirrorService) -> SRAMirrorService:
+    """A service over a freshly compacted copy of the synthetic mirror."""
+    compacted = Path(svc.mirror_path).with_suffix(".compact.duckdb")
+    compacted.unlink(missing_ok=True)
+    con = duckdb.connect(str(compacted))
+    try:
+        started = time.perf_counter()
+        compact_mirror(con, svc.mirror_path)
+        logger.info("Compacted mirror in %.1fs", time.perf_counter() - started)
+    finally:
+        con.close()
+    return SRAMirrorService(str(compacted))
+
+
+def bench_layout(svc: SRAMirrorService, repeat: int) -> None:
+    """Cache-miss cost and rows scanned for listings, ingest order vs the
+    compacted layout.
+
+    The compacted copy is written next to the synthetic mirror, so the base
+    file keeps measuring ingest order. The synthetic ingest order is by
+    study, which already suits study lookups -- the case where compaction
+    costs the most.
+    """
+    csvc = compacted_copy(svc)
+
+    study, bioproject = svc._con.execute(
+        "SELECT sra_study, bioproject FROM runs WHERE organism = 'Organism 7' LIMIT 1"
+    ).fetchone()
+    cases = (
+        ("search, large", lambda m: m.search_runs(LARGE_ORGANISM)),
+        ("search, small", lambda m: m.search_runs("Organism 7")),
+        (
+            "search, large filtered",
+            lambda m: m.search_runs(
+                LARGE_ORGANISM, platform="PACBIO_SMRT", since="2024"
+            ),
+        ),
+        ("study runs, SRP", lambda m: m.get_study_runs(study)),
+        ("study runs, PRJ", lambda m: m.get_study_runs(bioproject)),
+        ("summary, small", lambda m: m.summary_for_organism("Organism 7")),
+    )
+    filters = {
+        "search, large": lambda m: m._search_filter(
+            LARGE_ORGANISM, None, None, None, None
+        )[2:],
+        "search, small": lambda m: m._search_filter(
+            "Organism 7", None, None, None, None
+        )[2:],
+        "search, large filtered": lambda m: m._search_filter(
+            LARGE_ORGANISM, None, "PACBIO_SMRT", None, "2024"
+        )[2:],
+        "study runs, SRP": lambda m: m._study_filter(study)[2:],
+        "study runs, PRJ": lambda m: m._study_filter(bioproject)[2:],
+    }
+    for label, call in cases:
+        timings = []
+        for mirror in (svc, csvc):
+
+            def uncached(mirror=mirror, call=call) -> None:
+                mirror._cache.clear()
+                call(mirror)
+
+            timings.append(time_call(uncached, repeat)["median_ms"])
+        line = (
+            f"{label:>22}: ingest order {timings[0]:8.1f} ms   "
+            f"compacted {timings[1]:8.1f} ms   "
+            f"speedup {timings[0] / timings[1]:6.1f}x"
+        )
+        if label in filters:
+            scanned = [rows_scanned(m, *filters[label](m)) for m in (svc, csvc)]
+            line += f"   rows scanned {scanned[0]:>10,} -> {scanned[1]:>10,}"
+        print(line)
+
+
+def bench_accessions(svc: SRAMirrorService, repeat: int) -> None:
+    """get_runs_by_accessions for 2,000-run batches: ingest order, the
+    compacted layout scanned directly, and the compacted layout narrowed by
+    its run_accessions lookup.
+
+    "one study" is every run of a study of the large organism; "adjacent"
+    takes consecutive accessions, which the synthetic data assigns study by
+    study; "random" draws from the whole mirror and skips the lookup. The
+    synthetic ingest order is sorted by accession, so it is the best case
+    for a direct scan.
+    """
+    csvc = compacted_copy(svc)
+    (study,) = svc._con.execute(
+        "SELECT sra_study FROM runs WHERE organism = ? "
+        "GROUP BY sra_study ORDER BY COUNT(*) DESC LIMIT 1",
+        [LARGE_ORGANISM],
+    ).fetchone()
+    batches = {
+        "one study": [
+            acc
+            for (acc,) in svc._con.execute(
+                "SELECT acc FROM runs WHERE sra_study = ? LIMIT 2000", [study]
+            ).fetchall()
+        ],
+        "adjacent": [
+            acc
+            for (acc,) in svc._con.execute(
+                "SELECT acc FROM runs ORDER BY acc LIMIT 2000 OFFSET 100000"
+            ).fetchall()
+        ],
+        "random": [
+            acc
+            for (acc,) in svc._con.execute(
+                "SELECT acc FROM runs USING SAMPLE 2000 ROWS"
+            ).fetchall()
+        ],
+    }
+    for label, accessions in batches.items():
+        timings = []
+        for mirror, span in (
+            (svc, _ACCESSION_LOOKUP_SPAN),
+            (csvc, -1),
+            (csvc, _ACCESSION_LOOKUP_SPAN),
+        ):
+
+            def fetch(mirror=mirror, accessions=accessions) -> None:
+                mirror.get_runs_by_accessions(accessions)
+
+            with mock.patch.object(sra_mirror, "_ACCESSION_LOOKUP_SPAN", span):
+                timings.append(time_call(fetch, repeat)["median_ms"])
+        print(
+            f"{label:>10} ({len(accessions):,} runs): "
+            f"ingest order {timings[0]:7.1f} ms   "
+            f"compacted, scan {timings[1]:7.1f} ms   "
+            f"lookup {timings[2]:7.1f} ms"
+        )
+
+
+# -- resolve -----------------------------------------------------------------
+
+
+def sql_resolve(con: duckdb.DuckDBPyConnection, term: str) -> None:
+    """The pre-index resolve path: a taxid_names query per lookup."""
+    rows = con.execute(
+        "SELECT DISTINCT taxid FROM taxid_names WHERE LOWER(name) = LOWER(?) "
+        "ORDER BY taxid",
+        [term],
+    ).fetchall()
+    if rows:
+        con.execute(
+            "SELECT name FROM taxid_names WHERE taxid = ?", [rows[0][0]]
+        ).fetchall()
+
+
+def pad_names(svc: SRAMirrorService, names: int) -> SRAMirrorService:
+    """A copy of the mirror with `names` synthetic names added to taxid_names.
+
+    Shaped like NCBI's table: Latin-ish binomials built from shared
+    syllables (so common trigrams are common, as "-ium"/"-us" are), drawn
+    from 3,000 genera and 30,000 epithets, three names per taxid, two of
+    them strain-qualified synonyms.
+    """
+    padded = Path(svc.mirror_path).with_suffix(".names.duckdb")
+    shutil.copyfile(svc.mirror_path, padded)
+    syllables = "[" + ", ".join(f"'{s}'" for s in NAME_SYLLABLES) + "]"
+    con = duckdb.connect(str(padded))
+    try:
+        con.execute(
+            f"""
+            INSERT INTO taxid_names
+            WITH words AS (
+                SELECT i, list_transform(
+                    range(6),
+                    k -> {syllables}[1 + CAST(
+                        hash(CASE WHEN k < 3 THEN t // 10 ELSE t END, k)
+                        % {len(NAME_SYLLABLES)} AS BIGINT)]
+                ) AS syl
+                FROM (SELECT i, (i // 3) % 30000 AS t FROM range({names}) r(i))
+            )
+            SELECT 1000000 + i // 3,
+                   upper(syl[1][1]) || syl[1][2:] || syl[2] || syl[3] || 'us '
+                       || syl[4] || syl[5] || syl[6] || 'is'
+                       || CASE WHEN i % 3 > 0 THEN ' strain ' || i ELSE '' END
+            FROM words
+            """
+        )
+    finally:
+        con.close()
+    return SRAMirrorService(str(padded))
+
+
+def bench_resolve(svc: SRAMirrorService, repeat: int, names: int) -> None:
+    """_resolve_organism latency and the index's memory at `names` names,
+    timing the per-lookup SQL it replaced against the in-memory index."""
+    psvc = pad_names(svc, names)
+    n_rows = psvc._con.execute("SELECT COUNT(*) FROM taxid_names").fetchone()[0]
+    synonym = psvc._con.execute(
+        "SELECT name FROM taxid_names ORDER BY rowid DESC LIMIT 1"
+    ).fetchone()[0]
+
+    # Timed untraced: tracemalloc slows allocation-heavy code several-fold.
+    started = time.perf_counter()
+    _OrganismNames.load(psvc._con)
+    load_s = time.perf_counter() - started
+    tracemalloc.start()
+    index = _OrganismNames.load(psvc._con)
+    footprint, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(
+        f"index over {n_rows:,} names: "
+        f"{footprint / 2**20:.1f} MiB, built in {load_s:.2f}s"
+    )
+    del index
+
+    # Each case repeated so per-call latency is above timer resolution.
+    per_case = 200
+    for label, term in (
+        ("name", "Organism 7"),
+        ("synonym", synonym),
+        ("miss", "Notarealorganism xyzzy"),
+    ):
+        sql = time_call(
+            lambda term=term: [sql_resolve(psvc._con, term) for _ in range(per_case)],
+            repeat,
+        )
+        mem = time_call(
+            lambda term=term: [psvc._resolve_organism(term) for _ in range(per_case)],
+            repeat,
+        )
+        sql_us = sql["median_ms"] * 1000 / per_case
+        mem_us = mem["median_ms"] * 1000 / per_case
+        print(
+            f"{label:>8}: sql {sql_us:9.1f} us   in-memory {mem_us:7.2f} us   "
+            f"speedup {sql_us / mem_us:8.0f}x"
+        )
+
+
+# -- suggest -----------------------------------------------------------------
+
+
+def bench_suggest(svc: SRAMirrorService, repeat: int, names: int) -> None:
+    """Did-you-mean build cost, footprint and per-lookup latency at `names`."""
+    psvc = pad_names(svc, names)
+    psvc._suggester_thread.join()
+    binomial, strain = psvc._con.execute(
+        """
+        SELECT min(name) FILTER (WHERE name NOT LIKE '% strain %'),
+               max(name) FILTER (WHERE name LIKE '% strain %')
+        FROM taxid_names WHERE taxid >= 1000000
+        """
+    ).fetchone()
+
+    started = time.perf_counter()
+    _NameSuggester(psvc._names, _ORGANISM_ALIASES)
+    build_s = time.perf_counter() - started
+    tracemalloc.start()
+    suggester = _NameSuggester(psvc._names, _ORGANISM_ALIASES)
+    footprint, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(
+        f"suggester over {len(psvc._names):,} names: "
+        f"{footprint / 2**20:.1f} MiB, built in {build_s:.2f}s"
+    )
+
+    def typo(name: str) -> str:
+        # Drop a letter from each longer word; strain numbers stay exact.
+        return " ".join(
+            w[:2] + w[3:] if len(w) > 4 and not w.isdigit() else w for w in name.split()
+        )
+
+    per_case = 20
+    for label, term in (
+        ("binomial typo", typo(binomial)),
+        ("strain typo", typo(strain)),
+        ("genus typo", typo(binomial.split()[0])),
+        ("prefix", binomial[:6]),
+        ("alias typo", "sars-cov2"),
+        ("real typo", "Severe acute respiratry syndrome coronavirus 2"),
+        ("gibberish", "Notarealorganism xyzzy"),
+    ):
+        timing = time_call(
+            lambda term=term: [
+                suggester.suggest(term, _SUGGEST_LIMIT) for _ in range(per_case)
+            ],
+            repeat,
+        )
+        top = suggester.suggest(term, _SUGGEST_LIMIT)
+        print(
+            f"{label:>14}: {timing['median_ms'] / per_case:6.2f} ms   "
+            f"{term!r} -> {top[0][0] if top else None!r}"
+        )
+
+
+# -- concurrency -----------------------------------------------------------
+
+
+def _throughput(call: Callable[[int], Any], threads: int, calls: int) -> float:
+    """Calls per second of `call(i)` for i in range(calls) on `threads` workers."""
+    with concurrent.futures.ThreadPoolExecutor(max_workers=threads) as pool:
+        started = time.perf_counter()
+        list(pool.map(call, range(calls)))
+        return calls / (time.perf_counter() - started)
+
+
+def bench_concurrency(svc: SRAMirrorService, repeat: int, threads: List[int]) -> None:
+    """search_runs throughput vs worker threads: pooled cursors vs one lock.
+
+    Every call uses a distinct (since, limit) so it misses the cache and runs a query,
+    mixing the dominant organism with small ones. The serialized column wraps
+    the same calls in one global lock -- what the service did before cursors
+    were pooled -- so the ratio isolates what the pool buys. Scaling is
+    bounded by the cores DuckDB can use; on a single core both columns stay
+    flat.
+    """
+    organisms = [LARGE_ORGANISM] + [f"Organism {i}" for i in range(7)]
+    calls = 40 * max(1, repeat)
+    keys = itertools.count()
+    serial = threading.Lock()
+
+    def pooled(i: int) -> None:
+        # (since, limit) from a shared counter: a fresh cache key every call.
+        k = next(keys)
+        since = (datetime.date(2010, 1, 1) + datetime.timedelta(k // 200)).isoformat()
+        svc.search_runs(organisms[i % len(organisms)], since=since, limit=k % 200 + 1)
+
+    def serialized(i: int) -> None:
+        with serial:
+            pooled(i)
+
+    base = None
+    for n in threads:
+        locked = _throughput(serialized, n, calls)
+        free = _throughput(pooled, n, calls)
+        base = base or free
+        print(
+            f"{n:>3} threads: serialized {locked:8.1f} q/s   "
+            f"pooled {free:8.1f} q/s   "
+            f"vs serialized {free / locked:5.2f}x   "
+            f"vs 1 thread {free / base:5.2f}x"
+        )
+
+
+# -- cache -------------------------------------------------------------------
+
+
+def bench_cache(svc: SRAMirrorService, repeat: int) -> None:
+    """Cache-hit cost of a 200-run search_runs page as the tools serve it:
+    deep copy + json.dumps per hit vs the shared frozen result and its
+    memoized encoding."""
+    svc.search_runs(LARGE_ORGANISM, limit=200)
+    key = ("search", _norm_organism(LARGE_ORGANISM), None, None, None, None, 200, None)
+    frozen = svc._cache_get(key)
+    assert frozen is not None, "cache key drifted from search_runs"
+
+    def copied() -> str:
+        return json.dumps(copy.deepcopy(frozen), indent=2, default=str)
+
+    def shared() -> str:
+        return svc._cache_get(key).to_json()
+
+    # Timed untraced, then traced for allocations: tracemalloc skews timings.
+    per_case = 100
+    for label, hit in (("deepcopy+dumps", copied), ("frozen", shared)):
+        timing = time_call(lambda hit=hit: [hit() for _ in range(per_case)], repeat)
+        tracemalloc.start()
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        for _ in range(per_case):
+            hit()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(
+            f"{label:>15}: {timing['median_ms'] * 1000 / per_case:9.1f} us/hit   "
+            f"peak alloc {(peak - before) / 1024:8.1f} KiB"
+        )
+
+
+BENCHMARKS = {
+    "accessions": bench_accessions,
+    "batch": bench_batch,
+    "cache": bench_cache,
+    "concurrency": bench_concurrency,
+    "histogram": bench_histogram,
+    "layout": bench_layout,
+    "resolve": bench_resolve,
+    "rollups": bench_rollups,
+    "suggest": bench_suggest,
+    "summary": bench_summary,
+}
+
+
+def main() -> int:
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("benchmark", choices=sorted(BENCHMARKS))
+    parser.add_argument(
+        "--rows",
+        type=int,
+        default=5_000_000,
+        help="runs in the synthetic mirror (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--mirror",
+        type=Path,
+        default=Path(tempfile.gettempdir()) / "bench-sra-mirror.duckdb",
+        help="where to build/reuse the synthetic mirror (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=5,
+        help="timed iterations per measurement (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--threads",
+        default="1,2,4,8",
+        help="worker-thread counts for the concurrency benchmark "
+        "(default: %(default)s)",
+    )
+    parser.add_argument(
+        "--names",
+        type=int,
+        default=1_000_000,
+        help="synthetic names added to taxid_names for resolve/suggest "
+        "(default: %(default)s)",
+    )
+    args = parser.parse_args()
+
+    svc = open_mirror(args.mirror, args.rows)
+    if not svc.is_available():
+        logger.error("Synthetic mirror at %s failed to open", args.mirror)
+        return 1
+    if args.benchmark == "concurrency":
+        threads = [int(n) for n in args.threads.split(",")]
+        bench_concurrency(svc, args.repeat, threads)
+    elif args.benchmark in ("resolve", "suggest"):
+        BENCHMARKS[args.benchmark](svc, args.repeat, args.names)
+    else:
+        BENCHMARKS[args.benchmark](svc, args.repeat)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
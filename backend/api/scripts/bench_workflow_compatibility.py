@@ -0,0 +1,159 @@
+#!/usr/bin/env python
+"""Benchmark for the MCP server's workflow compatibility queries.
+
+Loads a catalog built from the genome TSV (see bench_catalog_memory) with the
+catalog build's workflows.json, and times get_compatible_workflows per
+organism, check_workflow_assembly_compatibility per (workflow, assembly) pair,
+and the bulk lookup for every assembly, against the per-call checks of every
+workflow that the precomputed matrix replaced.
+
+    python -m scripts.bench_workflow_compatibility
+    python -m scripts.bench_workflow_compatibility --scale 1 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+from app.services.catalog_data import CatalogData, _is_assembly_scope
+from scripts.bench_catalog_memory import DEFAULT_TSV, build_catalog
+
+DEFAULT_WORKFLOWS = (
+    Path(__file__).resolve().parents[3] / "catalog/output/workflows.json"
+)
+
+
+def linear_compatible_workflows(
+    catalog: CatalogData, ploidies: List[str], taxonomy_id: str
+) -> List[Dict[str, Any]]:
+    """get_compatible_workflows before the matrix."""
+    results = []
+    for cat in catalog.workflow_categories:
+        for wf in cat.get("workflows", []):
+            if not _is_assembly_scope(wf):
+                continue
+            wf_ploidy = wf.get("ploidy")
+            if wf_ploidy is not None and wf_ploidy != "ANY":
+                if wf_ploidy not in ploidies:
+                    continue
+            wf_tax = wf.get("taxonomyId")
+            if taxonomy_id and wf_tax is not None:
+                if not catalog._lineage.is_ancestor(wf_tax, taxonomy_id):
+                    continue
+            results.append(catalog._condense_workflow(wf))
+    return results
+
+
+def linear_check(catalog: CatalogData, iwc_id: str, accession: str) -> Dict[str, Any]:
+    """check_workflow_assembly_compatibility before the matrix."""
+    wf = catalog._workflows_by_iwc_id[iwc_id]
+    asm = catalog._assemblies_by_accession[accession]
+    issues = []
+    wf_ploidy = wf.get("ploidy")
+    asm_ploidies = asm.get("ploidy", [])
+    if isinstance(asm_ploidies, str):
+        asm_ploidies = [asm_ploidies]
+    if wf_ploidy not in (None, "ANY") and wf_ploidy not in asm_ploidies:
+        issues.append(
+            f"Ploidy mismatch: workflow requires "
+            f"'{wf_ploidy}', assembly is {asm_ploidies}"
+        )
+    wf_tax = wf.get("taxonomyId")
+    asm_lineage = asm.get("lineageTaxonomyIds", [])
+    if wf_tax is not None and str(wf_tax) not in [str(t) for t in asm_lineage]:
+        issues.append(
+            f"Taxonomy mismatch: workflow targets taxonomy {wf_tax}, "
+            f"assembly taxonomy is {asm.get('ncbiTaxonomyId')}"
+        )
+    if issues:
+        return {"compatible": False, "reason": "; ".join(issues)}
+    return {
+        "compatible": True,
+        "workflow": wf.get("workflowName"),
+        "assembly": accession,
+    }
+
+
+def time_ms(fn: Callable[[], Any]) -> float:
+    started = time.perf_counter()
+    fn()
+    return (time.perf_counter() - started) * 1000
+
+
+def bench_scale(tsv: Path, workflows: Path, scale: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        build_catalog(tsv, Path(tmp), scale)
+        shutil.copy(workflows, Path(tmp) / "workflows.json")
+        started = time.perf_counter()
+        catalog = CatalogData(tmp)
+        load_ms = (time.perf_counter() - started) * 1000
+
+    organisms = [(_ploidies(o), str(o["ncbiTaxonomyId"])) for o in catalog.organisms]
+    accessions = list(catalog._assemblies_by_accession)
+    iwc_ids = [wf.get("iwcId") for wf in catalog._compatibility.workflows]
+    rng = random.Random(0)
+    pairs = [(rng.choice(iwc_ids), rng.choice(accessions)) for _ in range(20_000)]
+
+    rows = [
+        (
+            f"compatible workflows x{len(organisms):,}",
+            lambda: [linear_compatible_workflows(catalog, p, t) for p, t in organisms],
+            lambda: [catalog.get_compatible_workflows(p, t) for p, t in organisms],
+        ),
+        (
+            f"check pair x{len(pairs):,}",
+            lambda: [linear_check(catalog, w, a) for w, a in pairs],
+            lambda: [
+                catalog.check_workflow_assembly_compatibility(w, a) for w, a in pairs
+            ],
+        ),
+        (
+            f"all assemblies x{len(accessions):,}",
+            lambda: [
+                [w for w in iwc_ids if linear_check(catalog, w, a)["compatible"]]
+                for a in accessions
+            ],
+            lambda: catalog.get_compatible_workflows_bulk(accessions, []),
+        ),
+    ]
+    print(
+        f"\n{scale}x genome TSV -- {len(accessions):,} assemblies, "
+        f"{len(iwc_ids)} workflows, loaded in {load_ms:,.0f} ms"
+    )
+    print(f"{'query':<30} {'per-call ms':>12} {'matrix ms':>10} {'speedup':>8}")
+    for name, before, after in rows:
+        linear, matrix = time_ms(before), time_ms(after)
+        print(f"{name:<30} {linear:>12,.1f} {matrix:>10,.1f} {linear / matrix:>7.0f}x")
+
+
+def _ploidies(org: Any) -> List[str]:
+    return sorted({p for g in org.get("genomes") or [] for p in g.get("ploidy", [])})
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tsv", type=Path, default=DEFAULT_TSV)
+    parser.add_argument("--workflows", type=Path, default=DEFAULT_WORKFLOWS)
+    parser.add_argument(
+        "--scale",
+        type=int,
+        nargs="+",
+        default=[1, 10],
+        help="copies of the genome TSV to load (default: %(default)s)",
+    )
+    args = parser.parse_args()
+
+    for scale in args.scale:
+        bench_scale(args.tsv, args.workflows, scale)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,74 @@
+#!/usr/bin/env python
+"""Write the query_catalog DuckDB snapshot next to the catalog JSON.
+
+Build-time step after the catalog build: loads every entity query_catalog
+knows about (assemblies.json, organisms.json) into catalog-query.duckdb, checks
+each table against ENTITY_SCHEMA, and records which JSON it was built from.
+Workers then attach the snapshot read-only at boot instead of parsing the
+JSON. Without it -- or with a snapshot that no longer matches the JSON --
+they load the JSON, exactly as before.
+
+    python -m scripts.build_catalog_snapshot /catalog/output
+
+Exits non-zero on schema drift, leaving any previous snapshot in place; the
+drift has to be fixed in catalog_query.py or the catalog build.
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+
+import duckdb
+
+from app.services.tools.catalog_query import (
+    ENTITY_SCHEMA,
+    SNAPSHOT_FILE,
+    CatalogSchemaDrift,
+    build_snapshot,
+)
+
+logger = logging.getLogger("build_catalog_snapshot")
+
+
+def main() -> int:
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("catalog", type=Path, help="catalog output directory")
+    parser.add_argument(
+        "--output",
+        type=Path,
+        help=f"snapshot path (default: {SNAPSHOT_FILE} in the catalog directory)",
+    )
+    args = parser.parse_args()
+
+    for schema in ENTITY_SCHEMA.values():
+        if not (args.catalog / schema.source).is_file():
+            logger.error("No %s in %s", schema.source, args.catalog)
+            return 1
+
+    started = time.perf_counter()
+    try:
+        counts = build_snapshot(
+            str(args.catalog), str(args.output) if args.output else None
+        )
+    except CatalogSchemaDrift as exc:
+        logger.error("Snapshot not written: %s", exc)
+        return 1
+    except duckdb.Error as exc:
+        logger.error("Snapshot build failed, previous snapshot kept: %s", exc)
+        return 1
+
+    logger.info(
+        "Built catalog snapshot (%s) in %.1fs",
+        ", ".join(f"{e}={n:,}" for e, n in counts.items()),
+        time.perf_counter() - started,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+"""Materialize per-taxid rollup tables into an SRA mirror file.
+
+Optional post-build step for the weekly mirror: writes the rollup_taxid_*
+tables (counts by platform, assay type, country, BioProject and release month)
+next to `runs` so summary_for_organism and top_bioprojects_for_organism read a
+handful of pre-aggregated rows instead of scanning runs. Without it the
+service answers from live scans, exactly as before.
+
+    python -m scripts.build_sra_rollups /data/sra-mirror.duckdb
+
+Run it on the new file before it's published to the workers -- DuckDB won't
+open a file for writing while another process holds it. Re-running replaces
+the rollups. The service ignores rollups whose provenance doesn't match the
+file's runs, so a mirror rebuilt without this step falls back to live scans
+rather than serving stale counts.
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+
+import duckdb
+
+from app.services.sra_mirror import build_rollups
+
+logger = logging.getLogger("build_sra_rollups")
+
+
+def main() -> int:
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("mirror", type=Path, help="path to the mirror .duckdb file")
+    args = parser.parse_args()
+
+    if not args.mirror.is_file():
+        logger.error("No mirror file at %s", args.mirror)
+        return 1
+
+    started = time.perf_counter()
+    try:
+        con = duckdb.connect(str(args.mirror))
+    except duckdb.Error as exc:
+        logger.error("Could not open %s for writing: %s", args.mirror, exc)
+        return 1
+    try:
+        provenance = build_rollups(con)
+    except duckdb.Error as exc:
+        logger.error("Rollup build failed, previous rollups kept: %s", exc)
+        return 1
+    finally:
+        con.close()
+
+    logger.info(
+        "Built rollups for mirror %s (%s runs) in %.1fs",
+        provenance["rollups_source_built_at"] or "unknown",
+        provenance["rollups_source_runs"],
+        time.perf_counter() - started,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+"""Write a compacted copy of an SRA mirror file.
+
+Optional post-build step for the weekly mirror: copies the mirror to a new
+file with `runs` sorted by organism and release date, a dictionary-encoded
+`organism_id` column, and per-study `run_spans` (see compact_mirror). DuckDB's
+row-group stats then let organism searches and study lookups skip most of
+the file. The service detects the layout on open; an uncompacted file is
+served exactly as before.
+
+    python -m scripts.compact_sra_mirror /data/sra-mirror.duckdb \\
+        /data/sra-mirror.compact.duckdb
+
+Writes a new file rather than rewriting in place -- DuckDB doesn't shrink a
+file whose table was replaced, so an in-place rewrite would double its size.
+Publish the result by renaming it over SRA_MIRROR_PATH. Rollups survive
+compaction, so build_sra_rollups can run before or after.
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+
+import duckdb
+
+from app.services.sra_mirror import compact_mirror
+
+logger = logging.getLogger("compact_sra_mirror")
+
+
+def main() -> int:
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("mirror", type=Path, help="path to the mirror .duckdb file")
+    parser.add_argument("output", type=Path, help="where to write the compacted copy")
+    args = parser.parse_args()
+
+    if not args.mirror.is_file():
+        logger.error("No mirror file at %s", args.mirror)
+        return 1
+    if args.output.exists():
+        logger.error("%s already exists; not overwriting it", args.output)
+        return 1
+
+    started = time.perf_counter()
+    try:
+        con = duckdb.connect(str(args.output))
+    except duckdb.Error as exc:
+        logger.error("Could not create %s: %s", args.output, exc)
+        return 1
+    try:
+        compact_mirror(con, str(args.mirror))
+        n_runs, n_organisms = con.execute(
+            "SELECT COUNT(*), COUNT(DISTINCT organism_id) FROM runs"
+        ).fetchone()
+    except duckdb.Error as exc:
+        con.close()
+        logger.error("Compaction failed: %s", exc)
+        args.output.unlink(missing_ok=True)
+        Path(f"{args.output}.wal").unlink(missing_ok=True)
+        return 1
+    con.close()
+
+    logger.info(
+        "Compacted %s runs of %s organisms into %s (%.0f MiB, was %.0f MiB) in %.1fs",
+        f"{n_runs:,}",
+        f"{n_organisms:,}",
+        args.output,
+        args.output.stat().st_size / 2**20,
+        args.mirror.stat().st_size / 2**20,
+        time.perf_counter() - started,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -41,7 +41,7 @@ def agent():
     instance.catalog = MagicMock()
     instance.catalog.workflows_by_category = []
     instance.sra_mirror = None
-    instance.query_con = None  # query_catalog degrades to "unavailable"
+    instance.query_engine = None  # query_catalog degrades to "unavailable"
     instance.settings = get_settings()
     return instance
 
@@ -1512,9 +1512,12 @@ class TestSystemPromptSRAGating:
 
     SRA_TOOL_NAMES = (
         "sra_summary_for_organism",
+        "sra_summaries_for_organisms",
+        "sra_release_histogram",
         "search_sra_runs",
         "top_bioprojects_for_organism",
         "get_sra_study_runs",
+        "get_sra_runs",
     )
 
     def test_prompt_omits_sra_tools_when_unavailable(self):
@@ -1976,7 +1979,7 @@ def _extraction_agent(reply, state, catalog=None):
     # Real int: _build_transcript compares a serialized size against it.
     instance.settings.ASSISTANT_TURN_LOG_MAX_TRANSCRIPT_BYTES = 65536
     instance.sra_mirror = None
-    instance.query_con = None
+    instance.query_engine = None
     instance.catalog = catalog if catalog is not None else MagicMock()
     if catalog is None:
         instance.catalog.workflows_by_category = []
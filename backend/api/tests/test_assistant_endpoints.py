@@ -295,3 +295,21 @@ class TestAnonymousSessionClaim:
 
         assert resp.status_code == 200, resp.text
         agent.session_service.claim_session.assert_not_awaited()
+
+
+class TestCatalogQueryStats:
+    def test_reports_the_engine_cache(self, client):
+        from app.core.dependencies import get_assistant_agent
+
+        agent = client.app.dependency_overrides[get_assistant_agent]()
+        agent.query_engine.cache_stats.return_value = {"hits": 3, "misses": 1}
+        resp = client.get("/api/v1/assistant/catalog-query/stats")
+        assert resp.status_code == 200, resp.text
+        assert resp.json() == {"hits": 3, "misses": 1}
+
+    def test_unavailable_without_an_engine(self, client):
+        from app.core.dependencies import get_assistant_agent
+
+        client.app.dependency_overrides[get_assistant_agent]().query_engine = None
+        resp = client.get("/api/v1/assistant/catalog-query/stats")
+        assert resp.status_code == 503
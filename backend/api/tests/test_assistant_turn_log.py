@@ -281,7 +281,7 @@ def _stub_agent():
     instance.catalog = MagicMock()
     instance.catalog.workflows_by_category = []
     instance.sra_mirror = None
-    instance.query_con = None
+    instance.query_engine = None
     instance.agent = object()
     instance.settings = get_settings()
     return instance
@@ -11,21 +11,34 @@ but assert against a fixed fixture so they don't drift with the live catalog.
 
 from __future__ import annotations
 
+import asyncio
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
 
+from app.services.query_guard import QueryLimits, QueryTooExpensive
 from app.services.tools.catalog_query import (
     ENTITY_SCHEMA,
     SCALAR,
+    SNAPSHOT_FILE,
+    CatalogEngine,
     CatalogQuery,
+    CatalogSchemaDrift,
     EntitySchema,
     Filter,
     Op,
     Sort,
     _compile_predicate,
     _schema_issues,
+    build_snapshot,
+    canonical_query,
+    catalog_build_id,
     connect,
     execute,
 )
+from app.services.tools.catalog_tools import AssistantDeps, query_catalog
 
 # --- IR validation (no DB) ----------------------------------------------------
 
@@ -403,6 +416,66 @@ def test_facets_group_by_level(con):
     }
 
 
+def _facet_per_column(con, col: str, limit: int) -> dict:
+    """The facet as the executor used to compute it: one GROUP BY per column."""
+    rows = con.execute(
+        f'SELECT "{col}" AS k, count(*) AS c FROM assembly '
+        f"GROUP BY k ORDER BY c DESC, k LIMIT {limit}"
+    ).fetchall()
+    return {("(none)" if k is None else str(k)): c for k, c in rows}
+
+
+@pytest.mark.parametrize("facet_limit", [50, 1])
+def test_facets_match_one_group_by_per_column(con, monkeypatch, facet_limit):
+    monkeypatch.setattr("app.services.tools.catalog_query._FACET_LIMIT", facet_limit)
+    cols = ["level", "isRef", "strainName", "taxonomicLevelGenus"]
+    out = execute(CatalogQuery(operation="facets", facet_by=cols), con)
+    assert out["total"] == 5
+    for col in cols:
+        expected = _facet_per_column(con, col, facet_limit)
+        # Same buckets in the same order, ties included.
+        assert list(out["facets"][col].items()) == list(expected.items())
+
+
+def _queries_run(con, q: CatalogQuery) -> int:
+    from app.services.query_profile import profiler
+
+    profiler.configure(enabled=True, capacity=8)
+    profiler.clear()
+    try:
+        execute(q, con)
+        [record] = profiler.records()
+    finally:
+        profiler.configure(enabled=False, capacity=256)
+        profiler.clear()
+    return len(record["queries"])
+
+
+def test_facets_and_total_share_one_scan(con):
+    facets = CatalogQuery(operation="facets", facet_by=["level", "isRef"])
+    assert _queries_run(con, facets) == 1
+    # A truncated list: the page, then the total with the auto-facets.
+    assert _queries_run(con, CatalogQuery(operation="list", limit=2)) == 2
+    # A page that reaches the end tells the total by itself.
+    assert _queries_run(con, CatalogQuery(operation="list", limit=10)) == 1
+
+
+def test_list_total_when_paging(con):
+    out = execute(CatalogQuery(operation="list", limit=2, offset=4), con)
+    assert (out["total"], out["returned"], out["truncated"]) == (5, 1, False)
+    out = execute(CatalogQuery(operation="list", limit=2, offset=9), con)
+    assert (out["total"], out["returned"], out["truncated"]) == (5, 0, False)
+
+
+def test_facets_on_an_empty_match(con):
+    q = CatalogQuery(
+        operation="facets",
+        facet_by=["level"],
+        filters=[Filter(field="accession", op=Op.eq, value="nope")],
+    )
+    assert execute(q, con) == {"total": 0, "facets": {"level": {}}}
+
+
 def test_list_field_eq_coercion_matches_contains(con):
     # `eq` on the list field ploidy should behave like contains (membership)
     eq_q = CatalogQuery(
@@ -604,6 +677,92 @@ def test_connect_requires_every_entity_table(tmp_path):
     assert connect(str(tmp_path)) is None
 
 
+def _write_catalog(catalog_dir, n_assemblies: int = 3) -> None:
+    """A catalog JSON pair that passes the drift check: every configured
+    column present and typed as its schema declares."""
+
+    def record(entity: str, i: int) -> dict:
+        schema = ENTITY_SCHEMA[entity]
+        out = {}
+        for c in sorted(schema.configured_columns):
+            if c in schema.numeric_fields:
+                out[c] = i
+            elif c in schema.list_fields:
+                out[c] = [f"{c}-{i}"]
+            else:
+                out[c] = f"{c}-{i % 2}"
+        return out
+
+    (catalog_dir / "assemblies.json").write_text(
+        json.dumps([record("assembly", i) for i in range(n_assemblies)])
+    )
+    (catalog_dir / "organisms.json").write_text(
+        json.dumps([record("organism", i) for i in range(2)])
+    )
+
+
+class TestSnapshot:
+    @staticmethod
+    def _database(con) -> str:
+        return con.execute("SELECT current_database()").fetchone()[0]
+
+    def test_connect_prefers_the_snapshot(self, tmp_path):
+        pytest.importorskip("duckdb")
+        _write_catalog(tmp_path)
+        from_json = connect(str(tmp_path))
+        assert self._database(from_json) == "memory"
+        assert build_snapshot(str(tmp_path)) == {"assembly": 3, "organism": 2}
+        from_snapshot = connect(str(tmp_path))
+        assert self._database(from_snapshot) == "snapshot"
+        for entity in ENTITY_SCHEMA:
+            q = CatalogQuery(entity=entity, operation="list", limit=10)
+            assert execute(q, from_snapshot) == execute(q, from_json)
+
+    def test_snapshot_is_read_only(self, tmp_path):
+        duckdb = pytest.importorskip("duckdb")
+        _write_catalog(tmp_path)
+        build_snapshot(str(tmp_path))
+        con = connect(str(tmp_path))
+        with pytest.raises(duckdb.Error):
+            con.execute("DELETE FROM assembly")
+
+    def test_stale_snapshot_falls_back_to_json(self, tmp_path):
+        pytest.importorskip("duckdb")
+        _write_catalog(tmp_path)
+        build_snapshot(str(tmp_path))
+        _write_catalog(tmp_path, n_assemblies=5)
+        con = connect(str(tmp_path))
+        assert self._database(con) == "memory"
+        assert execute(CatalogQuery(), con)["total"] == 5
+
+    def test_unreadable_snapshot_falls_back_to_json(self, tmp_path):
+        pytest.importorskip("duckdb")
+        _write_catalog(tmp_path)
+        (tmp_path / SNAPSHOT_FILE).write_text("not a database")
+        con = connect(str(tmp_path))
+        assert self._database(con) == "memory"
+
+    def test_explicit_snapshot_path(self, tmp_path):
+        pytest.importorskip("duckdb")
+        _write_catalog(tmp_path)
+        elsewhere = tmp_path / "built" / "snap.duckdb"
+        elsewhere.parent.mkdir()
+        build_snapshot(str(tmp_path), str(elsewhere))
+        con = connect(str(tmp_path), snapshot_path=str(elsewhere))
+        assert self._database(con) == "snapshot"
+
+    def test_build_fails_on_drift_and_keeps_the_old_snapshot(self, tmp_path):
+        pytest.importorskip("duckdb")
+        _write_catalog(tmp_path)
+        build_snapshot(str(tmp_path))
+        before = (tmp_path / SNAPSHOT_FILE).read_bytes()
+        (tmp_path / "assemblies.json").write_text('[{"accession": "A1"}]')
+        with pytest.raises(CatalogSchemaDrift):
+            build_snapshot(str(tmp_path))
+        assert (tmp_path / SNAPSHOT_FILE).read_bytes() == before
+        assert not (tmp_path / (SNAPSHOT_FILE + ".tmp")).exists()
+
+
 def _ok_coltypes(entity: str = "assembly") -> dict[str, str]:
     """A schema where every column the entity is configured for is present and
     correctly typed (numeric -> BIGINT, list -> VARCHAR[], else VARCHAR)."""
@@ -746,3 +905,227 @@ def test_facets_have_stable_order_on_count_ties(con):
     # resolve deterministically by key, not shuffle.
     out = execute(CatalogQuery(operation="facets", facet_by=["level"]), con)
     assert list(out["facets"]["level"]) == ["Chromosome", "Scaffold", "Contig"]
+
+
+# --- cost guards ----------------------------------------------------------------
+
+# Minutes of work if nobody stops it.
+SLOW_SQL = "SELECT SUM(hash(i)) FROM range(10000000000) t(i)"
+
+
+class TestCatalogLimits:
+    def test_list_over_the_cap_raises(self, con):
+        q = CatalogQuery(operation="list", limit=2)
+        # A list fetches limit + 1 rows to tell whether it was truncated.
+        assert execute(q, con, QueryLimits(max_rows=3))["returned"] == 2
+        with pytest.raises(QueryTooExpensive):
+            execute(q, con, QueryLimits(max_rows=2))
+
+    def test_timeout(self, con, monkeypatch):
+        monkeypatch.setattr(
+            "app.services.tools.catalog_query._compile_where",
+            lambda q: (f"({SLOW_SQL}) IS NOT NULL", []),
+        )
+        with pytest.raises(QueryTooExpensive) as exc_info:
+            execute(CatalogQuery(), con, QueryLimits(timeout_seconds=0.2))
+        assert exc_info.value.reason == "timeout"
+
+    @pytest.mark.asyncio
+    async def test_tool_returns_structured_result(self, con):
+        engine = CatalogEngine(con, QueryLimits(max_rows=1))
+        deps = AssistantDeps(catalog=None, query_engine=engine)
+        out = json.loads(await query_catalog(deps, CatalogQuery(operation="list")))
+        engine.close()
+        assert out["too_expensive"] == {"reason": "rows", "limit": 1}
+
+
+class TestCatalogEngine:
+    def test_each_thread_gets_its_own_connection(self, con):
+        engine = CatalogEngine(con, max_workers=4)
+        q = CatalogQuery(operation="facets", facet_by=["level"])
+        expected = execute(q, con)
+        barrier = threading.Barrier(4)
+
+        def run():
+            barrier.wait()
+            return engine.execute(q), id(engine._connection())
+
+        with ThreadPoolExecutor(4) as pool:
+            results = list(pool.map(lambda _: run(), range(4)))
+        engine.close()
+        assert all(result == expected for result, _ in results)
+        assert len({con_id for _, con_id in results}) == 4
+
+    @pytest.mark.asyncio
+    async def test_run_keeps_the_event_loop_free(self, con, monkeypatch):
+        # A query that takes a while; the loop must keep ticking meanwhile.
+        monkeypatch.setattr(
+            "app.services.tools.catalog_query._compile_where",
+            lambda q: (
+                "(SELECT SUM(hash(i)) FROM range(30000000) t(i)) IS NOT NULL",
+                [],
+            ),
+        )
+        engine = CatalogEngine(con)
+        ticks = 0
+
+        async def tick():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        ticker = asyncio.create_task(tick())
+        result = await engine.run(CatalogQuery())
+        ticker.cancel()
+        engine.close()
+        assert result["total"] == 5
+        assert ticks > 0
+
+    @pytest.mark.asyncio
+    async def test_snapshot_engine_on_worker_threads(self, tmp_path):
+        _write_catalog(tmp_path)
+        build_snapshot(str(tmp_path))
+        engine = CatalogEngine(connect(str(tmp_path)), max_workers=2)
+        results = await asyncio.gather(
+            *(engine.run(CatalogQuery(entity="organism")) for _ in range(4))
+        )
+        engine.close()
+        assert [r["total"] for r in results] == [2, 2, 2, 2]
+
+
+class TestResultCache:
+    def test_equivalent_queries_share_a_key(self):
+        a = CatalogQuery(
+            filters=[
+                Filter(field="level", op=Op.in_, value=["Contig", "Scaffold"]),
+                Filter(field="isRef", op=Op.eq, value="Yes"),
+            ],
+            facet_by=["level"],
+            limit=5,
+        )
+        b = CatalogQuery(
+            filters=[
+                Filter(field="isRef", op=Op.eq, value=" Yes "),
+                Filter(
+                    field="level", op=Op.in_, value=["Scaffold", "Contig", "Contig"]
+                ),
+                Filter(field="isRef", op=Op.eq, value="Yes"),
+            ],
+            limit=5,
+        )
+        assert canonical_query(a) == canonical_query(b)
+        assert canonical_query(a) != canonical_query(a.model_copy(update={"offset": 5}))
+        # A count doesn't page, so paging can't split its entries.
+        count = CatalogQuery(operation="count")
+        assert canonical_query(count) == canonical_query(
+            count.model_copy(update={"limit": 3, "offset": 6})
+        )
+
+    def test_whitespace_is_stripped_before_matching(self, con):
+        q = CatalogQuery(
+            operation="count",
+            filters=[Filter(field="level", op=Op.in_, value=[" Contig", "Scaffold "])],
+        )
+        assert q.filters[0].value == ["Contig", "Scaffold"]
+        assert execute(q, con)["total"] > 0
+
+    def test_repeat_skips_duckdb(self, con):
+        engine = CatalogEngine(con)
+        q = CatalogQuery(operation="facets", facet_by=["level"])
+        first = engine.execute(q)
+        first["total"] = -1  # callers can't corrupt the cached copy
+        reordered = CatalogQuery(operation="facets", facet_by=["level", "level"])
+        assert _queries_run_on(engine, reordered) == 0
+        assert engine.execute(reordered) == execute(q, con)
+        assert engine.cache_stats() == {
+            "build_id": None,
+            "entries": 1,
+            "capacity": 1024,
+            "hits": 2,
+            "misses": 1,
+            "hit_rate": 0.6667,
+        }
+        engine.close()
+
+    @pytest.mark.asyncio
+    async def test_run_answers_hits_without_a_thread(self, con):
+        engine = CatalogEngine(con, build_id="b1")
+        q = CatalogQuery(operation="count")
+        assert await engine.run(q) == await engine.run(q)
+        assert engine.cache_stats()["hits"] == 1
+        engine.close()
+
+    def test_build_id_is_part_of_the_key(self, con):
+        old = CatalogEngine(con, build_id="old", cache_size=2)
+        q = CatalogQuery(operation="count")
+        old.execute(q)
+        # Same tables, same query: only the build id differs.
+        old.build_id = "new"
+        old.execute(q)
+        assert old.cache_stats()["misses"] == 2
+        old.close()
+
+    def test_oldest_entry_is_evicted(self, con):
+        engine = CatalogEngine(con, cache_size=2)
+        for limit in (1, 2, 3):
+            engine.execute(CatalogQuery(limit=limit))
+        assert engine.cache_stats()["entries"] == 2
+        assert _queries_run_on(engine, CatalogQuery(limit=1)) > 0
+        engine.close()
+
+    def test_zero_size_turns_the_cache_off(self, con):
+        engine = CatalogEngine(con, cache_size=0)
+        engine.execute(CatalogQuery(operation="count"))
+        engine.execute(CatalogQuery(operation="count"))
+        stats = engine.cache_stats()
+        assert (stats["entries"], stats["hits"], stats["hit_rate"]) == (0, 0, None)
+        engine.close()
+
+    def test_too_expensive_is_not_cached(self, con):
+        engine = CatalogEngine(con, QueryLimits(max_rows=1))
+        q = CatalogQuery(limit=5)
+        for _ in range(2):
+            with pytest.raises(QueryTooExpensive):
+                engine.execute(q)
+        assert engine.cache_stats()["entries"] == 0
+        engine.close()
+
+    def test_build_id_comes_from_build_meta(self, tmp_path):
+        assert catalog_build_id(str(tmp_path)) is None
+        (tmp_path / "data-build-meta.json").write_text(
+            json.dumps({"start_time": "a", "end_time": "2026-01-02T03:04:05"})
+        )
+        assert catalog_build_id(str(tmp_path)) == "2026-01-02T03:04:05"
+
+
+def _queries_run_on(engine: CatalogEngine, q: CatalogQuery) -> int:
+    from app.services.query_profile import profiler
+
+    profiler.configure(enabled=True, capacity=1)
+    profiler.clear()
+    try:
+        engine.execute(q)
+        [record] = profiler.records()
+    finally:
+        profiler.configure(enabled=False, capacity=256)
+        profiler.clear()
+    return len(record["queries"])
+
+
+class TestCatalogProfiling:
+    def test_execute_is_recorded(self, con):
+        from app.services.query_profile import profiler
+
+        profiler.configure(enabled=True, capacity=256)
+        profiler.clear()
+        try:
+            execute(CatalogQuery(operation="list", limit=2), con)
+            [record] = profiler.records(source="catalog")
+        finally:
+            profiler.configure(enabled=False, capacity=256)
+            profiler.clear()
+        assert record["tool"] == "query_catalog"
+        # The total, the auto-facets and the page each get an entry.
+        assert len(record["queries"]) >= 2
+        assert all("FROM" in q["sql"] for q in record["queries"])
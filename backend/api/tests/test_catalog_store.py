@@ -0,0 +1,131 @@
+"""Tests for the shared, compact catalog store behind both CatalogData classes."""
+
+import json
+
+import pytest
+
+from app.services.catalog_data import CatalogData as MCPCatalogData
+from app.services.catalog_store import (
+    _MISSING,
+    CatalogRecord,
+    CatalogStore,
+    get_catalog_store,
+)
+from app.services.tools.catalog_data import CatalogData as AssistantCatalogData
+
+GENOMES = [
+    {
+        "accession": "GCF_000002765.6",
+        "ncbiTaxonomyId": "36329",
+        "speciesTaxonomyId": "5833",
+        "taxonomicLevelGenus": "Plasmodium",
+        "ploidy": ["HAPLOID"],
+        "strainName": None,
+        "isRef": "Yes",
+    },
+    {
+        "accession": "GCA_900632045.1",
+        "ncbiTaxonomyId": "5833",
+        "speciesTaxonomyId": "5833",
+        "taxonomicLevelGenus": "Plasmodium",
+        "ploidy": ["HAPLOID"],
+        "strainName": "7G8",
+        "isRef": "No",
+    },
+]
+ORGANISMS = [
+    {
+        "ncbiTaxonomyId": "5833",
+        "taxonomicLevelSpecies": "Plasmodium falciparum",
+        "taxonomicLevelGenus": "Plasmodium",
+        "genomes": GENOMES,
+    },
+    {"ncbiTaxonomyId": "1", "taxonomicLevelGenus": "Plasmodium"},
+]
+
+
+@pytest.fixture()
+def catalog_dir(tmp_path):
+    (tmp_path / "organisms.json").write_text(json.dumps(ORGANISMS))
+    (tmp_path / "assemblies.json").write_text(json.dumps(GENOMES))
+    (tmp_path / "workflows.json").write_text("[]")
+    return tmp_path
+
+
+class TestCatalogRecord:
+    def test_reads_like_the_json_object(self, catalog_dir):
+        asm = CatalogStore(catalog_dir).assemblies[0]
+        assert asm == GENOMES[0]
+        assert dict(asm) == GENOMES[0]
+        assert {**asm, "extra": 1} == {**GENOMES[0], "extra": 1}
+        assert asm["isRef"] == "Yes"
+        assert asm.get("strainName", "x") is None
+        assert "accession" in asm and len(asm) == len(GENOMES[0])
+
+    def test_absent_keys(self, catalog_dir):
+        org = CatalogStore(catalog_dir).organisms[1]
+        # The first organism's keys are in the shared table, but not this one's.
+        assert org.get("genomes", []) == []
+        assert "genomes" not in org
+        assert set(org) == {"ncbiTaxonomyId", "taxonomicLevelGenus"}
+        with pytest.raises(KeyError):
+            org["genomes"]
+        with pytest.raises(KeyError):
+            org["nope"]
+        assert org and not CatalogRecord({"genomes": 0}, (_MISSING,))
+
+    def test_has_no_instance_dict(self, catalog_dir):
+        asm = CatalogStore(catalog_dir).assemblies[0]
+        assert not hasattr(asm, "__dict__")
+        with pytest.raises(AttributeError):
+            asm.accession = "x"
+
+
+class TestCatalogStore:
+    def test_genomes_are_the_assembly_records(self, catalog_dir):
+        store = CatalogStore(catalog_dir)
+        first, second = store.organisms[0]["genomes"]
+        assert first is store.assemblies[0] and second is store.assemblies[1]
+
+    def test_differing_genome_is_kept_as_is(self, catalog_dir):
+        changed = [{**GENOMES[0], "isRef": "No"}, GENOMES[1]]
+        (catalog_dir / "assemblies.json").write_text(json.dumps(changed))
+        store = CatalogStore(catalog_dir)
+        first, second = store.organisms[0]["genomes"]
+        assert first["isRef"] == "Yes" and first is not store.assemblies[0]
+        assert second is store.assemblies[1]
+
+    def test_strings_are_interned(self, catalog_dir):
+        store = CatalogStore(catalog_dir)
+        genera = [a["taxonomicLevelGenus"] for a in store.assemblies]
+        genera += [o["taxonomicLevelGenus"] for o in store.organisms]
+        assert all(g is genera[0] for g in genera)
+        assert store.assemblies[0]["ploidy"][0] is store.assemblies[1]["ploidy"][0]
+
+    def test_missing_and_corrupt_files_load_empty(self, catalog_dir):
+        (catalog_dir / "organisms.json").write_text("{not json")
+        (catalog_dir / "workflows.json").unlink()
+        store = CatalogStore(catalog_dir)
+        assert store.organisms == [] and store.workflow_categories == []
+        assert len(store.assemblies) == 2
+
+
+class TestSharedStore:
+    def test_one_store_per_directory(self, catalog_dir):
+        store = get_catalog_store(str(catalog_dir))
+        assert get_catalog_store(str(catalog_dir / ".." / catalog_dir.name)) is store
+
+    def test_both_catalogs_are_views_over_it(self, catalog_dir):
+        mcp = MCPCatalogData(str(catalog_dir))
+        assistant = AssistantCatalogData(str(catalog_dir))
+        assert mcp.organisms is assistant.organisms
+        assert assistant.organisms[0]["genomes"][0] is mcp.assemblies[0]
+        assert mcp.get_assembly_details("GCA_900632045.1")["strain"] == "7G8"
+        assert assistant.get_assembly_details("GCA_900632045.1")["strain"] == "7G8"
+
+    def test_files_are_read_once(self, catalog_dir):
+        store = get_catalog_store(str(catalog_dir))
+        (catalog_dir / "organisms.json").write_text(json.dumps(ORGANISMS[:1]))
+        # Both catalogs built after a change still share the first load.
+        assert get_catalog_store(str(catalog_dir)) is store
+        assert len(AssistantCatalogData(str(catalog_dir)).organisms) == 2
@@ -0,0 +1,143 @@
+"""Tests for catalog type-ahead suggestions and /api/v1/catalog/suggest."""
+
+import json
+
+import pytest
+
+from app.services.catalog_data import CatalogData
+
+ORGANISMS = [
+    {
+        "ncbiTaxonomyId": "5833",
+        "taxonomicLevelSpecies": "Plasmodium falciparum",
+        "commonNames": ["malaria parasite"],
+    },
+    {
+        "ncbiTaxonomyId": "5855",
+        "taxonomicLevelSpecies": "Plasmodium vivax",
+    },
+    {
+        "ncbiTaxonomyId": "1",
+        "taxonomicLevelSpecies": "Plasmodium",
+        "commonNames": "plasmodia",
+    },
+    {
+        "ncbiTaxonomyId": "5476",
+        "taxonomicLevelSpecies": "Candida albicans",
+        "commonNames": ["thrush yeast", "yeast"],
+    },
+]
+ASSEMBLIES = [
+    {"accession": "GCF_000002765.6", "taxonomicLevelSpecies": "Plasmodium falciparum"},
+    {"accession": "GCA_000002415.2", "taxonomicLevelSpecies": "Plasmodium vivax"},
+]
+WORKFLOWS = [
+    {
+        "category": "VARIANT_CALLING",
+        "name": "Variant calling",
+        "workflows": [
+            {"iwcId": "haploid-vc", "workflowName": "Haploid variant calling"},
+            {
+                "iwcId": "plasmid-flye",
+                "workflowName": "Plasmid assembly with Flye",
+                "scope": "ORGANISM",
+            },
+        ],
+    }
+]
+
+
+@pytest.fixture()
+def catalog(tmp_path):
+    # Not tmp_path itself: the app fixture writes its own catalog there.
+    path = tmp_path / "catalog"
+    path.mkdir()
+    for name, data in (
+        ("organisms", ORGANISMS),
+        ("assemblies", ASSEMBLIES),
+        ("workflows", WORKFLOWS),
+    ):
+        (path / f"{name}.json").write_text(json.dumps(data))
+    return CatalogData(str(path))
+
+
+def _ids(suggestions):
+    return [(s["type"], s["id"]) for s in suggestions]
+
+
+class TestSuggest:
+    def test_exact_then_name_prefix_then_word_prefix(self, catalog):
+        # "plasmodia" and "Plasmodium" both start with "plasmodi"; the exact
+        # name comes first when the query is whole.
+        assert _ids(catalog.suggest("plasmodium")) == [
+            ("organism", "1"),
+            ("organism", "5833"),
+            ("organism", "5855"),
+        ]
+        assert _ids(catalog.suggest("falcip")) == [("organism", "5833")]
+
+    def test_common_name_reports_what_matched(self, catalog):
+        [hit] = catalog.suggest("Malaria")
+        assert hit == {
+            "type": "organism",
+            "id": "5833",
+            "label": "Plasmodium falciparum",
+            "description": "malaria parasite",
+            "matched": "malaria parasite",
+        }
+        # Both common names match; the organism is suggested once.
+        assert _ids(catalog.suggest("yeast")) == [("organism", "5476")]
+
+    def test_assemblies_and_workflows(self, catalog):
+        assert _ids(catalog.suggest("gcf_0000")) == [("assembly", "GCF_000002765.6")]
+        # A later word of the accession works too.
+        assert _ids(catalog.suggest("000002415")) == [("assembly", "GCA_000002415.2")]
+        assert _ids(catalog.suggest("variant")) == [("workflow", "haploid-vc")]
+
+    def test_non_assembly_scope_workflows_are_left_out(self, catalog):
+        assert catalog.suggest("flye") == []
+
+    def test_type_filter_and_limit(self, catalog):
+        assert _ids(catalog.suggest("p", types=["assembly"])) == []
+        assert _ids(catalog.suggest("plasmodium", limit=1)) == [("organism", "1")]
+        assert {s["type"] for s in catalog.suggest("g", types=["assembly"])} == {
+            "assembly"
+        }
+
+    def test_blank(self, catalog):
+        assert catalog.suggest("  ") == []
+
+
+class TestSuggestEndpoint:
+    @pytest.fixture()
+    def api(self, client, catalog):
+        from app.core.dependencies import get_catalog_data
+
+        client.app.dependency_overrides[get_catalog_data] = lambda: catalog
+        return client
+
+    def test_suggest(self, api):
+        resp = api.get("/api/v1/catalog/suggest", params={"q": "plas", "limit": 2})
+        assert resp.status_code == 200, resp.text
+        body = resp.json()
+        assert body["query"] == "plas"
+        assert _ids(body["suggestions"]) == [("organism", "1"), ("organism", "5833")]
+
+    def test_type_filter(self, api):
+        resp = api.get(
+            "/api/v1/catalog/suggest",
+            params=[("q", "g"), ("type", "assembly"), ("type", "workflow")],
+        )
+        assert {s["type"] for s in resp.json()["suggestions"]} == {"assembly"}
+
+    @pytest.mark.parametrize(
+        "params",
+        [
+            {"q": ""},
+            {"q": "p", "limit": 0},
+            {"q": "p", "limit": 51},
+            {"q": "p", "type": "x"},
+        ],
+    )
+    def test_invalid(self, api, params):
+        assert api.get("/api/v1/catalog/suggest", params=params).status_code == 422
@@ -12,6 +12,7 @@ class TestSRAMirrorDependencyGating:
     def _with_path(self, monkeypatch, path):
         fake = MagicMock()
         fake.SRA_MIRROR_PATH = path
+        fake.SRA_MIRROR_RELOAD_SECONDS = 0
         monkeypatch.setattr(dependencies, "get_settings", lambda: fake)
         dependencies.get_sra_mirror_service.cache_clear()
 
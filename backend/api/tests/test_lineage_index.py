@@ -0,0 +1,113 @@
+"""Tests for the interval-encoded taxonomy lineage index."""
+
+import json
+import random
+
+from app.services.catalog_data import CatalogData as MCPCatalogData
+from app.services.lineage_index import LineageIndex
+
+LINEAGES = [
+    ["1", "131567", "2", "1224", "561", "562"],  # E. coli
+    [1, 131567, 2, 1224, 590],  # Salmonella, as ints
+    ["1", "131567", "2759", "4751", "4932", "559292"],  # yeast
+    ["1", "10239", "11158"],  # a virus
+    [],
+]
+
+
+def test_ancestors_and_descendants():
+    index = LineageIndex(LINEAGES)
+    assert len(index) == 13
+    assert index.is_ancestor("2", "562") and index.is_ancestor(2, 590)
+    assert index.is_ancestor("131567", "559292")
+    assert index.is_ancestor("1", "11158") and index.is_ancestor("10239", "11158")
+    # Inclusive of the taxon itself; never a descendant or a sibling.
+    assert index.is_ancestor("562", "562")
+    assert not index.is_ancestor("562", "2")
+    assert not index.is_ancestor("590", "562")
+    assert not index.is_ancestor("2", "559292")
+    assert not index.is_ancestor("131567", "11158")
+
+
+def test_subtree():
+    index = LineageIndex(LINEAGES)
+    assert index.subtree("2") == ["2", "1224", "561", "562", "590"]
+    assert index.subtree(562) == ["562"]
+    assert index.subtree("999") == []
+    assert len(index.subtree("1")) == len(index)
+
+
+def test_unknown_taxa_match_nothing():
+    index = LineageIndex(LINEAGES)
+    assert "999" not in index and "562" in index
+    assert not index.is_ancestor("999", "562")
+    assert not index.is_ancestor("2", "999")
+    assert not LineageIndex([]).is_ancestor("1", "1")
+
+
+def test_first_lineage_wins_a_conflict():
+    index = LineageIndex([["1", "2", "3"], ["1", "4", "3"]])
+    assert index.is_ancestor("2", "3")
+    assert not index.is_ancestor("4", "3")
+
+
+def _lineage(parent, tid):
+    path = []
+    while tid is not None:
+        path.append(tid)
+        tid = parent[tid]
+    return path[::-1]
+
+
+def test_matches_the_ancestor_sets():
+    # Random trees: every answer agrees with membership in the taxon's own
+    # root..taxon prefix, the ancestor sets this index replaced.
+    rng = random.Random(3)
+    for _ in range(20):
+        parent = {"0": None}
+        for n in range(1, 200):
+            parent[str(n)] = str(rng.randrange(n))
+        lineages = [_lineage(parent, str(rng.randrange(200))) for _ in range(60)]
+        ancestors = {}
+        for lin in lineages:
+            for i, tid in enumerate(lin):
+                ancestors.setdefault(tid, set()).update(lin[: i + 1])
+        index = LineageIndex(lineages)
+        for taxon, above in ancestors.items():
+            for candidate in ancestors:
+                assert index.is_ancestor(candidate, taxon) == (candidate in above)
+
+
+def test_mcp_compatible_workflows_only_match_ancestor_taxa(tmp_path):
+    (tmp_path / "assemblies.json").write_text(
+        json.dumps(
+            [
+                {"accession": "GCF_000005845.2", "lineageTaxonomyIds": LINEAGES[0]},
+                {"accession": "GCF_000146045.2", "lineageTaxonomyIds": LINEAGES[2]},
+            ]
+        )
+    )
+    (tmp_path / "workflows.json").write_text(
+        json.dumps(
+            [
+                {
+                    "category": "ANNOTATION",
+                    "name": "Annotation",
+                    "workflows": [
+                        {"iwcId": "bacteria", "taxonomyId": 2, "ploidy": "ANY"},
+                        {"iwcId": "e-coli", "taxonomyId": "562", "ploidy": "ANY"},
+                    ],
+                }
+            ]
+        )
+    )
+    catalog = MCPCatalogData(str(tmp_path))
+
+    def compatible(taxonomy_id):
+        wfs = catalog.get_compatible_workflows(["HAPLOID"], taxonomy_id)
+        return {w["iwcId"] for w in wfs}
+
+    assert compatible("562") == {"bacteria", "e-coli"}
+    # A workflow for E. coli isn't one for every bacterium.
+    assert compatible("2") == {"bacteria"}
+    assert compatible("559292") == set()
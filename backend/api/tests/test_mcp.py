@@ -21,7 +21,14 @@ from app.services.sra_mirror import SRAMirrorService
 from tests.test_catalog_data import SAMPLE_ORGANISMS, SAMPLE_WORKFLOWS
 from tests.test_sra_mirror import _build_mirror
 
-SRA_TOOL_NAMES = {"search_sra", "sra_data_summary", "get_sra_study_runs"}
+SRA_TOOL_NAMES = {
+    "search_sra",
+    "sra_data_summary",
+    "sra_data_summaries",
+    "sra_release_histogram",
+    "get_sra_study_runs",
+    "get_sra_runs",
+}
 
 
 def _make_app(tmp_path, monkeypatch, sra_mirror_path=None):
@@ -219,6 +226,7 @@ class TestSRAInstructions:
     def test_instructions_mention_sra_when_available(self, tmp_path, mirror):
         mcp = create_mcp_server(_catalog_data(tmp_path), MagicMock(), sra_mirror=mirror)
         assert "search_sra" in mcp.instructions
+        assert "sra_data_summaries" in mcp.instructions
 
     def test_instructions_silent_without_mirror(self, tmp_path):
         mcp = create_mcp_server(_catalog_data(tmp_path), MagicMock(), sra_mirror=None)
@@ -253,12 +261,41 @@ class TestSRAToolCalls:
         assert data["resolved"] is True
         assert data["n_runs"] >= 2
 
+    def test_sra_data_summaries_returns_one_per_organism(self, tmp_path, mirror):
+        mcp = create_mcp_server(_catalog_data(tmp_path), MagicMock(), sra_mirror=mirror)
+        data = _call_tool(
+            mcp,
+            "sra_data_summaries",
+            {"organisms": ["Plasmodium falciparum", "Mycobacterium tuberculosis"]},
+        )
+        assert [s["n_runs"] for s in data["summaries"]] == [2, 1]
+
+    def test_sra_release_histogram_counts_per_year(self, tmp_path, mirror):
+        mcp = create_mcp_server(_catalog_data(tmp_path), MagicMock(), sra_mirror=mirror)
+        data = _call_tool(
+            mcp,
+            "sra_release_histogram",
+            {"organism": "Plasmodium falciparum", "breakdown": "platform"},
+        )
+        assert [(b["period"], b["counts"]) for b in data["buckets"]] == [
+            ("2020", {"ILLUMINA": 1}),
+            ("2021", {"OXFORD_NANOPORE": 1}),
+        ]
+
     def test_get_sra_study_runs_returns_runs(self, tmp_path, mirror):
         mcp = create_mcp_server(_catalog_data(tmp_path), MagicMock(), sra_mirror=mirror)
         data = _call_tool(mcp, "get_sra_study_runs", {"accession": "PRJNA12345"})
         assert data["matched_column"] == "bioproject"
         assert data["n_returned"] == 2
 
+    def test_get_sra_runs_returns_runs_in_input_order(self, tmp_path, mirror):
+        mcp = create_mcp_server(_catalog_data(tmp_path), MagicMock(), sra_mirror=mirror)
+        data = _call_tool(
+            mcp, "get_sra_runs", {"accessions": ["SRR002", "SRR999", "SRR001"]}
+        )
+        assert [r["accession"] for r in data["runs"]] == ["SRR002", "SRR001"]
+        assert data["not_found"] == ["SRR999"]
+
 
 class TestSRAMCPWiring:
     """End-to-end through create_app(): SRA_MIRROR_PATH set wires the mirror
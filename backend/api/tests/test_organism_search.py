@@ -0,0 +1,130 @@
+"""Tests for the inverted index behind CatalogData.search_organisms."""
+
+import random
+
+import pytest
+
+from app.services.organism_search import (
+    NO_MATCH,
+    OrganismSearchIndex,
+    _rank,
+    field_values,
+)
+
+FIELDS = ("taxonomicLevelSpecies", "taxonomicLevelGenus", "commonNames")
+
+ORGANISMS = [
+    {
+        "ncbiTaxonomyId": "5855",
+        "taxonomicLevelSpecies": "Plasmodium vivax",
+        "taxonomicLevelGenus": "Plasmodium",
+        "commonNames": ["malaria parasite"],
+    },
+    {
+        "ncbiTaxonomyId": "562",
+        "taxonomicLevelSpecies": "Escherichia coli",
+        "taxonomicLevelGenus": "Escherichia",
+        "commonNames": ["E. coli"],
+    },
+    {
+        "ncbiTaxonomyId": "5833",
+        "taxonomicLevelSpecies": "Plasmodium falciparum",
+        "taxonomicLevelGenus": "Plasmodium",
+        "commonNames": None,
+    },
+    {
+        "ncbiTaxonomyId": "90371",
+        "taxonomicLevelSpecies": "Salmonella enterica",
+        "taxonomicLevelGenus": "Salmonella",
+        "commonNames": [],
+    },
+    {
+        "ncbiTaxonomyId": "1",
+        "taxonomicLevelSpecies": "Plasmodium",
+        "taxonomicLevelGenus": "Plasmodium",
+    },
+]
+
+
+@pytest.fixture()
+def index():
+    return OrganismSearchIndex(ORGANISMS, FIELDS, exact_fields=("ncbiTaxonomyId",))
+
+
+def _scan(organisms, query, limit):
+    """Rank every organism by brute force, best first, catalog order within a
+    rank."""
+    q = query.strip().lower()
+    ranked = [
+        (_rank(q, [v for f in FIELDS for v in field_values(org, f)]), i)
+        for i, org in enumerate(organisms)
+    ]
+    return [i for rank, i in sorted(ranked) if rank < NO_MATCH and q][:limit]
+
+
+def test_exact_then_prefix_then_substring(index):
+    # "Plasmodium" is the whole species of #4 and the genus of #0 and #2,
+    # all exact; catalog order breaks the tie.
+    assert index.search("plasmodium") == [0, 2, 4]
+    # "coli" starts a word of #1's species; "ella" is only inside #3's genus.
+    assert index.search("coli") == [1]
+    assert index.search("ella") == [3]
+    assert index.search("vivax") == [0]
+
+
+def test_rank_orders_across_organisms():
+    organisms = [
+        {"taxonomicLevelSpecies": "Candida lauris"},  # substring
+        {"taxonomicLevelSpecies": "Aurisia major"},  # prefix
+        {"taxonomicLevelSpecies": "auris"},  # exact
+    ]
+    index = OrganismSearchIndex(organisms, FIELDS)
+    assert index.search("auris") == [2, 1, 0]
+    assert index.search("uris") == [0, 1, 2]
+
+
+def test_multi_word_and_punctuation(index):
+    assert index.search("  Malaria Parasite ") == [0]
+    assert index.search("e. coli") == [1]
+    assert index.search("falciparum x") == []
+    # Nothing to look up by, but still a substring of "e. coli".
+    assert index.search(". ") == [1]
+
+
+def test_exact_only_fields(index):
+    assert index.search("5833") == [2]
+    assert index.search("583") == []
+
+
+def test_limit_and_blank(index):
+    assert index.search("plasmodium", limit=2) == [0, 2]
+    assert index.search("a", limit=0) == []
+    assert index.search("   ") == []
+
+
+def test_short_queries_scan_the_words(index):
+    assert index.search("co") == _scan(ORGANISMS, "co", 10)
+    assert index.search("x") == _scan(ORGANISMS, "x", 10)
+
+
+def test_matches_the_linear_scan():
+    rng = random.Random(7)
+    syllables = ["ba", "co", "li", "ma", "ra", "sal", "mon", "el", "la", "x"]
+
+    def word():
+        return "".join(rng.choice(syllables) for _ in range(rng.randint(1, 4)))
+
+    organisms = [
+        {
+            "taxonomicLevelSpecies": f"{word().title()} {word()}",
+            "taxonomicLevelGenus": word().title(),
+            "commonNames": [f"{word()}-{word()}" for _ in range(rng.randint(0, 2))],
+        }
+        for _ in range(300)
+    ]
+    index = OrganismSearchIndex(organisms, FIELDS)
+    queries = [word()[: rng.randint(1, 6)] for _ in range(200)]
+    queries += ["a b", "-", "la-", " mon ", "-ma", "co ma"]
+    for q in queries:
+        for limit in (3, len(organisms)):
+            assert index.search(q, limit) == _scan(organisms, q, limit), q
@@ -0,0 +1,89 @@
+"""Deadlines, row caps and memory limits for the in-process DuckDB queries."""
+
+import time
+
+import duckdb
+import pytest
+
+from app.services.query_guard import (
+    QueryLimits,
+    QueryTooExpensive,
+    QueryWatchdog,
+    fetch_capped,
+)
+
+# Minutes of work if nobody stops it. Shared with the service tests.
+SLOW_SQL = "SELECT SUM(hash(i)) FROM range(10000000000) t(i)"
+
+
+@pytest.fixture()
+def watchdog():
+    return QueryWatchdog()
+
+
+class TestDeadline:
+    def test_slow_query_is_interrupted(self, watchdog):
+        con = duckdb.connect()
+        started = time.monotonic()
+        with pytest.raises(QueryTooExpensive) as exc_info:
+            with watchdog.guard(con, QueryLimits(timeout_seconds=0.2)):
+                con.execute(SLOW_SQL).fetchall()
+        assert time.monotonic() - started < 5
+        assert exc_info.value.reason == "timeout"
+        # The connection is still usable afterwards.
+        assert con.execute("SELECT 42").fetchone() == (42,)
+
+    def test_every_query_of_a_late_call_is_stopped(self, watchdog):
+        # An interrupt that lands between two queries is cleared when the
+        # next one starts; the watchdog keeps interrupting until the call ends.
+        con = duckdb.connect()
+        with pytest.raises(QueryTooExpensive):
+            with watchdog.guard(con, QueryLimits(timeout_seconds=0.1)):
+                time.sleep(0.3)
+                con.execute(SLOW_SQL).fetchall()
+
+    def test_finished_call_is_not_interrupted_later(self, watchdog):
+        con = duckdb.connect()
+        with watchdog.guard(con, QueryLimits(timeout_seconds=0.1)):
+            assert con.execute("SELECT 1").fetchone() == (1,)
+        time.sleep(0.3)
+        assert con.execute("SELECT count(*) FROM range(1000000)").fetchone() == (
+            1000000,
+        )
+
+    def test_interrupt_from_elsewhere_is_not_a_timeout(self, watchdog):
+        con = duckdb.connect()
+        with pytest.raises(duckdb.InterruptException):
+            with watchdog.guard(con, QueryLimits(timeout_seconds=60)):
+                raise duckdb.InterruptException("INTERRUPT Error: Interrupted!")
+
+    def test_no_timeout_means_no_deadline(self, watchdog):
+        con = duckdb.connect()
+        with watchdog.guard(con, QueryLimits()):
+            con.execute("SELECT 1").fetchall()
+        assert watchdog._thread is None
+
+
+class TestCostLimits:
+    def test_row_cap(self):
+        con = duckdb.connect()
+        assert len(fetch_capped(con.execute("SELECT * FROM range(5)"), 5)) == 5
+        with pytest.raises(QueryTooExpensive) as exc_info:
+            fetch_capped(con.execute("SELECT * FROM range(6)"), 5)
+        assert exc_info.value.reason == "rows"
+        assert len(fetch_capped(con.execute("SELECT * FROM range(6)"), 0)) == 6
+
+    def test_memory_limit(self, watchdog):
+        limits = QueryLimits(memory_limit="32MB")
+        con = duckdb.connect(config=limits.duckdb_config())
+        with pytest.raises(QueryTooExpensive) as exc_info:
+            with watchdog.guard(con, limits):
+                con.execute(
+                    "SELECT i, count(*) FROM range(20000000) t(i) GROUP BY i"
+                ).fetchall()
+        assert exc_info.value.reason == "memory"
+
+    def test_result_is_structured(self):
+        result = QueryTooExpensive("rows", 5000).result()
+        assert result["too_expensive"] == {"reason": "rows", "limit": 5000}
+        assert "5,000" in result["error"]
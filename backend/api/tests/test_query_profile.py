@@ -0,0 +1,123 @@
+"""Opt-in query profiling and the admin endpoint that serves it."""
+
+import duckdb
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.services.query_profile import QueryProfiler, profiler
+
+
+@pytest.fixture()
+def enabled_profiler():
+    """The process-wide profiler, on and empty; off again afterwards."""
+    profiler.configure(enabled=True, capacity=256)
+    profiler.clear()
+    yield profiler
+    profiler.configure(enabled=False, capacity=256)
+    profiler.clear()
+
+
+class TestProfiler:
+    def test_off_records_nothing(self):
+        p = QueryProfiler()
+        con = duckdb.connect()
+        with p.call("catalog", "query_catalog"):
+            with p.query(con, "SELECT 1"):
+                con.execute("SELECT 1").fetchall()
+        assert p.records() == []
+
+    def test_call_records_queries(self):
+        p = QueryProfiler(enabled=True)
+        con = duckdb.connect()
+        with p.call("sra_mirror", "summary_for_organism"):
+            p.cache("miss")
+            with p.query(con, "SELECT count(*)\n   FROM range(1000)"):
+                con.execute("SELECT count(*) FROM range(1000)").fetchall()
+        [record] = p.records(include_profiles=True)
+        assert record["source"] == "sra_mirror"
+        assert record["tool"] == "summary_for_organism"
+        assert record["cache"] == "miss"
+        [query] = record["queries"]
+        assert query["sql"] == "SELECT count(*) FROM range(1000)"
+        assert query["rows_scanned"] == 1000
+        assert record["rows_scanned"] == 1000
+        assert "children" in query["profile"]
+        # Profiling is switched back off once the call is done.
+        setting = "SELECT current_setting('enable_profiling')"
+        assert con.execute(setting).fetchone() == (None,)
+
+    def test_profiles_are_opt_in_on_read(self):
+        p = QueryProfiler(enabled=True)
+        con = duckdb.connect()
+        with p.call("catalog", "query_catalog"):
+            with p.query(con, "SELECT 1"):
+                con.execute("SELECT 1").fetchall()
+        assert "profile" not in p.records()[0]["queries"][0]
+
+    def test_nested_calls_fold_into_the_outer_one(self):
+        p = QueryProfiler(enabled=True)
+        with p.call("sra_mirror", "outer"):
+            with p.call("sra_mirror", "inner"):
+                p.cache("hit")
+        [record] = p.records()
+        assert record["tool"] == "outer"
+        assert record["cache"] == "hit"
+
+    def test_ring_buffer_and_summary(self):
+        p = QueryProfiler(capacity=3, enabled=True)
+        for tool in ("a", "b", "a", "a"):
+            with p.call("sra_mirror", tool):
+                p.cache("miss")
+        assert [r["tool"] for r in p.records()] == ["a", "a", "b"]
+        assert [r["tool"] for r in p.records(limit=1)] == ["a"]
+        assert [r["tool"] for r in p.records(tool="b")] == ["b"]
+        summary = {(g["tool"], g["cache"]): g["calls"] for g in p.summary()}
+        assert summary == {("a", "miss"): 2, ("b", "miss"): 1}
+        p.configure(enabled=True, capacity=1)
+        assert len(p.records()) == 1
+
+
+class TestAdminEndpoint:
+    @pytest.fixture()
+    def client(self):
+        from app.api.v1 import admin
+
+        app = FastAPI()
+        app.include_router(admin.router, prefix="/api/v1/admin")
+        with TestClient(app) as client:
+            yield client
+
+    def test_hidden_without_a_token(self, client, monkeypatch):
+        monkeypatch.delenv("ADMIN_API_TOKEN", raising=False)
+        assert client.get("/api/v1/admin/query-profile").status_code == 404
+
+    def test_requires_the_token(self, client, monkeypatch):
+        monkeypatch.setenv("ADMIN_API_TOKEN", "s3cret")
+        assert client.get("/api/v1/admin/query-profile").status_code == 401
+        resp = client.get(
+            "/api/v1/admin/query-profile",
+            headers={"Authorization": "Bearer wrong"},
+        )
+        assert resp.status_code == 401
+
+    def test_serves_and_clears_the_buffer(self, client, monkeypatch, enabled_profiler):
+        monkeypatch.setenv("ADMIN_API_TOKEN", "s3cret")
+        headers = {"Authorization": "Bearer s3cret"}
+        with enabled_profiler.call("catalog", "query_catalog"):
+            pass
+        resp = client.get("/api/v1/admin/query-profile", headers=headers)
+        assert resp.status_code == 200
+        body = resp.json()
+        assert body["enabled"] is True
+        assert [r["tool"] for r in body["records"]] == ["query_catalog"]
+        assert body["summary"][0]["calls"] == 1
+        resp = client.get(
+            "/api/v1/admin/query-profile?source=sra_mirror", headers=headers
+        )
+        assert resp.json()["records"] == []
+
+        resp = client.delete("/api/v1/admin/query-profile", headers=headers)
+        assert resp.status_code == 204
+        resp = client.get("/api/v1/admin/query-profile", headers=headers)
+        assert resp.json()["records"] == []
@@ -5,12 +5,26 @@ handling without requiring a real mirror file -- a small DuckDB fixture is
 built at a temp path so the service's real read-only queries run against it.
 """
 
+import copy
+import csv
+import io
+import json
 import logging
+import operator
+import threading
+import time
 
 import duckdb
 import pytest
 
-from app.services.sra_mirror import SRAMirrorService
+from app.services.query_guard import QueryLimits, QueryTooExpensive
+from app.services.sra_mirror import (
+    SRAMirrorService,
+    _accession_span_is_narrow,
+    build_rollups,
+    compact_mirror,
+)
+from tests.test_query_guard import SLOW_SQL
 
 
 def _build_mirror(path: str) -> None:
@@ -36,7 +50,8 @@ def _build_mirror(path: str) -> None:
             (1773, 'Mycobacterium tuberculosis'),
             (777, 'Duplicatus exampleus'),
             (778, 'Duplicatus exampleus'),
-            (42, 'Sameday organism')
+            (42, 'Sameday organism'),
+            (99, 'Facetus testus')
         """
     )
     con.execute(
@@ -66,7 +81,20 @@ def _build_mirror(path: str) -> None:
             ('SRRB','SRP9','PRJNA9','Sameday organism','WGS','ILLUMINA','X',
              'PAIRED', DATE '2022-01-01','Kenya', 2),
             ('SRRC','SRP9','PRJNA9','Sameday organism','WGS','ILLUMINA','X',
-             'PAIRED', DATE '2022-01-01','Kenya', 3)
+             'PAIRED', DATE '2022-01-01','Kenya', 3),
+            -- Facet edge cases for the single-pass summary: NULL platform /
+            -- assay / bioproject, an 'uncalculated' country, and one study
+            -- split across two platforms.
+            ('SRRF1','SRPF1','PRJNAF1','Facetus testus','WGS','ILLUMINA','X',
+             'PAIRED', DATE '2018-01-01','Kenya', 1),
+            ('SRRF2','SRPF1','PRJNAF1','Facetus testus','WGS','PACBIO_SMRT','X',
+             'PAIRED', DATE '2018-02-01','Kenya', 1),
+            ('SRRF3','SRPF2','PRJNAF2','Facetus testus','RNA-Seq',NULL,'X',
+             'PAIRED', DATE '2019-01-01','uncalculated', 1),
+            ('SRRF4','SRPF3',NULL,'Facetus testus',NULL,'ILLUMINA','X',
+             'SINGLE', DATE '2020-01-01',NULL, 1),
+            ('SRRF5','SRPF3',NULL,'Facetus testus','WGS','ILLUMINA','X',
+             'SINGLE', NULL,'Brazil', 1)
         """
     )
     con.close()
@@ -81,6 +109,26 @@ def mirror(tmp_path):
     return svc
 
 
+@pytest.fixture()
+def rollup_mirror(tmp_path):
+    """The fixture mirror plus a recent run, with per-taxid rollups built."""
+    path = str(tmp_path / "rollup-mirror.duckdb")
+    _build_mirror(path)
+    con = duckdb.connect(path)
+    con.execute(
+        """
+        INSERT INTO runs VALUES
+            ('SRRF6','SRPF4','PRJNAF2','Facetus testus','WGS','ILLUMINA','X',
+             'PAIRED', CURRENT_DATE - INTERVAL 10 DAY,'Kenya', 1)
+        """
+    )
+    build_rollups(con)
+    con.close()
+    svc = SRAMirrorService(path)
+    assert svc.is_available()
+    return svc
+
+
 class TestInitializeGating:
     """F2: an unset/empty SRA_MIRROR_PATH must not log an ERROR traceback.
 
@@ -162,6 +210,39 @@ class TestOrganismResolution:
         assert result["n_runs"] == 0
         assert result["resolved"] is True
 
+    def test_name_lookup_is_case_insensitive_and_expands_synonyms(self, mirror):
+        assert mirror._resolve_organism("  plasmodium FALCIPARUM 3d7 ") == (
+            5833,
+            ["Plasmodium falciparum", "Plasmodium falciparum 3D7"],
+        )
+        assert mirror._resolve_organism("5833")[1] == [
+            "Plasmodium falciparum",
+            "Plasmodium falciparum 3D7",
+        ]
+
+    def test_resolution_reads_the_in_memory_index(self, mirror, monkeypatch):
+        """Resolving is a dict lookup -- no query against taxid_names."""
+
+        def no_queries(*_args, **_kwargs):
+            raise AssertionError("resolution should not query the mirror")
+
+        monkeypatch.setattr(mirror._pool, "checkout", no_queries)
+        assert mirror._resolve_organism("Mycobacterium tuberculosis")[0] == 1773
+        assert mirror._resolve_organism("tb")[0] == 1773
+        assert mirror._resolve_organism("nothing here") == (None, ["nothing here"])
+
+    def test_index_is_rebuilt_for_a_new_mirror_file(self, tmp_path):
+        path = str(tmp_path / "mirror.duckdb")
+        _build_mirror(path)
+        assert SRAMirrorService(path)._resolve_organism("Novus organismus")[0] is None
+        con = duckdb.connect(path)
+        con.execute("INSERT INTO taxid_names VALUES (4242, 'Novus organismus')")
+        con.close()
+        assert SRAMirrorService(path)._resolve_organism("Novus organismus") == (
+            4242,
+            ["Novus organismus"],
+        )
+
     def test_unknown_numeric_taxid_is_not_resolved(self, mirror):
         # A numeric taxid absent from taxid_names matches nothing, so it should
         # read as unresolved -- not a phantom "known organism" with zero runs.
@@ -170,6 +251,516 @@ class TestOrganismResolution:
         assert result["resolved"] is False
 
 
+class TestDidYouMean:
+    """An unresolved term comes back with ranked candidates from taxid_names
+    and the curated aliases, so the model can retry without guessing."""
+
+    @pytest.fixture()
+    def suggesting(self, mirror):
+        mirror._suggester_thread.join(timeout=10)
+        assert mirror._suggester is not None
+        return mirror
+
+    def test_misspelling_suggests_the_organism(self, suggesting):
+        result = suggesting.summary_for_organism("Plasmodium falciparam")
+        assert result["resolved"] is False
+        # Both P. falciparum names share taxid 5833 -- offered once.
+        assert result["did_you_mean"] == [
+            {"name": "Plasmodium falciparum", "taxid": 5833}
+        ]
+        assert "Plasmodium falciparum (taxid 5833)" in result["message"]
+
+    def test_prefix_completes(self, suggesting):
+        result = suggesting.search_runs("mycobact")
+        assert result["did_you_mean"][0] == {
+            "name": "Mycobacterium tuberculosis",
+            "taxid": 1773,
+        }
+
+    def test_aliases_are_suggested(self, suggesting):
+        result = suggesting.top_bioprojects_for_organism("sars-cov2")
+        assert {"name": "sars-cov-2", "taxid": 3418604} in result["did_you_mean"]
+
+    def test_gibberish_gets_no_candidates(self, suggesting):
+        result = suggesting.summary_for_organism("Notarealorganism xyzzy")
+        assert "did_you_mean" not in result
+        assert "check the spelling" in result["message"]
+
+    def test_resolved_terms_carry_no_candidates(self, suggesting):
+        result = suggesting.summary_for_organism("Duplicatus exampleus")
+        assert result["resolved"] is True
+        assert "did_you_mean" not in result
+
+
+class TestSinglePassSummary:
+    """summary_for_organism computes every facet from one GROUPING SETS query
+    instead of six separate scans. It must return exactly what the per-facet
+    queries would: distinct counts, NULL and 'uncalculated' keys excluded from
+    the rankings, and the same (count desc, key desc) order."""
+
+    def test_totals_and_distinct_counts(self, mirror):
+        result = mirror.summary_for_organism("Facetus testus")
+        assert result["n_runs"] == 5
+        # NULL bioproject is not a project, matching COUNT(DISTINCT).
+        assert result["n_bioprojects"] == 2
+        assert result["n_studies"] == 3
+        assert result["earliest_release"] == "2018-01-01"
+        assert result["latest_release"] == "2020-01-01"
+        assert result["runs_last_90_days"] == 0
+
+    def test_facets_skip_null_and_uncalculated_keys(self, mirror):
+        result = mirror.summary_for_organism("Facetus testus")
+        assert result["top_platforms"] == [
+            {"platform": "ILLUMINA", "n_runs": 3},
+            {"platform": "PACBIO_SMRT", "n_runs": 1},
+        ]
+        assert result["top_assay_types"] == [
+            {"assay_type": "WGS", "n_runs": 3},
+            {"assay_type": "RNA-Seq", "n_runs": 1},
+        ]
+        assert result["top_countries"] == [
+            {"country": "Kenya", "n_runs": 2},
+            {"country": "Brazil", "n_runs": 1},
+        ]
+
+    def test_top_bioprojects_carry_release_range(self, mirror):
+        result = mirror.summary_for_organism("Facetus testus")
+        assert result["top_bioprojects"] == [
+            {
+                "bioproject": "PRJNAF1",
+                "n_runs": 2,
+                "earliest_release": "2018-01-01",
+                "latest_release": "2018-02-01",
+            },
+            {
+                "bioproject": "PRJNAF2",
+                "n_runs": 1,
+                "earliest_release": "2019-01-01",
+                "latest_release": "2019-01-01",
+            },
+        ]
+
+    def test_equal_counts_tiebreak_on_key_desc(self, mirror):
+        # ILLUMINA and OXFORD_NANOPORE each have one P. falciparum run.
+        result = mirror.summary_for_organism("Plasmodium falciparum")
+        assert [p["platform"] for p in result["top_platforms"]] == [
+            "OXFORD_NANOPORE",
+            "ILLUMINA",
+        ]
+
+
+class TestBatchSummary:
+    """summaries_for_organisms answers a comparison in one grouped pass, with
+    each entry exactly what summary_for_organism returns for that term."""
+
+    TERMS = [
+        "Facetus testus",
+        "Plasmodium falciparum",
+        "Sameday organism",
+        "Mycobacterium tuberculosis",
+        "Duplicatus exampleus",
+        "Plasmodium falciparam",
+    ]
+
+    def test_matches_single_summaries(self, mirror, tmp_path):
+        path = str(tmp_path / "fresh.duckdb")
+        _build_mirror(path)
+        single = SRAMirrorService(path)
+        # Both suggesters up, so the misspelling's did_you_mean compares equal.
+        mirror._suggester_thread.join(timeout=10)
+        single._suggester_thread.join(timeout=10)
+
+        batch = mirror.summaries_for_organisms(self.TERMS)
+        assert batch["n_organisms"] == len(self.TERMS)
+        for term, summary in zip(self.TERMS, batch["summaries"], strict=True):
+            assert summary == single.summary_for_organism(term), term
+
+    def test_one_pass_for_all_live_summaries(self, mirror, monkeypatch):
+        passes = []
+        original = mirror._summarize_many
+
+        def counting(groups):
+            passes.append(groups)
+            return original(groups)
+
+        monkeypatch.setattr(mirror, "_summarize_many", counting)
+        mirror.summaries_for_organisms(self.TERMS)
+        assert len(passes) == 1
+
+    def test_keeps_order_and_drops_repeats(self, mirror):
+        batch = mirror.summaries_for_organisms(
+            ["Sameday organism", " plasmodium FALCIPARUM ", "sameday organism", "5833"]
+        )
+        assert [s["input"] for s in batch["summaries"]] == [
+            "Sameday organism",
+            " plasmodium FALCIPARUM ",
+            "5833",
+        ]
+        # Two spellings of one taxid resolve to the same name union.
+        assert [s["n_runs"] for s in batch["summaries"]] == [3, 2, 2]
+
+    def test_shares_the_summary_cache(self, mirror):
+        mirror.summary_for_organism("Facetus testus")
+        mirror.summaries_for_organisms(["Facetus testus", "Sameday organism"])
+        executed = mirror.query_stats()["executed"]
+        assert mirror.summary_for_organism("Sameday organism")["n_runs"] == 3
+        assert mirror.query_stats()["executed"] == executed
+
+    def test_rollups_and_live_terms_mix(self, rollup_mirror):
+        batch = rollup_mirror.summaries_for_organisms(
+            ["Facetus testus", "Plasmodium falciparum 3D7", "Notanorganism"]
+        )
+        facetus, pf, missing = batch["summaries"]
+        assert "rollups_built_at" in facetus["_meta"]
+        assert facetus["n_runs"] == 6
+        assert pf["n_runs"] == 2
+        assert missing["resolved"] is False and missing["n_runs"] == 0
+
+    @pytest.mark.parametrize(
+        "organisms", [[], ["  "], [f"Organism {i}" for i in range(21)]]
+    )
+    def test_rejects_empty_and_oversized_batches(self, mirror, organisms):
+        assert "error" in mirror.summaries_for_organisms(organisms)
+
+
+class TestReleaseHistogram:
+    """release_histogram bins an organism's runs by release period in one
+    pass, with quiet periods as zeros and an optional per-facet split."""
+
+    def test_periods_span_first_to_last_release(self, mirror):
+        result = mirror.release_histogram("Facetus testus", interval="month")
+        buckets = result["buckets"]
+        assert (buckets[0]["period"], buckets[-1]["period"]) == ("2018-01", "2020-01")
+        assert len(buckets) == 25
+        assert [b["n_runs"] for b in buckets[:3]] == [1, 1, 0]
+        # SRRF5 has no release date: counted, but in no bucket.
+        assert (result["n_runs"], result["n_undated"]) == (5, 1)
+
+    @pytest.mark.parametrize(
+        "interval, labels",
+        [
+            ("quarter", ["2018-Q1", "2018-Q2"]),
+            ("year", ["2018", "2019"]),
+        ],
+    )
+    def test_interval_labels(self, mirror, interval, labels):
+        result = mirror.release_histogram("Facetus testus", interval=interval)
+        assert [b["period"] for b in result["buckets"][:2]] == labels
+
+    def test_breakdown_splits_each_period(self, mirror):
+        result = mirror.release_histogram("Facetus testus", breakdown="country")
+        assert [(b["period"], b["counts"]) for b in result["buckets"]] == [
+            ("2018", {"Kenya": 2}),
+            # 'uncalculated' and NULL countries both read as unknown.
+            ("2019", {"unknown": 1}),
+            ("2020", {"unknown": 1}),
+        ]
+        assert result["key_totals"] == [
+            {"key": "Kenya", "n_runs": 2},
+            {"key": "unknown", "n_runs": 2},
+        ]
+
+    def test_keys_past_the_top_fold_into_other(self, mirror, monkeypatch):
+        monkeypatch.setattr("app.services.sra_mirror._HISTOGRAM_TOP_KEYS", 1)
+        result = mirror.release_histogram("Facetus testus", breakdown="platform")
+        # ILLUMINA leads overall (3 runs with the undated one); the rest fold.
+        assert result["buckets"][0]["counts"] == {"ILLUMINA": 1, "other": 1}
+        assert [k["key"] for k in result["key_totals"]] == ["ILLUMINA", "other"]
+        for bucket in result["buckets"]:
+            assert sum(bucket["counts"].values()) == bucket["n_runs"]
+
+    def test_filters_apply(self, mirror):
+        result = mirror.release_histogram(
+            "Facetus testus", platform="illumina", since="2019"
+        )
+        assert [(b["period"], b["n_runs"]) for b in result["buckets"]] == [("2020", 1)]
+        assert result["filters_applied"] == {"platform": "illumina", "since": "2019"}
+
+    def test_served_from_rollups_when_unfiltered(self, rollup_mirror, monkeypatch):
+        rolled = rollup_mirror.release_histogram("Facetus testus", interval="quarter")
+        assert "rollups_built_at" in rolled["_meta"]
+        monkeypatch.setattr(rollup_mirror, "_rollup_covers", lambda taxid: False)
+        rollup_mirror._cache.clear()
+        live = rollup_mirror.release_histogram("Facetus testus", interval="quarter")
+        assert "rollups_built_at" not in live["_meta"]
+        for field in ("n_runs", "n_undated", "buckets"):
+            assert rolled[field] == live[field], field
+
+    def test_unresolved_term_is_flagged(self, mirror):
+        result = mirror.release_histogram("Notanorganism")
+        assert result["resolved"] is False and result["buckets"] == []
+
+    @pytest.mark.parametrize(
+        "kwargs",
+        [{"interval": "decade"}, {"breakdown": "instrument"}, {"since": "lately"}],
+    )
+    def test_bad_arguments_are_structured_errors(self, mirror, kwargs):
+        assert "error" in mirror.release_histogram("Facetus testus", **kwargs)
+
+    def test_repeat_is_a_cache_hit(self, mirror):
+        mirror.release_histogram("Facetus testus", breakdown="Platform")
+        executed = mirror.query_stats()["executed"]
+        mirror.release_histogram(" facetus testus ", breakdown="platform")
+        assert mirror.query_stats()["executed"] == executed
+
+
+class TestRollups:
+    """Per-taxid rollups answer summaries and top-BioProject lists without
+    scanning runs. They must return exactly what the live path would, and be
+    ignored -- falling back to the live scan -- when absent or stale."""
+
+    ORGANISMS = [
+        "Plasmodium falciparum",
+        "Mycobacterium tuberculosis",
+        "Sameday organism",
+        "Facetus testus",
+        "Duplicatus exampleus",
+    ]
+
+    def test_rollups_unused_without_build_step(self, mirror):
+        assert mirror._rollups_built_at is None
+        result = mirror.summary_for_organism("Plasmodium falciparum")
+        assert "rollups_built_at" not in result["_meta"]
+
+    def test_summary_served_from_rollups(self, rollup_mirror):
+        result = rollup_mirror.summary_for_organism("Facetus testus")
+        assert result["_meta"]["rollups_built_at"] is not None
+        assert result["n_runs"] == 6
+        assert result["runs_last_90_days"] == 1
+
+    @pytest.mark.parametrize("organism", ORGANISMS)
+    def test_rollup_summary_matches_live_scan(self, rollup_mirror, organism):
+        taxid, names = rollup_mirror._resolve_organism(organism)
+        assert rollup_mirror._summarize_from_rollups(taxid) == rollup_mirror._summarize(
+            names
+        )
+
+    @pytest.mark.parametrize("organism", ORGANISMS)
+    def test_rollup_bioprojects_match_live_scan(self, rollup_mirror, organism):
+        taxid, names = rollup_mirror._resolve_organism(organism)
+        result = rollup_mirror.top_bioprojects_for_organism(organism)
+        assert result["_meta"]["rollups_built_at"] is not None
+        live = rollup_mirror._top_bioprojects_scan(names, 20)
+        assert [
+            (
+                b["bioproject"],
+                b["n_runs"],
+                b["n_studies"],
+                b["earliest_release"],
+                b["latest_release"],
+            )
+            for b in result["bioprojects"]
+        ] == [
+            (bp, n, st, str(e) if e else None, str(la) if la else None)
+            for bp, n, st, e, la in live
+        ]
+
+    def test_unresolved_term_falls_back_to_live_scan(self, rollup_mirror):
+        result = rollup_mirror.summary_for_organism("Notarealorganism xyzzy")
+        assert result["resolved"] is False
+        assert "rollups_built_at" not in result["_meta"]
+
+    def test_stale_rollups_are_ignored(self, tmp_path, caplog):
+        path = str(tmp_path / "stale.duckdb")
+        _build_mirror(path)
+        con = duckdb.connect(path)
+        build_rollups(con)
+        # The weekly rebuild refreshed runs but skipped the rollup step.
+        con.execute(
+            "UPDATE mirror_meta SET value = '2026-05-27' WHERE key = 'mirror_built_at'"
+        )
+        con.close()
+        with caplog.at_level(logging.WARNING):
+            svc = SRAMirrorService(path)
+        assert svc.is_available()
+        assert svc._rollups_built_at is None
+        assert any("stale" in r.getMessage() for r in caplog.records)
+        result = svc.summary_for_organism("Plasmodium falciparum")
+        assert result["n_runs"] == 2
+        assert "rollups_built_at" not in result["_meta"]
+
+    def test_rebuild_replaces_rollups(self, tmp_path):
+        path = str(tmp_path / "rebuild.duckdb")
+        _build_mirror(path)
+        con = duckdb.connect(path)
+        build_rollups(con)
+        build_rollups(con)
+        keys = [
+            k
+            for (k,) in con.execute(
+                "SELECT key FROM mirror_meta WHERE key LIKE 'rollups%'"
+            ).fetchall()
+        ]
+        con.close()
+        assert sorted(keys) == [
+            "rollups_built_at",
+            "rollups_source_built_at",
+            "rollups_source_runs",
+        ]
+
+
+def _compact(source: str, dest: str) -> None:
+    con = duckdb.connect(dest)
+    compact_mirror(con, source)
+    con.close()
+
+
+class TestCompactedLayout:
+    """A compacted copy (runs clustered by organism id and release date, plus
+    run_spans) must answer every query exactly as the file it came from."""
+
+    @pytest.fixture()
+    def compacted(self, tmp_path):
+        source = str(tmp_path / "source.duckdb")
+        _build_mirror(source)
+        dest = str(tmp_path / "compact.duckdb")
+        _compact(source, dest)
+        svc = SRAMirrorService(dest)
+        assert svc.is_available()
+        return svc
+
+    ORGANISMS = [
+        "Facetus testus",
+        "5833",
+        "Duplicatus exampleus",
+        "Sameday organism",
+        "Notanorganism",
+    ]
+
+    def test_layout_is_detected(self, mirror, compacted):
+        assert mirror._organism_ids is None
+        assert set(compacted._organism_ids) == {
+            "Plasmodium falciparum",
+            "Mycobacterium tuberculosis",
+            "Sameday organism",
+            "Facetus testus",
+        }
+
+    def test_runs_are_clustered(self, compacted):
+        rows = compacted._con.execute(
+            "SELECT organism, releasedate FROM runs"
+        ).fetchall()
+        organisms = [organism for organism, _ in rows]
+        assert organisms == sorted(organisms)
+        facetus = [date for organism, date in rows if organism == "Facetus testus"]
+        assert facetus[-1] is None
+        assert facetus[:-1] == sorted(facetus[:-1], reverse=True)
+
+    @pytest.mark.parametrize("organism", ORGANISMS)
+    def test_organism_queries_match(self, mirror, compacted, organism):
+        # Both suggesters up, so an unresolved term's did_you_mean compares equal.
+        mirror._suggester_thread.join(timeout=10)
+        compacted._suggester_thread.join(timeout=10)
+        for call in (
+            lambda m: m.search_runs(organism, limit=2),
+            lambda m: m.summary_for_organism(organism),
+            lambda m: m.top_bioprojects_for_organism(organism),
+            lambda m: m.release_histogram(organism, breakdown="country"),
+        ):
+            assert call(compacted) == call(mirror)
+
+    def test_batch_summary_matches(self, mirror, compacted):
+        mirror._suggester_thread.join(timeout=10)
+        compacted._suggester_thread.join(timeout=10)
+        assert compacted.summaries_for_organisms(
+            self.ORGANISMS
+        ) == mirror.summaries_for_organisms(self.ORGANISMS)
+
+    @pytest.mark.parametrize(
+        "accession",
+        # SRPF3 includes an undated run; PRJNAF1 spans two platforms.
+        ["SRP001", "prjna12345", "SRP9", "SRPF3", "PRJNAF1", "SRP404"],
+    )
+    def test_study_runs_match(self, mirror, compacted, accession):
+        assert compacted.get_study_runs(accession) == mirror.get_study_runs(accession)
+
+    def test_export_matches(self, mirror, compacted):
+        def exported(m):
+            lines = b"".join(m.export_runs("ndjson", accession="SRPF3"))
+            return sorted(lines.splitlines())
+
+        assert exported(compacted) == exported(mirror)
+
+    def test_rollups_survive_compaction(self, rollup_mirror, tmp_path):
+        dest = str(tmp_path / "rolled-compact.duckdb")
+        _compact(rollup_mirror.mirror_path, dest)
+        svc = SRAMirrorService(dest)
+        assert svc._organism_ids is not None
+        assert svc._rollups_built_at == rollup_mirror._rollups_built_at
+        assert svc.summary_for_organism("Facetus testus") == (
+            rollup_mirror.summary_for_organism("Facetus testus")
+        )
+
+    def test_compacting_twice_rebuilds_the_layout(self, compacted, tmp_path):
+        dest = str(tmp_path / "again.duckdb")
+        _compact(compacted.mirror_path, dest)
+        again = SRAMirrorService(dest)
+        assert again._organism_ids == compacted._organism_ids
+        assert again.get_study_runs("SRPF3") == compacted.get_study_runs("SRPF3")
+
+    @pytest.mark.parametrize(
+        "accessions",
+        [
+            ["SRR002", "SRR001"],
+            ["SRR003", "SRR404", "SRR001"],
+            # Not all numeric: skips the run_accessions lookup.
+            ["SRRF5", "SRR003", "SRRF1"],
+            ["SRR404"],
+        ],
+    )
+    def test_runs_by_accessions_match(self, mirror, compacted, accessions):
+        assert compacted.get_runs_by_accessions(
+            accessions
+        ) == mirror.get_runs_by_accessions(accessions)
+
+
+class TestRunsByAccessions:
+    def test_runs_come_back_in_input_order(self, mirror):
+        result = mirror.get_runs_by_accessions(["SRRF2", "SRR001", "SRRA"])
+        assert [r["accession"] for r in result["runs"]] == ["SRRF2", "SRR001", "SRRA"]
+        assert result["runs"][1]["bioproject"] == "PRJNA12345"
+        assert result["n_returned"] == 3
+        assert result["not_found"] == []
+
+    def test_normalizes_and_drops_repeats(self, mirror):
+        result = mirror.get_runs_by_accessions([" srr001 ", "SRR001", "", "srr002"])
+        assert result["n_requested"] == 2
+        assert [r["accession"] for r in result["runs"]] == ["SRR001", "SRR002"]
+
+    def test_unknown_accessions_are_reported(self, mirror):
+        result = mirror.get_runs_by_accessions(["SRR001", "SRR404"])
+        assert result["not_found"] == ["SRR404"]
+        assert "message" not in result
+
+    def test_non_run_accessions_get_a_hint(self, mirror):
+        result = mirror.get_runs_by_accessions(["SRP001", "SRR001,SRR002"])
+        assert result["runs"] == []
+        assert result["not_found"] == ["SRP001", "SRR001,SRR002"]
+        assert "get_study_runs" in result["message"]
+
+    def test_empty_and_oversized_batches_are_refused(self, mirror):
+        assert "error" in mirror.get_runs_by_accessions([" "])
+        too_many = [f"SRR{i}" for i in range(5001)]
+        assert "5000" in mirror.get_runs_by_accessions(too_many)["error"]
+
+    @pytest.mark.parametrize(
+        "accessions, narrow",
+        [
+            (["SRR1000", "SRR1999"], True),
+            (["SRR1000000", "SRR1600000"], False),
+            (["SRR999999", "SRR1000000"], False),
+            (["SRR1000", "ERR1000"], False),
+            (["SRRF1", "SRRF2"], False),
+        ],
+    )
+    def test_accession_span(self, accessions, narrow):
+        assert _accession_span_is_narrow(accessions) is narrow
+
+    def test_batches_are_not_cached(self, mirror):
+        mirror.get_runs_by_accessions(["SRR001"])
+        assert mirror._cache == {}
+
+
 class TestResolvedFlagAcrossOutputs:
     """F6 follow-up: the `resolved` flag belongs on every organism-based
     output, not just summary -- top_bioprojects is offered for cohort
@@ -242,7 +833,7 @@ class TestCountryMatching:
 
 class TestCacheHygiene:
     """F10/F12/F13: the in-process TTL cache must stay bounded, hand back
-    copies (not shared references), and key on a normalized organism so
+    results no caller can corrupt, and key on a normalized organism so
     casing/whitespace variants don't each trigger a fresh aggregate."""
 
     def test_cache_is_bounded(self, mirror):
@@ -254,12 +845,27 @@ class TestCacheHygiene:
 
     def test_cached_result_not_mutated_by_caller(self, mirror):
         r1 = mirror.summary_for_organism("Plasmodium falciparum")
-        r1["n_runs"] = -999
-        r1["top_platforms"].append({"platform": "BOGUS", "n_runs": 1})
+        with pytest.raises(TypeError):
+            r1["n_runs"] = -999
+        with pytest.raises(TypeError):
+            r1["top_platforms"].append({"platform": "BOGUS", "n_runs": 1})
+        with pytest.raises(TypeError):
+            r1["top_platforms"][0]["n_runs"] = 0
+        # A deep copy is the caller's own, plain and editable.
+        mine = copy.deepcopy(r1)
+        mine["n_runs"] = -999
+        mine["top_platforms"].append({"platform": "BOGUS", "n_runs": 1})
         r2 = mirror.summary_for_organism("Plasmodium falciparum")
         assert r2["n_runs"] != -999
         assert all(p["platform"] != "BOGUS" for p in r2["top_platforms"])
 
+    def test_hits_share_one_object_and_encoding(self, mirror):
+        r1 = mirror.search_runs("Plasmodium falciparum")
+        r2 = mirror.search_runs("plasmodium falciparum")
+        assert r2 is r1
+        assert r2.to_json() is r1.to_json()
+        assert json.loads(r1.to_json()) == json.loads(json.dumps(r1))
+
     def test_organism_cache_key_is_normalized(self, mirror):
         mirror.summary_for_organism("Plasmodium falciparum")
         n_after_first = len(mirror._cache)
@@ -301,6 +907,158 @@ class TestStableOrdering:
         assert accs == ["SRRC", "SRRB", "SRRA"]
 
 
+class TestKeysetPagination:
+    """Listings page on (releasedate, acc) -- the ORDER BY itself -- so walking
+    next_cursor returns every run exactly once, in the single-call order, even
+    across same-day ties and the NULL-releasedate tail."""
+
+    @staticmethod
+    def _walk(fetch):
+        accs, cursor, pages = [], None, 0
+        while True:
+            page = fetch(cursor)
+            accs += [r["accession"] for r in page["runs"]]
+            pages += 1
+            cursor = page.get("next_cursor")
+            if cursor is None:
+                return accs, pages
+
+    def test_search_pages_cover_every_run_in_order(self, mirror):
+        everything = mirror.search_runs("Facetus testus")
+        accs, pages = self._walk(
+            lambda c: mirror.search_runs("Facetus testus", limit=2, cursor=c)
+        )
+        assert accs == [r["accession"] for r in everything["runs"]]
+        # The undated run sorts last and is still reached.
+        assert accs[-1] == "SRRF5"
+        assert pages == 3
+
+    def test_same_day_ties_page_by_accession(self, mirror):
+        accs, _ = self._walk(
+            lambda c: mirror.search_runs("Sameday organism", limit=1, cursor=c)
+        )
+        assert accs == ["SRRC", "SRRB", "SRRA"]
+
+    def test_study_runs_page(self, mirror):
+        accs, pages = self._walk(
+            lambda c: mirror.get_study_runs("PRJNA9", limit=2, cursor=c)
+        )
+        assert accs == ["SRRC", "SRRB", "SRRA"]
+        assert pages == 2
+
+    def test_exactly_full_last_page_has_no_cursor(self, mirror):
+        result = mirror.search_runs("Sameday organism", limit=3)
+        assert result["n_returned"] == 3
+        assert "next_cursor" not in result
+
+    def test_invalid_cursor_is_a_structured_error(self, mirror):
+        result = mirror.search_runs("Sameday organism", cursor="not-a-cursor")
+        assert "Invalid cursor" in result["error"]
+        assert result["resolved"] is True
+        assert "Invalid cursor" in mirror.get_study_runs("PRJNA9", cursor="x")["error"]
+
+
+class TestExport:
+    """export_runs streams the full match set, unpaged and unclamped, in the
+    same field layout as the JSON listings."""
+
+    def test_ndjson_matches_the_listing(self, mirror):
+        body = b"".join(mirror.export_runs("ndjson", organism="Facetus testus"))
+        exported = [json.loads(line) for line in body.decode().splitlines()]
+        listed = mirror.search_runs("Facetus testus")["runs"]
+        key = operator.itemgetter("accession")
+        assert sorted(exported, key=key) == sorted(listed, key=key)
+
+    def test_csv_has_header_and_every_run(self, mirror):
+        body = b"".join(mirror.export_runs("csv", accession="prjna9"))
+        rows = list(csv.DictReader(io.StringIO(body.decode())))
+        assert sorted(r["accession"] for r in rows) == ["SRRA", "SRRB", "SRRC"]
+        assert rows[0]["release_date"] == "2022-01-01"
+
+    def test_parquet_round_trips_with_filters(self, mirror, tmp_path):
+        out = tmp_path / "runs.parquet"
+        chunks = mirror.export_runs(
+            "parquet", organism="Facetus testus", platform="illumina"
+        )
+        out.write_bytes(b"".join(chunks))
+        rows = (
+            duckdb.connect()
+            .execute(
+                f"SELECT accession, release_date FROM read_parquet('{out}') ORDER BY 1"
+            )
+            .fetchall()
+        )
+        # Same case-insensitive platform filter as search_runs; dates stay
+        # typed in Parquet.
+        assert [r[0] for r in rows] == ["SRRF1", "SRRF4", "SRRF5"]
+        assert str(rows[0][1]) == "2018-01-01"
+
+    def test_stream_is_batched(self, mirror, monkeypatch):
+        from app.services import sra_mirror as sra_mod
+
+        monkeypatch.setattr(sra_mod, "_EXPORT_BATCH_ROWS", 2)
+        chunks = list(mirror.export_runs("ndjson", organism="Facetus testus"))
+        assert len(chunks) == 3
+
+    @pytest.mark.parametrize(
+        "kwargs",
+        [
+            {"fmt": "xlsx", "organism": "Facetus testus"},
+            {"fmt": "csv"},
+            {"fmt": "csv", "organism": "Facetus testus", "accession": "PRJNA9"},
+            {"fmt": "csv", "organism": "Facetus testus", "since": "last year"},
+        ],
+    )
+    def test_bad_arguments_raise_before_streaming(self, mirror, kwargs):
+        with pytest.raises(ValueError):
+            mirror.export_runs(**kwargs)
+
+    def test_endpoint_streams_with_download_headers(self, mirror, monkeypatch):
+        from fastapi import FastAPI
+        from fastapi.testclient import TestClient
+
+        from app.api.v1 import sra
+
+        monkeypatch.setattr(sra, "get_sra_mirror_service", lambda: mirror)
+        app = FastAPI()
+        app.include_router(sra.router, prefix="/api/v1/sra")
+        with TestClient(app) as client:
+            ok = client.get(
+                "/api/v1/sra/runs/export",
+                params={"organism": "Sameday organism", "format": "csv"},
+            )
+            bad = client.get(
+                "/api/v1/sra/runs/export",
+                params={"organism": "Sameday organism", "since": "soon"},
+            )
+            filtered_study = client.get(
+                "/api/v1/sra/runs/export",
+                params={"accession": "PRJNA9", "platform": "ILLUMINA"},
+            )
+        assert ok.status_code == 200
+        assert ok.headers["content-type"].startswith("text/csv")
+        assert (
+            'filename="sra-runs-sameday-organism.csv"'
+            in (ok.headers["content-disposition"])
+        )
+        assert len(ok.text.splitlines()) == 4
+        assert bad.status_code == 400
+        assert filtered_study.status_code == 400
+
+    def test_endpoint_503_without_mirror(self, monkeypatch):
+        from fastapi import FastAPI
+        from fastapi.testclient import TestClient
+
+        from app.api.v1 import sra
+
+        monkeypatch.setattr(sra, "get_sra_mirror_service", lambda: None)
+        app = FastAPI()
+        app.include_router(sra.router, prefix="/api/v1/sra")
+        with TestClient(app) as client:
+            resp = client.get("/api/v1/sra/runs/export", params={"accession": "PRJNA9"})
+        assert resp.status_code == 503
+
+
 class TestInitErrorHandling:
     """F9: an incomplete/corrupt mirror should fail with a specific, clean
     log -- not a raw traceback from a bare `except Exception` -- and must not
@@ -354,8 +1112,9 @@ class TestConcurrentAccess:
     threads at once. A single DuckDB connection is not safe for concurrent
     execute()/fetch() (a second thread's execute() resets the pending result,
     so the first thread's fetch returns None -> TypeError), and the plain-dict
-    cache is not safe for concurrent mutation under eviction. The public methods
-    serialize on an instance lock; this exercises that.
+    cache is not safe for concurrent mutation under eviction. Each call checks
+    out a pooled cursor of its own and the cache has its own lock; this
+    exercises both.
 
     Every call below uses a UNIQUE cache key (distinct limit per iteration) so
     it misses the cache and actually hits the connection -- a shared key would
@@ -390,3 +1149,458 @@ class TestConcurrentAccess:
             list(pool.map(hammer, range(n_iter)))
 
         assert not errors, errors[:5]
+
+    def test_pooled_cursors_are_reused(self, mirror):
+        """A sequential caller keeps reusing one idle cursor instead of opening
+        a connection per call, and nested pooled helpers share the caller's."""
+        mirror.search_runs("Plasmodium falciparum", limit=3)
+        idle = list(mirror._pool._idle)
+        assert len(idle) == 1
+        mirror.summary_for_organism("Plasmodium falciparum")
+        mirror.get_study_runs("PRJNA12345", limit=3)
+        assert mirror._pool._idle == idle
+
+    def test_idle_cursors_are_capped(self, mirror):
+        """A burst wider than the cap closes the surplus cursors on release."""
+        import threading
+
+        mirror._pool._max_idle = 2
+        barrier = threading.Barrier(6)
+
+        def hold(_):
+            with mirror._pool.connection():
+                barrier.wait(timeout=5)
+
+        threads = [threading.Thread(target=hold, args=(i,)) for i in range(6)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert len(mirror._pool._idle) == 2
+
+
+class TestSingleFlight:
+    """Concurrent identical misses share one computation instead of each
+    running the aggregate; the counters say how many ran vs were shared."""
+
+    @staticmethod
+    def _gate(monkeypatch, mirror, method):
+        """Make `method` block until released, counting how often it runs."""
+        import threading
+
+        started, release = threading.Event(), threading.Event()
+        calls = []
+        original = getattr(mirror, method)
+
+        def gated(*args, **kwargs):
+            calls.append(args)
+            started.set()
+            assert release.wait(timeout=5)
+            return original(*args, **kwargs)
+
+        monkeypatch.setattr(mirror, method, gated)
+        return started, release, calls
+
+    @staticmethod
+    def _wait_for_waiters(mirror):
+        import time
+
+        # Waiters park on the flight's Event; there's no counter to poll, so
+        # give the threads time to reach it before the runner finishes.
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline and not mirror._inflight:
+            time.sleep(0.01)
+        time.sleep(0.2)
+
+    def test_identical_misses_run_once(self, mirror, monkeypatch):
+        import concurrent.futures
+
+        started, release, calls = self._gate(monkeypatch, mirror, "_summarize")
+        with concurrent.futures.ThreadPoolExecutor(max_workers=6) as pool:
+            futures = [
+                pool.submit(mirror.summary_for_organism, term)
+                for term in ("Plasmodium falciparum", " plasmodium FALCIPARUM ") * 3
+            ]
+            assert started.wait(timeout=5)
+            self._wait_for_waiters(mirror)
+            release.set()
+            results = [f.result(timeout=5) for f in futures]
+
+        assert len(calls) == 1
+        assert all(r is results[0] for r in results)
+        assert results[0]["n_runs"] == 2
+        assert mirror.query_stats() == {"executed": 1, "coalesced": 5, "in_flight": 0}
+
+    def test_distinct_keys_do_not_wait_on_each_other(self, mirror):
+        mirror.search_runs("Plasmodium falciparum", limit=1)
+        mirror.search_runs("Plasmodium falciparum", limit=2)
+        mirror.search_runs("Plasmodium falciparum", limit=2)
+        # The repeat is a cache hit: neither executed nor coalesced.
+        assert mirror.query_stats() == {"executed": 2, "coalesced": 0, "in_flight": 0}
+
+    def test_failed_run_is_not_shared(self, mirror, monkeypatch):
+        """Waiters on a run that raised retry it themselves rather than
+        inheriting the failure or hanging."""
+        import concurrent.futures
+        import threading
+
+        started, release = threading.Event(), threading.Event()
+        original = mirror._summarize
+        attempts = []
+
+        def fail_first(names):
+            attempts.append(names)
+            if len(attempts) == 1:
+                started.set()
+                assert release.wait(timeout=5)
+                raise duckdb.IOException("disk went away")
+            return original(names)
+
+        monkeypatch.setattr(mirror, "_summarize", fail_first)
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=3) as pool:
+            futures = [
+                pool.submit(mirror.summary_for_organism, "Plasmodium falciparum")
+                for _ in range(3)
+            ]
+            assert started.wait(timeout=5)
+            self._wait_for_waiters(mirror)
+            release.set()
+            outcomes = []
+            for f in futures:
+                try:
+                    outcomes.append(f.result(timeout=5)["n_runs"])
+                except duckdb.IOException:
+                    outcomes.append("raised")
+
+        assert sorted(outcomes, key=str) == [2, 2, "raised"]
+        stats = mirror.query_stats()
+        assert stats["in_flight"] == 0
+        assert stats["executed"] == 2
+        assert stats["coalesced"] == 1
+
+    def test_stats_endpoint(self, mirror, monkeypatch):
+        from fastapi import FastAPI
+        from fastapi.testclient import TestClient
+
+        from app.api.v1 import sra
+
+        mirror.summary_for_organism("Plasmodium falciparum")
+        monkeypatch.setattr(sra, "get_sra_mirror_service", lambda: mirror)
+        app = FastAPI()
+        app.include_router(sra.router, prefix="/api/v1/sra")
+        with TestClient(app) as client:
+            resp = client.get("/api/v1/sra/stats")
+        assert resp.status_code == 200
+        assert resp.json() == {"executed": 1, "coalesced": 0, "in_flight": 0}
+
+
+class TestHotSwap:
+    """A new weekly build published at SRA_MIRROR_PATH -- renamed over the
+    old file or behind a flipped symlink -- is picked up without a restart,
+    and calls already running finish on the file they started on."""
+
+    @staticmethod
+    def _next_build(path, built_at="2026-05-27"):
+        """A rebuilt mirror at `path`: one more run and organism, new date."""
+        _build_mirror(path)
+        con = duckdb.connect(path)
+        con.execute(
+            "UPDATE mirror_meta SET value = ? WHERE key = 'mirror_built_at'",
+            [built_at],
+        )
+        con.execute("INSERT INTO taxid_names VALUES (4242, 'Novus organismus')")
+        con.execute(
+            """
+            INSERT INTO runs VALUES
+                ('SRR004','SRP001','PRJNA12345','Plasmodium falciparum','WGS',
+                 'ILLUMINA','HiSeq','PAIRED', DATE '2026-05-25','Kenya', 100)
+            """
+        )
+        con.close()
+
+    def test_renamed_file_is_swapped_in(self, tmp_path):
+        import os
+
+        path = str(tmp_path / "mirror.duckdb")
+        _build_mirror(path)
+        svc = SRAMirrorService(path)
+        assert svc.summary_for_organism("Plasmodium falciparum")["n_runs"] == 2
+        assert svc.reload() is False
+
+        self._next_build(str(tmp_path / "next.duckdb"))
+        os.replace(tmp_path / "next.duckdb", path)
+        assert svc.reload() is True
+
+        summary = svc.summary_for_organism("Plasmodium falciparum")
+        assert summary["n_runs"] == 3
+        assert summary["_meta"]["mirror_built_at"] == "2026-05-27"
+        assert svc._resolve_organism("Novus organismus")[0] == 4242
+        assert svc._suggester is not None
+        assert svc.reload() is False
+
+    def test_symlink_flip_is_swapped_in(self, tmp_path):
+        import os
+
+        _build_mirror(str(tmp_path / "week1.duckdb"))
+        self._next_build(str(tmp_path / "week2.duckdb"))
+        link = tmp_path / "current.duckdb"
+        os.symlink(tmp_path / "week1.duckdb", link)
+        svc = SRAMirrorService(str(link))
+
+        os.symlink(tmp_path / "week2.duckdb", tmp_path / "next-link")
+        os.replace(tmp_path / "next-link", link)
+        assert svc.reload() is True
+        assert svc._meta["mirror_built_at"] == "2026-05-27"
+
+    def test_in_flight_call_drains_on_the_old_file(self, tmp_path, monkeypatch):
+        import os
+        import threading
+
+        path = str(tmp_path / "mirror.duckdb")
+        _build_mirror(path)
+        svc = SRAMirrorService(path)
+        old_pool = svc._pool
+
+        started, release = threading.Event(), threading.Event()
+        original = svc._summarize
+
+        def gated(names):
+            started.set()
+            assert release.wait(timeout=5)
+            return original(names)
+
+        monkeypatch.setattr(svc, "_summarize", gated)
+        result = {}
+        caller = threading.Thread(
+            target=lambda: result.update(svc.summary_for_organism("5833"))
+        )
+        caller.start()
+        assert started.wait(timeout=5)
+
+        self._next_build(str(tmp_path / "next.duckdb"))
+        os.replace(tmp_path / "next.duckdb", path)
+        assert svc.reload() is True
+        # The old database stays open for the call still running on it.
+        assert old_pool._active == 1
+        release.set()
+        caller.join(timeout=5)
+
+        assert result["n_runs"] == 2
+        assert result["_meta"]["mirror_built_at"] == "2026-05-20"
+        assert old_pool._active == 0
+        with pytest.raises(duckdb.Error):
+            old_pool._root.execute("SELECT 1")
+        # Computed on the retired file, so not cached for the new one.
+        assert svc.summary_for_organism("5833")["n_runs"] == 3
+
+    def test_checkout_racing_a_swap_moves_to_the_new_file(self, tmp_path):
+        """A call that read the old state just before the swap retired its
+        pool takes the new file's pool instead of a closed database."""
+        import os
+
+        from app.services import sra_mirror as sra_mod
+
+        path = str(tmp_path / "mirror.duckdb")
+        _build_mirror(path)
+        svc = SRAMirrorService(path)
+        stale = svc._state
+        self._next_build(str(tmp_path / "next.duckdb"))
+        os.replace(tmp_path / "next.duckdb", path)
+        assert svc.reload() is True
+        with pytest.raises(sra_mod._PoolRetired):
+            stale.pool.checkout()
+
+        reads = iter([stale])
+        svc._current = lambda: next(reads, svc._state)
+        state, cur = svc._checkout()
+        assert state is svc._state
+        state.pool.release(cur)
+
+    def test_cached_summaries_are_warmed_before_the_swap(self, tmp_path):
+        import os
+
+        path = str(tmp_path / "mirror.duckdb")
+        _build_mirror(path)
+        svc = SRAMirrorService(path)
+        svc.summary_for_organism("Plasmodium falciparum")
+        svc.top_bioprojects_for_organism("Plasmodium falciparum", limit=5)
+        svc.search_runs("Plasmodium falciparum")
+
+        self._next_build(str(tmp_path / "next.duckdb"))
+        os.replace(tmp_path / "next.duckdb", path)
+        svc.reload()
+        executed = svc.query_stats()["executed"]
+
+        assert svc.summary_for_organism("Plasmodium falciparum")["n_runs"] == 3
+        top = svc.top_bioprojects_for_organism("Plasmodium falciparum", limit=5)
+        assert top["bioprojects"][0]["n_runs"] == 3
+        assert svc.query_stats()["executed"] == executed
+        # Searches aren't warmed, and the old page is gone with the old file.
+        assert svc.search_runs("Plasmodium falciparum")["n_returned"] == 3
+        assert svc.query_stats()["executed"] == executed + 1
+
+    @pytest.mark.parametrize(
+        "fmt, kwargs",
+        [
+            ("ndjson", {"organism": "Facetus testus"}),
+            ("csv", {"accession": "PRJNA9"}),
+            ("parquet", {"organism": "Facetus testus"}),
+        ],
+    )
+    def test_export_keeps_the_file_it_started_on(self, tmp_path, fmt, kwargs):
+        """An export started on a compacted file and drained after a swap to
+        one in the name-matched layout reads the rows its filter was built
+        for -- organism ids and run_spans bounds don't exist in the new one."""
+        import os
+
+        source = str(tmp_path / "source.duckdb")
+        _build_mirror(source)
+        _compact(source, str(tmp_path / "week1.duckdb"))
+        self._next_build(str(tmp_path / "week2.duckdb"))
+        link = tmp_path / "current.duckdb"
+        os.symlink(tmp_path / "week1.duckdb", link)
+        svc = SRAMirrorService(str(link))
+        assert svc._organism_ids is not None
+        expected = b"".join(svc.export_runs(fmt, **kwargs))
+        old_pool = svc._pool
+
+        chunks = svc.export_runs(fmt, **kwargs)
+        os.symlink(tmp_path / "week2.duckdb", tmp_path / "next-link")
+        os.replace(tmp_path / "next-link", link)
+        assert svc.reload() is True and svc._organism_ids is None
+
+        body = b"".join(chunks)
+        if fmt != "parquet":
+            assert body == expected
+        assert old_pool._active == 0
+
+    def test_unread_export_releases_its_cursor_on_close(self, tmp_path):
+        path = str(tmp_path / "mirror.duckdb")
+        _build_mirror(path)
+        svc = SRAMirrorService(path)
+        chunks = svc.export_runs("ndjson", accession="PRJNA9")
+        assert svc._pool._active == 1
+        chunks.close()
+        assert svc._pool._active == 0
+
+    def test_broken_new_file_keeps_the_old_one_serving(self, tmp_path, caplog):
+        import os
+
+        path = str(tmp_path / "mirror.duckdb")
+        _build_mirror(path)
+        svc = SRAMirrorService(path)
+        duckdb.connect(str(tmp_path / "empty.duckdb")).close()
+        os.replace(tmp_path / "empty.duckdb", path)
+
+        with caplog.at_level(logging.ERROR):
+            assert svc.reload() is False
+            assert svc.reload() is False
+        assert len([r for r in caplog.records if r.levelno >= logging.ERROR]) == 1
+        assert svc.summary_for_organism("Plasmodium falciparum")["n_runs"] == 2
+
+    def test_watcher_picks_up_a_new_file(self, tmp_path):
+        import os
+        import time
+
+        path = str(tmp_path / "mirror.duckdb")
+        _build_mirror(path)
+        svc = SRAMirrorService(path, reload_interval=0.05)
+        try:
+            self._next_build(str(tmp_path / "next.duckdb"))
+            os.replace(tmp_path / "next.duckdb", path)
+            deadline = time.monotonic() + 5
+            while svc._meta.get("mirror_built_at") != "2026-05-27":
+                assert time.monotonic() < deadline, "watcher never swapped"
+                time.sleep(0.05)
+        finally:
+            svc.close()
+        assert not svc.is_available()
+
+
+class TestSRAMirrorLimits:
+    @pytest.fixture()
+    def capped(self, tmp_path):
+        path = str(tmp_path / "mirror.duckdb")
+        _build_mirror(path)
+        return SRAMirrorService(path, limits=QueryLimits(max_rows=1))
+
+    def test_query_over_the_cap_returns_too_expensive(self, capped):
+        result = capped.search_runs("Plasmodium falciparum")
+        assert result["too_expensive"]["reason"] == "rows"
+        # Not cached: a later call under the cap still runs.
+        assert capped.get_runs_by_accessions(["SRR001"])["n_returned"] == 1
+        assert capped._cache == {}
+
+    def test_cursor_goes_back_to_the_pool(self, capped):
+        capped.get_runs_by_accessions(["SRR001", "SRR002"])
+        assert capped._pool._active == 0
+
+    def test_waiters_share_the_refusal(self, capped):
+        # The runner's refusal goes to the calls waiting on it rather than
+        # each of them re-running the query into the same limit.
+        key = ("probe",)
+        entered, results = threading.Event(), []
+
+        def runner():
+            with pytest.raises(QueryTooExpensive):
+                with capped._coalesced(key) as hit:
+                    assert hit is None
+                    entered.set()
+                    time.sleep(0.2)
+                    raise QueryTooExpensive("rows", 1)
+
+        def waiter():
+            entered.wait()
+            with capped._coalesced(key) as hit:
+                results.append(hit)
+
+        threads = [threading.Thread(target=f) for f in (runner, waiter)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(timeout=10)
+        assert results[0]["too_expensive"] == {"reason": "rows", "limit": 1}
+        assert capped._cache == {}
+
+    def test_timeout_applies_to_pooled_calls(self, tmp_path, monkeypatch):
+        path = str(tmp_path / "mirror.duckdb")
+        _build_mirror(path)
+        svc = SRAMirrorService(path, limits=QueryLimits(timeout_seconds=0.2))
+        monkeypatch.setattr(
+            SRAMirrorService,
+            "_accession_filter",
+            lambda self, accessions: (
+                f"acc IN (SELECT UNNEST(?)) AND ({SLOW_SQL}) IS NOT NULL",
+                [accessions],
+            ),
+        )
+        result = svc.get_runs_by_accessions(["SRR001"])
+        assert result["too_expensive"]["reason"] == "timeout"
+
+
+class TestQueryProfiling:
+    @pytest.fixture()
+    def profiler(self):
+        from app.services.query_profile import profiler
+
+        profiler.configure(enabled=True, capacity=256)
+        profiler.clear()
+        yield profiler
+        profiler.configure(enabled=False, capacity=256)
+        profiler.clear()
+
+    def test_calls_are_recorded_with_cache_outcome(self, mirror, profiler):
+        mirror.summary_for_organism("Plasmodium falciparum")
+        mirror.summary_for_organism("Plasmodium falciparum")
+        hit, miss = profiler.records(source="sra_mirror")
+        assert (miss["tool"], miss["cache"]) == ("summary_for_organism", "miss")
+        assert (hit["tool"], hit["cache"]) == ("summary_for_organism", "hit")
+        assert miss["queries"] and miss["rows_scanned"] > 0
+        assert hit["queries"] == []
+
+    def test_turning_it_off_stops_recording(self, mirror, profiler):
+        mirror.search_runs(organism="Plasmodium falciparum")
+        profiler.configure(enabled=False, capacity=256)
+        mirror.search_runs(organism="Plasmodium vivax")
+        assert len(profiler.records()) == 1
@@ -0,0 +1,187 @@
+"""Tests for the precomputed workflow compatibility matrix and its bulk API."""
+
+import json
+import random
+
+import pytest
+
+from app.services.catalog_data import CatalogData
+from app.services.lineage_index import LineageIndex
+from app.services.workflow_compatibility import CompatibilityMatrix
+
+ECOLI = ["1", "131567", "2", "1224", "561", "562"]
+YEAST = ["1", "131567", "2759", "4751", "4932", "559292"]
+ASSEMBLIES = [
+    {
+        "accession": "GCF_000005845.2",
+        "ncbiTaxonomyId": "511145",
+        "speciesTaxonomyId": "562",
+        "ploidy": ["HAPLOID"],
+        "lineageTaxonomyIds": ECOLI + ["511145"],
+    },
+    {
+        "accession": "GCF_000146045.2",
+        "ncbiTaxonomyId": "559292",
+        "speciesTaxonomyId": "4932",
+        "ploidy": "DIPLOID",
+        "lineageTaxonomyIds": YEAST,
+    },
+]
+WORKFLOWS = [
+    {
+        "category": "VARIANT_CALLING",
+        "name": "Variant calling",
+        "workflows": [
+            {"iwcId": "any", "workflowName": "Any", "ploidy": "ANY"},
+            {"iwcId": "haploid", "ploidy": "HAPLOID", "taxonomyId": None},
+            {"iwcId": "diploid", "ploidy": "DIPLOID"},
+            {"iwcId": "bacteria", "ploidy": "HAPLOID", "taxonomyId": 2},
+            {"iwcId": "organism", "ploidy": "ANY", "scope": "ORGANISM"},
+        ],
+    },
+    {
+        "category": "ANNOTATION",
+        "name": "Annotation",
+        # Listed under two categories.
+        "workflows": [{"iwcId": "any", "workflowName": "Any", "ploidy": "ANY"}],
+    },
+]
+
+
+@pytest.fixture()
+def catalog(tmp_path):
+    # Not tmp_path itself: the app fixture writes its own catalog there.
+    path = tmp_path / "catalog"
+    path.mkdir()
+    (path / "assemblies.json").write_text(json.dumps(ASSEMBLIES))
+    (path / "workflows.json").write_text(json.dumps(WORKFLOWS))
+    return CatalogData(str(path))
+
+
+def _ids(workflows):
+    return [wf["iwcId"] for wf in workflows]
+
+
+class TestMatrix:
+    def test_compatible_workflows(self, catalog):
+        assert _ids(catalog.get_compatible_workflows(["HAPLOID"], "562")) == [
+            "any",
+            "haploid",
+            "bacteria",
+            "any",
+        ]
+        assert _ids(catalog.get_compatible_workflows(["DIPLOID"], "559292")) == [
+            "any",
+            "diploid",
+            "any",
+        ]
+        # No taxon to check: taxon-specific workflows are in.
+        assert "bacteria" in _ids(catalog.get_compatible_workflows(["HAPLOID"]))
+        # An unknown taxon matches only untargeted workflows.
+        assert "bacteria" not in _ids(
+            catalog.get_compatible_workflows(["HAPLOID"], "999")
+        )
+
+    def test_check_pairs(self, catalog):
+        ok = catalog.check_workflow_assembly_compatibility(
+            "bacteria", "GCF_000005845.2"
+        )
+        assert ok == {
+            "compatible": True,
+            "workflow": None,
+            "assembly": "GCF_000005845.2",
+        }
+        bad = catalog.check_workflow_assembly_compatibility(
+            "bacteria", "GCF_000146045.2"
+        )
+        assert bad["compatible"] is False
+        assert "Ploidy mismatch" in bad["reason"]
+        assert "Taxonomy mismatch" in bad["reason"]
+        hidden = catalog.check_workflow_assembly_compatibility(
+            "organism", "GCF_000005845.2"
+        )
+        assert hidden["reason"] == "Workflow 'organism' not found"
+
+    def test_matches_checking_every_workflow(self):
+        # The matrix agrees with the per-call checks it replaced, on random
+        # workflows and assemblies.
+        rng = random.Random(5)
+        lineages = [ECOLI, ECOLI[:4] + ["590"], YEAST, ["1", "10239", "11158"]]
+        taxa = sorted({t for lineage in lineages for t in lineage} | {"999"})
+        ploidies = ["HAPLOID", "DIPLOID", "POLYPLOID"]
+        workflows = [
+            {
+                "iwcId": f"wf{i}",
+                "ploidy": rng.choice(ploidies + ["ANY", None]),
+                "taxonomyId": rng.choice(taxa + [None, None]),
+            }
+            for i in range(40)
+        ]
+        assemblies = [
+            {
+                "accession": f"GCA_{i}",
+                "ploidy": rng.sample(ploidies, rng.randint(0, 2)),
+                "lineageTaxonomyIds": rng.choice(lineages),
+            }
+            for i in range(30)
+        ]
+        lineage = LineageIndex(a["lineageTaxonomyIds"] for a in assemblies)
+        matrix = CompatibilityMatrix(workflows, assemblies, lineage)
+
+        def ploidy_ok(wf, have):
+            return wf["ploidy"] in (None, "ANY") or wf["ploidy"] in have
+
+        for have in ([], ["HAPLOID"], ["DIPLOID", "POLYPLOID"]):
+            for taxon in taxa:
+                expected = [
+                    wf
+                    for wf in workflows
+                    if ploidy_ok(wf, have)
+                    and (
+                        wf["taxonomyId"] is None
+                        or lineage.is_ancestor(wf["taxonomyId"], taxon)
+                    )
+                ]
+                columns = matrix.for_ploidies(have) & matrix.for_taxon(taxon)
+                assert matrix.select(columns) == expected
+        for asm in assemblies:
+            for wf in workflows:
+                expected = ploidy_ok(wf, asm["ploidy"]) and (
+                    wf["taxonomyId"] is None
+                    or wf["taxonomyId"] in asm["lineageTaxonomyIds"]
+                )
+                assert matrix.compatible(wf["iwcId"], asm["accession"]) == expected
+
+
+class TestBulk:
+    def test_assemblies_and_organisms(self, catalog):
+        result = catalog.get_compatible_workflows_bulk(
+            ["GCF_000005845.2", "GCF_000146045.2", "GCA_nope"],
+            ["562", "511145", "4932", "1"],
+        )
+        assert result["assemblies"] == {
+            "GCF_000005845.2": ["any", "haploid", "bacteria"],
+            "GCF_000146045.2": ["any", "diploid"],
+        }
+        assert result["organisms"] == {
+            "562": ["any", "haploid", "bacteria"],
+            "511145": ["any", "haploid", "bacteria"],
+            "4932": ["any", "diploid"],
+        }
+        assert result["not_found"] == {"assemblies": ["GCA_nope"], "organisms": ["1"]}
+        assert set(result["workflows"]) == {"any", "haploid", "bacteria", "diploid"}
+        assert result["workflows"]["any"]["name"] == "Any"
+
+    def test_endpoint(self, client, catalog):
+        from app.core.dependencies import get_catalog_data
+
+        client.app.dependency_overrides[get_catalog_data] = lambda: catalog
+        resp = client.post(
+            "/api/v1/catalog/compatible-workflows",
+            json={"accessions": ["GCF_000146045.2"]},
+        )
+        assert resp.status_code == 200, resp.text
+        assert resp.json()["assemblies"] == {"GCF_000146045.2": ["any", "diploid"]}
+        too_many = {"accessions": [f"GCA_{i}" for i in range(1001)]}
+        resp = client.post("/api/v1/catalog/compatible-workflows", json=too_many)
+        assert resp.status_code == 422